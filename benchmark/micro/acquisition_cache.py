@@ -0,0 +1,102 @@
+"""Measures the cache of the acquisition values during a hyperparameter optimization of the Hartmann function on a
+grid of integers with the random forest facade. Reports the time spent in the acquisition function and in maximizing
+it per maximization and the hit rate of the cache, with the cache vs. without it (``max_size=0``).
+
+Usage: ``python micro/acquisition_cache.py [--n-trials 100] [--n-seeds 2]``
+"""
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from ConfigSpace import Configuration, ConfigurationSpace, Integer
+
+from smac import HyperparameterOptimizationFacade, Scenario
+from smac.acquisition.function import EI
+from smac.acquisition.maximizer import LocalAndSortedRandomSearch
+
+
+class TimedEI(EI):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.time = 0.0
+
+    def __call__(self, configurations: list[Configuration] | np.ndarray) -> np.ndarray:
+        start = time.perf_counter()
+        acq = super().__call__(configurations)
+        self.time += time.perf_counter() - start
+
+        return acq
+
+
+class TimedMaximizer(LocalAndSortedRandomSearch):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.times: list[float] = []
+
+    def _maximize_lazily(self, *args: Any, **kwargs: Any) -> Iterator[tuple[float, Configuration]]:
+        # The challengers are generated on demand, so the time to generate each of them is added up
+        self.times.append(0.0)
+        challengers = super()._maximize_lazily(*args, **kwargs)
+        while True:
+            start = time.perf_counter()
+            challenger = next(challengers, None)
+            self.times[-1] += time.perf_counter() - start
+            if challenger is None:
+                return
+
+            yield challenger
+
+
+def hartmann(config: Configuration, seed: int = 0) -> float:
+    x = np.array([config[f"x{i}"] for i in range(6)]) / 10
+    alpha = np.array([1.0, 1.2, 3.0, 3.2])
+    A = np.array([[10, 3, 17, 3.5, 1.7, 8], [0.05, 10, 17, 0.1, 8, 14], [3, 3.5, 1.7, 10, 17, 8], [17, 8, 0.05, 10, 0.1, 14]])
+    P = 1e-4 * np.array([[1312, 1696, 5569, 124, 8283, 5886], [2329, 4135, 8307, 3736, 1004, 9991],
+                         [2348, 1451, 3522, 2883, 3047, 6650], [4047, 8828, 8732, 5743, 1091, 381]])  # fmt: skip
+
+    return float(-np.sum(alpha * np.exp(-np.sum(A * (x - P) ** 2, axis=1))))
+
+
+def run(n_trials: int, seed: int, cache_size: int) -> tuple[float, float, float]:
+    cs = ConfigurationSpace(seed=seed)
+    cs.add_hyperparameters([Integer(f"x{i}", (0, 10)) for i in range(6)])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scenario = Scenario(cs, deterministic=True, n_trials=n_trials, seed=seed, output_directory=tmp_dir)
+        acquisition_function = TimedEI(log=True)
+        acquisition_function.cache.max_size = cache_size
+        maximizer = TimedMaximizer(cs, acquisition_function, challengers=1000, seed=seed)
+        smac = HyperparameterOptimizationFacade(
+            scenario,
+            hartmann,
+            acquisition_function=acquisition_function,
+            acquisition_maximizer=maximizer,
+            overwrite=True,
+            logging_level=40,
+        )
+        smac.optimize()
+
+    n = len(maximizer.times)
+    return acquisition_function.time / n, float(np.mean(maximizer.times)), acquisition_function.cache.hit_rate
+
+
+def main(n_trials: int, n_seeds: int) -> None:
+    print(f"{'cache size':>10} {'acquisition [ms]':>18} {'maximize [ms]':>15} {'hit rate':>10}")
+    for cache_size in [0, 50000]:
+        results = [run(n_trials, seed, cache_size) for seed in range(n_seeds)]
+        acquisition_time, maximize_time, hit_rate = np.mean(results, axis=0)
+        print(f"{cache_size:>10} {acquisition_time * 1e3:>18.1f} {maximize_time * 1e3:>15.1f} {hit_rate:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-trials", type=int, default=100)
+    parser.add_argument("--n-seeds", type=int, default=2)
+    args = parser.parse_args()
+
+    main(args.n_trials, args.n_seeds)
@@ -0,0 +1,112 @@
+"""Measures batch acquisition with the random forest (``hpo``) or the Gaussian process (``bb``) facade on the
+Hartmann function, where each batch of ``q`` configurations is asked before any of them is told (as with ``q``
+parallel workers). Reports the smallest distance between the configurations of a batch (averaged over the batches),
+the best cost and the time to select a configuration for the expected improvement vs. the batch acquisition
+functions.
+
+Usage: ``python micro/batch_acquisition.py [--facade hpo] [--n-batches 10] [--q 8] [--n-seeds 3]``
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from ConfigSpace import Configuration, ConfigurationSpace, Float
+from scipy.spatial.distance import pdist
+
+from smac import BlackBoxFacade, HyperparameterOptimizationFacade, Scenario
+from smac.acquisition.function import (
+    EI,
+    AbstractAcquisitionFunction,
+    BatchTS,
+    ConstantLiar,
+    KrigingBeliever,
+    LocalPenalization,
+)
+from smac.runhistory import TrialValue
+
+
+def hartmann(config: Configuration, seed: int = 0) -> float:
+    x = np.array([config[f"x{i}"] for i in range(6)])
+    alpha = np.array([1.0, 1.2, 3.0, 3.2])
+    A = np.array([[10, 3, 17, 3.5, 1.7, 8], [0.05, 10, 17, 0.1, 8, 14], [3, 3.5, 1.7, 10, 17, 8], [17, 8, 0.05, 10, 0.1, 14]])
+    P = 1e-4 * np.array([[1312, 1696, 5569, 124, 8283, 5886], [2329, 4135, 8307, 3736, 1004, 9991],
+                         [2348, 1451, 3522, 2883, 3047, 6650], [4047, 8828, 8732, 5743, 1091, 381]])  # fmt: skip
+
+    return float(-np.sum(alpha * np.exp(-np.sum(A * (x - P) ** 2, axis=1))))
+
+
+FACADES = {"hpo": HyperparameterOptimizationFacade, "bb": BlackBoxFacade}
+
+
+def run(
+    facade: str,
+    get_acquisition_function: Callable[[], AbstractAcquisitionFunction],
+    n_batches: int,
+    q: int,
+    seed: int,
+) -> tuple[float, float, float]:
+    cs = ConfigurationSpace(seed=seed)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(6)])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scenario = Scenario(cs, deterministic=True, n_trials=10000, seed=seed, output_directory=tmp_dir)
+        smac = FACADES[facade](
+            scenario,
+            hartmann,
+            acquisition_function=get_acquisition_function(),
+            overwrite=True,
+            logging_level=40,
+        )
+
+        # The initial design is evaluated first
+        for _ in range(len(smac._config_selector._initial_design_configs)):
+            info = smac.ask()
+            smac.tell(info, TrialValue(cost=hartmann(info.config)))
+
+        distances, times = [], []
+        for _ in range(n_batches):
+            start = time.perf_counter()
+            infos = [smac.ask() for _ in range(q)]
+            times.append((time.perf_counter() - start) / q)
+            distances.append(pdist(np.array([info.config.get_array() for info in infos])).min())
+            for info in infos:
+                smac.tell(info, TrialValue(cost=hartmann(info.config)))
+
+        best = min(trial_value.cost for trial_value in smac.runhistory.values())
+
+    return float(np.mean(distances)), float(best), float(np.mean(times))
+
+
+def main(facade: str, n_batches: int, q: int, n_seeds: int) -> None:
+    # The random forest facade models log costs
+    log = facade == "hpo"
+    acquisition_functions: dict[str, Callable[[], AbstractAcquisitionFunction]] = {
+        "EI": lambda: EI(log=log),
+        "KrigingBeliever": lambda: KrigingBeliever(EI(log=log)),
+        "ConstantLiar(min)": lambda: ConstantLiar(EI(log=log), lie="min"),
+        "ConstantLiar(max)": lambda: ConstantLiar(EI(log=log), lie="max"),
+        "LocalPenalization": lambda: LocalPenalization(EI(log=log)),
+        "BatchTS": lambda: BatchTS(),
+    }
+
+    print(f"{'acquisition function':>20} {'min distance':>13} {'best cost':>10} {'select [ms]':>12}")
+    for name, get_acquisition_function in acquisition_functions.items():
+        results = [run(facade, get_acquisition_function, n_batches, q, seed) for seed in range(n_seeds)]
+        distance, best, select_time = np.mean(results, axis=0)
+        print(f"{name:>20} {distance:>13.3f} {best:>10.3f} {select_time * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--facade", choices=list(FACADES), default="hpo")
+    parser.add_argument("--n-batches", type=int, default=10)
+    parser.add_argument("--q", type=int, default=8)
+    parser.add_argument("--n-seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.facade, args.n_batches, args.q, args.n_seeds)
@@ -0,0 +1,68 @@
+"""Measures the time until the first challengers of the local and sorted random search are available, generating all
+challengers at once (``_maximize``) vs. generating them on demand (``maximize``). The acquisition function is the
+expected improvement of a random forest trained on previously evaluated configurations.
+
+Usage: ``python micro/challenger_stream.py [--n-points 1 8 5000] [--n-repetitions 3]``
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+from ConfigSpace import Categorical, ConfigurationSpace, EqualsCondition, Float, Integer
+
+from smac.acquisition.function import EI
+from smac.acquisition.maximizer import LocalAndSortedRandomSearch
+from smac.model.random_forest import RandomForest
+
+
+def get_configspace() -> ConfigurationSpace:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+    cs.add_hyperparameters([Integer(f"i{i}", (1, 100), log=True) for i in range(3)])
+    kernel = Categorical("kernel", ["linear", "rbf", "poly"])
+    gamma = Float("gamma", (1e-4, 1), log=True)
+    degree = Integer("degree", (2, 5))
+    cs.add_hyperparameters([kernel, gamma, degree])
+    cs.add_conditions([EqualsCondition(gamma, kernel, "rbf"), EqualsCondition(degree, kernel, "poly")])
+
+    return cs
+
+
+def main(n_points: list[int], n_repetitions: int) -> None:
+    cs = get_configspace()
+    rng = np.random.RandomState(0)
+    previous_configs = cs.sample_configuration(50)
+    X = np.array([config.get_array() for config in previous_configs])
+    model = RandomForest(cs, seed=0)
+    model.train(X, rng.rand(len(X)))
+    ei = EI()
+    ei.update(model=model, eta=0.0)
+
+    print(f"{'n_points':>8} {'challengers':>12} {'all at once [s]':>16} {'on demand [s]':>14}")
+    for n, k in itertools.product(n_points, [1, 8]):
+        eager_times, lazy_times = [], []
+        for seed in range(n_repetitions):
+            # The cache is cleared to not share acquisition values between the repetitions
+            ei.cache.clear()
+            start = time.perf_counter()
+            LocalAndSortedRandomSearch(cs, ei, seed=seed)._maximize(previous_configs, n)[:k]
+            eager_times.append(time.perf_counter() - start)
+
+            ei.cache.clear()
+            start = time.perf_counter()
+            list(itertools.islice(LocalAndSortedRandomSearch(cs, ei, seed=seed).maximize(previous_configs, n), k))
+            lazy_times.append(time.perf_counter() - start)
+
+        print(f"{n:>8} {k:>12} {np.mean(eager_times):>16.3f} {np.mean(lazy_times):>14.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-points", type=int, nargs="+", default=[1, 8, 5000])
+    parser.add_argument("--n-repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.n_points, args.n_repetitions)
@@ -0,0 +1,57 @@
+"""Measures the cost of transforming the runhistory into X/Y matrices as the runhistory grows.
+
+Between two transforms, ``--step`` trials are added (as between two model retrains). Since the encoder only encodes
+the trials which were added since the last transform, the time per transform should grow much slower than the
+number of trials. With ``--uncached``, the matrices are built from scratch on every transform.
+
+Usage: ``python micro/encoder_transform.py [--n-trials 50000] [--step 1000] [--uncached]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac import RunHistory, Scenario
+from smac.runhistory.encoder import AbstractRunHistoryEncoder
+from smac.runhistory.encoder.log_scaled_encoder import RunHistoryLogScaledEncoder
+
+
+class UncachedEncoder(RunHistoryLogScaledEncoder):
+    _build_matrix_from_rows = AbstractRunHistoryEncoder._build_matrix_from_rows
+
+
+def main(n_trials: int, step: int, uncached: bool) -> None:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(10)])
+    configs = cs.sample_configuration(n_trials)
+
+    scenario = Scenario(cs)
+    runhistory = RunHistory()
+    encoder = (UncachedEncoder if uncached else RunHistoryLogScaledEncoder)(scenario)
+    encoder.runhistory = runhistory
+
+    rng = np.random.RandomState(0)
+    costs = rng.rand(n_trials)
+
+    print(f"{'trials':>10} {'ms/transform':>14}")
+    for i in range(n_trials):
+        runhistory.add(configs[i], float(costs[i]), seed=0)
+
+        if (i + 1) % step == 0:
+            start = time.perf_counter()
+            encoder.transform()
+            end = time.perf_counter()
+            print(f"{i + 1:>10} {(end - start) * 1e3:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-trials", type=int, default=50000)
+    parser.add_argument("--step", type=int, default=5000)
+    parser.add_argument("--uncached", action="store_true")
+    args = parser.parse_args()
+
+    main(args.n_trials, args.step, args.uncached)
@@ -0,0 +1,49 @@
+"""Measures the time to train the Gaussian process of the black-box facade after new data points were added. Training
+from scratch (optimizing the hyperparameters on every training) is compared to the incremental update of the
+Cholesky decomposition (see ``reoptimize_after``), which optimizes the hyperparameters only every few data points.
+
+Usage: ``python micro/gp_incremental.py [--n-train 50 100 200] [--n-new 5] [--reoptimize-after 50]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac import BlackBoxFacade, Scenario
+
+
+def main(n_train: list[int], n_new: int, reoptimize_after: int) -> None:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+    scenario = Scenario(cs, deterministic=True)
+
+    rng = np.random.RandomState(0)
+    print(f"{'n':>6} {'scratch [ms]':>14} {'incremental [ms]':>18}")
+    for n in n_train:
+        X = rng.rand(n + n_new * 5, 5)
+        y = np.sin(3 * X).sum(axis=1, keepdims=True) + 0.01 * rng.randn(len(X), 1)
+
+        times = []
+        for k in [1, reoptimize_after]:
+            model = BlackBoxFacade.get_model(scenario, reoptimize_after=k)
+            model.train(X[:n], y[:n])
+
+            start = time.perf_counter()
+            for i in range(1, 6):
+                model.train(X[: n + i * n_new], y[: n + i * n_new])
+            times.append((time.perf_counter() - start) / 5)
+
+        print(f"{n:>6} {times[0] * 1e3:>14.1f} {times[1] * 1e3:>18.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-train", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--n-new", type=int, default=5)
+    parser.add_argument("--reoptimize-after", type=int, default=50)
+    args = parser.parse_args()
+
+    main(args.n_train, args.n_new, args.reoptimize_after)
@@ -0,0 +1,55 @@
+"""Measures the time to evaluate the kernel of the black-box facade and its gradient for changing hyperparameters,
+as done by the hyperparameter optimization of the Gaussian process. Recomputing the differences of the data points
+on every evaluation (the cache is disabled with ``max_size=0``) is compared to reweighting the cached differences
+(see ``DifferenceCache``).
+
+Usage: ``python micro/gp_kernel_cache.py [--n 100 200 400] [--n-dimensions 5 20] [--n-evaluations 20]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import Categorical, ConfigurationSpace, Float
+
+from smac import BlackBoxFacade, Scenario
+from smac.model.gaussian_process.kernels import AbstractKernel
+
+
+def main(n: list[int], n_dimensions: list[int], n_evaluations: int) -> None:
+    cache = AbstractKernel.difference_cache
+    max_size = cache.max_size
+
+    print(f"{'d':>4} {'n':>6} {'recompute [ms]':>16} {'cached [ms]':>14}")
+    for d in n_dimensions:
+        cs = ConfigurationSpace(seed=0)
+        cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(d)])
+        cs.add_hyperparameter(Categorical("c", ["a", "b", "c"]))
+        kernel = BlackBoxFacade.get_kernel(Scenario(cs, deterministic=True))
+
+        rng = np.random.RandomState(0)
+        for size in n:
+            X = np.hstack([rng.rand(size, d), rng.randint(0, 3, (size, 1))])
+
+            times = []
+            for cache.max_size in [0, max_size]:
+                theta = kernel.theta
+                start = time.perf_counter()
+                for _ in range(n_evaluations):
+                    kernel.theta = theta + 0.1 * rng.randn(len(theta))
+                    kernel(X, eval_gradient=True)
+                times.append((time.perf_counter() - start) / n_evaluations)
+                kernel.theta = theta
+
+            print(f"{d:>4} {size:>6} {times[0] * 1e3:>16.2f} {times[1] * 1e3:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--n-dimensions", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--n-evaluations", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.n, args.n_dimensions, args.n_evaluations)
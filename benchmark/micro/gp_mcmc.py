@@ -0,0 +1,58 @@
+"""Measures the time to train and predict with the MCMC Gaussian process of the black-box facade. Evaluating the
+likelihood of each walker separately is compared to evaluating the likelihood of all walkers at once with the shared
+differences of the training data (see ``BatchedKernel``).
+
+Usage: ``python micro/gp_mcmc.py [--n-train 25 50 100] [--n-dimensions 5] [--n-test 1000]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac import BlackBoxFacade, Scenario
+
+
+def main(n_train: list[int], n_dimensions: int, n_test: int) -> None:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(n_dimensions)])
+    scenario = Scenario(cs, deterministic=True)
+
+    rng = np.random.RandomState(0)
+    X_test = rng.rand(n_test, n_dimensions)
+
+    print(f"{'n':>6} {'train [s]':>12} {'batched [s]':>12} {'predict [ms]':>14} {'batched [ms]':>14}")
+    for n in n_train:
+        X = rng.rand(n, n_dimensions)
+        y = np.sin(3 * X).sum(axis=1, keepdims=True) + 0.01 * rng.randn(n, 1)
+
+        train_times, predict_times = [], []
+        for batched in [False, True]:
+            model = BlackBoxFacade.get_model(scenario, model_type="mcmc")
+            if not batched:
+                model._batched_kernel = None
+
+            start = time.perf_counter()
+            model.train(X, y)
+            train_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            model.predict(X_test)
+            predict_times.append(time.perf_counter() - start)
+
+        print(
+            f"{n:>6} {train_times[0]:>12.2f} {train_times[1]:>12.2f} "
+            f"{predict_times[0] * 1e3:>14.1f} {predict_times[1] * 1e3:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-train", type=int, nargs="+", default=[25, 50, 100])
+    parser.add_argument("--n-dimensions", type=int, default=5)
+    parser.add_argument("--n-test", type=int, default=1000)
+    args = parser.parse_args()
+
+    main(args.n_train, args.n_dimensions, args.n_test)
@@ -0,0 +1,62 @@
+"""Measures the training and prediction time and the prediction error of the sparse Gaussian process (see
+``BlackBoxFacade.get_model(model_type="sparse")``) compared to the exact Gaussian process. The exact Gaussian
+process is only trained up to ``--max-exact`` data points since it needs O(n³) time and O(n²) memory.
+
+Usage: ``python micro/gp_sparse.py [--n-train 1000 5000 20000] [--n-inducing-points 100] [--max-exact 1000]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac import BlackBoxFacade, Scenario
+
+
+def function(X: np.ndarray) -> np.ndarray:
+    return np.sin(3 * X).sum(axis=1) + X[:, 0] * X[:, 1]
+
+
+def main(n_train: list[int], n_inducing_points: int, max_exact: int) -> None:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+    scenario = Scenario(cs, deterministic=True)
+
+    rng = np.random.RandomState(0)
+    X_test = rng.rand(1000, 5)
+    y_test = function(X_test)
+
+    print(f"{'n':>6} {'model':>7} {'train [s]':>10} {'predict [ms]':>13} {'rmse':>8}")
+    for n in n_train:
+        X = rng.rand(n, 5)
+        y = function(X) + 0.05 * rng.randn(n)
+
+        for model_type in ["sparse", "vanilla"]:
+            if model_type == "vanilla" and n > max_exact:
+                print(f"{n:>6} {model_type:>7} {'-':>10} {'-':>13} {'-':>8}")
+                continue
+
+            model = BlackBoxFacade.get_model(scenario, model_type=model_type, n_inducing_points=n_inducing_points)
+
+            start = time.perf_counter()
+            model.train(X, y.reshape((-1, 1)))
+            train_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            mean, _ = model.predict(X_test)
+            predict_time = time.perf_counter() - start
+
+            rmse = np.sqrt(np.mean((mean.ravel() - y_test) ** 2))
+            print(f"{n:>6} {model_type:>7} {train_time:>10.2f} {predict_time * 1e3:>13.1f} {rmse:>8.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-train", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--n-inducing-points", type=int, default=100)
+    parser.add_argument("--max-exact", type=int, default=1000)
+    args = parser.parse_args()
+
+    main(args.n_train, args.n_inducing_points, args.max_exact)
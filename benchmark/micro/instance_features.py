@@ -0,0 +1,60 @@
+"""Measures the time to preprocess the instance features (scaling and PCA) when training and predicting with a
+model. The model itself does nothing, so that only the preprocessing of ``AbstractModel`` is measured. The scaler and
+the PCA are fitted once on the features of all instances and applied as a single affine map afterwards.
+
+Usage: ``python micro/instance_features.py [--n 1000 5000 20000] [--n-instances 100] [--n-features 20]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac.model.abstract_model import AbstractModel
+
+
+class NoModel(AbstractModel):
+    def _train(self, X: np.ndarray, Y: np.ndarray) -> NoModel:
+        return self
+
+    def _predict(self, X: np.ndarray, covariance_type: str | None = "diagonal") -> tuple[np.ndarray, np.ndarray]:
+        return np.zeros(len(X)), np.zeros(len(X))
+
+
+def main(n: list[int], n_instances: int, n_features: int) -> None:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+
+    rng = np.random.RandomState(0)
+    instance_features = {str(i): list(rng.rand(n_features)) for i in range(n_instances)}
+    features = np.array(list(instance_features.values()))
+    model = NoModel(cs, instance_features=instance_features)
+
+    print(f"{'n':>8} {'train [ms]':>12} {'predict [ms]':>14}")
+    for size in n:
+        X = np.hstack([rng.rand(size, 5), features[rng.randint(0, n_instances, size)]])
+        y = rng.rand(size)
+
+        start = time.perf_counter()
+        for _ in range(10):
+            model.train(X, y)
+        train_time = (time.perf_counter() - start) / 10
+
+        start = time.perf_counter()
+        for _ in range(10):
+            model.predict(X)
+        predict_time = (time.perf_counter() - start) / 10
+
+        print(f"{size:>8} {train_time * 1e3:>12.2f} {predict_time * 1e3:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--n-instances", type=int, default=100)
+    parser.add_argument("--n-features", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.n, args.n_instances, args.n_features)
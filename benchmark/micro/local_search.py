@@ -0,0 +1,83 @@
+"""Measures the local search of the acquisition maximizer on a configuration space with categorical, integer, float
+and conditional hyperparameters. Reports the time per neighbour of the one-exchange neighbourhood created as
+configurations by ConfigSpace vs. as vectors, and the time of a local search with the expected improvement of a
+random forest for different numbers of start points and worker processes.
+
+Usage: ``python micro/local_search.py [--n-start-points 10 50] [--n-jobs 1 2] [--n-repetitions 3]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import Categorical, ConfigurationSpace, EqualsCondition, Float, Integer
+
+from smac.acquisition.function import EI
+from smac.acquisition.maximizer import LocalSearch
+from smac.model.random_forest import RandomForest
+from smac.utils.configspace import (
+    get_one_exchange_neighbourhood,
+    get_one_exchange_neighbourhood_vectors,
+)
+
+
+def get_configspace() -> ConfigurationSpace:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+    cs.add_hyperparameters([Integer(f"i{i}", (1, 100), log=True) for i in range(3)])
+    kernel = Categorical("kernel", ["linear", "rbf", "poly"])
+    gamma = Float("gamma", (1e-4, 1), log=True)
+    degree = Integer("degree", (2, 5))
+    cs.add_hyperparameters([kernel, gamma, degree])
+    cs.add_conditions([EqualsCondition(gamma, kernel, "rbf"), EqualsCondition(degree, kernel, "poly")])
+
+    return cs
+
+
+def main(n_start_points: list[int], n_jobs: list[int], n_repetitions: int) -> None:
+    cs = get_configspace()
+    configs = cs.sample_configuration(100)
+
+    start = time.perf_counter()
+    n = sum(len(list(get_one_exchange_neighbourhood(config, seed=i))) for i, config in enumerate(configs))
+    configuration_time = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    random_state = np.random.RandomState()
+    n = sum(
+        len(list(get_one_exchange_neighbourhood_vectors(cs, config.get_array(), seed=i, random_state=random_state)))
+        for i, config in enumerate(configs)
+    )
+    vector_time = (time.perf_counter() - start) / n
+
+    print(f"Neighbourhood: {configuration_time * 1e6:.1f} us per configuration, {vector_time * 1e6:.1f} us per vector")
+
+    rng = np.random.RandomState(0)
+    X = np.array([config.get_array() for config in cs.sample_configuration(100)])
+    model = RandomForest(cs, seed=0)
+    model.train(X, rng.rand(len(X)))
+    ei = EI()
+    ei.update(model=model, eta=0.0)
+
+    print(f"{'start points':>14} {'jobs':>6} {'local search [s]':>18}")
+    for size in n_start_points:
+        for jobs in n_jobs:
+            times = []
+            for seed in range(n_repetitions):
+                start_points = cs.sample_configuration(size)
+                start = time.perf_counter()
+                LocalSearch(cs, ei, n_jobs=jobs, seed=seed)._search_in_parallel(start_points)
+                times.append(time.perf_counter() - start)
+
+            print(f"{size:>14} {jobs:>6} {np.mean(times):>18.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-start-points", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--n-repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.n_start_points, args.n_jobs, args.n_repetitions)
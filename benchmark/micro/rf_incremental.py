@@ -0,0 +1,92 @@
+"""Compares rebuilding the random forest on every training with online updates of the existing forest (see
+``rebuild_after``) during a hyperparameter optimization of the Branin function. The model is retrained after every
+trial. Reports the training time per iteration, the number of rebuilds, and the final incumbent cost averaged over
+several seeds.
+
+The costs are passed to the model as they are (i.e., without the log-scaled encoder and the log expected improvement
+of the facade): The log-scaled encoder normalizes the costs with statistics of all costs, which changes the targets
+of all previous data points, so that the forest is rebuilt anyway.
+
+Usage: ``python micro/rf_incremental.py [--n-trials 200] [--n-seeds 3] [--rebuild-after 1 5 20]``
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from ConfigSpace import Configuration, ConfigurationSpace, Float
+
+from smac import HyperparameterOptimizationFacade, Scenario
+from smac.acquisition.function import EI
+from smac.model.random_forest import RandomForest
+from smac.runhistory.encoder import RunHistoryEncoder
+
+
+class TimedRandomForest(RandomForest):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.train_times: list[float] = []
+        self.n_rebuilds = 0
+
+    def _train(self, X: np.ndarray, y: np.ndarray) -> RandomForest:
+        forest = self._rf
+        start = time.perf_counter()
+        super()._train(X, y)
+        self.train_times.append(time.perf_counter() - start)
+        self.n_rebuilds += int(self._rf is not forest)
+
+        return self
+
+
+def branin(config: Configuration, seed: int = 0) -> float:
+    x1, x2 = config["x1"], config["x2"]
+    a, b, c = 1.0, 5.1 / (4.0 * np.pi**2), 5.0 / np.pi
+    r, s, t = 6.0, 10.0, 1.0 / (8.0 * np.pi)
+
+    return a * (x2 - b * x1**2 + c * x1 - r) ** 2 + s * (1 - t) * np.cos(x1) + s
+
+
+def run(n_trials: int, seed: int, rebuild_after: int) -> tuple[float, float, int]:
+    cs = ConfigurationSpace(seed=seed)
+    cs.add_hyperparameters([Float("x1", (-5, 10)), Float("x2", (0, 15))])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scenario = Scenario(cs, deterministic=True, n_trials=n_trials, seed=seed, output_directory=tmp_dir)
+        model = TimedRandomForest(cs, ratio_features=1.0, min_samples_split=2, min_samples_leaf=1,
+                                  rebuild_after=rebuild_after, seed=seed)  # fmt: skip
+        smac = HyperparameterOptimizationFacade(
+            scenario,
+            branin,
+            model=model,
+            acquisition_function=EI(),
+            runhistory_encoder=RunHistoryEncoder(scenario),
+            config_selector=HyperparameterOptimizationFacade.get_config_selector(scenario, retrain_after=1),
+            overwrite=True,
+            logging_level=40,
+        )
+        incumbent = smac.optimize()
+
+    assert isinstance(incumbent, Configuration)
+    return float(np.mean(model.train_times)), branin(incumbent), model.n_rebuilds
+
+
+def main(n_trials: int, n_seeds: int, rebuild_after: list[int]) -> None:
+    print(f"{'rebuild_after':>14} {'ms/train':>10} {'rebuilds':>10} {'incumbent cost':>16}")
+    for k in rebuild_after:
+        results = [run(n_trials, seed, k) for seed in range(n_seeds)]
+        train_time, cost, n_rebuilds = np.mean(results, axis=0)
+        print(f"{k:>14} {train_time * 1e3:>10.2f} {n_rebuilds:>10.1f} {cost:>16.5f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-trials", type=int, default=200)
+    parser.add_argument("--n-seeds", type=int, default=3)
+    parser.add_argument("--rebuild-after", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    main(args.n_trials, args.n_seeds, args.rebuild_after)
@@ -0,0 +1,58 @@
+"""Measures the time to predict a batch of points (e.g., the neighbours of a local search step) with the random
+forest. The batched prediction is compared to predicting the points one by one with pyrfr, which was done before.
+
+Usage: ``python micro/rf_predict.py [--n-train 1000] [--n-predict 10000] [--log-y]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac.model.random_forest import RandomForest
+
+
+def main(n_train: int, n_predict: int, log_y: bool) -> None:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(10)])
+
+    rng = np.random.RandomState(0)
+    X = rng.rand(n_train, 10)
+    y = np.log(X.sum(axis=1)) if log_y else X.sum(axis=1)
+    X_test = rng.rand(n_predict, 10)
+
+    model = RandomForest(cs, log_y=log_y)
+    model.train(X, y.reshape((-1, 1)))
+
+    start = time.perf_counter()
+    model.predict(X_test)
+    end = time.perf_counter()
+    print(f"batched (first call, includes exporting the trees): {(end - start) * 1e3:.1f} ms")
+
+    start = time.perf_counter()
+    model.predict(X_test)
+    end = time.perf_counter()
+    print(f"batched: {(end - start) * 1e3:.1f} ms")
+
+    assert model._rf is not None
+    start = time.perf_counter()
+    for row in model._impute_inactive(X_test):
+        for forest in model._rf:
+            if log_y:
+                forest.all_leaf_values(row)
+            else:
+                forest.predict_mean_var(row)
+    end = time.perf_counter()
+    print(f"per row: {(end - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-train", type=int, default=1000)
+    parser.add_argument("--n-predict", type=int, default=10000)
+    parser.add_argument("--log-y", action="store_true")
+    args = parser.parse_args()
+
+    main(args.n_train, args.n_predict, args.log_y)
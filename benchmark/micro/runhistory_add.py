@@ -0,0 +1,57 @@
+"""Measures the cost of adding trials to the runhistory as the runhistory grows.
+
+Since the objective bounds are maintained incrementally, the time per added trial should stay (roughly) constant
+instead of growing linearly with the number of trials in the runhistory.
+
+Usage: ``python micro/runhistory_add.py [--n-trials 50000] [--n-objectives 2] [--columnar]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac import RunHistory, Scenario
+from smac.multi_objective.aggregation_strategy import MeanAggregationStrategy
+
+
+def main(n_trials: int, n_objectives: int, n_configs: int | None, columnar: bool, chunk_size: int) -> None:
+    # By default, every trial evaluates a new configuration (as in black-box optimization)
+    if n_configs is None:
+        n_configs = n_trials
+
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+    configs = cs.sample_configuration(n_configs)
+
+    scenario = Scenario(cs, objectives=[f"o{i}" for i in range(n_objectives)] if n_objectives > 1 else "cost")
+    mo = MeanAggregationStrategy(scenario) if n_objectives > 1 else None
+    runhistory = RunHistory(multi_objective_algorithm=mo, columnar=columnar)
+
+    rng = np.random.RandomState(0)
+    costs = rng.rand(n_trials, n_objectives)
+
+    print(f"{'trials':>10} {'us/trial':>10}")
+    start = time.perf_counter()
+    for i in range(n_trials):
+        cost = costs[i].tolist() if n_objectives > 1 else float(costs[i, 0])
+        runhistory.add(configs[i % n_configs], cost, seed=i)
+
+        if (i + 1) % chunk_size == 0:
+            end = time.perf_counter()
+            print(f"{i + 1:>10} {(end - start) / chunk_size * 1e6:>10.1f}")
+            start = time.perf_counter()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-trials", type=int, default=50000)
+    parser.add_argument("--n-objectives", type=int, default=2)
+    parser.add_argument("--n-configs", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--columnar", action="store_true")
+    args = parser.parse_args()
+
+    main(args.n_trials, args.n_objectives, args.n_configs, args.columnar, args.chunk_size)
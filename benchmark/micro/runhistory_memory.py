@@ -0,0 +1,62 @@
+"""Measures the memory footprint and the time to fill the runhistory with the dictionary vs. the columnar storage.
+The trials are evaluated on every instance-seed pair of every configuration (as in algorithm configuration), and the
+memory is measured with ``tracemalloc`` after all trials were added.
+
+Usage: ``python micro/runhistory_memory.py [--n-configs 250] [--n-instances 20] [--n-seeds 10]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace, Float
+
+from smac import RunHistory
+
+
+def fill(columnar: bool, n_configs: int, n_instances: int, n_seeds: int, trace: bool) -> tuple[float, float]:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float(f"x{i}", (0, 1)) for i in range(5)])
+    configs = cs.sample_configuration(n_configs)
+    instances = [f"i{i}" for i in range(n_instances)]
+    costs = np.random.RandomState(0).rand(n_configs, n_instances, n_seeds).tolist()
+
+    if trace:
+        tracemalloc.start()
+
+    runhistory = RunHistory(columnar=columnar)
+    start = time.perf_counter()
+    for config, config_costs in zip(configs, costs):
+        for instance, instance_costs in zip(instances, config_costs):
+            for seed, cost in enumerate(instance_costs):
+                runhistory.add(config, cost, instance=instance, seed=seed)
+
+    duration = time.perf_counter() - start
+    memory = 0.0
+    if trace:
+        memory = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+    return memory, duration
+
+
+def main(n_configs: int, n_instances: int, n_seeds: int) -> None:
+    print(f"{n_configs * n_instances * n_seeds} trials")
+    print(f"{'storage':>10} {'memory [MB]':>12} {'fill [s]':>9}")
+    for name, columnar in (("dict", False), ("columnar", True)):
+        # Tracing slows down the fill, which is therefore timed in a separate run
+        memory, _ = fill(columnar, n_configs, n_instances, n_seeds, trace=True)
+        _, duration = fill(columnar, n_configs, n_instances, n_seeds, trace=False)
+        print(f"{name:>10} {memory:>12.1f} {duration:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-configs", type=int, default=250)
+    parser.add_argument("--n-instances", type=int, default=20)
+    parser.add_argument("--n-seeds", type=int, default=10)
+    args = parser.parse_args()
+
+    main(args.n_configs, args.n_instances, args.n_seeds)
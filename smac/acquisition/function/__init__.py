@@ -1,5 +1,13 @@
 from smac.acquisition.function.abstract_acquisition_function import (
     AbstractAcquisitionFunction,
+    AcquisitionCache,
+)
+from smac.acquisition.function.batch_acquisition_function import (
+    AbstractBatchAcquisitionFunction,
+    BatchTS,
+    ConstantLiar,
+    KrigingBeliever,
+    LocalPenalization,
 )
 from smac.acquisition.function.confidence_bound import LCB
 from smac.acquisition.function.expected_improvement import EI, EIPS
@@ -12,6 +20,7 @@ from smac.acquisition.function.thompson import TS
 
 __all__ = [
     "AbstractAcquisitionFunction",
+    "AcquisitionCache",
     "LCB",
     "PI",
     "EI",
@@ -19,4 +28,9 @@ __all__ = [
     "TS",
     "PriorAcquisitionFunction",
     "IntegratedAcquisitionFunction",
+    "AbstractBatchAcquisitionFunction",
+    "KrigingBeliever",
+    "ConstantLiar",
+    "LocalPenalization",
+    "BatchTS",
 ]
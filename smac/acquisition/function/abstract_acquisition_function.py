@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
+
+import threading
+from collections import OrderedDict
 
 import numpy as np
 from ConfigSpace import Configuration
@@ -10,6 +13,9 @@ from smac.model.abstract_model import AbstractModel
 from smac.utils.configspace import convert_configurations_to_array
 from smac.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from smac.runhistory.runhistory import RunHistory
+
 __copyright__ = "Copyright 2022, automl.org"
 __license__ = "3-clause BSD"
 
@@ -17,11 +23,153 @@ __license__ = "3-clause BSD"
 logger = get_logger(__name__)
 
 
+class AcquisitionCache:
+    """Least recently used cache of acquisition values, keyed by the bytes of the configuration vectors. While the
+    model and the acquisition function are fixed (i.e., within one iteration of the optimization), points are often
+    evaluated multiple times, e.g., the start points of the local search which were already scored by the random
+    search, or the neighbours which are revisited by plateau walks.
+
+    The cache has to be cleared whenever the acquisition values change, which ``AbstractAcquisitionFunction.update``
+    does automatically.
+
+    Parameters
+    ----------
+    max_size : int, defaults to 50000
+        The maximum number of cached points. The least recently used points are evicted first. A size of zero
+        disables the cache.
+    """
+
+    def __init__(self, max_size: int = 50000) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, list] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        # The acquisition function might be evaluated in multiple threads
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Copies (e.g., for worker processes) start with an empty cache
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        del state["_lock"]
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of cached points."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int) -> None:
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    @property
+    def hits(self) -> int:
+        """The number of points whose acquisition value was taken from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of points whose acquisition value had to be computed."""
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of points whose acquisition value was taken from the cache."""
+        n = self._hits + self._misses
+        if n == 0:
+            return 0.0
+
+        return self._hits / n
+
+    def get(self, X: np.ndarray, compute: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """Returns the acquisition values of X. Only the values of points which are not cached are computed.
+
+        Parameters
+        ----------
+        X : np.ndarray [N, D]
+            The points to evaluate.
+        compute : Callable[[np.ndarray], np.ndarray]
+            Computes the acquisition values of the points which are not cached.
+
+        Returns
+        -------
+        np.ndarray [N, 1]
+            The acquisition values of X.
+        """
+        if self._max_size <= 0:
+            self._misses += len(X)
+            return compute(X)
+
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        keys = [x.tobytes() for x in X]
+        with self._lock:
+            values = [self._entries.get(key) for key in keys]
+            hits = [i for i, value in enumerate(values) if value is not None]
+            for i in hits:
+                self._entries.move_to_end(keys[i])
+
+            self._hits += len(hits)
+            self._misses += len(X) - len(hits)
+
+        if len(hits) == 0:
+            missing: list[int] = list(range(len(X)))
+            acq = compute(X)
+            if np.shape(acq)[:1] != (len(X),):
+                # Values which are not given per point can not be cached
+                return acq
+
+            computed = acq.tolist()
+        else:
+            missing = [i for i, value in enumerate(values) if value is None]
+            acq = np.empty((len(X), *np.shape(values[hits[0]])))
+            acq[hits] = [values[i] for i in hits]
+
+            computed = []
+            if len(missing) > 0:
+                acq[missing] = compute(X[missing])
+                computed = acq[missing].tolist()
+
+        # The values are stored as lists, from which arrays are created faster than from many small arrays
+        with self._lock:
+            for i, value in zip(missing, computed):
+                self._entries[keys[i]] = value
+
+            self._evict()
+
+        return acq
+
+    def clear(self) -> None:
+        """Removes all cached points. The statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
 class AbstractAcquisitionFunction:
-    """Abstract base class for acquisition function."""
+    """Abstract base class for acquisition function.
+
+    The acquisition values are cached per point until the acquisition function is updated (see ``cache``).
+    """
 
     def __init__(self) -> None:
         self._model: AbstractModel | None = None
+        self._runhistory: RunHistory | None = None
+        self._cacheable = True
+        self._cache = AcquisitionCache()
 
     @property
     def name(self) -> str:
@@ -44,6 +192,32 @@ class AbstractAcquisitionFunction:
     def model(self, model: AbstractModel) -> None:
         """Updates the surrogate model."""
         self._model = model
+        self._cache.clear()
+
+    @property
+    def cache(self) -> AcquisitionCache:
+        """Return the cache of the acquisition values, which also keeps the hit-rate statistics."""
+        return self._cache
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the acquisition values of a point only change when the acquisition function is updated. Acquisition
+        functions which draw random values on every call (e.g., Thompson sampling) and the acquisition functions which
+        wrap them are not cacheable.
+        """
+        return self._cacheable
+
+    @property
+    def runhistory(self) -> RunHistory | None:
+        """Return the runhistory whose vector cache is used to convert configurations."""
+        return self._runhistory
+
+    @runhistory.setter
+    def runhistory(self, runhistory: RunHistory | None) -> None:
+        """Sets the runhistory. The vectors of configurations which are stored in the runhistory are then taken
+        from its cache instead of being computed again.
+        """
+        self._runhistory = runhistory
 
     def update(self, model: AbstractModel, **kwargs: Any) -> None:
         """Update the acquisition function attributes required for calculation.
@@ -64,6 +238,15 @@ class AbstractAcquisitionFunction:
         self.model = model
         self._update(**kwargs)
 
+        # The acquisition values of the previous model are invalid now
+        self._cache.clear()
+        logger.debug(
+            "Acquisition cache: %d hits, %d misses (hit rate %.3f).",
+            self._cache.hits,
+            self._cache.misses,
+            self._cache.hit_rate,
+        )
+
     def _update(self, **kwargs: Any) -> None:
         """Update acsquisition function attributes
 
@@ -71,23 +254,39 @@ class AbstractAcquisitionFunction:
         """
         pass
 
-    def __call__(self, configurations: list[Configuration]) -> np.ndarray:
+    def __call__(self, configurations: list[Configuration] | np.ndarray) -> np.ndarray:
         """Compute the acquisition value for a given configuration.
 
         Parameters
         ----------
-        configurations : list[Configuration]
-            The configurations where the acquisition function should be evaluated.
+        configurations : list[Configuration] | np.ndarray
+            The configurations where the acquisition function should be evaluated. The configurations can also be
+            passed in their vector representation, which avoids converting them.
 
         Returns
         -------
         np.ndarray [N, 1]
             Acquisition values for X
         """
-        X = convert_configurations_to_array(configurations)
+        if isinstance(configurations, np.ndarray) and np.issubdtype(configurations.dtype, np.number):
+            X = configurations
+        elif self._runhistory is not None:
+            X = self._runhistory.get_configs_array(configurations)
+        else:
+            X = convert_configurations_to_array(configurations)
+
         if len(X.shape) == 1:
             X = X[np.newaxis, :]
 
+        return self._cache.get(X, self._compute_values)
+
+    def _disable_cache(self) -> None:
+        """Marks the acquisition function as not cacheable and disables its cache."""
+        self._cacheable = False
+        self._cache.max_size = 0
+
+    def _compute_values(self, X: np.ndarray) -> np.ndarray:
+        """Computes the acquisition values of X and replaces NaN values with the lowest possible value."""
         acq = self._compute(X)
         if np.any(np.isnan(acq)):
             idx = np.where(np.isnan(acq))[0]
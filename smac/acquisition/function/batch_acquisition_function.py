@@ -0,0 +1,436 @@
+from __future__ import annotations
+
+from typing import Any, Literal
+
+import copy
+
+import numpy as np
+from ConfigSpace import Configuration
+from scipy.spatial.distance import cdist, pdist
+from scipy.special import erfc
+
+from smac.acquisition.function.abstract_acquisition_function import (
+    AbstractAcquisitionFunction,
+)
+from smac.acquisition.function.confidence_bound import LCB
+from smac.acquisition.function.integrated_acquisition_function import (
+    IntegratedAcquisitionFunction,
+)
+from smac.acquisition.function.thompson import TS
+from smac.constants import VERY_SMALL_NUMBER
+from smac.model.abstract_model import AbstractModel
+from smac.model.gaussian_process.abstract_gaussian_process import (
+    AbstractGaussianProcess,
+)
+from smac.utils.configspace import convert_configurations_to_array
+from smac.utils.logging import get_logger
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+logger = get_logger(__name__)
+
+
+class AbstractBatchAcquisitionFunction(AbstractAcquisitionFunction):
+    """Abstract base class for batch acquisition functions, which select several diverse configurations from one fit
+    of the surrogate model (e.g., for parallel workers).
+
+    A batch acquisition function wraps an acquisition function and takes pending points into account: The
+    configurations of the running trials and the configurations which were already selected for the batch. The config
+    selector sets the configurations of the running trials as pending points after the acquisition function was
+    updated (see ``set_pending``), and maximizes the acquisition function again after each selected configuration,
+    which is added to the pending points (see ``add_pending``).
+
+    Which batch acquisition function works best depends on the model: With Gaussian processes, the fantasy-based
+    ``KrigingBeliever`` and ``ConstantLiar`` (with ``lie="max"`` for the most diverse batches) condition the
+    posterior on the pending points without training the model again, and ``BatchTS`` is the cheapest. With random
+    forests, whose variance hardly shrinks around a fantasized point, ``LocalPenalization`` yields the most diverse
+    batches, while the fantasy-based functions exploit more.
+
+    Parameters
+    ----------
+    acquisition_function : AbstractAcquisitionFunction
+        The acquisition function which is adjusted for the pending points.
+    """
+
+    def __init__(self, acquisition_function: AbstractAcquisitionFunction) -> None:
+        super().__init__()
+        self._acquisition_function = acquisition_function
+        self._pending: list[np.ndarray] = []
+        self._kwargs: dict[str, Any] = {}
+
+        # Caching would freeze the random values of the wrapped acquisition function
+        if not getattr(acquisition_function, "cacheable", True):
+            self._disable_cache()
+
+    @property
+    def meta(self) -> dict[str, Any]:  # noqa: D102
+        meta = super().meta
+        meta.update({"acquisition_function": self._acquisition_function.meta})
+
+        return meta
+
+    @property
+    def pending(self) -> np.ndarray:
+        """Returns the vectors of the pending configurations."""
+        return np.array(self._pending)
+
+    def set_pending(self, configurations: list[Configuration]) -> None:
+        """Replaces the pending configurations.
+
+        Parameters
+        ----------
+        configurations : list[Configuration]
+            The configurations which are evaluated at the moment, e.g., by the running trials.
+        """
+        self._pending = list(self._get_vectors(configurations))
+        self._update_pending()
+        self._cache.clear()
+
+    def add_pending(self, configuration: Configuration) -> None:
+        """Adds a pending configuration, e.g., a configuration which was selected for the batch.
+
+        Parameters
+        ----------
+        configuration : Configuration
+            The configuration which is going to be evaluated.
+        """
+        self._pending.append(self._get_vectors([configuration])[0])
+        self._update_pending()
+        self._cache.clear()
+
+    def _update(self, **kwargs: Any) -> None:
+        """Updates the wrapped acquisition function and drops the pending points of the previous model."""
+        assert self.model is not None
+        self._kwargs = kwargs
+        self._pending = []
+        self._acquisition_function.update(model=self.model, **kwargs)
+
+    def _update_pending(self) -> None:
+        """Adjusts the acquisition function to the changed pending points. Might be different for each child
+        class.
+        """
+        pass
+
+    def _get_vectors(self, configurations: list[Configuration]) -> np.ndarray:
+        if self._runhistory is not None:
+            return self._runhistory.get_configs_array(configurations)
+
+        return convert_configurations_to_array(configurations)
+
+
+class KrigingBeliever(AbstractBatchAcquisitionFunction):
+    r"""Kriging believer: The targets of the pending points are fantasized with the mean prediction of the surrogate
+    model, and the wrapped acquisition function is computed with a copy of the model which includes the fantasized
+    data. The posterior of a Gaussian process is conditioned on the fantasized data with the current hyperparameters
+    (see ``AbstractGaussianProcess.fantasize``), which shrinks the variance around the pending points. Other models
+    (e.g., the random forest) are trained on the observed and the fantasized data; since the fantasized data points
+    are appended to the training data, models which support online updates add them incrementally. The fantasized
+    targets are believed to be observed, i.e., they also improve on the incumbent (``eta``) of the acquisition
+    function.
+
+    See "Kriging Is Well-Suited to Parallelize Optimization" by David Ginsbourger et al. for further details.
+
+    Note
+    ----
+    The training data of the model have to be passed to ``update`` (``X_train`` and ``Y_train``) if the model is
+    not a Gaussian process, which is done by the config selector.
+
+    Parameters
+    ----------
+    acquisition_function : AbstractAcquisitionFunction
+        The acquisition function which is computed with the fantasized model.
+    """
+
+    def __init__(self, acquisition_function: AbstractAcquisitionFunction) -> None:
+        super().__init__(acquisition_function)
+        self._fantasy_model: AbstractModel | None = None
+        self._fantasized: list[np.ndarray] = []
+        self._X_fantasy: np.ndarray | None = None
+        self._Y_fantasy: np.ndarray | None = None
+        # The best observed value including the fantasized targets
+        self._eta: float | None = None
+
+    @property
+    def name(self) -> str:  # noqa: D102
+        return f"Kriging Believer ({self._acquisition_function.__class__.__name__})"
+
+    def _update(self, **kwargs: Any) -> None:
+        super()._update(**kwargs)
+        self._fantasy_model = None
+        self._fantasized = []
+
+    def _update_pending(self) -> None:
+        assert self.model is not None
+        n = len(self._fantasized)
+        if n > len(self._pending) or any(
+            not np.array_equal(a, b, equal_nan=True) for a, b in zip(self._fantasized, self._pending)
+        ):
+            # The fantasies are only extended; otherwise, they are started from the observed data again
+            self._fantasy_model = None
+            self._fantasized = []
+            n = 0
+
+        if len(self._pending) == 0:
+            self._acquisition_function.update(model=self.model, **self._kwargs)
+            return
+
+        if self._fantasy_model is None:
+            self._fantasy_model = copy.deepcopy(self.model)
+            self._X_fantasy = self._kwargs.get("X_train")
+            self._Y_fantasy = self._kwargs.get("Y_train")
+            self._eta = self._kwargs.get("eta")
+
+        X_new = self._get_data_points(np.array(self._pending[n:]))
+        Y_new = self._get_lies(X_new).reshape(len(X_new), -1)
+        if self._eta is not None:
+            # Fantasized targets are believed to be observed, i.e., they can improve on the incumbent (the targets of
+            # the instances of a configuration are averaged)
+            lies = Y_new.reshape(len(self._pending) - n, -1).mean(axis=1)
+            self._eta = min(self._eta, float(lies.min()))
+
+        if self._X_fantasy is not None and self._Y_fantasy is not None:
+            self._X_fantasy = np.vstack([self._X_fantasy, X_new])
+            self._Y_fantasy = np.vstack([self._Y_fantasy, Y_new])
+
+        if not self._fantasize(X_new, Y_new):
+            if self._X_fantasy is None or self._Y_fantasy is None:
+                self._fantasy_model = None
+                self._fantasized = []
+                raise ValueError(f"{self.__class__.__name__} requires the training data (X_train and Y_train).")
+
+            self._fantasy_model.train(self._X_fantasy, self._Y_fantasy)
+
+        self._fantasized = list(self._pending)
+
+        kwargs = dict(self._kwargs)
+        if self._eta is not None:
+            kwargs["eta"] = self._eta
+
+        self._acquisition_function.update(model=self._fantasy_model, **kwargs)
+
+    def _fantasize(self, X: np.ndarray, Y: np.ndarray) -> bool:
+        """Conditions the posterior of the fantasy model on the fantasized data points if it is a Gaussian process.
+
+        Returns
+        -------
+        fantasized : bool
+            Whether the posterior was conditioned. If not, the fantasy model has to be trained.
+        """
+        if not isinstance(self._fantasy_model, AbstractGaussianProcess):
+            return False
+
+        try:
+            self._fantasy_model.fantasize(X, Y)
+        except (NotImplementedError, np.linalg.LinAlgError):
+            return False
+
+        return True
+
+    def _get_data_points(self, X: np.ndarray) -> np.ndarray:
+        """Returns the data points of the configurations X, i.e., one data point per instance if the model uses
+        instance features.
+        """
+        assert self.model is not None
+        instance_features = self.model._instance_features
+        if instance_features is None or len(instance_features) == 0:
+            return X
+
+        features = np.array(list(instance_features.values()), dtype=np.float64)
+        X = np.repeat(X, len(features), axis=0)
+
+        return np.hstack([X, np.tile(features, (len(X) // len(features), 1))])
+
+    def _get_lies(self, X: np.ndarray) -> np.ndarray:
+        """Returns the fantasized targets of the data points X."""
+        assert self._fantasy_model is not None
+        mean, _ = self._fantasy_model.predict(X)
+
+        return mean
+
+    def _compute(self, X: np.ndarray) -> np.ndarray:
+        return self._acquisition_function._compute(X)
+
+
+class ConstantLiar(KrigingBeliever):
+    r"""Constant liar: Like the kriging believer, but the targets of the pending points are fantasized with a
+    constant (the minimum, mean or maximum of the observed targets).
+
+    See "Kriging Is Well-Suited to Parallelize Optimization" by David Ginsbourger et al. for further details.
+
+    Parameters
+    ----------
+    acquisition_function : AbstractAcquisitionFunction
+        The acquisition function which is computed with the fantasized model.
+    lie : Literal["min", "mean", "max"], defaults to "min"
+        The statistic of the observed targets which is used as target of the pending points. The minimum leads to the
+        most exploitative batches, the maximum to the most explorative ones.
+    """
+
+    def __init__(
+        self,
+        acquisition_function: AbstractAcquisitionFunction,
+        lie: Literal["min", "mean", "max"] = "min",
+    ) -> None:
+        super().__init__(acquisition_function)
+        if lie not in ("min", "mean", "max"):
+            raise ValueError(f"Unknown lie {lie}.")
+
+        self._lie = lie
+
+    @property
+    def name(self) -> str:  # noqa: D102
+        return f"Constant Liar ({self._acquisition_function.__class__.__name__})"
+
+    @property
+    def meta(self) -> dict[str, Any]:  # noqa: D102
+        meta = super().meta
+        meta.update({"lie": self._lie})
+
+        return meta
+
+    def _get_lies(self, X: np.ndarray) -> np.ndarray:
+        if "Y_train" not in self._kwargs:
+            raise ValueError(f"{self.__class__.__name__} requires the observed targets (Y_train).")
+
+        lie = getattr(np, self._lie)(self._kwargs["Y_train"], axis=0)
+
+        return np.tile(lie, (len(X), 1))
+
+
+class LocalPenalization(AbstractBatchAcquisitionFunction):
+    r"""Local penalization: The acquisition values are multiplied with a penalty around each pending point, which is
+    the probability that the point is not within the ball around the pending point that cannot contain the optimum.
+    The radius of the ball is the predicted gap of the pending point to the incumbent divided by the Lipschitz
+    constant of the predicted mean, which is estimated by the largest slope between the most recent training
+    configurations. The model does not have to be trained again, and distances are measured in the vector
+    representation of the configurations (with inactive hyperparameters set to -1).
+
+    :math:`\tilde{\alpha}(x) = \alpha(x) \prod_j \frac{1}{2} \text{erfc}\left(-\frac{L \|x - x_j\| - \mu(x_j) +
+    \eta}{\sqrt{2 \sigma^2(x_j)}}\right)`
+
+    See "Batch Bayesian Optimization via Local Penalization" by Javier González et al. for further details.
+
+    Parameters
+    ----------
+    acquisition_function : AbstractAcquisitionFunction
+        The acquisition function which is penalized. It should be non-negative; the values of LCB and TS are
+        rescaled as in the prior acquisition function.
+    n_lipschitz_points : int, defaults to 500
+        Number of the most recent training configurations which are used to estimate the Lipschitz constant.
+    """
+
+    def __init__(self, acquisition_function: AbstractAcquisitionFunction, n_lipschitz_points: int = 500) -> None:
+        super().__init__(acquisition_function)
+        self._n_lipschitz_points = n_lipschitz_points
+        self._lipschitz_constant = 1.0
+        self._eta: float | None = None
+        self._radius: np.ndarray | None = None
+        self._scale: np.ndarray | None = None
+
+        if isinstance(self._acquisition_function, IntegratedAcquisitionFunction):
+            acquisition_type = self._acquisition_function._acquisition_function
+        else:
+            acquisition_type = self._acquisition_function
+
+        self._rescale = isinstance(acquisition_type, (LCB, TS))
+
+    @property
+    def name(self) -> str:  # noqa: D102
+        return f"Local Penalization ({self._acquisition_function.__class__.__name__})"
+
+    @property
+    def meta(self) -> dict[str, Any]:  # noqa: D102
+        meta = super().meta
+        meta.update({"n_lipschitz_points": self._n_lipschitz_points})
+
+        return meta
+
+    def _update(self, **kwargs: Any) -> None:
+        """Updates the wrapped acquisition function and estimates the Lipschitz constant of the predicted mean.
+
+        Parameters
+        ----------
+        eta : float
+            Current incumbent value.
+        X : np.ndarray [#configurations, #hyperparameters]
+            The vectors of the training configurations.
+        """
+        assert "eta" in kwargs
+        super()._update(**kwargs)
+        self._eta = kwargs["eta"]
+        self._radius = None
+        self._scale = None
+
+        self._lipschitz_constant = 0.0
+        X = kwargs.get("X")
+        if X is not None and len(X) > 1:
+            X = X[-self._n_lipschitz_points :]
+            assert self.model is not None
+            mean, _ = self.model.predict_marginalized(X)
+            distances = pdist(self._impute(X))
+            slopes = pdist(mean.reshape(len(X), -1)[:, :1]) / np.maximum(distances, VERY_SMALL_NUMBER)
+            self._lipschitz_constant = float(np.max(slopes[distances > 0], initial=0.0))
+
+        # A flat model would penalize the whole space
+        if self._lipschitz_constant < 1e-7:
+            self._lipschitz_constant = 10.0
+
+    def _update_pending(self) -> None:
+        if len(self._pending) == 0:
+            self._radius = None
+            self._scale = None
+            return
+
+        assert self.model is not None and self._eta is not None
+        mean, var = self.model.predict_marginalized(self.pending)
+        mean = mean.reshape(len(self._pending), -1)[:, 0]
+        std = np.sqrt(np.maximum(var.reshape(len(self._pending), -1)[:, 0], VERY_SMALL_NUMBER))
+
+        # Pending points which are predicted to be better than the incumbent are penalized the least
+        self._radius = np.maximum(mean - self._eta, 0) / self._lipschitz_constant
+        self._scale = std / self._lipschitz_constant
+
+    def _compute(self, X: np.ndarray) -> np.ndarray:
+        if self._rescale:
+            # Same as in the prior acquisition function, the penalty requires non-negative values
+            acq_values = np.clip(self._acquisition_function._compute(X) + self._eta, 0, np.inf)
+        else:
+            acq_values = self._acquisition_function._compute(X)
+
+        if self._radius is None or self._scale is None:
+            return acq_values
+
+        distances = cdist(self._impute(X), self._impute(self.pending))
+        penalties = 0.5 * erfc(-(distances - self._radius) / (np.sqrt(2) * self._scale))
+
+        return acq_values * np.prod(penalties, axis=1, keepdims=True)
+
+    @staticmethod
+    def _impute(X: np.ndarray) -> np.ndarray:
+        return np.where(np.isnan(X), -1, X)
+
+
+class BatchTS(AbstractBatchAcquisitionFunction):
+    r"""Thompson sampling for batches: Each configuration of the batch maximizes its own samples from the posterior
+    of the surrogate model, since the acquisition function is maximized again after each selected configuration. The
+    samples make the batch diverse, which is why the pending points are not taken into account.
+
+    See "Parallelised Bayesian Optimisation via Thompson Sampling" by Kirthevasan Kandasamy et al. for further
+    details.
+
+    Parameters
+    ----------
+    acquisition_function : TS | None, defaults to None
+        The Thompson sampling acquisition function. If None, a new one is created.
+    """
+
+    def __init__(self, acquisition_function: TS | None = None) -> None:
+        super().__init__(acquisition_function if acquisition_function is not None else TS())
+
+    @property
+    def name(self) -> str:  # noqa: D102
+        return "Batch Thompson Sampling"
+
+    def _compute(self, X: np.ndarray) -> np.ndarray:
+        return self._acquisition_function._compute(X)
@@ -47,6 +47,10 @@ class IntegratedAcquisitionFunction(AbstractAcquisitionFunction):
         self._functions: list[AbstractAcquisitionFunction] = []
         self._eta: float | None = None
 
+        # Caching would freeze the random values of the wrapped acquisition function
+        if not getattr(acquisition_function, "cacheable", True):
+            self._disable_cache()
+
     @property
     def name(self) -> str:  # noqa: D102
         return f"Integrated Acquisition Function ({self._acquisition_function.__class__.__name__})"
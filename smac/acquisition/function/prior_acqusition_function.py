@@ -74,6 +74,10 @@ class PriorAcquisitionFunction(AbstractAcquisitionFunction):
         self._rescale = isinstance(acquisition_type, (LCB, TS))
         self._iteration_number = 0
 
+        # Caching would freeze the random values of the wrapped acquisition function
+        if not getattr(acquisition_function, "cacheable", True):
+            self._disable_cache()
+
     @property
     def name(self) -> str:  # noqa: D102
         return f"Prior Acquisition Function ({self._acquisition_function.__class__.__name__})"
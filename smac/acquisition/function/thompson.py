@@ -30,6 +30,11 @@ class TS(AbstractAcquisitionFunction):
         TS does not require xi here, we only wants to make it consistent with other acquisition functions.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        # Every call draws new samples, which must not be replaced by the ones of previous calls
+        self._disable_cache()
+
     @property
     def name(self) -> str:  # noqa: D102
         return "Thompson Sampling"
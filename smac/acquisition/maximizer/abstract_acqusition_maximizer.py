@@ -100,12 +100,12 @@ class AbstractAcquisitionMaximizer:
         if n_points is None:
             n_points = self._challengers
 
-        def next_configs_by_acquisition_value() -> list[Configuration]:
+        def next_configs_by_acquisition_value() -> Iterator[Configuration]:
             assert n_points is not None
             # since maximize returns a tuple of acquisition value and configuration,
             # and we only need the configuration, we return the second element of the tuple
             # for each element in the list
-            return [t[1] for t in self._maximize(previous_configs, n_points)]
+            return (t[1] for t in self._maximize_lazily(previous_configs, n_points))
 
         challengers = ChallengerList(
             self._configspace,
@@ -143,6 +143,30 @@ class AbstractAcquisitionMaximizer:
         """
         raise NotImplementedError()
 
+    def _maximize_lazily(
+        self,
+        previous_configs: list[Configuration],
+        n_points: int,
+    ) -> Iterator[tuple[float, Configuration]]:
+        """Generates the challengers of `_maximize` on demand. Used by `maximize`, whose callers usually only
+        request a few challengers before the surrogate model is retrained. By default, all challengers are
+        generated by `_maximize` once the first challenger is requested. Subclasses can override this method to
+        generate the challengers incrementally.
+
+        Parameters
+        ----------
+        previous_configs: list[Configuration]
+            Previously evaluated configurations.
+        n_points: int
+            Number of points to be sampled.
+
+        Returns
+        -------
+        challengers : Iterator[tuple[float, Configuration]]
+            Tuples of acquisition_value and configuration.
+        """
+        yield from self._maximize(previous_configs, n_points)
+
     def _sort_by_acquisition_value(self, configs: list[Configuration]) -> list[tuple[float, Configuration]]:
         """Sort the given configurations by the acquisition value.
 
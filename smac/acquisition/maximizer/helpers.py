@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Callable, Iterator
+from typing import Callable, Iterable, Iterator
 
 from ConfigSpace import Configuration, ConfigurationSpace
 
@@ -20,8 +20,9 @@ class ChallengerList(Iterator):
     ----------
     configspace : ConfigurationSpace
     challenger_callback : Callable
-        Callback function which returns a list of challengers (without interleaved random configurations, must a be a
-        python closure.
+        Callback function which returns the challengers (without interleaved random configurations), must a be a
+        python closure. The challengers can also be generated lazily (e.g., by a generator), in which case only the
+        challengers which are actually requested are generated.
     random_design : AbstractRandomDesign | None, defaults to ModulusRandomDesign(modulus=2.0)
         Which random design should be used.
     """
@@ -29,11 +30,12 @@ class ChallengerList(Iterator):
     def __init__(
         self,
         configspace: ConfigurationSpace,
-        challenger_callback: Callable,
+        challenger_callback: Callable[[], Iterable[Configuration]],
         random_design: AbstractRandomDesign | None = ModulusRandomDesign(modulus=2.0),
     ):
         self._challengers_callback = challenger_callback
         self._challengers: list[Configuration] | None = None
+        self._iterator: Iterator[Configuration] | None = None
         self._configspace = configspace
         self._index = 0
         self._iteration = 1  # 1-based to prevent from starting with a random configuration
@@ -41,38 +43,56 @@ class ChallengerList(Iterator):
 
     def __next__(self) -> Configuration:
         # If we already returned the required number of challengers
-        if self._challengers is not None and self._index == len(self._challengers):
+        if self._challengers is not None and not self._fetch():
             raise StopIteration
         # If we do not want to have random configs, we just yield the next challenger
         elif self._random_design is None:
-            if self._challengers is None:
-                self._challengers = self._challengers_callback()
-
-            config = self._challengers[self._index]
-            self._index += 1
-
-            return config
+            return self._next_challenger()
         # If we want to interleave challengers with random configs, sample one
         else:
             if self._random_design.check(self._iteration):
                 config = self._configspace.sample_configuration()
                 config.origin = "Random Search"
             else:
-                if self._challengers is None:
-                    self._challengers = self._challengers_callback()
-
-                config = self._challengers[self._index]
-                self._index += 1
+                config = self._next_challenger()
             self._iteration += 1
 
             return config
 
     def __len__(self) -> int:
-        if self._challengers is None:
-            self._challengers = self._challengers_callback()
+        # All remaining challengers have to be generated to know their number
+        self._fetch()
+        assert self._challengers is not None and self._iterator is not None
+        self._challengers.extend(self._iterator)
 
         return len(self._challengers) - self._index
 
+    def _fetch(self) -> bool:
+        """Generates the next challenger if it was not generated yet. Returns False if there are no challengers
+        left.
+        """
+        if self._challengers is None or self._iterator is None:
+            self._challengers = []
+            self._iterator = iter(self._challengers_callback())
+
+        if self._index == len(self._challengers):
+            try:
+                self._challengers.append(next(self._iterator))
+            except StopIteration:
+                return False
+
+        return True
+
+    def _next_challenger(self) -> Configuration:
+        if not self._fetch():
+            raise StopIteration
+
+        assert self._challengers is not None
+        config = self._challengers[self._index]
+        self._index += 1
+
+        return config
+
 
 '''
 class FixedSet(AbstractAcquisitionMaximizer):
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
+import heapq
+import itertools
+
+import numpy as np
 from ConfigSpace import Configuration, ConfigurationSpace
 
 from smac.acquisition.function import AbstractAcquisitionFunction
@@ -40,6 +44,8 @@ class LocalAndSortedRandomSearch(AbstractAcquisitionMaximizer):
         [LocalSearch] number of steps during a plateau walk before local search terminates.
     local_search_iterations: int, defauts to 10
         [Local Search] number of local search iterations.
+    n_jobs : int, defaults to 1
+        [LocalSearch] Number of processes which run the local searches. A value of -1 uses all CPUs.
     seed : int, defaults to 0
     """
 
@@ -51,6 +57,7 @@ class LocalAndSortedRandomSearch(AbstractAcquisitionMaximizer):
         max_steps: int | None = None,
         n_steps_plateau_walk: int = 10,
         local_search_iterations: int = 10,
+        n_jobs: int = 1,
         seed: int = 0,
     ) -> None:
         super().__init__(
@@ -71,6 +78,7 @@ class LocalAndSortedRandomSearch(AbstractAcquisitionMaximizer):
             acquisition_function=acquisition_function,
             max_steps=max_steps,
             n_steps_plateau_walk=n_steps_plateau_walk,
+            n_jobs=n_jobs,
             seed=seed,
         )
 
@@ -132,6 +140,22 @@ class LocalAndSortedRandomSearch(AbstractAcquisitionMaximizer):
 
         return next_configs_by_acq_value
 
+    def _maximize_lazily(
+        self,
+        previous_configs: list[Configuration],
+        n_points: int,
+    ) -> Iterator[tuple[float, Configuration]]:
+        random_configs = self._random_search._sample(n_points, "Acquisition Function Maximizer: Random Search (sorted)")
+
+        yield from _stream_challengers(
+            self._local_search,
+            previous_configs,
+            random_configs,
+            n_points,
+            self._local_search_iterations,
+            self._rng,
+        )
+
 
 class LocalAndSortedPriorRandomSearch(AbstractAcquisitionMaximizer):
     """Implements SMAC's default acquisition function optimization.
@@ -161,6 +185,8 @@ class LocalAndSortedPriorRandomSearch(AbstractAcquisitionMaximizer):
     prior_sampling_fraction: float, defaults to 0.5
         The ratio of random samples that are taken from the user-defined ConfigurationSpace, as opposed to the uniform
         version.
+    n_jobs : int, defaults to 1
+        [LocalSearch] Number of processes which run the local searches. A value of -1 uses all CPUs.
     seed : int, defaults to 0
     """
 
@@ -174,6 +200,7 @@ class LocalAndSortedPriorRandomSearch(AbstractAcquisitionMaximizer):
         n_steps_plateau_walk: int = 10,
         local_search_iterations: int = 10,
         prior_sampling_fraction: float = 0.5,
+        n_jobs: int = 1,
         seed: int = 0,
     ) -> None:
         super().__init__(
@@ -200,6 +227,7 @@ class LocalAndSortedPriorRandomSearch(AbstractAcquisitionMaximizer):
             configspace=configspace,
             max_steps=max_steps,
             n_steps_plateau_walk=n_steps_plateau_walk,
+            n_jobs=n_jobs,
             seed=seed,
         )
 
@@ -249,3 +277,83 @@ class LocalAndSortedPriorRandomSearch(AbstractAcquisitionMaximizer):
         )
 
         return next_configs_by_acq_value
+
+    def _maximize_lazily(
+        self,
+        previous_configs: list[Configuration],
+        n_points: int,
+    ) -> Iterator[tuple[float, Configuration]]:
+        origin = "Acquisition Function Maximizer: Random Search (sorted)"
+        random_configs = self._prior_random_search._sample(round(n_points * self._prior_sampling_fraction), origin)
+        random_configs += self._uniform_random_search._sample(
+            round(n_points * (1 - self._prior_sampling_fraction)),
+            origin,
+        )
+
+        yield from _stream_challengers(
+            self._local_search,
+            previous_configs,
+            random_configs,
+            n_points,
+            self._local_search_iterations,
+            self._rng,
+        )
+
+
+def _stream_challengers(
+    local_search: LocalSearch,
+    previous_configs: list[Configuration],
+    random_configs: list[Configuration],
+    n_points: int,
+    local_search_iterations: int,
+    rng: np.random.RandomState,
+) -> Iterator[tuple[float, Configuration]]:
+    """Generates the challengers of the local and sorted random search on demand, ordered by their acquisition
+    value. The random configurations are kept in a heap instead of being sorted. The local searches are run in rounds
+    of ``n_points`` start points, and the next round is only run once ``n_points`` new challengers (which were not
+    evaluated before) were yielded since the last round. Hence, the costs scale with the number of requested
+    challengers. Each configuration is yielded only once.
+    """
+    acquisition_function = local_search._acquisition_function
+    assert acquisition_function is not None
+
+    # The entries are sorted by the acquisition value (descending) with a random tie-break, and the counter
+    # prevents comparing the challengers themselves
+    heap: list[tuple[float, float, int, tuple[float, Configuration]]] = []
+    counter = itertools.count()
+    acq_values = acquisition_function(random_configs)
+    for acq_value, tie_break, config in zip(acq_values, rng.rand(len(random_configs)), random_configs):
+        heap.append((-float(acq_value[0]), tie_break, next(counter), (acq_value[0], config)))
+
+    heapq.heapify(heap)
+
+    # The best random configurations are additional start points of the local search
+    additional_start_points = [entry[3] for entry in heapq.nsmallest(local_search_iterations, heap)]
+    init_points = local_search._get_initial_points(previous_configs, local_search_iterations, additional_start_points)
+
+    processed = set(previous_configs)
+    yielded: set[Configuration] = set()
+    round_size = max(n_points, 1)
+    for start in range(0, len(init_points), round_size):
+        for acq_value, config in local_search._search_in_parallel(init_points[start : start + round_size]):
+            config.origin = "Acquisition Function Maximizer: Local Search"
+            heapq.heappush(heap, (-float(np.ravel(acq_value)[0]), rng.rand(), next(counter), (acq_value, config)))
+
+        # The next round of local searches is only run if more challengers are requested
+        n_new = 0
+        while len(heap) > 0 and n_new < n_points:
+            challenger = heapq.heappop(heap)[3]
+            if challenger[1] in yielded:
+                continue
+
+            yielded.add(challenger[1])
+            if challenger[1] not in processed:
+                n_new += 1
+
+            yield challenger
+
+    while len(heap) > 0:
+        challenger = heapq.heappop(heap)[3]
+        if challenger[1] not in yielded:
+            yielded.add(challenger[1])
+            yield challenger
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from typing import Any
 
+import copy
 import itertools
 import time
 
+import joblib
 import numpy as np
 from ConfigSpace import Configuration, ConfigurationSpace
+from ConfigSpace.c_util import check_configuration
 from ConfigSpace.exceptions import ForbiddenValueError
 
 from smac.acquisition.function import AbstractAcquisitionFunction
@@ -15,7 +18,7 @@ from smac.acquisition.maximizer.abstract_acqusition_maximizer import (
 )
 from smac.utils.configspace import (
     convert_configurations_to_array,
-    get_one_exchange_neighbourhood,
+    get_one_exchange_neighbourhood_vectors,
 )
 from smac.utils.logging import get_logger
 
@@ -44,6 +47,11 @@ class LocalSearch(AbstractAcquisitionMaximizer):
     vectorization_max_obtain : int, defaults to 64
         Maximal number of neighbors to obtain at once for each local search for vectorized calls. Can be tuned to
         reduce the overhead of SMAC.
+    n_jobs : int, defaults to 1
+        Number of processes which run the local searches. The start points are split into one partition per process,
+        and each process searches from its partition with a snapshot of the model and the acquisition function. Each
+        partition is searched with its own seed, which is drawn from ``seed``, so that the results are reproducible
+        for the same number of jobs (but differ between different numbers of jobs). A value of -1 uses all CPUs.
     seed : int, defaults to 0
     """
 
@@ -56,6 +64,7 @@ class LocalSearch(AbstractAcquisitionMaximizer):
         n_steps_plateau_walk: int = 10,
         vectorization_min_obtain: int = 2,
         vectorization_max_obtain: int = 64,
+        n_jobs: int = 1,
         seed: int = 0,
     ) -> None:
         super().__init__(
@@ -69,6 +78,7 @@ class LocalSearch(AbstractAcquisitionMaximizer):
         self._n_steps_plateau_walk = n_steps_plateau_walk
         self._vectorization_min_obtain = vectorization_min_obtain
         self._vectorization_max_obtain = vectorization_max_obtain
+        self._n_jobs = n_jobs
 
     @property
     def meta(self) -> dict[str, Any]:  # noqa: D102
@@ -79,6 +89,7 @@ class LocalSearch(AbstractAcquisitionMaximizer):
                 "n_steps_plateau_walk": self._n_steps_plateau_walk,
                 "vectorization_min_obtain": self._vectorization_min_obtain,
                 "vectorization_max_obtain": self._vectorization_max_obtain,
+                "n_jobs": self._n_jobs,
             }
         )
 
@@ -115,7 +126,7 @@ class LocalSearch(AbstractAcquisitionMaximizer):
             Final candidates.
         """
         init_points = self._get_initial_points(previous_configs, n_points, additional_start_points)
-        configs_acq = self._search(init_points)
+        configs_acq = self._search_in_parallel(init_points)
 
         # Shuffle for random tie-break
         self._rng.shuffle(configs_acq)
@@ -204,7 +215,13 @@ class LocalSearch(AbstractAcquisitionMaximizer):
 
         # configurations with the lowest predictive cost, check for None to make unit tests work
         if self._acquisition_function.model is not None:
-            conf_array = convert_configurations_to_array(previous_configs)
+            # The vectors of the previous configurations are taken from the runhistory if available
+            runhistory = getattr(self._acquisition_function, "runhistory", None)
+            if runhistory is not None:
+                conf_array = runhistory.get_configs_array(previous_configs)
+            else:
+                conf_array = convert_configurations_to_array(previous_configs)
+
             costs = self._acquisition_function.model.predict_marginalized(conf_array)[0]
             assert len(conf_array) == len(costs), (conf_array.shape, costs.shape)
 
@@ -245,6 +262,49 @@ class LocalSearch(AbstractAcquisitionMaximizer):
 
         return init_points
 
+    def _search_in_parallel(
+        self,
+        start_points: list[Configuration],
+    ) -> list[tuple[float, Configuration]]:
+        """Splits the start points into one partition per job and searches from the partitions in parallel worker
+        processes (see ``_search``). Without multiple jobs, all start points are searched in this process.
+
+        Parameters
+        ----------
+        start_points : list[Configuration]
+            Starting points for the search.
+
+        Returns
+        -------
+        list[tuple[float, Configuration]]
+            Candidates with their acquisition function value. (acq value, candidate)
+        """
+        n_jobs = min(joblib.effective_n_jobs(self._n_jobs), len(start_points))
+        if n_jobs <= 1:
+            return self._search(start_points)
+
+        # The workers get a snapshot of the local search including the trained model and the acquisition function.
+        # The runhistory is not needed there since the start points are passed on.
+        assert self._acquisition_function is not None
+        local_search = copy.copy(self)
+        local_search._acquisition_function = copy.copy(self._acquisition_function)
+        local_search._acquisition_function.runhistory = None
+
+        seeds = [int(seed) for seed in self._rng.randint(0, 2**31 - 1, size=n_jobs)]
+        partitions = np.array_split(np.arange(len(start_points)), n_jobs)
+        results = joblib.Parallel(n_jobs=n_jobs, backend="loky")(
+            joblib.delayed(_search_partition)(local_search, [start_points[i] for i in partition], seed)
+            for partition, seed in zip(partitions, seeds)
+        )
+
+        # The candidates are created in the configuration spaces of this process
+        configs_acq = []
+        for partition, candidates in zip(partitions, results):
+            for i, (acq_val, vector) in zip(partition, candidates):
+                configs_acq.append((acq_val, Configuration(start_points[i].configuration_space, vector=vector)))
+
+        return configs_acq
+
     def _search(
         self,
         start_points: list[Configuration],
@@ -265,6 +325,10 @@ class LocalSearch(AbstractAcquisitionMaximizer):
         The local search for a starting point is stopped if the number of evaluations is larger
         than self._n_steps_plateau_walk.
 
+        The search works on the vector representation of the configurations: The neighbours of all active local
+        searches are collected in a single array and evaluated in one call of the acquisition function. Configuration
+        objects are only created for the final candidates.
+
 
         Parameters
         ----------
@@ -282,16 +346,21 @@ class LocalSearch(AbstractAcquisitionMaximizer):
         if isinstance(start_points, Configuration):
             start_points = [start_points]
 
-        candidates = start_points
         # Compute the acquisition value of the candidates
-        num_candidates = len(candidates)
-        acq_val_candidates_ = self._acquisition_function(candidates)
+        num_candidates = len(start_points)
+        acq_val_candidates_ = self._acquisition_function(start_points)
 
         if num_candidates == 1:
             acq_val_candidates = [acq_val_candidates_[0][0]]
         else:
             acq_val_candidates = [a[0] for a in acq_val_candidates_]
 
+        # The local searches move in the vector representation of the configurations. The configuration spaces of the
+        # starting points are kept as they might differ from the one of the local search (e.g., uniform versions of
+        # prior configuration spaces).
+        configspaces = [config.configuration_space for config in start_points]
+        candidates = [config.get_array() for config in start_points]
+
         # Set up additional variables required to do vectorized local search:
         # whether the i-th local search is still running
         active = [True] * num_candidates
@@ -310,9 +379,11 @@ class LocalSearch(AbstractAcquisitionMaximizer):
         # Tracking the time it takes to compute the acquisition function
         times = []
 
-        # Set up the neighborhood generators
+        # Set up the neighborhood generators. Each local search reuses its random state for all of its neighborhoods
+        # since seeding a random state is much cheaper than creating a new one.
+        random_states = [np.random.RandomState() for _ in range(num_candidates)]
         neighborhood_iterators = []
-        for i, inc in enumerate(candidates):
+        for i, vector in enumerate(candidates):
             neighborhood_iterators.append(
                 # get_one_exchange_neighbourhood implementational details:
                 # https://github.com/automl/ConfigSpace/blob/05ab3da2a06c084ba920e8e4e3f62f2e87e81442/ConfigSpace/util.pyx#L95
@@ -323,12 +394,17 @@ class LocalSearch(AbstractAcquisitionMaximizer):
                 #     Sequential Model-Based Optimization for General Algorithm Configuration
                 #     In Proceedings of the conference on Learning and Intelligent
                 #     Optimization(LION 5)
-                get_one_exchange_neighbourhood(inc, seed=self._rng.randint(low=0, high=100000))
+                get_one_exchange_neighbourhood_vectors(
+                    configspaces[i],
+                    vector,
+                    seed=self._rng.randint(low=0, high=100000),
+                    random_state=random_states[i],
+                )
             )
             local_search_steps[i] += 1
 
         # Keeping track of configurations with equal acquisition value for plateau walking
-        neighbors_w_equal_acq: list[list[Configuration]] = [[] for _ in range(num_candidates)]
+        neighbors_w_equal_acq: list[list[np.ndarray]] = [[] for _ in range(num_candidates)]
 
         num_iters = 0
         while np.any(active):
@@ -341,6 +417,7 @@ class LocalSearch(AbstractAcquisitionMaximizer):
 
             # gather all neighbors
             neighbors = []
+            neighbors_configspaces = []
             for i, neighborhood_iterator in enumerate(neighborhood_iterators):
                 if active[i]:
                     neighbors_for_i = []
@@ -359,10 +436,11 @@ class LocalSearch(AbstractAcquisitionMaximizer):
                             break
                     obtain_n[i] = len(neighbors_for_i)
                     neighbors.extend(neighbors_for_i)
+                    neighbors_configspaces.extend([configspaces[i]] * len(neighbors_for_i))
 
             if len(neighbors) != 0:
                 start_time = time.time()
-                acq_val = self._acquisition_function(neighbors)
+                acq_val = self._evaluate(np.asarray(neighbors), neighbors_configspaces)
                 end_time = time.time()
                 times.append(end_time - start_time)
                 if np.ndim(acq_val.shape) == 0:
@@ -388,7 +466,7 @@ class LocalSearch(AbstractAcquisitionMaximizer):
                             if acq_val[acq_index] > acq_val_candidates[i]:
                                 is_valid = False
                                 try:
-                                    neighbors[acq_index].is_valid_configuration()
+                                    check_configuration(configspaces[i], neighbors[acq_index], False)
                                     is_valid = True
                                 except (ValueError, ForbiddenValueError) as e:
                                     logger.debug("Local search %d: %s", i, e)
@@ -436,9 +514,11 @@ class LocalSearch(AbstractAcquisitionMaximizer):
                         active[i] = False
                         continue
 
-                    neighborhood_iterators[i] = get_one_exchange_neighbourhood(
+                    neighborhood_iterators[i] = get_one_exchange_neighbourhood_vectors(
+                        configspaces[i],
                         candidates[i],
                         seed=self._rng.randint(low=0, high=100000),
+                        random_state=random_states[i],
                     )
 
         logger.debug(
@@ -449,4 +529,30 @@ class LocalSearch(AbstractAcquisitionMaximizer):
             np.mean(times),
         )
 
-        return [(a, i) for a, i in zip(acq_val_candidates, candidates)]
+        return [
+            (a, Configuration(configspace, vector=vector))
+            for a, configspace, vector in zip(acq_val_candidates, configspaces, candidates)
+        ]
+
+    def _evaluate(self, X: np.ndarray, configspaces: list[ConfigurationSpace]) -> np.ndarray:
+        """Returns the acquisition values of the configurations in their vector representation. Acquisition functions
+        which are not derived from ``AbstractAcquisitionFunction`` are called with configuration objects instead.
+        """
+        assert self._acquisition_function is not None
+        if isinstance(self._acquisition_function, AbstractAcquisitionFunction):
+            return self._acquisition_function(X)
+
+        return self._acquisition_function([Configuration(cs, vector=x) for cs, x in zip(configspaces, X)])
+
+
+def _search_partition(
+    local_search: LocalSearch,
+    start_points: list[Configuration],
+    seed: int,
+) -> list[tuple[float, np.ndarray]]:
+    """Searches from a partition of the start points with the given seed. This function is executed in the worker
+    processes, which is why the candidates are returned as vectors.
+    """
+    local_search._rng = np.random.RandomState(seed)
+
+    return [(acq_val, config.get_array()) for acq_val, config in local_search._search(start_points)]
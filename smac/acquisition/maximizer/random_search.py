@@ -38,18 +38,23 @@ class RandomSearch(AbstractAcquisitionMaximizer):
         list[tuple[float, Configuration]]
             Candidates with their acquisition function value. (acq value, candidate)
         """
-        if n_points > 1:
-            rand_configs = self._configspace.sample_configuration(size=n_points)
-        else:
-            rand_configs = [self._configspace.sample_configuration(size=1)]
-
         if _sorted:
-            for i in range(len(rand_configs)):
-                rand_configs[i].origin = "Acquisition Function Maximizer: Random Search (sorted)"
+            rand_configs = self._sample(n_points, "Acquisition Function Maximizer: Random Search (sorted)")
 
             return self._sort_by_acquisition_value(rand_configs)
         else:
-            for i in range(len(rand_configs)):
-                rand_configs[i].origin = "Acquisition Function Maximizer: Random Search"
+            rand_configs = self._sample(n_points, "Acquisition Function Maximizer: Random Search")
 
             return [(0, rand_configs[i]) for i in range(len(rand_configs))]
+
+    def _sample(self, n_points: int, origin: str) -> list[Configuration]:
+        """Samples configurations from the configuration space and sets their origin."""
+        if n_points > 1:
+            rand_configs = self._configspace.sample_configuration(size=n_points)
+        else:
+            rand_configs = [self._configspace.sample_configuration(size=1)]
+
+        for i in range(len(rand_configs)):
+            rand_configs[i].origin = origin
+
+        return rand_configs
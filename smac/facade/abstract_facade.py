@@ -100,6 +100,10 @@ class AbstractFacade:
         User-created dask client, which can be used to start a dask cluster and then attach SMAC to it. This will not
         be closed automatically and will have to be closed manually if provided explicitly. If none is provided
         (default), a local one will be created for you and closed upon completion.
+    journal : bool, defaults to False
+        When True, the results of each trial are appended to journals instead of rewriting the runhistory,
+        intensifier and optimization files after every trial. The journals are compacted into the regular files
+        periodically. Recommended for long runs with many trials.
     """
 
     def __init__(
@@ -120,6 +124,7 @@ class AbstractFacade:
         callbacks: list[Callback] = [],
         overwrite: bool = False,
         dask_client: Client | None = None,
+        journal: bool = False,
     ):
         setup_logging(logging_level)
 
@@ -170,6 +175,7 @@ class AbstractFacade:
         self._config_selector = config_selector
         self._callbacks = callbacks
         self._overwrite = overwrite
+        self._journal = journal
 
         # Prepare the algorithm executer
         runner: AbstractRunner
@@ -429,6 +435,7 @@ class AbstractFacade:
             runhistory=self._runhistory,
             intensifier=self._intensifier,
             overwrite=self._overwrite,
+            journal=self._journal,
         )
 
     def _update_dependencies(self) -> None:
@@ -35,6 +35,7 @@ class AlgorithmConfigurationFacade(AbstractFacade):
         max_depth: int = 20,
         bootstrapping: bool = True,
         pca_components: int = 4,
+        n_jobs: int = 1,
     ) -> RandomForest:
         """Returns a random forest as surrogate model.
 
@@ -54,6 +55,9 @@ class AlgorithmConfigurationFacade(AbstractFacade):
             Enables bootstrapping.
         pca_components : float, defaults to 4
             Number of components to keep when using PCA to reduce dimensionality of instance features.
+        n_jobs : int, defaults to 1
+            Number of processes which fit the trees and number of threads which predict. The forest is the same
+            for any number of jobs other than one. A value of -1 uses all CPUs.
         """
         return RandomForest(
             configspace=scenario.configspace,
@@ -66,6 +70,7 @@ class AlgorithmConfigurationFacade(AbstractFacade):
             log_y=False,
             instance_features=scenario.instance_features,
             pca_components=pca_components,
+            n_jobs=n_jobs,
             seed=scenario.seed,
         )
 
@@ -89,10 +94,19 @@ class AlgorithmConfigurationFacade(AbstractFacade):
     @staticmethod
     def get_acquisition_maximizer(  # type: ignore
         scenario: Scenario,
+        *,
+        n_jobs: int = 1,
     ) -> LocalAndSortedRandomSearch:
-        """Returns local and sorted random search as acquisition maximizer."""
+        """Returns local and sorted random search as acquisition maximizer.
+
+        Parameters
+        ----------
+        n_jobs : int, defaults to 1
+            Number of processes which run the local searches. A value of -1 uses all CPUs.
+        """
         optimizer = LocalAndSortedRandomSearch(
             scenario.configspace,
+            n_jobs=n_jobs,
             seed=scenario.seed,
         )
 
@@ -23,6 +23,9 @@ from smac.model.gaussian_process.kernels import (
 )
 from smac.model.gaussian_process.mcmc_gaussian_process import MCMCGaussianProcess
 from smac.model.gaussian_process.priors import HorseshoePrior, LogNormalPrior
+from smac.model.gaussian_process.sparse_gaussian_process import (
+    SparseGaussianProcess,
+)
 from smac.multi_objective.aggregation_strategy import MeanAggregationStrategy
 from smac.random_design.probability_design import ProbabilityRandomDesign
 from smac.runhistory.encoder.encoder import RunHistoryEncoder
@@ -52,6 +55,9 @@ class BlackBoxFacade(AbstractFacade):
         *,
         model_type: str | None = None,
         kernel: kernels.Kernel | None = None,
+        reoptimize_after: int = 1,
+        n_jobs: int = 1,
+        n_inducing_points: int = 100,
     ) -> AbstractGaussianProcess:
         """Returns a Gaussian Process surrogate model.
 
@@ -59,16 +65,26 @@ class BlackBoxFacade(AbstractFacade):
         ----------
         scenario : Scenario
         model_type : str | None, defaults to None
-            Which Gaussian Process model should be chosen. Choose between `vanilla` and `mcmc`.
+            Which Gaussian Process model should be chosen. Choose between `vanilla`, `mcmc` and `sparse`. The sparse
+            Gaussian process approximates the vanilla one with inducing points and scales to many thousands of
+            trials.
         kernel : kernels.Kernel | None, defaults to None
             The kernel used in the surrogate model.
+        reoptimize_after : int, defaults to 1
+            Number of new data points after which the hyperparameters of the vanilla Gaussian process are optimized
+            again. In between, new data points are added with an incremental update of the Cholesky decomposition.
+        n_jobs : int, defaults to 1
+            Number of threads which run the restarts of the hyperparameter optimization of the vanilla and sparse
+            Gaussian process in parallel.
+        n_inducing_points : int, defaults to 100
+            Number of inducing points of the sparse Gaussian process.
 
         Returns
         -------
-        model : GaussianProcess | MCMCGaussianProcess
+        model : GaussianProcess | MCMCGaussianProcess | SparseGaussianProcess
             The instantiated gaussian process.
         """
-        available_model_types = [None, "vanilla", "mcmc"]
+        available_model_types = [None, "vanilla", "mcmc", "sparse"]
         if model_type not in available_model_types:
             types = [str(t) for t in available_model_types]
             raise ValueError(f"The model_type `{model_type}` is not supported. Choose one of {', '.join(types)}")
@@ -81,6 +97,8 @@ class BlackBoxFacade(AbstractFacade):
                 configspace=scenario.configspace,
                 kernel=kernel,
                 normalize_y=True,
+                reoptimize_after=reoptimize_after,
+                n_jobs=n_jobs,
                 seed=scenario.seed,
             )
         elif model_type == "mcmc":
@@ -97,6 +115,15 @@ class BlackBoxFacade(AbstractFacade):
                 normalize_y=True,
                 seed=scenario.seed,
             )
+        elif model_type == "sparse":
+            return SparseGaussianProcess(
+                configspace=scenario.configspace,
+                kernel=kernel,
+                n_inducing_points=n_inducing_points,
+                normalize_y=True,
+                n_jobs=n_jobs,
+                seed=scenario.seed,
+            )
         else:
             raise ValueError("Unknown model type %s" % model_type)
 
@@ -192,6 +219,7 @@ class BlackBoxFacade(AbstractFacade):
         *,
         challengers: int = 1000,
         local_search_iterations: int = 10,
+        n_jobs: int = 1,
     ) -> LocalAndSortedRandomSearch:
         """Returns local and sorted random search as acquisition maximizer.
 
@@ -201,11 +229,14 @@ class BlackBoxFacade(AbstractFacade):
             Number of challengers.
         local_search_iterations: int, defaults to 10
             Number of local search iterations.
+        n_jobs : int, defaults to 1
+            Number of processes which run the local searches. A value of -1 uses all CPUs.
         """
         return LocalAndSortedRandomSearch(
             configspace=scenario.configspace,
             challengers=challengers,
             local_search_iterations=local_search_iterations,
+            n_jobs=n_jobs,
             seed=scenario.seed,
         )
 
@@ -30,6 +30,7 @@ class HyperparameterOptimizationFacade(AbstractFacade):
         min_samples_leaf: int = 1,
         max_depth: int = 2**20,
         bootstrapping: bool = True,
+        n_jobs: int = 1,
     ) -> RandomForest:
         """Returns a random forest as surrogate model.
 
@@ -47,6 +48,9 @@ class HyperparameterOptimizationFacade(AbstractFacade):
             The maximum depth of a single tree.
         bootstrapping : bool, defaults to True
             Enables bootstrapping.
+        n_jobs : int, defaults to 1
+            Number of processes which fit the trees and number of threads which predict. The forest is the same
+            for any number of jobs other than one. A value of -1 uses all CPUs.
         """
         return RandomForest(
             log_y=True,
@@ -58,6 +62,7 @@ class HyperparameterOptimizationFacade(AbstractFacade):
             max_depth=max_depth,
             configspace=scenario.configspace,
             instance_features=scenario.instance_features,
+            n_jobs=n_jobs,
             seed=scenario.seed,
         )
 
@@ -84,6 +89,7 @@ class HyperparameterOptimizationFacade(AbstractFacade):
         *,
         challengers: int = 10000,
         local_search_iterations: int = 10,
+        n_jobs: int = 1,
     ) -> LocalAndSortedRandomSearch:
         """Returns local and sorted random search as acquisition maximizer.
 
@@ -97,11 +103,14 @@ class HyperparameterOptimizationFacade(AbstractFacade):
             Number of challengers.
         local_search_iterations: int, defaults to 10
             Number of local search iterations.
+        n_jobs : int, defaults to 1
+            Number of processes which run the local searches. A value of -1 uses all CPUs.
         """
         optimizer = LocalAndSortedRandomSearch(
             scenario.configspace,
             challengers=challengers,
             local_search_iterations=local_search_iterations,
+            n_jobs=n_jobs,
             seed=scenario.seed,
         )
 
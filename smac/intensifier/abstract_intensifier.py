@@ -25,6 +25,7 @@ from smac.runhistory.dataclasses import (
 from smac.runhistory.runhistory import RunHistory
 from smac.scenario import Scenario
 from smac.utils.configspace import get_config_hash, print_config_changes
+from smac.utils.journal import Journal, dump_json, get_journal_filename
 from smac.utils.logging import get_logger
 from smac.utils.pareto_front import calculate_pareto_front, sort_by_crowding_distance
 
@@ -93,6 +94,13 @@ class AbstractIntensifier:
         self._rejected_config_ids: list[int] = []
         self._trajectory: list[TrajectoryItem] = []
 
+        # What has been written to the journal already, so that only the changes are appended (see
+        # ``append_to_journal``). The rejected configs are journaled as (config id, rejected) changes.
+        self._journaled_trajectory_length = 0
+        self._journaled_incumbents_changed = 0
+        self._journaled_state: dict[str, Any] | None = None
+        self._rejected_config_changes: list[tuple[int, bool]] = []
+
     @property
     def meta(self) -> dict[str, Any]:
         """Returns the meta data of the created object."""
@@ -651,44 +659,115 @@ class AbstractIntensifier:
             filename = Path(filename)
 
         assert str(filename).endswith(".json")
-        filename.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(self._get_snapshot(), filename)
 
-        data = {
-            "incumbent_ids": [self.runhistory.get_config_id(config) for config in self._incumbents],
-            "rejected_config_ids": self._rejected_config_ids,
-            "incumbents_changed": self._incumbents_changed,
-            "trajectory": [dataclasses.asdict(item) for item in self._trajectory],
-            "state": self.get_state(),
+    def append_to_journal(self, filename: str | Path = "intensifier.jsonl") -> None:
+        """Appends the changes since the last record as a compact record to the journal: The new trajectory items,
+        the changes of the rejected configs and, if they changed, the incumbents and the state (retrieved by
+        ``get_state``). Hence, the size of a record does not grow with the number of trials. The journal is
+        replayed by ``load`` if it is found next to the loaded file.
+        """
+        data: dict[str, Any] = {
+            "trajectory_offset": self._journaled_trajectory_length,
+            "trajectory": [dataclasses.asdict(item) for item in self._trajectory[self._journaled_trajectory_length :]],
+            "rejected_config_changes": self._rejected_config_changes,
         }
 
-        with open(filename, "w") as fp:
-            json.dump(data, fp, indent=2)
+        if self._incumbents_changed != self._journaled_incumbents_changed:
+            data["incumbent_ids"] = [self.runhistory.get_config_id(config) for config in self._incumbents]
+            data["incumbents_changed"] = self._incumbents_changed
+
+        state = self.get_state()
+        if state != self._journaled_state:
+            data["state"] = state
+
+        Journal(filename).append(data)
+
+        self._journaled_trajectory_length = len(self._trajectory)
+        self._journaled_incumbents_changed = self._incumbents_changed
+        self._journaled_state = state
+        self._rejected_config_changes = []
 
     def load(self, filename: str | Path) -> None:
-        """Loads the latest state of the intensifier including the incumbents and trajectory."""
+        """Loads the latest state of the intensifier including the incumbents and trajectory. If a journal
+        (e.g., ``intensifier.jsonl`` for ``intensifier.json``) is found, its records are applied afterwards.
+        """
         if isinstance(filename, str):
             filename = Path(filename)
 
+        journal = Journal(get_journal_filename(filename))
+
         try:
             with open(filename) as fp:
                 data = json.load(fp)
         except Exception as e:
-            logger.warning(
-                f"Encountered exception {e} while reading runhistory from {filename}. Not adding any trials!"
-            )
-            return
+            if not journal.exists():
+                logger.warning(
+                    f"Encountered exception {e} while reading runhistory from {filename}. Not adding any trials!"
+                )
+                return
+
+            data = None
 
         # We reset the intensifier and then reset the runhistory
         self.reset()
         if self._runhistory is not None:
             self.runhistory = self._runhistory
 
+        if data is not None:
+            self._set_snapshot(data)
+
+        # Each record contains the changes since the previous record: The trajectory is continued at the given
+        # offset, the rejected configs are changed, and the incumbents and state are replaced if they are given.
+        # Replaying records which are covered by the snapshot already gives the same result.
+        for record in journal.read():
+            self._apply_journal_record(record)
+
+        self._rotate_journal()
+
+    def _rotate_journal(self) -> None:
+        """Marks everything as journaled. Should be called whenever a snapshot is taken, so that the first record
+        after the snapshot contains the current incumbents and state.
+        """
+        self._journaled_trajectory_length = len(self._trajectory)
+        self._journaled_incumbents_changed = -1
+        self._journaled_state = None
+        self._rejected_config_changes = []
+
+    def _get_snapshot(self) -> dict[str, Any]:
+        """Returns the json-serializable representation of the intensifier, which is written by ``save``."""
+        return {
+            "incumbent_ids": [self.runhistory.get_config_id(config) for config in self._incumbents],
+            "rejected_config_ids": list(self._rejected_config_ids),
+            "incumbents_changed": self._incumbents_changed,
+            "trajectory": [dataclasses.asdict(item) for item in self._trajectory],
+            "state": self.get_state(),
+        }
+
+    def _set_snapshot(self, data: dict[str, Any]) -> None:
         self._incumbents = [self.runhistory.get_config(config_id) for config_id in data["incumbent_ids"]]
         self._incumbents_changed = data["incumbents_changed"]
         self._rejected_config_ids = data["rejected_config_ids"]
         self._trajectory = [TrajectoryItem(**item) for item in data["trajectory"]]
         self.set_state(data["state"])
 
+    def _apply_journal_record(self, record: dict[str, Any]) -> None:
+        offset = record["trajectory_offset"]
+        self._trajectory[offset:] = [TrajectoryItem(**item) for item in record["trajectory"]]
+
+        for config_id, rejected in record["rejected_config_changes"]:
+            if rejected and config_id not in self._rejected_config_ids:
+                self._rejected_config_ids.append(config_id)
+            elif not rejected and config_id in self._rejected_config_ids:
+                self._rejected_config_ids.remove(config_id)
+
+        if "incumbent_ids" in record:
+            self._incumbents = [self.runhistory.get_config(config_id) for config_id in record["incumbent_ids"]]
+            self._incumbents_changed = record["incumbents_changed"]
+
+        if "state" in record:
+            self.set_state(record["state"])
+
     def _update_trajectory(self, configs: list[Configuration]) -> None:
         rh = self.runhistory
         config_ids = [rh.get_config_id(c) for c in configs]
@@ -714,6 +793,7 @@ class AbstractIntensifier:
 
         if config_id not in self._rejected_config_ids:
             self._rejected_config_ids.append(config_id)
+            self._rejected_config_changes.append((config_id, True))
 
     def _remove_rejected_config(self, config: Configuration | int) -> None:
         if isinstance(config, Configuration):
@@ -723,6 +803,7 @@ class AbstractIntensifier:
 
         if config_id in self._rejected_config_ids:
             self._rejected_config_ids.remove(config_id)
+            self._rejected_config_changes.append((config_id, False))
 
     def _reorder_instance_seed_keys(
         self,
@@ -10,6 +10,9 @@ from ConfigSpace import Configuration
 from smac.acquisition.function.abstract_acquisition_function import (
     AbstractAcquisitionFunction,
 )
+from smac.acquisition.function.batch_acquisition_function import (
+    AbstractBatchAcquisitionFunction,
+)
 from smac.acquisition.maximizer.abstract_acqusition_maximizer import (
     AbstractAcquisitionMaximizer,
 )
@@ -121,7 +124,9 @@ class ConfigSelector:
         The method (after yielding the initial design configurations) trains the surrogate model, maximizes the
         acquisition function and yields ``n`` configurations. After the ``n`` configurations, the surrogate model is
         trained again, etc. The program stops if ``retries`` was reached within each iteration. A configuration
-        is ignored, if it was used already before.
+        is ignored, if it was used already before. With a batch acquisition function, the configurations of the
+        running trials and the configurations yielded since the surrogate model was trained are pending points, and
+        the acquisition function is maximized again after each yielded configuration.
 
         Note
         ----
@@ -141,6 +146,9 @@ class ConfigSelector:
         assert self._acquisition_function is not None
         assert self._random_design is not None
 
+        # The acquisition function takes the vectors of already evaluated configurations from the runhistory
+        self._acquisition_function.runhistory = self._runhistory
+
         self._processed_configs = self._runhistory.get_configs()
 
         # We add more retries because there could be a case in which the processed configs are sampled again
@@ -204,6 +212,8 @@ class ConfigSelector:
                     incumbent_array=x_best_array,
                     num_data=len(self._get_evaluated_configs()),
                     X=X_configurations,
+                    X_train=X,
+                    Y_train=Y,
                 )
 
             # We want to cache how many entries we used because if we have the same number of entries
@@ -211,11 +221,15 @@ class ConfigSelector:
             self._previous_entries = Y.shape[0]
 
             # Now we maximize the acquisition function
-            challengers = self._acquisition_maximizer.maximize(
-                previous_configs,
-                n_points=self._retrain_after,
-                random_design=self._random_design,
-            )
+            challengers: Iterator[Configuration]
+            if isinstance(self._acquisition_function, AbstractBatchAcquisitionFunction):
+                challengers = self._get_batch_challengers(previous_configs)
+            else:
+                challengers = self._acquisition_maximizer.maximize(
+                    previous_configs,
+                    n_points=self._retrain_after,
+                    random_design=self._random_design,
+                )
 
             counter = 0
             failed_counter = 0
@@ -242,6 +256,44 @@ class ConfigSelector:
                         logger.warning(f"Could not return a new configuration after {self._retries} retries." "")
                         return
 
+    def _get_batch_challengers(self, previous_configs: list[Configuration]) -> Iterator[Configuration]:
+        """Yields the challengers of a batch acquisition function. The configurations of the running trials are the
+        pending points at first. Each new challenger (which was not processed before) is added to the pending points,
+        and the acquisition function is maximized again for the next one. Random configurations are interleaved by
+        the random design as in the challenger list.
+        """
+        assert self._runhistory is not None
+        assert self._acquisition_maximizer is not None
+        assert self._random_design is not None
+        assert isinstance(self._acquisition_function, AbstractBatchAcquisitionFunction)
+
+        self._acquisition_function.set_pending(self._runhistory.get_running_configs())
+        self._random_design.next_iteration()
+
+        iteration = 1  # 1-based to prevent from starting with a random configuration
+        while True:
+            if self._random_design.check(iteration):
+                config = self._scenario.configspace.sample_configuration()
+                config.origin = "Random Search"
+                new = config not in self._processed_configs
+                yield config
+
+                if not new:
+                    continue
+            else:
+                for config in self._acquisition_maximizer.maximize(previous_configs, n_points=self._retrain_after):
+                    new = config not in self._processed_configs
+                    yield config
+
+                    if new:
+                        break
+                else:
+                    # There are no challengers left
+                    return
+
+            self._acquisition_function.add_pending(config)
+            iteration += 1
+
     def _call_callbacks_on_start(self) -> None:
         for callback in self._callbacks:
             callback.on_next_configurations_start(self)
@@ -266,7 +318,7 @@ class ConfigSelector:
         assert self._runhistory_encoder is not None
 
         # If we use a float value as a budget, we want to train the model only on the highest budget
-        unique_budgets: set[float] = {run_key.budget for run_key in self._runhistory if run_key.budget is not None}
+        unique_budgets = self._runhistory.get_budgets()
 
         available_budgets: list[float] | list[None]
         if len(unique_budgets) > 0:
@@ -275,11 +327,11 @@ class ConfigSelector:
         else:
             available_budgets = [None]
 
-        # Get #points per budget and if there are enough samples, then build a model
+        # Get #points per budget and if there are enough samples, then build a model. The number of points is
+        # counted first so that only the chosen budget is transformed.
         for b in available_budgets:
-            X, Y = self._runhistory_encoder.transform(budget_subset=[b])
-
-            if X.shape[0] >= self._min_trials:
+            if self._runhistory_encoder.get_n_trials(budget_subset=[b]) >= self._min_trials:
+                X, Y = self._runhistory_encoder.transform(budget_subset=[b])
                 self._considered_budgets = [b]
 
                 # TODO: Add running configs
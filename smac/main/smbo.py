@@ -5,6 +5,7 @@ from typing import Any
 import json
 import time
 from pathlib import Path
+from threading import Thread
 
 import numpy as np
 from ConfigSpace import Configuration
@@ -16,13 +17,14 @@ from smac.acquisition.function.abstract_acquisition_function import (
 from smac.callback.callback import Callback
 from smac.intensifier.abstract_intensifier import AbstractIntensifier
 from smac.model.abstract_model import AbstractModel
-from smac.runhistory import StatusType, TrialInfo, TrialValue
+from smac.runhistory import StatusType, TrialInfo, TrialKey, TrialValue
 from smac.runhistory.runhistory import RunHistory
 from smac.runner import FirstRunCrashedException
 from smac.runner.abstract_runner import AbstractRunner
 from smac.runner.dask_runner import DaskParallelRunner
 from smac.scenario import Scenario
 from smac.utils.data_structures import recursively_compare_dicts
+from smac.utils.journal import Journal, dump_json, get_journal_filename
 from smac.utils.logging import get_logger
 
 __copyright__ = "Copyright 2022, automl.org"
@@ -50,6 +52,13 @@ class SMBO:
         When True, overwrites the run results if a previous run is found that is
         inconsistent in the meta data with the current setup. If ``overwrite`` is set to False, the user is asked
         for the exact behaviour (overwrite completely, save old run, or use old results).
+    journal : bool, defaults to False
+        When True, ``tell`` does not rewrite the runhistory, intensifier and optimization files but appends a compact
+        record to their journals (``*.jsonl``) instead. The journals are compacted into the snapshot files
+        (``*.json``) every ``compact_after`` trials in a background thread. Loading a run restores the state from the
+        snapshots and the journals.
+    compact_after : int, defaults to 100
+        Number of journaled trials after which the snapshots are written. Only used if ``journal`` is true.
 
     Warning
     -------
@@ -63,6 +72,8 @@ class SMBO:
         runhistory: RunHistory,
         intensifier: AbstractIntensifier,
         overwrite: bool = False,
+        journal: bool = False,
+        compact_after: int = 100,
     ):
         self._scenario = scenario
         self._configspace = scenario.configspace
@@ -71,6 +82,10 @@ class SMBO:
         self._trial_generator = iter(intensifier)
         self._runner = runner
         self._overwrite = overwrite
+        self._journal = journal
+        self._compact_after = compact_after
+        self._journaled_trials = 0
+        self._compaction_thread: Thread | None = None
 
         # Internal variables
         self._finished = False
@@ -156,6 +171,11 @@ class SMBO:
         # This is really important because otherwise the intensifier would most likly sample the same trial again
         self._runhistory.add_running_trial(trial_info)
 
+        # The state of the intensifier might refer to the config of the running trial, which therefore has to be
+        # journaled before the next intensifier record
+        if self._journal:
+            self._append_to_journal(trial_info, running=True)
+
         for callback in self._callbacks:
             callback.on_ask_end(self, trial_info)
 
@@ -225,7 +245,10 @@ class SMBO:
                 self._stop = True
 
         if save:
-            self.save()
+            if self._journal:
+                self._append_to_journal(info)
+            else:
+                self.save()
 
     def update_model(self, model: AbstractModel) -> None:
         """Updates the model and updates the acquisition function."""
@@ -382,7 +405,9 @@ class SMBO:
         return False
 
     def load(self) -> None:
-        """Loads the optimizer, intensifier, and runhistory from the output directory specified in the scenario."""
+        """Loads the optimizer, intensifier, and runhistory from the output directory specified in the scenario.
+        Records of the journals are applied on top of the snapshots.
+        """
         filename = self._scenario.output_directory
 
         optimization_fn = filename / "optimization.json"
@@ -393,6 +418,10 @@ class SMBO:
             with open(optimization_fn) as fp:
                 data = json.load(fp)
 
+            # The last record contains the latest state
+            for record in Journal(get_journal_filename(optimization_fn)).read():
+                data = record
+
             self._runhistory.load(runhistory_fn, configspace=self._scenario.configspace)
             self._intensifier.load(intensifier_fn)
 
@@ -401,24 +430,94 @@ class SMBO:
             self._start_time = time.time() - data["used_walltime"]
 
     def save(self) -> None:
-        """Saves the current stats, runhistory, and intensifier."""
+        """Saves the current stats, runhistory, and intensifier. In journal mode, the journals are compacted, i.e.,
+        the snapshots are written and the journals are removed afterwards.
+        """
+        path = self._scenario.output_directory
+
+        if path is not None:
+            if self._journal:
+                self._compact(background=False)
+            else:
+                snapshots = self._get_snapshots()
+                self._write_snapshots(snapshots)
+
+                # Journals of a previous run are outdated now
+                for filename in snapshots.keys():
+                    Journal(get_journal_filename(filename)).clear()
+
+    def _get_snapshots(self) -> dict[Path, Any]:
+        """Returns the snapshot data of the optimization, runhistory, and intensifier by filename."""
+        path = self._scenario.output_directory
+
+        return {
+            path / "optimization.json": self._get_optimization_data(),
+            path / "runhistory.json": self._runhistory._get_snapshot(),
+            path / "intensifier.json": self._intensifier._get_snapshot(),
+        }
+
+    def _get_optimization_data(self) -> dict[str, Any]:
+        return {
+            "used_walltime": self.used_walltime,
+            "used_target_function_walltime": self.used_target_function_walltime,
+            "last_update": time.time(),
+            "finished": self._finished,
+        }
+
+    def _write_snapshots(self, snapshots: dict[Path, Any], journals: list[Journal] | None = None) -> None:
+        """Writes the snapshots and removes the rotated records of the journals which are covered by them."""
+        for filename, data in snapshots.items():
+            dump_json(data, filename)
+
+        for journal in journals or []:
+            journal.remove_rotated()
+
+    def _append_to_journal(self, info: TrialInfo, running: bool = False) -> None:
+        """Appends the trial and the changes of the intensifier and optimization to the journals. For a running
+        trial, only the trial (and its config) is appended.
+        """
         path = self._scenario.output_directory
 
         if path is not None:
-            data = {
-                "used_walltime": self.used_walltime,
-                "used_target_function_walltime": self.used_target_function_walltime,
-                "last_update": time.time(),
-                "finished": self._finished,
-            }
-
-            # Save optimization data
-            with open(str(path / "optimization.json"), "w") as file:
-                json.dump(data, file, indent=2)
-
-            # And save runhistory and intensifier
-            self._runhistory.save(path / "runhistory.json")
-            self._intensifier.save(path / "intensifier.json")
+            budget = float(info.budget) if info.budget is not None else None
+            key = TrialKey(self._runhistory.get_config_id(info.config), info.instance, info.seed, budget)
+
+            self._runhistory.append_to_journal([key], path / "runhistory.jsonl")
+            if not running:
+                self._intensifier.append_to_journal(path / "intensifier.jsonl")
+                Journal(path / "optimization.jsonl").append(self._get_optimization_data())
+
+            self._journaled_trials += 1
+            if self._journaled_trials >= self._compact_after:
+                self._compact()
+
+    def _compact(self, background: bool = True) -> None:
+        """Writes the snapshots and removes the journals. The snapshot data is collected in the main thread,
+        while writing the files can happen in a background thread. Records which are appended in the meantime
+        are written to fresh journals.
+        """
+        path = self._scenario.output_directory
+
+        # Only one compaction at a time
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+            self._compaction_thread = None
+
+        snapshots = self._get_snapshots()
+        journals = [Journal(get_journal_filename(filename)) for filename in snapshots.keys()]
+        for journal in journals:
+            journal.rotate()
+
+        self._intensifier._rotate_journal()
+
+        self._journaled_trials = 0
+
+        if background:
+            self._compaction_thread = Thread(target=self._write_snapshots, args=(snapshots, journals), daemon=True)
+            self._compaction_thread.start()
+        else:
+            self._write_snapshots(snapshots, journals)
+            logger.debug(f"Compacted journals in {path}.")
 
     def _add_results(self) -> None:
         """Adds results from the runner to the runhistory. Although most of the functionality could be written
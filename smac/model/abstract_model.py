@@ -9,7 +9,6 @@ import warnings
 import numpy as np
 from ConfigSpace import ConfigurationSpace
 from sklearn.decomposition import PCA
-from sklearn.exceptions import NotFittedError
 from sklearn.preprocessing import MinMaxScaler
 
 from smac.constants import VERY_SMALL_NUMBER
@@ -74,6 +73,11 @@ class AbstractModel:
         self._scaler = MinMaxScaler()
         self._apply_pca = False
 
+        # The scaler and the PCA combined into a single affine map (weights, offset) and the instance features they
+        # were fitted on. They are only fitted again if the instance features change.
+        self._projection: tuple[np.ndarray, np.ndarray] | None = None
+        self._projection_features: np.ndarray | None = None
+
         # Never use a lower variance than this.
         # If estimated variance < var_threshold, set to var_threshold
         self._var_threshold = VERY_SMALL_NUMBER
@@ -121,17 +125,13 @@ class AbstractModel:
         # Reduce dimensionality of features if larger than PCA_DIM
         if (
             self._pca_components is not None
+            and self._instance_features is not None
             and X.shape[0] > self._pca.n_components
             and self._n_features >= self._pca_components
+            and len(self._instance_features) >= self._pca_components
         ):
-            X_feats = X[:, -self._n_features :]
-
-            # Scale features
-            X_feats = self._scaler.fit_transform(X_feats)
-            X_feats = np.nan_to_num(X_feats)  # if features with max == min
-
-            # PCA
-            X_feats = self._pca.fit_transform(X_feats)
+            self._fit_projection()
+            X_feats = self._transform_features(X[:, -self._n_features :])
             X = np.hstack((X[:, : self._n_hps], X_feats))
 
             if hasattr(self, "_types"):
@@ -151,6 +151,47 @@ class AbstractModel:
 
         return self._train(X, Y)
 
+    def _fit_projection(self) -> None:
+        """Fits the scaler and the PCA on the features of all instances (each instance once) and combines them into a
+        single affine map. Nothing is done if the instance features did not change since the last call.
+        """
+        assert self._instance_features is not None
+        features = np.array(list(self._instance_features.values()), dtype=np.float64)
+        if self._projection_features is not None and np.array_equal(features, self._projection_features):
+            return
+
+        # Scale features
+        self._scaler.fit(features)
+        X_feats = np.nan_to_num(self._scaler.transform(features))  # if features with max == min
+
+        # PCA
+        self._pca.fit(X_feats)
+
+        # Scaling and projecting is an affine map: (X * scale + min - mean) @ components^T
+        components = self._pca.components_.T
+        self._projection = (
+            self._scaler.scale_[:, np.newaxis] * components,
+            (self._scaler.min_ - self._pca.mean_) @ components,
+        )
+        self._projection_features = features
+
+    def _transform_features(self, X_feats: np.ndarray) -> np.ndarray:
+        """Returns the scaled and projected instance features.
+
+        Parameters
+        ----------
+        X_feats : np.ndarray [#samples, #features]
+            The raw instance features.
+
+        Returns
+        -------
+        X_feats : np.ndarray [#samples, #components]
+        """
+        assert self._projection is not None
+        weights, offset = self._projection
+
+        return X_feats @ weights + offset
+
     @abstractmethod
     def _train(self: Self, X: np.ndarray, Y: np.ndarray) -> Self:
         """Trains the random forest on X and Y.
@@ -204,14 +245,8 @@ class AbstractModel:
             )
 
         if self._apply_pca:
-            try:
-                X_feats = X[:, -self._n_features :]
-                X_feats = self._scaler.transform(X_feats)
-                X_feats = self._pca.transform(X_feats)
-                X = np.hstack((X[:, : self._n_hps], X_feats))
-            except NotFittedError:
-                # PCA not fitted if only one training sample
-                pass
+            X_feats = self._transform_features(X[:, -self._n_features :])
+            X = np.hstack((X[:, : self._n_hps], X_feats))
 
         if X.shape[1] != len(self._types):
             raise ValueError("Rows in X should have %d entries but have %d!" % (len(self._types), X.shape[1]))
@@ -3,9 +3,13 @@ from smac.model.gaussian_process.abstract_gaussian_process import (
 )
 from smac.model.gaussian_process.gaussian_process import GaussianProcess
 from smac.model.gaussian_process.mcmc_gaussian_process import MCMCGaussianProcess
+from smac.model.gaussian_process.sparse_gaussian_process import (
+    SparseGaussianProcess,
+)
 
 __all__ = [
     "AbstractGaussianProcess",
     "GaussianProcess",
     "MCMCGaussianProcess",
+    "SparseGaussianProcess",
 ]
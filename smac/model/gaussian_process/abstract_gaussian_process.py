@@ -58,6 +58,42 @@ class AbstractGaussianProcess(AbstractModel):
 
         return meta
 
+    def fantasize(self, X: np.ndarray, Y: np.ndarray) -> None:
+        """Conditions the posterior of the trained Gaussian process on additional data points, e.g., on fantasized
+        targets of pending points. Unlike ``train``, neither the hyperparameters are optimized nor the targets are
+        normalized again, i.e., the posterior is updated as if the data points had been observed with the current
+        hyperparameters.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #hyperparameters + #features]
+            Input data points.
+        Y : np.ndarray [#samples, #objectives]
+            The corresponding target values.
+        """
+        if not self._is_trained:
+            raise Exception("Model has to be trained first!")
+
+        if self._apply_pca:
+            X_feats = self._transform_features(X[:, -self._n_features :])
+            X = np.hstack((X[:, : self._n_hps], X_feats))
+
+        y = Y.flatten()
+        if self._normalize_y:
+            y = (y - self.mean_y_) / self.std_y_
+
+        self._fantasize(self._impute_inactive(X), y)
+
+    def _fantasize(self, X: np.ndarray, y: np.ndarray) -> None:
+        """Conditions the posterior on the imputed data points X and the (normalized) targets y.
+
+        Raises
+        ------
+        np.linalg.LinAlgError
+            If the covariance of the extended data is not positive definite.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def _get_gaussian_process(self) -> GaussianProcessRegressor:
         """Generates a Gaussian process."""
@@ -3,10 +3,14 @@ from __future__ import annotations
 from typing import Any, Optional, TypeVar, cast
 
 import logging
+import time
 
+import joblib
 import numpy as np
 from ConfigSpace import ConfigurationSpace
 from scipy import optimize
+from scipy.linalg import cho_solve, cholesky, solve_triangular
+from sklearn.base import clone
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import Kernel
 
@@ -49,6 +53,22 @@ class GaussianProcess(AbstractGaussianProcess):
         on which the model is trained on.
     pca_components : float, defaults to 7
         Number of components to keep when using PCA to reduce dimensionality of instance features.
+    reoptimize_after : int, defaults to 1
+        Number of new data points after which the hyperparameters are optimized again. In between, new data points
+        are added with a rank-k update of the Cholesky decomposition using the current hyperparameters, which costs
+        O(n²k) instead of O(n³). This is only possible if the previously trained data points are unchanged;
+        otherwise, the hyperparameters are optimized anyway. By default, the hyperparameters are optimized on every
+        training.
+    reoptimize_tolerance : float, defaults to 0.1
+        The hyperparameters are optimized before ``reoptimize_after`` new data points were added if the marginal log
+        likelihood per data point drops by more than this value compared to the last optimization.
+    n_jobs : int, defaults to 1
+        Number of threads which run the restarts of the hyperparameter optimization in parallel. The marginal log
+        likelihood is mostly computed by LAPACK, which releases the GIL. A value of -1 uses all CPUs.
+    n_converged_restarts : int, defaults to 0
+        Stops the hyperparameter optimization once this number of restarts converged to the best optimum found so
+        far. The restarts are started in batches of ``n_jobs``, which is why more restarts might be finished with
+        multiple jobs. By default, all restarts are run.
     seed : int
     """
 
@@ -60,6 +80,10 @@ class GaussianProcess(AbstractGaussianProcess):
         normalize_y: bool = True,
         instance_features: dict[str, list[int | float]] | None = None,
         pca_components: int | None = 7,
+        reoptimize_after: int = 1,
+        reoptimize_tolerance: float = 0.1,
+        n_jobs: int = 1,
+        n_converged_restarts: int = 0,
         seed: int = 0,
     ):
         super().__init__(
@@ -72,18 +96,38 @@ class GaussianProcess(AbstractGaussianProcess):
 
         self._normalize_y = normalize_y
         self._n_restarts = n_restarts
+        self._reoptimize_after = max(1, reoptimize_after)
+        self._reoptimize_tolerance = reoptimize_tolerance
+        self._n_jobs = n_jobs
+        self._n_converged_restarts = n_converged_restarts
 
         # Internal variables
         self._hypers = np.empty((0,))
         self._is_trained = False
         self._n_ll_evals = 0
 
+        # Number of data points and marginal log likelihood per data point of the last hyperparameter optimization
+        self._n_optimized = 0
+        self._optimized_ll = -np.inf
+
+        # Time in seconds of each restart of the last hyperparameter optimization
+        self._restart_times: list[float] = []
+
         self._set_has_conditions()
 
     @property
     def meta(self) -> dict[str, Any]:  # noqa: D102
         meta = super().meta
-        meta.update({"n_restarts": self._n_restarts, "normalize_y": self._normalize_y})
+        meta.update(
+            {
+                "n_restarts": self._n_restarts,
+                "normalize_y": self._normalize_y,
+                "reoptimize_after": self._reoptimize_after,
+                "reoptimize_tolerance": self._reoptimize_tolerance,
+                "n_converged_restarts": self._n_converged_restarts,
+                "restart_times": list(self._restart_times),
+            }
+        )
 
         return meta
 
@@ -113,6 +157,29 @@ class GaussianProcess(AbstractGaussianProcess):
         X = self._impute_inactive(X)
         y = y.flatten()
 
+        if optimize_hyperparameters and self._update(X, y):
+            return self
+
+        self._fit(X, y, optimize_hyperparameters)
+
+        # Set the flag
+        self._is_trained = True
+
+        return self
+
+    def _fit(self, X: np.ndarray, y: np.ndarray, optimize_hyperparameters: bool = True) -> None:
+        """Fits the Gaussian process on the imputed (and normalized) data points and optimizes the hyperparameters.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #hyperparameters + #features]
+            Input data points with imputed inactive values.
+        y : np.ndarray [#samples]
+            The corresponding target values.
+        optimize_hyperparameters: boolean
+            If set to true, the hyperparameters are optimized, otherwise the default hyperparameters of the kernel are
+            used.
+        """
         n_tries = 10
         for i in range(n_tries):
             try:
@@ -133,13 +200,115 @@ class GaussianProcess(AbstractGaussianProcess):
             self._hypers = self._optimize()
             self._gp.kernel.theta = self._hypers
             self._gp.fit(X, y)
+
+            self._n_optimized = len(X)
+            if self._reoptimize_after > 1:
+                self._optimized_ll = self._gp.log_marginal_likelihood_value_ / len(X)
         else:
             self._hypers = self._gp.kernel.theta
 
-        # Set the flag
-        self._is_trained = True
+    def _update(self, X: np.ndarray, y: np.ndarray) -> bool:
+        """Adds the new data points of X to the fitted Gaussian process without optimizing the hyperparameters. The
+        Cholesky decomposition of the covariance is extended by the rows of the new data points, and the targets of
+        all data points are exchanged (they change if they are normalized).
 
-        return self
+        Returns
+        -------
+        updated : bool
+            Whether the Gaussian process was updated. If not, the Gaussian process has to be trained from scratch
+            because the hyperparameters are due to be optimized, the previous data points changed, or the marginal
+            log likelihood dropped.
+        """
+        if self._reoptimize_after <= 1 or not self._is_trained:
+            return False
+
+        X_train = self._gp.X_train_
+        n = len(X_train)
+        if len(X) < n or len(X) - self._n_optimized >= self._reoptimize_after:
+            return False
+
+        if not np.array_equal(X[:n], X_train, equal_nan=True):
+            return False
+
+        try:
+            L = self._extend_cholesky(X[n:])
+            alpha = cho_solve((L, True), y, check_finite=False)
+        except (np.linalg.LinAlgError, ValueError):
+            return False
+
+        ll = -0.5 * y @ alpha - np.log(np.diag(L)).sum() - 0.5 * len(y) * np.log(2 * np.pi)
+        if not np.isfinite(ll) or ll / len(y) < self._optimized_ll - self._reoptimize_tolerance:
+            return False
+
+        self._gp.X_train_ = X
+        self._gp.y_train_ = y
+        self._gp.L_ = L
+        self._gp.alpha_ = alpha
+        self._gp.log_marginal_likelihood_value_ = ll
+
+        return True
+
+    def _fantasize(self, X: np.ndarray, y: np.ndarray) -> None:
+        self._append_data_points(X, y, self._extend_cholesky(X))
+
+    def _append_data_points(self, X: np.ndarray, y: np.ndarray, L: np.ndarray) -> None:
+        """Appends the data points X and the targets y to the fitted Gaussian process, where L is the extended
+        Cholesky decomposition (see ``_extend_cholesky``).
+        """
+        y = np.concatenate([self._gp.y_train_, y])
+
+        self._gp.X_train_ = np.vstack([self._gp.X_train_, X])
+        self._gp.y_train_ = y
+        self._gp.L_ = L
+        self._gp.alpha_ = cho_solve((L, True), y, check_finite=False)
+
+    def _extend_cholesky(self, X_new: np.ndarray) -> np.ndarray:
+        """Returns the Cholesky decomposition of the covariance of the training data points extended by X_new."""
+        X_train = self._gp.X_train_
+        L = self._gp.L_
+        if len(X_new) == 0:
+            return L
+
+        # Rank-k update: [[L, 0], [L_12^T, L_22]] is the Cholesky decomposition of the extended covariance
+        kernel = self._gp.kernel_
+        L_12 = solve_triangular(L, kernel(X_train, X_new), lower=True, check_finite=False)
+        L_22 = cholesky(kernel(X_new) - L_12.T @ L_12, lower=True, check_finite=False)
+
+        return np.block([[L, np.zeros((len(X_train), len(X_new)))], [L_12.T, L_22]])
+
+    def _set_cholesky(self, X: np.ndarray, y: np.ndarray, L: np.ndarray) -> None:
+        """Sets the fitted state of the Gaussian process from the given Cholesky decomposition of the covariance of X
+        (under the current hyperparameters of the kernel) instead of computing it. This way, the decompositions of
+        several Gaussian processes can be computed at once (see ``MCMCGaussianProcess``).
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #hyperparameters + #features]
+            Input data points with imputed inactive values.
+        y : np.ndarray [#samples, #objectives]
+            The corresponding (normalized) target values.
+        L : np.ndarray [#samples, #samples]
+            Lower Cholesky decomposition of the covariance of X.
+        """
+        y = y.flatten()
+        alpha = cho_solve((L, True), y, check_finite=False)
+
+        # The attributes scikit-learn sets when fitting the Gaussian process without optimizer and normalization
+        self._gp = self._get_gaussian_process()
+        self._gp.kernel_ = clone(self._gp.kernel)
+        self._gp.X_train_ = X
+        self._gp.y_train_ = y
+        self._gp.L_ = L
+        self._gp.alpha_ = alpha
+        self._gp.log_marginal_likelihood_value_ = (
+            -0.5 * y @ alpha - np.log(np.diag(L)).sum() - 0.5 * len(y) * np.log(2 * np.pi)
+        )
+        self._gp._y_train_mean = np.zeros(1)
+        self._gp._y_train_std = np.ones(1)
+        self._gp.n_features_in_ = X.shape[1]
+
+        self._hypers = self._gp.kernel.theta
+        self._is_trained = True
 
     def _get_gaussian_process(self) -> GaussianProcessRegressor:
         return GaussianProcessRegressor(
@@ -220,10 +389,26 @@ class GaussianProcess(AbstractGaussianProcess):
                     dim_samples.append(prior.sample_from_prior(self._n_restarts).flatten())
             p0 += list(np.vstack(dim_samples).transpose())
 
+        # The restarts are run in batches so that the optimization can be stopped once enough restarts converged
+        n_jobs = max(1, min(joblib.effective_n_jobs(self._n_jobs), len(p0)))
+        results: list[tuple[np.ndarray, float, float]] = []
+        with joblib.Parallel(n_jobs=n_jobs, backend="threading") as parallel:
+            for start in range(0, len(p0), n_jobs):
+                batch = p0[start : start + n_jobs]
+                if n_jobs > 1:
+                    results += parallel(joblib.delayed(self._minimize)(p, log_bounds) for p in batch)
+                else:
+                    results += [self._minimize(p, log_bounds) for p in batch]
+
+                if self._n_converged_restarts > 0 and self._count_converged(results) >= self._n_converged_restarts:
+                    logger.debug(f"Stopped hyperparameter optimization after {len(results)} restarts.")
+                    break
+
+        self._restart_times = [seconds for _, _, seconds in results]
+
         theta_star: np.ndarray | None = None
         f_opt_star = np.inf
-        for i, start_point in enumerate(p0):
-            theta, f_opt, _ = optimize.fmin_l_bfgs_b(self._nll, start_point, bounds=log_bounds)
+        for theta, f_opt, _ in results:
             if f_opt < f_opt_star:
                 f_opt_star = f_opt
                 theta_star = theta
@@ -233,6 +418,33 @@ class GaussianProcess(AbstractGaussianProcess):
 
         return theta_star
 
+    def _minimize(
+        self,
+        start_point: np.ndarray,
+        log_bounds: list[tuple[float, float]],
+    ) -> tuple[np.ndarray, float, float]:
+        """Runs a single restart of the hyperparameter optimization and returns the found hyperparameter
+        configuration, its negative marginal log likelihood and the time in seconds.
+        """
+        start = time.perf_counter()
+        theta, f_opt, _ = optimize.fmin_l_bfgs_b(self._nll, start_point, bounds=log_bounds)
+
+        return theta, f_opt, time.perf_counter() - start
+
+    @staticmethod
+    def _count_converged(results: list[tuple[np.ndarray, float, float]]) -> int:
+        """Returns the number of restarts which converged to the best optimum, i.e., to the same hyperparameters and
+        negative marginal log likelihood (up to a small tolerance).
+        """
+        theta_best, f_best, _ = min(results, key=lambda result: result[1])
+        if not np.isfinite(f_best):
+            return 0
+
+        return sum(
+            np.isclose(f_opt, f_best, rtol=1e-4, atol=1e-4) and np.allclose(theta, theta_best, rtol=0, atol=1e-2)
+            for theta, f_opt, _ in results
+        )
+
     def _predict(
         self,
         X: np.ndarray,
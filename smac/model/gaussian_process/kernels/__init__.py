@@ -1,9 +1,11 @@
 from smac.model.gaussian_process.kernels.base_kernels import (
     AbstractKernel,
     ConstantKernel,
+    DifferenceCache,
     ProductKernel,
     SumKernel,
 )
+from smac.model.gaussian_process.kernels.batched_kernel import BatchedKernel
 from smac.model.gaussian_process.kernels.hamming_kernel import HammingKernel
 from smac.model.gaussian_process.kernels.matern_kernel import MaternKernel
 from smac.model.gaussian_process.kernels.rbf_kernel import RBFKernel
@@ -18,4 +20,6 @@ __all__ = [
     "WhiteKernel",
     "MaternKernel",
     "RBFKernel",
+    "BatchedKernel",
+    "DifferenceCache",
 ]
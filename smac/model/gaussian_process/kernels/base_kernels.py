@@ -3,6 +3,9 @@ from __future__ import annotations
 from abc import abstractmethod
 from typing import Any, Callable
 
+import threading
+import weakref
+from collections import OrderedDict
 from inspect import Signature, signature
 
 import numpy as np
@@ -15,6 +18,110 @@ __copyright__ = "Copyright 2022, automl.org"
 __license__ = "3-clause BSD"
 
 
+class DifferenceCache:
+    """Least recently used cache of the per-dimension differences of all pairs of data points in X, which is shared by
+    all kernels. The differences do not depend on the hyperparameters of the kernels, so that evaluating a kernel for
+    another length scale (e.g., while optimizing or sampling the hyperparameters of a Gaussian process) only reweights
+    the cached differences.
+
+    Entries are keyed by the identity and shape of X and the dimensions the kernel operates on. An entry is dropped
+    as soon as X is garbage collected, which is why X must not be modified in-place after a kernel was evaluated on it.
+
+    Parameters
+    ----------
+    max_size : int, defaults to 256 MiB
+        The maximum size of all cached entries in bytes. The least recently used entries are evicted first, and
+        entries which are larger than the maximum size are not cached at all.
+    """
+
+    def __init__(self, max_size: int = 256 * 2**20) -> None:
+        self._max_size = max_size
+        self._size = 0
+        self._entries: OrderedDict[tuple, tuple[weakref.ref, np.ndarray]] = OrderedDict()
+        # Kernels might be evaluated in multiple threads (e.g., by the restarts of the hyperparameter optimization)
+        self._lock = threading.RLock()
+
+    @property
+    def max_size(self) -> int:
+        """The maximum size of all cached entries in bytes."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int) -> None:
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """The size of all cached entries in bytes."""
+        return self._size
+
+    def get(self, X: np.ndarray, operate_on: np.ndarray | None, kind: str) -> np.ndarray:
+        """Returns the (cached) values of all pairs of data points in X.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #features]
+            The data points.
+        operate_on : np.ndarray | None
+            The dimensions of X which are used.
+        kind : str
+            Either ``squared`` for the squared differences, ``indicator`` for whether the values differ, or ``active``
+            for whether the conditional hyperparameters of both data points are active
+            (see ``get_conditional_hyperparameters``).
+
+        Returns
+        -------
+        values : np.ndarray [#samples, #samples, #dimensions] or [#samples, #samples] for ``active``
+        """
+        key = (id(X), X.shape, kind, None if operate_on is None else tuple(operate_on))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is X:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        values = self._compute(X if operate_on is None else X[:, operate_on], kind)
+        values.setflags(write=False)
+
+        if values.nbytes <= self._max_size:
+            with self._lock:
+                self._remove(key)
+                self._entries[key] = (weakref.ref(X, lambda _: self._remove(key)), values)
+                self._size += values.nbytes
+                self._evict()
+
+        return values
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _compute(self, X: np.ndarray, kind: str) -> np.ndarray:
+        if kind == "squared":
+            return (X[:, np.newaxis, :] - X[np.newaxis, :, :]) ** 2
+        elif kind == "indicator":
+            return (X[:, np.newaxis, :] != X[np.newaxis, :, :]).astype(np.float64)
+        elif kind == "active":
+            return get_conditional_hyperparameters(X, None)
+
+        raise ValueError(f"Unknown kind `{kind}`.")
+
+    def _remove(self, key: tuple) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1].nbytes
+
+    def _evict(self) -> None:
+        while self._size > self._max_size and len(self._entries) > 0:
+            _, (_, values) = self._entries.popitem(last=False)
+            self._size -= values.nbytes
+
+
 class AbstractKernel:
     """
     This is a mixin for a kernel to override functions of the kernel. Because it overrides functions of the kernel,
@@ -40,8 +147,12 @@ class AbstractKernel:
         Whether the kernel has conditions. Might be changed by the gaussian process.
     prior : AbstractPrior, defaults to None
         Which prior the kernel is using. Primarily used by sklearn.
+    difference_cache : DifferenceCache
+        The cache of the differences of the data points, which is shared by all kernels.
     """
 
+    difference_cache = DifferenceCache()
+
     def __init__(
         self,
         *,
@@ -136,7 +247,9 @@ class AbstractKernel:
     ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
         """Call the kernel function. Internally, `self._call` is called, which must be specified by a subclass."""
         if active is None and self.has_conditions:
-            if self.operate_on is None:
+            if Y is None:
+                active = self.difference_cache.get(X, self.operate_on, "active")
+            elif self.operate_on is None:
                 active = get_conditional_hyperparameters(X, Y)
             else:
                 if Y is None:
@@ -144,8 +257,13 @@ class AbstractKernel:
                 else:
                     active = get_conditional_hyperparameters(X[:, self.operate_on], Y[:, self.operate_on])
 
+        kwargs: dict[str, Any] = {}
+        differences = self._get_differences(X, Y, eval_gradient)
+        if differences is not None:
+            kwargs["differences"] = differences
+
         if self.operate_on is None:
-            rval = self._call(X, Y, eval_gradient, active)
+            rval = self._call(X, Y, eval_gradient, active, **kwargs)
         else:
             if self._len_active is None:
                 raise RuntimeError("The internal variable `_len_active` is not set.")
@@ -156,6 +274,7 @@ class AbstractKernel:
                     Y=None,
                     eval_gradient=eval_gradient,
                     active=active,
+                    **kwargs,
                 )
                 X = X[:, self.operate_on].reshape((-1, self._len_active))
             else:
@@ -194,6 +313,12 @@ class AbstractKernel:
 
         return ProductKernel(b, self)
 
+    def _get_differences(self, X: np.ndarray, Y: np.ndarray | None, eval_gradient: bool) -> np.ndarray | None:
+        """Returns the cached differences of X (see ``DifferenceCache``), which are passed to ``_call``, or None if
+        the kernel does not use them.
+        """
+        return None
+
     @abstractmethod
     def _call(
         self,
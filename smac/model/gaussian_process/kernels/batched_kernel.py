@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import sklearn.gaussian_process.kernels as kernels
+
+from smac.model.gaussian_process.kernels.base_kernels import (
+    ConstantKernel,
+    ProductKernel,
+    SumKernel,
+)
+from smac.model.gaussian_process.kernels.hamming_kernel import HammingKernel
+from smac.model.gaussian_process.kernels.matern_kernel import MaternKernel
+from smac.model.gaussian_process.kernels.rbf_kernel import RBFKernel
+from smac.model.gaussian_process.kernels.white_kernel import WhiteKernel
+from smac.utils.configspace import get_conditional_hyperparameters
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+class BatchedKernel:
+    """Evaluates a kernel for many hyperparameter configurations (theta) at once, e.g., for all walkers of an MCMC
+    ensemble or all hyperparameter samples of a Gaussian process. The parts of the kernel which do not depend on
+    theta (the squared differences of all pairs of points per dimension and the masks of conditional
+    hyperparameters) are computed once per pair of inputs (see ``precompute``) and reused for all theta values.
+
+    Supported are sums and products of constant, white, Matern (nu in 0.5, 1.5, 2.5), RBF and Hamming kernels.
+
+    Parameters
+    ----------
+    kernel : Kernel
+        The kernel whose hyperparameters are given as theta.
+    """
+
+    def __init__(self, kernel: kernels.Kernel) -> None:
+        if not self.is_supported(kernel):
+            raise ValueError(f"Kernel {kernel} is not supported.")
+
+        self._kernel = kernel
+
+    @staticmethod
+    def is_supported(kernel: kernels.Kernel) -> bool:
+        """Returns whether the kernel can be evaluated in batches."""
+        if isinstance(kernel, (SumKernel, ProductKernel)):
+            return BatchedKernel.is_supported(kernel.k1) and BatchedKernel.is_supported(kernel.k2)
+
+        if isinstance(kernel, MaternKernel):
+            return kernel.nu in (0.5, 1.5, 2.5)
+
+        return isinstance(kernel, (ConstantKernel, WhiteKernel, RBFKernel, HammingKernel))
+
+    def precompute(self, X: np.ndarray, Y: np.ndarray | None = None) -> dict[Any, Any]:
+        """Computes the parts of the kernel k(X, Y) which are independent of theta.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples X, #features]
+            Left argument of the kernel.
+        Y : np.ndarray [#samples Y, #features] | None, defaults to None
+            Right argument of the kernel. If None, k(X, X) is evaluated including the noise of white kernels.
+
+        Returns
+        -------
+        cache : dict[Any, Any]
+            The precomputed values per kernel, which are passed to ``__call__``.
+        """
+        cache: dict[Any, Any] = {"shape": (len(X), len(X) if Y is None else len(Y)), "symmetric": Y is None}
+        self._precompute(self._kernel, X, Y, cache)
+
+        return cache
+
+    def __call__(self, thetas: np.ndarray, cache: dict[Any, Any]) -> np.ndarray:
+        """Returns the kernel matrices for all hyperparameter configurations.
+
+        Parameters
+        ----------
+        thetas : np.ndarray [#configurations, #hyperparameters]
+            The hyperparameter configurations on a log scale (see ``kernel.theta``).
+        cache : dict[Any, Any]
+            The precomputed values of the inputs (see ``precompute``).
+
+        Returns
+        -------
+        K : np.ndarray [#configurations, #samples X, #samples Y]
+        """
+        thetas = np.atleast_2d(thetas)
+        K, _ = self._evaluate(self._kernel, thetas, 0, cache)
+
+        return np.broadcast_to(K, (len(thetas), *cache["shape"]))
+
+    def _precompute(
+        self,
+        kernel: kernels.Kernel,
+        X: np.ndarray,
+        Y: np.ndarray | None,
+        cache: dict[Any, Any],
+    ) -> None:
+        if isinstance(kernel, (SumKernel, ProductKernel)):
+            self._precompute(kernel.k1, X, Y, cache)
+            self._precompute(kernel.k2, X, Y, cache)
+            return
+
+        if isinstance(kernel, (ConstantKernel, WhiteKernel)):
+            return
+
+        kind = "indicator" if isinstance(kernel, HammingKernel) else "squared"
+        if Y is None:
+            # The differences of the training data are shared with the kernels
+            differences = kernel.difference_cache.get(X, kernel.operate_on, kind)
+            active = kernel.difference_cache.get(X, kernel.operate_on, "active") if kernel.has_conditions else None
+            cache[id(kernel)] = (differences, active)
+            return
+
+        if kernel.operate_on is not None:
+            X = X[:, kernel.operate_on]
+            Y = Y[:, kernel.operate_on]
+
+        if kind == "indicator":
+            differences = (X[:, np.newaxis, :] != Y[np.newaxis, :, :]).astype(np.float64)
+        else:
+            differences = (X[:, np.newaxis, :] - Y[np.newaxis, :, :]) ** 2
+
+        active = get_conditional_hyperparameters(X, Y) if kernel.has_conditions else None
+        cache[id(kernel)] = (differences, active)
+
+    def _evaluate(
+        self,
+        kernel: kernels.Kernel,
+        thetas: np.ndarray,
+        offset: int,
+        cache: dict[Any, Any],
+    ) -> tuple[np.ndarray, int]:
+        """Returns the kernel matrices of the (sub-)kernel, whose hyperparameters start at column ``offset`` of
+        thetas, and the number of its hyperparameters.
+        """
+        if isinstance(kernel, (SumKernel, ProductKernel)):
+            K1, n1 = self._evaluate(kernel.k1, thetas, offset, cache)
+            K2, n2 = self._evaluate(kernel.k2, thetas, offset + n1, cache)
+            K = K1 + K2 if isinstance(kernel, SumKernel) else K1 * K2
+
+            return K, n1 + n2
+
+        # The values of the hyperparameters of the kernel for all configurations
+        values: list[np.ndarray] = []
+        n_dims = 0
+        for hyperparameter in kernel.hyperparameters:
+            if hyperparameter.fixed:
+                value = np.atleast_1d(getattr(kernel, hyperparameter.name)).astype(np.float64)
+                values.append(np.broadcast_to(value, (len(thetas), len(value))))
+            else:
+                n = hyperparameter.n_elements
+                values.append(np.exp(thetas[:, offset + n_dims : offset + n_dims + n]))
+                n_dims += n
+
+        if isinstance(kernel, ConstantKernel):
+            return values[0][:, :1, np.newaxis], n_dims
+
+        if isinstance(kernel, WhiteKernel):
+            if not cache["symmetric"]:
+                return np.zeros((1, 1, 1)), n_dims
+
+            return values[0][:, :1, np.newaxis] * np.eye(cache["shape"][0]), n_dims
+
+        differences, active = cache[id(kernel)]
+        length_scale = values[0]
+        if length_scale.shape[1] == 1:
+            # Isotropic kernels scale all dimensions with the same length scale
+            length_scale = np.broadcast_to(length_scale, (len(thetas), differences.shape[2]))
+
+        if isinstance(kernel, HammingKernel):
+            K = np.tensordot(-1 / (2 * length_scale**2), differences, axes=(1, 2))
+            np.exp(K, out=K)
+        else:
+            # The operations are done in-place since the matrices of all configurations can be large
+            K = np.tensordot(1 / length_scale**2, differences, axes=(1, 2))
+            if isinstance(kernel, RBFKernel):
+                K *= -0.5
+                np.exp(K, out=K)
+            else:
+                np.sqrt(K, out=K)
+                K *= np.sqrt(2 * kernel.nu)
+                factor = 1.0
+                if kernel.nu >= 1.5:
+                    factor = 1.0 + K
+                if kernel.nu == 2.5:
+                    factor += K**2 / 3.0
+
+                K *= -1
+                np.exp(K, out=K)
+                K *= factor
+
+        if active is not None:
+            K = K * active
+
+        return K, n_dims
@@ -78,12 +78,19 @@ class HammingKernel(
             self.length_scale_bounds,
         )
 
+    def _get_differences(self, X: np.ndarray, Y: np.ndarray | None, eval_gradient: bool) -> np.ndarray | None:
+        if Y is None:
+            return self.difference_cache.get(X, self.operate_on, "indicator")
+
+        return None
+
     def _call(
         self,
         X: np.ndarray,
         Y: np.ndarray | None = None,
         eval_gradient: bool = False,
         active: np.ndarray | None = None,
+        differences: np.ndarray | None = None,
     ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
         X = np.atleast_2d(X)
         length_scale = kernels._check_length_scale(X, self.length_scale)
@@ -95,8 +102,14 @@ class HammingKernel(
         else:
             Y = np.atleast_2d(Y)
 
-        indicator = np.expand_dims(X, axis=1) != Y
-        K = (-1 / (2 * length_scale**2) * indicator).sum(axis=2)
+        if differences is not None:
+            # The indicator of X is cached, so that only the length scales have to be applied
+            indicator = differences
+            K = indicator @ np.broadcast_to(-1 / (2 * length_scale**2), indicator.shape[2])
+        else:
+            indicator = np.expand_dims(X, axis=1) != Y
+            K = (-1 / (2 * length_scale**2) * indicator).sum(axis=2)
+
         K = np.exp(K)
 
         if active is not None:
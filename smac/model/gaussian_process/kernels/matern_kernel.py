@@ -36,17 +36,29 @@ class MaternKernel(AbstractKernel, kernels.Matern):
             nu=nu,
         )
 
+    def _get_differences(self, X: np.ndarray, Y: np.ndarray | None, eval_gradient: bool) -> np.ndarray | None:
+        # Only the gradient of anisotropic kernels needs the differences per dimension. Otherwise, computing the
+        # distances from the scaled X directly is faster.
+        if Y is None and eval_gradient and self.anisotropic:
+            return self.difference_cache.get(X, self.operate_on, "squared")
+
+        return None
+
     def _call(
         self,
         X: np.ndarray,
         Y: np.ndarray | None = None,
         eval_gradient: bool = False,
         active: np.ndarray | None = None,
+        differences: np.ndarray | None = None,
     ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
         X = np.atleast_2d(X)
         length_scale = kernels._check_length_scale(X, self.length_scale)
 
-        if Y is None:
+        if differences is not None:
+            # The squared differences of X are cached, so that only the length scales have to be applied
+            dists = np.sqrt(differences @ np.broadcast_to(1 / length_scale**2, differences.shape[2]))
+        elif Y is None:
             dists = scipy.spatial.distance.pdist(X / length_scale, metric="euclidean")
         else:
             if eval_gradient:
@@ -70,8 +82,11 @@ class MaternKernel(AbstractKernel, kernels.Matern):
             K *= scipy.special.kv(self.nu, tmp)
 
         if Y is None:
-            # convert from upper-triangular matrix to square matrix
-            K = scipy.spatial.distance.squareform(K)
+            if differences is None:
+                # convert from upper-triangular matrix to square matrix
+                K = scipy.spatial.distance.squareform(K)
+                dists = scipy.spatial.distance.squareform(dists)
+
             np.fill_diagonal(K, 1)
 
         if active is not None:
@@ -83,20 +98,25 @@ class MaternKernel(AbstractKernel, kernels.Matern):
                 K_gradient = np.empty((X.shape[0], X.shape[0], 0))
                 return K, K_gradient
 
-            # We need to recompute the pairwise dimension-wise distances
+            # We need to recompute the pairwise dimension-wise distances if they are not cached
             if self.anisotropic:
-                D = (X[:, np.newaxis, :] - X[np.newaxis, :, :]) ** 2 / (length_scale**2)
+                if differences is None:
+                    differences = (X[:, np.newaxis, :] - X[np.newaxis, :, :]) ** 2
+                D = differences / (length_scale**2)
             else:
-                D = scipy.spatial.distance.squareform(dists**2)[:, :, np.newaxis]
+                D = (dists**2)[:, :, np.newaxis]
 
+            # The gradient is D scaled by a factor per pair of points, which only depends on the distance (note
+            # that the squared distance equals the sum of D)
             if self.nu == 0.5:
-                K_gradient = K[..., np.newaxis] * D / np.sqrt(D.sum(2))[:, :, np.newaxis]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    K_gradient = np.multiply(D, (K / dists)[..., np.newaxis], out=D)
                 K_gradient[~np.isfinite(K_gradient)] = 0
             elif self.nu == 1.5:
-                K_gradient = 3 * D * np.exp(-np.sqrt(3 * D.sum(-1)))[..., np.newaxis]
+                K_gradient = np.multiply(D, 3 * np.exp(-math.sqrt(3) * dists)[..., np.newaxis], out=D)
             elif self.nu == 2.5:
-                tmp = np.sqrt(5 * D.sum(-1))[..., np.newaxis]
-                K_gradient = 5.0 / 3.0 * D * (tmp + 1) * np.exp(-tmp)
+                tmp = math.sqrt(5) * dists
+                K_gradient = np.multiply(D, (5.0 / 3.0 * (tmp + 1) * np.exp(-tmp))[..., np.newaxis], out=D)
             else:
                 # original sklearn code would approximate gradient numerically, but this would violate our assumption
                 # that the kernel hyperparameters are not changed within __call__
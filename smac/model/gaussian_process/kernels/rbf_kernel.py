@@ -33,17 +33,30 @@ class RBFKernel(AbstractKernel, kernels.RBF):
             length_scale_bounds=length_scale_bounds,
         )
 
+    def _get_differences(self, X: np.ndarray, Y: np.ndarray | None, eval_gradient: bool) -> np.ndarray | None:
+        # Only the gradient of anisotropic kernels needs the differences per dimension. Otherwise, computing the
+        # distances from the scaled X directly is faster.
+        if Y is None and eval_gradient and self.anisotropic:
+            return self.difference_cache.get(X, self.operate_on, "squared")
+
+        return None
+
     def _call(
         self,
         X: np.ndarray,
         Y: np.ndarray | None = None,
         eval_gradient: bool = False,
         active: np.ndarray | None = None,
+        differences: np.ndarray | None = None,
     ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
         X = np.atleast_2d(X)
         length_scale = kernels._check_length_scale(X, self.length_scale)
 
-        if Y is None:
+        if differences is not None:
+            # The squared differences of X are cached, so that only the length scales have to be applied
+            dists = differences @ np.broadcast_to(1 / length_scale**2, differences.shape[2])
+            K = np.exp(-0.5 * dists)
+        elif Y is None:
             dists = scipy.spatial.distance.pdist(X / length_scale, metric="sqeuclidean")
             K = np.exp(-0.5 * dists)
             # convert from upper-triangular matrix to square matrix
@@ -63,11 +76,16 @@ class RBFKernel(AbstractKernel, kernels.RBF):
                 # Hyperparameter l kept fixed
                 return K, np.empty((X.shape[0], X.shape[0], 0))
             elif not self.anisotropic or length_scale.shape[0] == 1:
-                K_gradient = (K * scipy.spatial.distance.squareform(dists))[:, :, np.newaxis]
+                if differences is None:
+                    dists = scipy.spatial.distance.squareform(dists)
+
+                K_gradient = (K * dists)[:, :, np.newaxis]
                 return K, K_gradient
             elif self.anisotropic:
-                # We need to recompute the pairwise dimension-wise distances
-                K_gradient = (X[:, np.newaxis, :] - X[np.newaxis, :, :]) ** 2 / (length_scale**2)
+                # We need to recompute the pairwise dimension-wise distances if they are not cached
+                if differences is None:
+                    differences = (X[:, np.newaxis, :] - X[np.newaxis, :, :]) ** 2
+                K_gradient = differences / (length_scale**2)
                 K_gradient *= K[..., np.newaxis]
                 return K, K_gradient
 
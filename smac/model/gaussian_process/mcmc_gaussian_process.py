@@ -9,13 +9,16 @@ from copy import deepcopy
 import emcee
 import numpy as np
 from ConfigSpace import ConfigurationSpace
+from scipy.linalg import solve_triangular
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import Kernel
 
+from smac.constants import VERY_SMALL_NUMBER
 from smac.model.gaussian_process.abstract_gaussian_process import (
     AbstractGaussianProcess,
 )
 from smac.model.gaussian_process.gaussian_process import GaussianProcess
+from smac.model.gaussian_process.kernels.batched_kernel import BatchedKernel
 from smac.model.gaussian_process.priors.abstract_prior import AbstractPrior
 
 __copyright__ = "Copyright 2022, automl.org"
@@ -25,12 +28,19 @@ __license__ = "3-clause BSD"
 logger = logging.getLogger(__name__)
 Self = TypeVar("Self", bound="MCMCGaussianProcess")
 
+PREDICT_CHUNK_SIZE = 1000
+
 
 class MCMCGaussianProcess(AbstractGaussianProcess):
     """Implementation of a Gaussian process model which out-integrates its hyperparameters by
     Markow-Chain-Monte-Carlo (MCMC). If you use this class make sure that you also use an integrated acquisition
     function to integrate over the GP's hyperparameter as proposed by Snoek et al.
 
+    If the kernel can be evaluated in batches (see ``BatchedKernel``), the differences between the data points are
+    computed once per training and shared by all hyperparameter samples: The likelihood is evaluated for all walkers
+    of the emcee sampler at once, the Cholesky decompositions of the sampled Gaussian processes are computed in a
+    single batched call, and the kernel between test and training points is computed for all of them at once.
+
     This code is based on the implementation of RoBO:
 
     Klein, A. and Falkner, S. and Mansur, N. and Hutter, F.
@@ -96,6 +106,11 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
         self._average_samples = average_samples
         self._set_has_conditions()
 
+        self._batched_kernel = BatchedKernel(kernel) if BatchedKernel.is_supported(kernel) else None
+        # Theta-independent parts of the kernel of the training data, which are only kept during training
+        self._cache: dict[Any, Any] | None = None
+        self._y_train: np.ndarray | None = None
+
         # Internal statistics
         self._n_ll_evals = 0
         self._burned = False
@@ -152,6 +167,9 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
             y = self._normalize(y)
 
         self._gp = self._get_gaussian_process()
+        if self._batched_kernel is not None:
+            self._cache = self._batched_kernel.precompute(X)
+            self._y_train = y.flatten()
 
         if optimize_hyperparameters:
             self._gp.fit(X, y)
@@ -161,7 +179,12 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
             )
 
             if self._mcmc_sampler == "emcee":
-                sampler = emcee.EnsembleSampler(self._n_mcmc_walkers, len(self._kernel.theta), self._ll)
+                if self._batched_kernel is not None:
+                    sampler = emcee.EnsembleSampler(
+                        self._n_mcmc_walkers, len(self._kernel.theta), self._ll_batch, vectorize=True
+                    )
+                else:
+                    sampler = emcee.EnsembleSampler(self._n_mcmc_walkers, len(self._kernel.theta), self._ll)
                 sampler.random_state = self._rng.get_state()
                 # Do a burn-in in the first iteration
                 if not self._burned:
@@ -253,6 +276,12 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
             if (sample > 50).any():
                 sample[sample > 50] = 50
 
+        # Decompose the covariances of all samples at once
+        choleskies, valid = None, None
+        if self._batched_kernel is not None:
+            choleskies, valid = self._get_choleskies(np.array(self._samples))
+
+        for i, sample in enumerate(self._samples):
             # Instantiate a GP for each hyperparameter configuration
             kernel = deepcopy(self._kernel)
             kernel.theta = sample
@@ -263,7 +292,10 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
                 seed=self._rng.randint(low=0, high=10000),
             )
             try:
-                model._train(X, y, optimize_hyperparameters=False)
+                if choleskies is not None and valid is not None and valid[i]:
+                    model._set_cholesky(X, y, choleskies[i])
+                else:
+                    model._train(X, y, optimize_hyperparameters=False)
                 self._models.append(model)
             except np.linalg.LinAlgError:
                 pass
@@ -288,9 +320,17 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
                 model.mean_y_ = self.mean_y_
                 model.std_y_ = self.std_y_
 
+        self._cache = None
+        self._y_train = None
         self._is_trained = True
         return self
 
+    def _fantasize(self, X: np.ndarray, y: np.ndarray) -> None:
+        # All decompositions are extended before any model is changed so that the models keep sharing their data
+        choleskies = [model._extend_cholesky(X) for model in self._models]
+        for model, L in zip(self._models, choleskies):
+            model._append_data_points(X, y, L)
+
     def _get_gaussian_process(self) -> GaussianProcessRegressor:
         return GaussianProcessRegressor(
             kernel=self._kernel,
@@ -334,6 +374,60 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
         else:
             return lml
 
+    def _ll_batch(self, thetas: np.ndarray) -> np.ndarray:
+        """Returns the marginal log likelihood (+ the prior) for multiple hyperparameter configurations at once, e.g.,
+        for all walkers of the emcee sampler (see ``_ll``).
+
+        Parameters
+        ----------
+        thetas : np.ndarray [#configurations, #hyperparameters]
+            Hyperparameter vectors. Note that all hyperparameters are on a log scale.
+        """
+        assert self._y_train is not None
+        self._n_ll_evals += len(thetas)
+
+        # Bound the hyperparameter space to keep things sane. Note that all hyperparameters live on a log scale.
+        thetas = np.clip(thetas, -50, 50)
+
+        y = self._y_train
+        L, valid = self._get_choleskies(thetas)
+        lml = np.full(len(thetas), -np.inf)
+        for i in np.flatnonzero(valid):
+            z = solve_triangular(L[i], y, lower=True, check_finite=False)
+            lml[i] = -0.5 * z @ z - np.log(np.diag(L[i])).sum() - 0.5 * len(y) * np.log(2 * np.pi)
+
+        # Add prior
+        for dim, priors in enumerate(self._all_priors):
+            for prior in priors:
+                lml += [prior.get_log_probability(theta[dim]) for theta in thetas]
+
+        lml[~np.isfinite(lml)] = -np.inf
+
+        return lml
+
+    def _get_choleskies(self, thetas: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the lower Cholesky decompositions of the covariances of the training data for multiple
+        hyperparameter configurations and whether they could be computed (i.e., the covariance is positive definite).
+        """
+        assert self._batched_kernel is not None and self._cache is not None
+        K = self._batched_kernel(thetas, self._cache)
+
+        valid = np.ones(len(thetas), dtype=bool)
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            # Decompose the covariances one by one to find the ones which are not positive definite
+            L = np.zeros(K.shape)
+            for i in range(len(K)):
+                try:
+                    L[i] = np.linalg.cholesky(K[i])
+                except np.linalg.LinAlgError:
+                    valid[i] = False
+
+        valid &= np.isfinite(L).all(axis=(1, 2))
+
+        return L, valid
+
     def _ll_w_grad(self, theta: np.ndarray) -> tuple[float, np.ndarray]:
         """Returns the marginal log likelihood (+ the prior) for a hyperparameter configuration
         theta.
@@ -400,13 +494,16 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
 
         X_test = self._impute_inactive(X)
 
-        mu = np.zeros([len(self._models), X_test.shape[0]])
-        var = np.zeros([len(self._models), X_test.shape[0]])
-        for i, model in enumerate(self._models):
-            mu_tmp, var_tmp = model.predict(X_test)
-            assert var_tmp is not None
-            mu[i] = mu_tmp.flatten()
-            var[i] = var_tmp.flatten()
+        if self._batched_kernel is not None:
+            mu, var = self._predict_batched(X_test)
+        else:
+            mu = np.zeros([len(self._models), X_test.shape[0]])
+            var = np.zeros([len(self._models), X_test.shape[0]])
+            for i, model in enumerate(self._models):
+                mu_tmp, var_tmp = model.predict(X_test)
+                assert var_tmp is not None
+                mu[i] = mu_tmp.flatten()
+                var[i] = var_tmp.flatten()
 
         m = mu.mean(axis=0)
 
@@ -423,3 +520,33 @@ class MCMCGaussianProcess(AbstractGaussianProcess):
             v[np.where((v < np.finfo(v.dtype).eps) & (v > -np.finfo(v.dtype).eps))] = 0
 
         return m, v
+
+    def _predict_batched(self, X_test: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the predictive means and variances of all models with shape [#models, #samples]. The kernel
+        between the test and the training data points is computed for all models at once, and the test data points
+        are processed in chunks to bound the memory of the precomputed differences.
+        """
+        assert self._batched_kernel is not None
+        gps = [model._gp for model in self._models]
+        X_train = gps[0].X_train_
+        thetas = np.array([gp.kernel_.theta for gp in gps])
+        alphas = np.array([gp.alpha_ for gp in gps])
+
+        mu = np.zeros([len(gps), X_test.shape[0]])
+        var = np.zeros([len(gps), X_test.shape[0]])
+        for start in range(0, len(X_test), PREDICT_CHUNK_SIZE):
+            rows = slice(start, start + PREDICT_CHUNK_SIZE)
+            K_trans = self._batched_kernel(thetas, self._batched_kernel.precompute(X_test[rows], X_train))
+            mu[:, rows] = np.einsum("wij,wj->wi", K_trans, alphas)
+
+            for i, gp in enumerate(gps):
+                V = solve_triangular(gp.L_, K_trans[i].T, lower=True, check_finite=False)
+                var[i, rows] = gp.kernel_.diag(X_test[rows]) - np.einsum("ij,ij->j", V, V)
+
+        # Clip negative variances and set them to the smallest positive float value
+        var = np.clip(var, VERY_SMALL_NUMBER, np.inf)
+
+        if self._normalize_y:
+            mu, var = self._untransform_y(mu, var)
+
+        return mu, var
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+import numpy as np
+from ConfigSpace import ConfigurationSpace
+from scipy import optimize
+from scipy.linalg import cholesky, solve_triangular
+from sklearn.gaussian_process.kernels import Kernel
+
+from smac.constants import VERY_SMALL_NUMBER
+from smac.model.gaussian_process.gaussian_process import GaussianProcess
+from smac.model.gaussian_process.kernels import SumKernel, WhiteKernel
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+Self = TypeVar("Self", bound="SparseGaussianProcess")
+
+
+class SparseGaussianProcess(GaussianProcess):
+    """Sparse Gaussian process which approximates the exact Gaussian process with m inducing points (FITC, fully
+    independent training conditional). Training and prediction cost O(nm²) instead of O(n³), which makes the model
+    usable for many thousands of data points.
+
+    The inducing points are a subset of the data points, which are selected either greedily by their remaining
+    variance given the points selected so far (pivoted Cholesky decomposition) or by k-means++ seeding. The kernel
+    hyperparameters are estimated as in ``GaussianProcess`` (i.e., with the same priors and restarts) by optimizing
+    the exact marginal log likelihood of the inducing points and their targets. If there are at most m data points,
+    the model equals the exact Gaussian process.
+
+    The noise of the kernel (e.g., a ``WhiteKernel``) is only added to the diagonal of the covariance, which is why
+    the kernel is evaluated with ``kernel(X, Z)`` for the cross-covariances and ``kernel.diag(X)`` for the variances.
+    Since the inducing points are interpolated, their noise level is not informative: If the kernel is a sum whose
+    last summand is a ``WhiteKernel``, the noise level is optimized afterwards on the FITC marginal log likelihood of
+    all data points.
+
+    Edward Snelson and Zoubin Ghahramani. Sparse Gaussian processes using pseudo-inputs.
+    In: Advances in Neural Information Processing Systems 18, 2006.
+
+    Parameters
+    ----------
+    configspace : ConfigurationSpace
+    kernel : Kernel
+        Kernel which is used for the Gaussian process.
+    n_inducing_points : int, defaults to 100
+        Number of inducing points m.
+    inducing_point_selection : str, defaults to "greedy_variance"
+        How the inducing points are selected, either "greedy_variance" or "kmeans++".
+    n_restarts : int, defaults to 10
+        Number of restarts for the Gaussian process hyperparameter optimization.
+    normalize_y : bool, defaults to True
+        Zero mean unit variance normalization of the output values.
+    instance_features : dict[str, list[int | float]] | None, defaults to None
+        Features (list of int or floats) of the instances (str). The features are incorporated into the X data,
+        on which the model is trained on.
+    pca_components : float, defaults to 7
+        Number of components to keep when using PCA to reduce dimensionality of instance features.
+    n_jobs : int, defaults to 1
+        Number of threads which run the restarts of the hyperparameter optimization in parallel.
+    seed : int
+    """
+
+    def __init__(
+        self,
+        configspace: ConfigurationSpace,
+        kernel: Kernel,
+        n_inducing_points: int = 100,
+        inducing_point_selection: str = "greedy_variance",
+        n_restarts: int = 10,
+        normalize_y: bool = True,
+        instance_features: dict[str, list[int | float]] | None = None,
+        pca_components: int | None = 7,
+        n_jobs: int = 1,
+        seed: int = 0,
+    ):
+        if inducing_point_selection not in ("greedy_variance", "kmeans++"):
+            raise ValueError(f"Unknown inducing point selection {inducing_point_selection}.")
+
+        super().__init__(
+            configspace=configspace,
+            kernel=kernel,
+            n_restarts=n_restarts,
+            normalize_y=normalize_y,
+            instance_features=instance_features,
+            pca_components=pca_components,
+            n_jobs=n_jobs,
+            seed=seed,
+        )
+
+        self._n_inducing_points = n_inducing_points
+        self._inducing_point_selection = inducing_point_selection
+
+        # Inducing points and the quantities of the posterior which are independent of the points to predict
+        self._X_inducing = np.empty((0, 0))
+        self._L_inducing = np.empty((0, 0))
+        self._R = np.empty((0, 0))
+        self._c = np.empty((0,))
+
+    @property
+    def meta(self) -> dict[str, Any]:  # noqa: D102
+        meta = super().meta
+        meta.update(
+            {
+                "n_inducing_points": self._n_inducing_points,
+                "inducing_point_selection": self._inducing_point_selection,
+            }
+        )
+
+        return meta
+
+    def _train(
+        self: Self,
+        X: np.ndarray,
+        y: np.ndarray,
+        optimize_hyperparameters: bool = True,
+    ) -> Self:
+        """Selects the inducing points, estimates the hyperparameters on the inducing points, and computes the
+        sparse approximation of the posterior for all data points.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #hyperparameters + #features]
+            Input data points.
+        Y : np.ndarray [#samples, #objectives]
+            The corresponding target values.
+        optimize_hyperparameters: boolean
+            If set to true, the hyperparameters are optimized, otherwise the default hyperparameters of the kernel are
+            used.
+        """
+        if self._normalize_y:
+            y = self._normalize(y)
+
+        X = self._impute_inactive(X)
+        y = y.flatten()
+
+        if self._inducing_point_selection == "kmeans++":
+            inducing = self._select_kmeans(X)
+        else:
+            inducing = self._select_greedy_variance(X)
+
+        self._fit(X[inducing], y[inducing], optimize_hyperparameters)
+
+        kernel = self._gp.kernel_
+        X_inducing = X[inducing]
+        L_uu, V, residuals = self._get_nystroem(X, X_inducing)
+        has_noise = isinstance(self._kernel, SumKernel) and isinstance(self._kernel.k2, WhiteKernel)
+        if optimize_hyperparameters and has_noise:
+            # The noise cannot be estimated from the inducing points alone since they are interpolated
+            self._optimize_noise(V, residuals, y)
+
+        L_A, Lambda, b, _ = self._get_fitc(V, residuals, self._get_noise(kernel, X), y)
+
+        self._X_inducing = X_inducing
+        self._L_inducing = L_uu
+        # R = L_A^-1 L_uu^-1 is the root of the posterior covariance of the inducing points
+        self._R = solve_triangular(L_A, solve_triangular(L_uu, np.eye(len(L_uu)), lower=True), lower=True)
+        # The predictive mean is K_*u L_uu^-T c
+        self._c = solve_triangular(L_A.T, b, lower=False, check_finite=False)
+
+        # Set the flag
+        self._is_trained = True
+
+        return self
+
+    def _get_nystroem(self, X: np.ndarray, X_inducing: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the Cholesky decomposition of the covariance of the inducing points L_uu, the matrix
+        V = L_uu^-1 K_uX (i.e., V^T V is the Nyström approximation of the covariance of X), and the variances of X
+        which are not explained by the inducing points (without noise).
+        """
+        kernel = self._gp.kernel_
+        K_uu = kernel(X_inducing, X_inducing.copy())
+        n_tries = 10
+        for i in range(n_tries):
+            try:
+                # Relative jitter for numerical stability (the inducing points have no noise)
+                jitter = 1e-8 * (1 + np.mean(np.diag(K_uu))) * 10**i
+                L_uu = cholesky(K_uu + jitter * np.eye(len(K_uu)), lower=True, check_finite=False)
+                break
+            except np.linalg.LinAlgError as e:
+                if i == n_tries - 1:
+                    raise e
+
+        V = solve_triangular(L_uu, kernel(X_inducing, X), lower=True, check_finite=False)
+        residuals = np.clip(kernel.diag(X) - self._get_noise(kernel, X) - np.sum(V**2, axis=0), 0, np.inf)
+
+        return L_uu, V, residuals
+
+    def _get_fitc(
+        self,
+        V: np.ndarray,
+        residuals: np.ndarray,
+        noise: float,
+        y: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """Returns the Cholesky decomposition L_A of A = I + V Λ^-1 V^T, the diagonal Λ of the FITC covariance
+        Q + Λ, the vector b = L_A^-1 V Λ^-1 y, and the negative marginal log likelihood of y.
+        """
+        Lambda = np.clip(residuals + noise, VERY_SMALL_NUMBER, np.inf)
+        V_scaled = V / np.sqrt(Lambda)
+        A = V_scaled @ V_scaled.T
+        A[np.diag_indices_from(A)] += 1
+        L_A = cholesky(A, lower=True, check_finite=False)
+        b = solve_triangular(L_A, V @ (y / Lambda), lower=True, check_finite=False)
+
+        # The log determinant and the inverse of Q + Λ follow from the matrix determinant and inversion lemmas
+        nll = 0.5 * (
+            np.sum(np.log(Lambda))
+            + 2 * np.sum(np.log(np.diag(L_A)))
+            + y @ (y / Lambda)
+            - b @ b
+            + len(y) * np.log(2 * np.pi)
+        )
+
+        return L_A, Lambda, b, nll
+
+    def _optimize_noise(self, V: np.ndarray, residuals: np.ndarray, y: np.ndarray) -> None:
+        """Optimizes the noise level (the last hyperparameter) by minimizing the negative FITC marginal log
+        likelihood (+ the prior) of all data points. The other hyperparameters and the inducing points are kept.
+        """
+        priors = self._all_priors[-1]
+
+        def nll(log_noise: float) -> float:
+            try:
+                value = self._get_fitc(V, residuals, np.exp(log_noise), y)[3]
+            except np.linalg.LinAlgError:
+                return 1e25
+
+            for prior in priors:
+                value -= prior.get_log_probability(log_noise)
+
+            return value if np.isfinite(value) else 1e25
+
+        bounds = self._kernel.bounds[-1]
+        result = optimize.minimize_scalar(nll, bounds=(bounds[0], bounds[1]), method="bounded")
+
+        theta = self._kernel.theta
+        theta[-1] = result.x
+        self._kernel.theta = theta
+        self._gp.kernel_.theta = theta
+        self._hypers = theta
+
+    @staticmethod
+    def _get_noise(kernel: Kernel, X: np.ndarray) -> float:
+        """Returns the noise of the kernel, which is only added to the diagonal if the kernel is called with one
+        argument (e.g., by a ``WhiteKernel``).
+        """
+        return kernel.diag(X[:1])[0] - kernel(X[:1], X[:1].copy())[0, 0]
+
+    def _select_greedy_variance(self, X: np.ndarray) -> np.ndarray:
+        """Selects the data point with the largest remaining variance given the points selected so far until
+        ``n_inducing_points`` points are selected or the variance of all data points is explained (pivoted Cholesky
+        decomposition with the current kernel).
+        """
+        m = min(self._n_inducing_points, len(X))
+        kernel = self._kernel
+
+        # The variances without noise
+        noise = self._get_noise(kernel, X)
+        variances = kernel.diag(X) - noise
+
+        indices: list[int] = []
+        V = np.zeros((m, len(X)))
+        for j in range(m):
+            i = int(np.argmax(variances))
+            if variances[i] <= 1e-10 * (1 + abs(noise)):
+                break
+
+            indices.append(i)
+            k_i = kernel(X, X[i : i + 1]).ravel()
+            V[j] = (k_i - V[:j].T @ V[:j, i]) / np.sqrt(variances[i])
+            variances -= V[j] ** 2
+            variances[i] = -np.inf
+
+        return np.array(indices, dtype=np.int64)
+
+    def _select_kmeans(self, X: np.ndarray) -> np.ndarray:
+        """Selects ``n_inducing_points`` data points with k-means++ seeding, i.e., each point is sampled with a
+        probability proportional to its squared distance to the closest point selected so far.
+        """
+        m = min(self._n_inducing_points, len(X))
+        indices = [int(self._rng.randint(len(X)))]
+        distances = np.sum((X - X[indices[0]]) ** 2, axis=1)
+        for _ in range(1, m):
+            total = distances.sum()
+            if total <= 0:
+                # All remaining points are duplicates of the selected ones
+                break
+
+            i = int(self._rng.choice(len(X), p=distances / total))
+            indices.append(i)
+            distances = np.minimum(distances, np.sum((X - X[i]) ** 2, axis=1))
+
+        return np.array(indices, dtype=np.int64)
+
+    def _predict(
+        self,
+        X: np.ndarray,
+        covariance_type: str | None = "diagonal",
+    ) -> tuple[np.ndarray, np.ndarray | None]:
+        if not self._is_trained:
+            raise Exception("Model has to be trained first!")
+
+        X_test = self._impute_inactive(X)
+        mu, W, S = self._get_posterior(X_test)
+
+        var: np.ndarray | None = None
+        if covariance_type is not None:
+            if covariance_type == "full":
+                var = self._gp.kernel_(X_test) - W.T @ W + S.T @ S
+            else:
+                var = self._gp.kernel_.diag(X_test) - np.sum(W**2, axis=0) + np.sum(S**2, axis=0)
+
+            # Clip negative variances and set them to the smallest
+            # positive float value
+            var = np.clip(var, VERY_SMALL_NUMBER, np.inf)
+
+        if self._normalize_y:
+            if var is None:
+                mu = self._untransform_y(mu)
+            else:
+                mu, var = self._untransform_y(mu, var)
+
+        if covariance_type == "std":
+            assert var is not None
+            var = np.sqrt(var)  # Converting variance to std deviation if specified
+
+        return mu, var
+
+    def _fantasize(self, X: np.ndarray, y: np.ndarray) -> None:
+        # The posterior is approximated with the inducing points, which would have to be selected again
+        raise NotImplementedError()
+
+    def _get_posterior(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the posterior mean of X and the roots of the Nyström approximation (W^T W) and of the posterior
+        covariance of the inducing points (S^T S) for X.
+        """
+        K_u = self._gp.kernel_(self._X_inducing, X)
+        W = solve_triangular(self._L_inducing, K_u, lower=True, check_finite=False)
+
+        return W.T @ self._c, W, self._R @ K_u
+
+    def sample_functions(self, X_test: np.ndarray, n_funcs: int = 1) -> np.ndarray:
+        """Samples F function values from the current posterior at the N specified test points.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #hyperparameters + #features]
+            Input data points.
+        n_funcs: int
+            Number of function values that are drawn at each test point.
+
+        Returns
+        -------
+        function_samples : np.ndarray
+            The F function values drawn at the N test points.
+        """
+        if not self._is_trained:
+            raise Exception("Model has to be trained first.")
+
+        X_test = self._impute_inactive(X_test)
+        mu, W, S = self._get_posterior(X_test)
+        cov = self._gp.kernel_(X_test) - W.T @ W + S.T @ S
+        funcs = self._rng.multivariate_normal(mu, cov, size=n_funcs).T
+
+        if self._normalize_y:
+            funcs = self._untransform_y(funcs)
+
+        if len(funcs.shape) == 1:
+            return funcs[None, :]
+        else:
+            return funcs
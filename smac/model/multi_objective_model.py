@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import TypeVar
+from typing import Any, Callable, TypeVar
 
+import copy
+
+import joblib
 import numpy as np
 
 from smac.model.abstract_model import AbstractModel
@@ -16,13 +19,19 @@ Self = TypeVar("Self", bound="MultiObjectiveModel")
 class MultiObjectiveModel(AbstractModel):
     """Wrapper for the surrogate model to predict multiple objectives.
 
+    The data points are validated and their instance features are reduced (see ``pca_components``) once for all
+    models, which are then trained and predict on the preprocessed data points directly.
+
     Parameters
     ----------
     models : AbstractModel | list[AbstractModel]
         Which model should be used. If it is a list, then it must provide as many models as objectives.
-        If it is a single model only, the model is used for all objectives.
+        If it is a single model only, a copy of the model is used for each objective.
     objectives : list[str]
         Which objectives should be used.
+    n_jobs : int, defaults to 1
+        Number of threads which train and predict with the models of the objectives in parallel. A value of -1 uses
+        all CPUs.
     seed : int
     """
 
@@ -30,26 +39,31 @@ class MultiObjectiveModel(AbstractModel):
         self,
         models: AbstractModel | list[AbstractModel],
         objectives: list[str],
+        n_jobs: int = 1,
         seed: int = 0,
     ) -> None:
         self._n_objectives = len(objectives)
         if isinstance(models, list):
             assert len(models) == len(objectives)
 
-            # Make sure the configspace is the same
+            # Make sure the configspace and the instance features are the same
             configspace = models[0]._configspace
             for m in models:
                 assert configspace == m._configspace
+                assert m._instance_features == models[0]._instance_features
+                assert m._pca_components == models[0]._pca_components
 
             self._models = models
         else:
             configspace = models._configspace
-            self._models = [models for _ in range(self._n_objectives)]
+            self._models = [models] + [copy.deepcopy(models) for _ in range(self._n_objectives - 1)]
+
+        self._n_jobs = n_jobs
 
         super().__init__(
             configspace=configspace,
-            instance_features=None,
-            pca_components=None,
+            instance_features=self._models[0]._instance_features,
+            pca_components=self._models[0]._pca_components,
             seed=seed,
         )
 
@@ -59,11 +73,11 @@ class MultiObjectiveModel(AbstractModel):
         return self._models
 
     def predict_marginalized(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:  # noqa: D102
+        results = self._map(lambda model: model.predict_marginalized(X))
+
         mean = np.zeros((X.shape[0], self._n_objectives))
         var = np.zeros((X.shape[0], self._n_objectives))
-
-        for i, estimator in enumerate(self._models):
-            m, v = estimator.predict_marginalized(X)
+        for i, (m, v) in enumerate(results):
             mean[:, i] = m.flatten()
             var[:, i] = v.flatten()
 
@@ -73,8 +87,17 @@ class MultiObjectiveModel(AbstractModel):
         if len(self._models) == 0:
             raise ValueError("The list of surrogate models is empty.")
 
-        for i, model in enumerate(self._models):
-            model.train(X, Y[:, i])
+        # The models are trained on the preprocessed data points directly, which is why they get the state of the
+        # preprocessing, too. This way, they can also be used on their own.
+        for model in self._models:
+            model._types = copy.deepcopy(self._types)
+            model._apply_pca = self._apply_pca
+            model._scaler = self._scaler
+            model._pca = self._pca
+            model._projection = self._projection
+            model._projection_features = self._projection_features
+
+        self._map(lambda model, y: model._train(X, y), list(Y.T))
 
         return self
 
@@ -86,13 +109,23 @@ class MultiObjectiveModel(AbstractModel):
         if covariance_type != "diagonal":
             raise ValueError("`covariance_type` can only take `diagonal` for this model.")
 
+        results = self._map(lambda model: model._predict(X, covariance_type))
+
         mean = np.zeros((X.shape[0], self._n_objectives))
         var = np.zeros((X.shape[0], self._n_objectives))
-
-        for i, estimator in enumerate(self._models):
-            m, v = estimator.predict(X)
+        for i, (m, v) in enumerate(results):
             assert v is not None
             mean[:, i] = m.flatten()
             var[:, i] = v.flatten()
 
         return mean, var
+
+    def _map(self, func: Callable[..., Any], *args: list) -> list[Any]:
+        """Calls the function for each model (and the corresponding entries of args) in parallel threads."""
+        n_jobs = max(1, min(joblib.effective_n_jobs(self._n_jobs), len(self._models)))
+        if n_jobs == 1:
+            return [func(model, *arguments) for model, *arguments in zip(self._models, *args)]
+
+        return joblib.Parallel(n_jobs=n_jobs, backend="threading")(
+            joblib.delayed(func)(model, *arguments) for model, *arguments in zip(self._models, *args)
+        )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+from pyrfr.regression import binary_rss_forest as BinaryForest
+
+from smac.constants import VERY_SMALL_NUMBER
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+class ForestPredictor:
+    """Batched prediction engine for fitted pyrfr forests. The trees are exported once into flat NumPy arrays
+    (one entry per node) so that all rows of X are routed through all trees at once, level by level, instead of
+    calling pyrfr for each row.
+
+    The prediction of a tree equals the one of pyrfr, i.e., the (weighted) mean of the data points in the leaf. For
+    log-transformed targets, the values of each leaf are aggregated to ``log(mean(exp(values)))`` once so that no
+    ragged array of leaf values is needed when predicting.
+
+    Parameters
+    ----------
+    forests : list[BinaryForest]
+        The fitted forests whose trees are combined into a single forest.
+    log_y : bool, defaults to False
+        Whether the forests were fitted on log-transformed targets.
+    """
+
+    def __init__(self, forests: list[BinaryForest], log_y: bool = False) -> None:
+        trees = [tree for forest in forests for tree in json.loads(forest.ascii_string_representation())["value1"]]
+        n_nodes = sum(len(tree["value0"]) for tree in trees)
+
+        self._n_trees = len(trees)
+        self._roots = np.zeros(self._n_trees, dtype=np.int64)
+        self._features = np.zeros(n_nodes, dtype=np.int64)
+        self._thresholds = np.zeros(n_nodes, dtype=np.float64)
+        self._children = np.zeros((n_nodes, 2), dtype=np.int64)
+        self._values = np.zeros(n_nodes, dtype=np.float64)
+        # Statistics of the leaves which are needed to add data points later on (see ``update``)
+        self._weights = np.zeros(n_nodes, dtype=np.float64)
+        self._exp_sums = np.zeros(n_nodes, dtype=np.float64)
+        self._counts = np.zeros(n_nodes, dtype=np.float64)
+        self._log_y = log_y
+        self._categorical = np.zeros(n_nodes, dtype=bool)
+
+        # Categories which are routed to the left child of categorical splits
+        categories: dict[int, list[int]] = {}
+
+        offset = 0
+        for i, tree in enumerate(trees):
+            self._roots[i] = offset
+            for j, node in enumerate(tree["value0"]):
+                index = offset + j
+                left, right = node["value3"]["value0"], node["value3"]["value1"]
+                if left == 0 and right == 0:
+                    # Leaves point to themselves so that rows which arrived at a leaf stay there
+                    self._children[index] = index
+                    self._weights[index] = sum(node["value1"])
+                    if log_y:
+                        values = np.asarray(node["value0"], dtype=np.float64)
+                        self._exp_sums[index] = np.sum(np.exp(values))
+                        self._counts[index] = len(values)
+                        self._values[index] = np.log(self._exp_sums[index] / len(values) + VERY_SMALL_NUMBER)
+                    else:
+                        self._values[index] = node["value6"]["value0"]
+
+                    continue
+
+                self._children[index] = (offset + left, offset + right)
+                self._features[index] = node["value5"]["value0"]
+                self._thresholds[index] = node["value5"]["value1"]
+
+                # The split value is NaN for categorical splits, which store the categories as bitset instead
+                if np.isnan(self._thresholds[index]):
+                    bitset = node["value5"]["value2"]
+                    data = bitset["data"]
+                    bits = int(data, 2) if isinstance(data, str) else int(data)
+
+                    self._categorical[index] = True
+                    categories[index] = [k for k in range(bits.bit_length()) if (bits >> k) & 1]
+
+            offset += len(tree["value0"])
+
+        n_categories = max((max(c, default=-1) + 1 for c in categories.values()), default=0)
+        self._categories = np.zeros((n_nodes, n_categories + 1), dtype=bool)
+        for index, left_categories in categories.items():
+            self._categories[index, left_categories] = True
+
+        self._depth = self._get_depth()
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees of the forest."""
+        return self._n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Returns the prediction of every tree for all rows of X.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #features]
+            Input data points with imputed inactive values.
+
+        Returns
+        -------
+        predictions : np.ndarray [#samples, #trees]
+        """
+        return self._values[self._get_leaves(X)]
+
+    def update(self, X: np.ndarray, y: np.ndarray, weight: float = 1.0) -> None:
+        """Adds data points to the leaves they fall into without changing the structure of the trees. This mirrors
+        ``pseudo_update`` of pyrfr, which has to be applied to the forests as well.
+
+        Parameters
+        ----------
+        X : np.ndarray [#samples, #features]
+            Input data points with imputed inactive values.
+        y : np.ndarray [#samples]
+            The corresponding target values.
+        weight : float, defaults to 1.0
+            Weight of each data point.
+        """
+        leaves = self._get_leaves(X)
+        y = np.broadcast_to(np.asarray(y, dtype=np.float64).reshape((-1, 1)), leaves.shape)
+
+        # Leaves might receive multiple data points, which is why unbuffered additions are used
+        if self._log_y:
+            np.add.at(self._exp_sums, leaves, np.exp(y))
+            np.add.at(self._counts, leaves, 1)
+            self._values[leaves] = np.log(self._exp_sums[leaves] / self._counts[leaves] + VERY_SMALL_NUMBER)
+        else:
+            sums = self._values * self._weights
+            np.add.at(sums, leaves, weight * y)
+            np.add.at(self._weights, leaves, weight)
+            self._values[leaves] = sums[leaves] / self._weights[leaves]
+
+    def _get_leaves(self, X: np.ndarray) -> np.ndarray:
+        """Returns the indices of the leaves which the rows of X fall into with shape [#samples, #trees]."""
+        X = np.asarray(X, dtype=np.float64)
+        nodes = np.broadcast_to(self._roots, (len(X), self._n_trees)).copy()
+        rows = np.arange(len(X))[:, np.newaxis]
+
+        for _ in range(self._depth):
+            features = self._features[nodes]
+            values = X[rows, features]
+            go_right = values > self._thresholds[nodes]
+
+            if self._categories.shape[1] > 1:
+                categorical = self._categorical[nodes]
+                if np.any(categorical):
+                    # Unknown categories (e.g., imputed values of inactive hyperparameters) are routed to the right
+                    category = np.clip(values, 0, self._categories.shape[1] - 1).astype(np.int64)
+                    go_right[categorical] = ~self._categories[nodes, category][categorical]
+
+            nodes = self._children[nodes, go_right.astype(np.int64)]
+
+        return nodes
+
+    def _get_depth(self) -> int:
+        """Returns the maximum number of splits on a path from a root to a leaf."""
+        depth = 0
+        nodes = self._roots
+        while True:
+            inner = nodes[self._children[nodes, 0] != nodes]
+            if len(inner) == 0:
+                return depth
+
+            nodes = self._children[inner].ravel()
+            depth += 1
@@ -2,18 +2,23 @@ from __future__ import annotations
 
 from typing import Any
 
+import joblib
 import numpy as np
 from ConfigSpace import ConfigurationSpace
 from pyrfr import regression
 from pyrfr.regression import binary_rss_forest as BinaryForest
 from pyrfr.regression import default_data_container as DataContainer
 
-from smac.constants import N_TREES, VERY_SMALL_NUMBER
+from smac.constants import N_TREES
 from smac.model.random_forest import AbstractRandomForest
+from smac.model.random_forest.forest_predictor import ForestPredictor
 
 __copyright__ = "Copyright 2022, automl.org"
 __license__ = "3-clause BSD"
 
+# Minimum number of points per thread when predicting in parallel
+PREDICT_CHUNK_SIZE = 1000
+
 
 class RandomForest(AbstractRandomForest):
     """Random forest that takes instance features into account.
@@ -46,6 +51,17 @@ class RandomForest(AbstractRandomForest):
         on which the model is trained on.
     pca_components : float, defaults to 7
         Number of components to keep when using PCA to reduce dimensionality of instance features.
+    rebuild_after : int, defaults to 1
+        Number of trainings after which the forest is rebuilt from scratch. In between, new data points are added to
+        the leaves of the existing trees (online update) without changing their structure. This is only possible if
+        the previously trained data points and targets are unchanged (e.g., the targets change if they are normalized
+        by a new minimum); otherwise, the forest is rebuilt anyway. By default, the forest is rebuilt on every
+        training.
+    n_jobs : int, defaults to 1
+        Number of processes which fit the trees and number of threads which predict. Each tree is fitted with its own
+        seed, which is derived from ``seed``, so that the forest is the same for any number of jobs. The trees are
+        split into disjoint groups which are fitted in parallel worker processes, and the points to predict are split
+        across threads. A value of -1 uses all CPUs.
     seed : int
     """
 
@@ -64,6 +80,8 @@ class RandomForest(AbstractRandomForest):
         log_y: bool = False,
         instance_features: dict[str, list[int | float]] | None = None,
         pca_components: int | None = 7,
+        rebuild_after: int = 1,
+        n_jobs: int = 1,
         seed: int = 0,
     ) -> None:
         super().__init__(
@@ -75,19 +93,24 @@ class RandomForest(AbstractRandomForest):
 
         max_features = 0 if ratio_features > 1.0 else max(1, int(len(self._types) * ratio_features))
 
-        self._rf_opts = regression.forest_opts()
-        self._rf_opts.num_trees = n_trees
-        self._rf_opts.do_bootstrapping = bootstrapping
-        self._rf_opts.tree_opts.max_features = max_features
-        self._rf_opts.tree_opts.min_samples_to_split = min_samples_split
-        self._rf_opts.tree_opts.min_samples_in_leaf = min_samples_leaf
-        self._rf_opts.tree_opts.max_depth = max_depth
-        self._rf_opts.tree_opts.epsilon_purity = eps_purity
-        self._rf_opts.tree_opts.max_num_nodes = max_nodes
-        self._rf_opts.compute_law_of_total_variance = False
-        self._rf: BinaryForest | None = None
+        # The options of the pyrfr forests are created in the (worker) processes which fit the trees
+        self._rf_opts: dict[str, Any] = {
+            "do_bootstrapping": bootstrapping,
+            "compute_law_of_total_variance": False,
+            "tree_opts": {
+                "max_features": max_features,
+                "min_samples_to_split": min_samples_split,
+                "min_samples_in_leaf": min_samples_leaf,
+                "max_depth": max_depth,
+                "epsilon_purity": eps_purity,
+                "max_num_nodes": max_nodes,
+            },
+        }
+        # Every tree is a pyrfr forest on its own so that each tree is fitted with its own seed
+        self._rf: list[BinaryForest] | None = None
+        # Batched prediction engine of the fitted forest, which is created on the first prediction after training
+        self._predictor: ForestPredictor | None = None
         self._log_y = log_y
-        self._rng = regression.default_random_engine(seed)
 
         self._n_trees = n_trees
         self._n_points_per_tree = n_points_per_tree
@@ -98,6 +121,14 @@ class RandomForest(AbstractRandomForest):
         self._eps_purity = eps_purity
         self._max_nodes = max_nodes
         self._bootstrapping = bootstrapping
+        self._rebuild_after = max(1, rebuild_after)
+        self._n_jobs = n_jobs
+
+        # The data container and the data of the last training are kept so that new data points can be appended
+        self._data: DataContainer | None = None
+        self._X: np.ndarray | None = None
+        self._y: np.ndarray | None = None
+        self._n_online_updates = 0
 
         # This list well be read out by save_iteration() in the solver
         # self._hypers = [
@@ -113,6 +144,28 @@ class RandomForest(AbstractRandomForest):
         #    self._seed,
         # ]
 
+    def __getstate__(self) -> dict[str, Any]:
+        # The pyrfr objects can not be pickled: The trees are stored as strings, and the data container is created
+        # again on the next training
+        state = self.__dict__.copy()
+        state["_data"] = None
+        if self._rf is not None:
+            state["_rf"] = [forest.ascii_string_representation() for forest in self._rf]
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if state["_rf"] is not None:
+            forests = []
+            for representation in state["_rf"]:
+                forest = regression.binary_rss_forest()
+                forest.load_from_ascii_string(representation)
+                forests.append(forest)
+
+            state["_rf"] = forests
+
+        self.__dict__.update(state)
+
     @property
     def meta(self) -> dict[str, Any]:  # noqa: D102
         meta = super().meta
@@ -128,6 +181,8 @@ class RandomForest(AbstractRandomForest):
                 "max_nodes": self._max_nodes,
                 "bootstrapping": self._bootstrapping,
                 "pca_components": self._pca_components,
+                "rebuild_after": self._rebuild_after,
+                "n_jobs": self._n_jobs,
             }
         )
 
@@ -137,19 +192,58 @@ class RandomForest(AbstractRandomForest):
         X = self._impute_inactive(X)
         y = y.flatten()
 
-        # self.X = X
-        # self.y = y.flatten()
+        # Whether the data of the last training is unchanged and only new data points are appended
+        n_previous = 0
+        if self._X is not None and self._y is not None and len(self._X) <= len(X):
+            n_previous = len(self._X)
+            if not (
+                np.array_equal(X[:n_previous], self._X, equal_nan=True)
+                and np.array_equal(y[:n_previous], self._y, equal_nan=True)
+            ):
+                n_previous = 0
+
+        if n_previous > 0 and self._data is not None:
+            for row_X, row_y in zip(X[n_previous:], y[n_previous:]):
+                self._data.add_data_point(row_X, row_y)
+        else:
+            self._data = self._init_data_container(X, y)
+
+        self._X, self._y = X, y
+
+        if self._rf is not None and n_previous > 0 and self._n_online_updates + 1 < self._rebuild_after:
+            # Online update: The new data points are only added to the leaves they fall into
+            for forest in self._rf:
+                for row_X, row_y in zip(X[n_previous:], y[n_previous:]):
+                    forest.pseudo_update(row_X, row_y, 1.0)
 
+            if self._predictor is not None:
+                self._predictor.update(X[n_previous:], y[n_previous:])
+
+            self._n_online_updates += 1
+
+            return self
+
+        options = dict(self._rf_opts)
         if self._n_points_per_tree <= 0:
-            self._rf_opts.num_data_points_per_tree = X.shape[0]
+            options["num_data_points_per_tree"] = X.shape[0]
         else:
-            self._rf_opts.num_data_points_per_tree = self._n_points_per_tree
-
-        self._rf = regression.binary_rss_forest()
-        self._rf.options = self._rf_opts
+            options["num_data_points_per_tree"] = self._n_points_per_tree
+
+        # The seeds of the trees are drawn independently of the number of jobs
+        seeds = [int(seed) for seed in self._rng.randint(0, 2**31 - 1, size=self._n_trees)]
+        n_jobs = min(joblib.effective_n_jobs(self._n_jobs), self._n_trees)
+        if n_jobs > 1:
+            groups = np.array_split(np.arange(self._n_trees), n_jobs)
+            forests = joblib.Parallel(n_jobs=n_jobs, backend="loky")(
+                joblib.delayed(_fit_trees)((X, y, self._bounds), options, [seeds[i] for i in group])
+                for group in groups
+            )
+            self._rf = [forest for group_forests in forests for forest in group_forests]
+        else:
+            self._rf = _fit_trees(self._data, options, seeds)
 
-        data = self._init_data_container(X, y)
-        self._rf.fit(data, rng=self._rng)
+        self._predictor = None
+        self._n_online_updates = 0
 
         return self
 
@@ -168,19 +262,7 @@ class RandomForest(AbstractRandomForest):
         data : DataContainer
             The filled data container that pyrfr can interpret.
         """
-        # Retrieve the types and the bounds from the ConfigSpace
-        data = regression.default_data_container(X.shape[1])
-
-        for i, (mn, mx) in enumerate(self._bounds):
-            if np.isnan(mx):
-                data.set_type_of_feature(i, mn)
-            else:
-                data.set_bounds_of_feature(i, mn, mx)
-
-        for row_X, row_y in zip(X, y):
-            data.add_data_point(row_X, row_y)
-
-        return data
+        return _create_data_container(X, y, self._bounds)
 
     def _predict(
         self,
@@ -199,38 +281,27 @@ class RandomForest(AbstractRandomForest):
         assert self._rf is not None
         X = self._impute_inactive(X)
 
+        if self._predictor is None:
+            self._predictor = ForestPredictor(self._rf, log_y=self._log_y)
+
+        n_jobs = min(joblib.effective_n_jobs(self._n_jobs), len(X) // PREDICT_CHUNK_SIZE)
+        if n_jobs > 1:
+            # NumPy releases the GIL while routing the points through the trees
+            preds_per_tree = np.concatenate(
+                joblib.Parallel(n_jobs=n_jobs, backend="threading")(
+                    joblib.delayed(self._predictor.predict)(chunk) for chunk in np.array_split(X, n_jobs)
+                )
+            )
+        else:
+            preds_per_tree = self._predictor.predict(X)
+        means = preds_per_tree.mean(axis=1)
         if self._log_y:
-            all_preds = []
-            third_dimension = 0
-
-            # Gather data in a list of 2d arrays and get statistics about the required size of the 3d array
-            for row_X in X:
-                preds_per_tree = self._rf.all_leaf_values(row_X)
-                all_preds.append(preds_per_tree)
-                max_num_leaf_data = max(map(len, preds_per_tree))
-                third_dimension = max(max_num_leaf_data, third_dimension)
-
-            # Transform list of 2d arrays into a 3d array
-            preds_as_array = np.zeros((X.shape[0], self._rf_opts.num_trees, third_dimension)) * np.NaN
-            for i, preds_per_tree in enumerate(all_preds):
-                for j, pred in enumerate(preds_per_tree):
-                    preds_as_array[i, j, : len(pred)] = pred
-
-            # Do all necessary computation with vectorized functions
-            preds_as_array = np.log(np.nanmean(np.exp(preds_as_array), axis=2) + VERY_SMALL_NUMBER)
-
-            # Compute the mean and the variance across the different trees
-            means = preds_as_array.mean(axis=1)
-            vars_ = preds_as_array.var(axis=1)
+            vars_ = preds_per_tree.var(axis=1)
+        elif self._predictor.n_trees > 1:
+            # Same as pyrfr, which uses the sample variance across the trees
+            vars_ = preds_per_tree.var(axis=1, ddof=1)
         else:
-            means, vars_ = [], []
-            for row_X in X:
-                mean_, var = self._rf.predict_mean_var(row_X)
-                means.append(mean_)
-                vars_.append(var)
-
-        means = np.array(means)
-        vars_ = np.array(vars_)
+            vars_ = np.zeros(len(X))
 
         return means.reshape((-1, 1)), vars_.reshape((-1, 1))
 
@@ -275,8 +346,10 @@ class RandomForest(AbstractRandomForest):
         X = self._impute_inactive(X)
 
         X_feat = list(self._instance_features.values())
-        dat_ = self._rf.predict_marginalized_over_instances_batch(X, X_feat, self._log_y)
-        dat_ = np.array(dat_)
+        dat_ = np.concatenate(
+            [np.array(forest.predict_marginalized_over_instances_batch(X, X_feat, self._log_y)) for forest in self._rf],
+            axis=1,
+        )
 
         # 3. compute statistics across trees
         mean_ = dat_.mean(axis=1)
@@ -293,3 +366,56 @@ class RandomForest(AbstractRandomForest):
             var = var.reshape((-1, 1))
 
         return mean_, var
+
+
+def _create_data_container(X: np.ndarray, y: np.ndarray, bounds: list[tuple[float, float]]) -> DataContainer:
+    """Fills a pyrfr default data container with the data points and the types and bounds of the features."""
+    data = regression.default_data_container(X.shape[1])
+
+    for i, (mn, mx) in enumerate(bounds):
+        if np.isnan(mx):
+            data.set_type_of_feature(i, mn)
+        else:
+            data.set_bounds_of_feature(i, mn, mx)
+
+    for row_X, row_y in zip(X, y):
+        data.add_data_point(row_X, row_y)
+
+    return data
+
+
+def _create_forest(options: dict[str, Any], n_trees: int) -> BinaryForest:
+    """Creates a pyrfr forest with the given number of trees and options."""
+    opts = regression.forest_opts()
+    opts.num_trees = n_trees
+    for key, value in options.items():
+        if key == "tree_opts":
+            for tree_key, tree_value in value.items():
+                setattr(opts.tree_opts, tree_key, tree_value)
+        else:
+            setattr(opts, key, value)
+
+    forest = regression.binary_rss_forest()
+    forest.options = opts
+
+    return forest
+
+
+def _fit_trees(
+    data: DataContainer | tuple[np.ndarray, np.ndarray, list[tuple[float, float]]],
+    options: dict[str, Any],
+    seeds: list[int],
+) -> list[BinaryForest]:
+    """Fits one single-tree pyrfr forest per seed. This function is executed in the worker processes, which is why
+    the data container can also be passed as data points and bounds.
+    """
+    if isinstance(data, tuple):
+        data = _create_data_container(*data)
+
+    forests = []
+    for seed in seeds:
+        forest = _create_forest(options, 1)
+        forest.fit(data, rng=regression.default_random_engine(seed))
+        forests.append(forest)
+
+    return forests
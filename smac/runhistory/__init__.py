@@ -7,9 +7,11 @@ from smac.runhistory.dataclasses import (
 )
 from smac.runhistory.enumerations import StatusType
 from smac.runhistory.runhistory import RunHistory
+from smac.runhistory.sharded_runhistory import ShardedRunHistory
 
 __all__ = [
     "RunHistory",
+    "ShardedRunHistory",
     "TrialKey",
     "InstanceSeedBudgetKey",
     "InstanceSeedKey",
@@ -0,0 +1,468 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, MutableMapping
+
+import numpy as np
+
+from smac.runhistory.dataclasses import TrialKey, TrialValue
+from smac.runhistory.enumerations import StatusType
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def pack_instance_seed(instance_id: int, seed: int | None) -> int:
+    """Packs an interned instance and a seed into an int64. The code is unique as long as the seeds fit into 32 bits
+    (and there are less than 2**30 instances), otherwise it is only deterministic.
+    """
+    code = (instance_id + 1) << 33
+    if seed is not None:
+        code |= (1 << 32) | (int(seed) & 0xFFFFFFFF)
+
+    return code
+
+
+def pack_instance_seeds(instance_ids: np.ndarray, seeds: np.ndarray, has_seed: np.ndarray) -> np.ndarray:
+    """Vectorized version of ``pack_instance_seed``, where the seeds are only considered where ``has_seed`` is
+    true.
+    """
+    seeds = np.where(has_seed, seeds.astype(np.int64), 0)
+    return ((instance_ids.astype(np.int64) + 1) << 33) | (has_seed.astype(np.int64) << 32) | (seeds & 0xFFFFFFFF)
+
+
+class ColumnarStorage(MutableMapping[TrialKey, TrialValue]):
+    """Array-backed storage of trials, which can be used by the runhistory instead of a dictionary.
+
+    Instead of keeping one ``TrialKey`` and one ``TrialValue`` object per trial, all fields are stored in
+    contiguous NumPy columns. Instances are interned, i.e., every distinct instance is stored only once and the
+    trials refer to it by index. Trials are looked up among the rows of their configuration (which are kept in an
+    array) by their instance and seed, which are packed into an integer, and by their budget, i.e., no Python object
+    is kept per trial. The storage behaves like an (ordered) dictionary: ``TrialKey`` and ``TrialValue`` objects are
+    only created on access. Overwriting a trial keeps its position, removing a trial shifts all subsequent rows so
+    that the row order always equals the iteration order.
+
+    Note
+    ----
+    The columns (e.g., ``costs`` or ``statuses``) are views on the internal buffers and are only valid until the
+    next modification of the storage.
+
+    Parameters
+    ----------
+    capacity : int, defaults to 1024
+        Initial number of rows which are allocated. The buffers grow geometrically if more rows are needed.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._initial_capacity = max(1, int(capacity))
+        self.clear()
+
+    @property
+    def config_ids(self) -> np.ndarray:
+        """Config ids of all trials."""
+        return self._config_ids[: self._size]
+
+    @property
+    def instance_ids(self) -> np.ndarray:
+        """Indices of the instances in ``instance_table``. -1 is used if no instance was given."""
+        return self._instances[: self._size]
+
+    @property
+    def instance_table(self) -> list[Any]:
+        """All distinct instances in the order they were seen first."""
+        return list(self._instance_table)
+
+    @property
+    def seeds(self) -> np.ndarray:
+        """Seeds of all trials. Only valid where ``has_seed`` is true."""
+        return self._seeds[: self._size]
+
+    @property
+    def has_seed(self) -> np.ndarray:
+        """Whether a seed was given for the trial."""
+        return self._has_seed[: self._size]
+
+    @property
+    def budgets(self) -> np.ndarray:
+        """Budgets of all trials. NaN is used if no budget was given."""
+        return self._budgets[: self._size]
+
+    @property
+    def costs(self) -> np.ndarray:
+        """Costs of all trials with shape [n_trials, n_objectives]. Scalar costs are broadcast to all columns."""
+        return self._costs[: self._size]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Times of all trials."""
+        return self._times[: self._size]
+
+    @property
+    def statuses(self) -> np.ndarray:
+        """Status of all trials as integers (see ``StatusType``)."""
+        return self._statuses[: self._size]
+
+    @property
+    def starttimes(self) -> np.ndarray:
+        """Start times of all trials."""
+        return self._starttimes[: self._size]
+
+    @property
+    def endtimes(self) -> np.ndarray:
+        """End times of all trials."""
+        return self._endtimes[: self._size]
+
+    @property
+    def additional_info(self) -> dict[int, Any]:
+        """Non-empty additional infos by row."""
+        return dict(self._additional_info)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes allocated by the columns."""
+        return sum(column.nbytes for column in self._columns())
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: dict[str, np.ndarray],
+        instance_table: list[Any],
+        additional_info: dict[int, Any],
+    ) -> ColumnarStorage:
+        """Creates a storage from the columns returned by ``to_columns``. The columns are used as they are, i.e.,
+        memory-mapped columns are not read into memory. They are only copied once the storage grows.
+
+        Parameters
+        ----------
+        columns : dict[str, np.ndarray]
+            The columns as returned by ``to_columns``.
+        instance_table : list[Any]
+            The distinct instances which are referred to by the instance column.
+        additional_info : dict[int, Any]
+            The non-empty additional infos by row.
+
+        Returns
+        -------
+        storage : ColumnarStorage
+        """
+        size = len(columns["config_ids"])
+        storage = cls(capacity=max(1, size))
+        if size == 0:
+            return storage
+
+        storage._size = size
+        storage._capacity = size
+        storage._config_ids = columns["config_ids"]
+        storage._instances = columns["instances"]
+        storage._seeds = columns["seeds"]
+        storage._has_seed = columns["has_seed"]
+        storage._budgets = columns["budgets"]
+        storage._costs = columns["costs"]
+        storage._cost_widths = columns["cost_widths"]
+        storage._times = columns["times"]
+        storage._statuses = columns["statuses"]
+        storage._starttimes = columns["starttimes"]
+        storage._endtimes = columns["endtimes"]
+        storage._additional_info = dict(additional_info)
+
+        storage._instance_table = list(instance_table)
+        storage._instance_ids = {instance: instance_id for instance_id, instance in enumerate(instance_table)}
+        storage._build_index()
+
+        return storage
+
+    def to_columns(self) -> dict[str, np.ndarray]:
+        """Returns the (trimmed) columns of the storage, which can be passed to ``from_columns``. The instances and
+        additional infos are accessible via ``instance_table`` and ``additional_info``.
+        """
+        return {
+            "config_ids": self.config_ids,
+            "instances": self.instance_ids,
+            "seeds": self.seeds,
+            "has_seed": self.has_seed,
+            "budgets": self.budgets,
+            "costs": self.costs,
+            "cost_widths": self._cost_widths[: self._size],
+            "times": self.times,
+            "statuses": self.statuses,
+            "starttimes": self.starttimes,
+            "endtimes": self.endtimes,
+        }
+
+    def get_row(self, k: TrialKey) -> int:
+        """Returns the row of the trial in the columns."""
+        row = self._find(k)
+        if row == -1:
+            raise KeyError(k)
+
+        return row
+
+    def __contains__(self, k: object) -> bool:
+        if not isinstance(k, TrialKey):
+            return False
+
+        return self._find(k) != -1
+
+    def __getitem__(self, k: TrialKey) -> TrialValue:
+        return self._get_value(self.get_row(k))
+
+    def get(self, k: TrialKey, default: Any = None) -> Any:  # noqa: D102
+        row = self._find(k)
+        if row == -1:
+            return default
+
+        return self._get_value(row)
+
+    def __setitem__(self, k: TrialKey, v: TrialValue) -> None:
+        row = self._find(k)
+
+        if row == -1:
+            if self._size == self._capacity:
+                self._resize(2 * self._capacity)
+
+            instance_id = self._intern(k.instance)
+
+            row = self._size
+            self._size += 1
+
+            self._config_ids[row] = k.config_id
+            self._instances[row] = instance_id
+            self._has_seed[row] = k.seed is not None
+            self._seeds[row] = k.seed if k.seed is not None else 0
+            self._budgets[row] = k.budget if k.budget is not None else np.nan
+            self._key_codes[row] = self._get_key_code(instance_id, k.seed)
+            self._add_config_row(k.config_id, row)
+
+        self._set_value(row, v)
+
+    def __delitem__(self, k: TrialKey) -> None:
+        row = self.get_row(k)
+
+        # Shift all subsequent rows to keep the row order equal to the iteration order
+        for column in self._columns():
+            column[row : self._size - 1] = column[row + 1 : self._size]
+
+        self._size -= 1
+        self._build_index()
+
+        self._additional_info = {
+            (other_row - 1 if other_row > row else other_row): info
+            for other_row, info in self._additional_info.items()
+            if other_row != row
+        }
+
+    def __iter__(self) -> Iterator[TrialKey]:
+        instance_table = self._instance_table
+        for config_id, instance_id, seed, has_seed, budget in zip(
+            self.config_ids.tolist(),
+            self.instance_ids.tolist(),
+            self.seeds.tolist(),
+            self.has_seed.tolist(),
+            self.budgets.tolist(),
+        ):
+            yield TrialKey(
+                config_id=config_id,
+                instance=instance_table[instance_id] if instance_id >= 0 else None,
+                seed=seed if has_seed else None,
+                budget=None if budget != budget else budget,
+            )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        """Removes all trials."""
+        capacity = self._initial_capacity
+
+        self._size = 0
+        self._capacity = capacity
+
+        self._config_ids = np.zeros(capacity, dtype=np.int64)
+        self._instances = np.full(capacity, -1, dtype=np.int32)
+        self._seeds = np.zeros(capacity, dtype=np.int64)
+        self._has_seed = np.zeros(capacity, dtype=bool)
+        self._budgets = np.full(capacity, np.nan, dtype=np.float64)
+        self._costs = np.full((capacity, 1), np.nan, dtype=np.float64)
+        # Zero means that the cost was given as a scalar, otherwise the length of the cost list
+        self._cost_widths = np.zeros(capacity, dtype=np.int16)
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._statuses = np.zeros(capacity, dtype=np.int8)
+        self._starttimes = np.zeros(capacity, dtype=np.float64)
+        self._endtimes = np.zeros(capacity, dtype=np.float64)
+        # Instance and seed packed into an integer, by which the trials of a configuration are looked up
+        self._key_codes = np.zeros(capacity, dtype=np.int64)
+
+        # Only non-empty additional infos are stored
+        self._additional_info: dict[int, Any] = {}
+
+        # Interned instances
+        self._instance_table: list[Any] = []
+        self._instance_ids: dict[Any, int] = {}
+
+        # Maps the config id to the (ascending) rows of its trials. The arrays grow geometrically, and only the
+        # first ``_n_config_rows[config_id]`` entries are valid.
+        self._config_rows: dict[int, np.ndarray] = {}
+        self._n_config_rows: dict[int, int] = {}
+
+    @staticmethod
+    def _get_key_code(instance_id: int, seed: int | None) -> int:
+        return pack_instance_seed(instance_id, seed)
+
+    @staticmethod
+    def _get_key_codes(instance_ids: np.ndarray, seeds: np.ndarray, has_seed: np.ndarray) -> np.ndarray:
+        return pack_instance_seeds(instance_ids, seeds, has_seed)
+
+    def _find(self, k: TrialKey) -> int:
+        """Returns the row of the trial or -1 if the trial is not stored."""
+        rows = self._config_rows.get(k.config_id)
+        if rows is None:
+            return -1
+
+        if k.instance is None:
+            instance_id = -1
+        else:
+            instance_id = self._instance_ids.get(k.instance, -2)
+            if instance_id == -2:
+                return -1
+
+        rows = rows[: self._n_config_rows[k.config_id]]
+        rows = rows[self._key_codes[rows] == self._get_key_code(instance_id, k.seed)].tolist()
+
+        # Rows of other budgets or of other trials with the same code are sorted out
+        for row in rows:
+            budget = self._budgets[row]
+            if (
+                self._instances[row] == instance_id
+                and self._has_seed[row] == (k.seed is not None)
+                and (k.seed is None or self._seeds[row] == k.seed)
+                and (budget != budget if k.budget is None else budget == k.budget)
+            ):
+                return row
+
+        return -1
+
+    def _add_config_row(self, config_id: int, row: int) -> None:
+        config_rows = self._config_rows.get(config_id)
+        n = self._n_config_rows.get(config_id, 0)
+        if config_rows is None or n == len(config_rows):
+            new_config_rows = np.zeros(max(8, 2 * n), dtype=np.int64)
+            if config_rows is not None:
+                new_config_rows[:n] = config_rows
+
+            config_rows = new_config_rows
+            self._config_rows[config_id] = config_rows
+
+        config_rows[n] = row
+        self._n_config_rows[config_id] = n + 1
+
+    def _build_index(self) -> None:
+        """Rebuilds the key codes and the rows per configuration from the columns."""
+        self._key_codes = np.zeros(self._capacity, dtype=np.int64)
+        self._key_codes[: self._size] = self._get_key_codes(self.instance_ids, self.seeds, self.has_seed)
+
+        config_ids = self.config_ids
+        order = np.argsort(config_ids, kind="stable")
+        unique_config_ids, starts, counts = np.unique(config_ids[order], return_index=True, return_counts=True)
+        self._config_rows = {
+            config_id: order[start : start + count].copy()
+            for config_id, start, count in zip(unique_config_ids.tolist(), starts.tolist(), counts.tolist())
+        }
+        self._n_config_rows = {config_id: len(rows) for config_id, rows in self._config_rows.items()}
+
+    def _intern(self, instance: Any) -> int:
+        if instance is None:
+            return -1
+
+        instance_id = self._instance_ids.get(instance)
+        if instance_id is None:
+            instance_id = len(self._instance_table)
+            self._instance_ids[instance] = instance_id
+            self._instance_table.append(instance)
+
+        return instance_id
+
+    def _set_value(self, row: int, v: TrialValue) -> None:
+        cost = v.cost
+        if isinstance(cost, (list, tuple, np.ndarray)):
+            width = len(cost)
+            if width > self._costs.shape[1]:
+                self._widen_costs(width)
+
+            self._costs[row, :] = np.nan
+            self._costs[row, :width] = cost
+            self._cost_widths[row] = width
+        else:
+            self._costs[row, :] = cost
+            self._cost_widths[row] = 0
+
+        self._times[row] = v.time
+        self._statuses[row] = v.status
+        self._starttimes[row] = v.starttime
+        self._endtimes[row] = v.endtime
+
+        # Empty dictionaries are the default and therefore not stored
+        if isinstance(v.additional_info, dict) and len(v.additional_info) == 0:
+            self._additional_info.pop(row, None)
+        else:
+            self._additional_info[row] = v.additional_info
+
+    def _get_value(self, row: int) -> TrialValue:
+        width = self._cost_widths[row]
+
+        cost: float | list[float]
+        if width == 0:
+            cost = float(self._costs[row, 0])
+        else:
+            cost = self._costs[row, :width].tolist()
+
+        return TrialValue(
+            cost=cost,
+            time=float(self._times[row]),
+            status=StatusType(int(self._statuses[row])),
+            starttime=float(self._starttimes[row]),
+            endtime=float(self._endtimes[row]),
+            additional_info=self._additional_info.get(row, {}),
+        )
+
+    def _columns(self) -> list[np.ndarray]:
+        return [
+            self._config_ids,
+            self._instances,
+            self._seeds,
+            self._has_seed,
+            self._budgets,
+            self._costs,
+            self._cost_widths,
+            self._times,
+            self._statuses,
+            self._starttimes,
+            self._endtimes,
+        ]
+
+    def _resize(self, capacity: int) -> None:
+        def grow(column: np.ndarray, fill: Any) -> np.ndarray:
+            new_column = np.full((capacity,) + column.shape[1:], fill, dtype=column.dtype)
+            new_column[: self._size] = column[: self._size]
+            return new_column
+
+        self._config_ids = grow(self._config_ids, 0)
+        self._instances = grow(self._instances, -1)
+        self._seeds = grow(self._seeds, 0)
+        self._has_seed = grow(self._has_seed, False)
+        self._budgets = grow(self._budgets, np.nan)
+        self._costs = grow(self._costs, np.nan)
+        self._cost_widths = grow(self._cost_widths, 0)
+        self._times = grow(self._times, 0.0)
+        self._statuses = grow(self._statuses, 0)
+        self._starttimes = grow(self._starttimes, 0.0)
+        self._endtimes = grow(self._endtimes, 0.0)
+        self._key_codes = grow(self._key_codes, 0)
+        self._capacity = capacity
+
+    def _widen_costs(self, width: int) -> None:
+        costs = np.full((self._capacity, width), np.nan, dtype=np.float64)
+        costs[:, : self._costs.shape[1]] = self._costs
+
+        # Scalar costs are broadcast to all objectives
+        scalar = self._cost_widths[: self._size] == 0
+        costs[: self._size][scalar] = self._costs[: self._size][scalar][:, :1]
+        self._costs = costs
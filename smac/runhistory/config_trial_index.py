@@ -0,0 +1,574 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from smac.runhistory.columnar_storage import pack_instance_seed, pack_instance_seeds
+from smac.runhistory.dataclasses import InstanceSeedBudgetKey, TrialKey
+from smac.runhistory.enumerations import StatusType
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+class ConfigTrialIndex:
+    """Index of all trials (including running ones) and of the costs of the finished trials, grouped by
+    configuration. The keys, statuses and costs are stored in contiguous arrays (one row per trial, in the order the
+    trials were added) so that aggregations and selections over arbitrary subsets of trials become NumPy operations.
+    Instances are interned, and the rows of a configuration are kept in an array as well, i.e., no Python object is
+    kept per trial. Trials are looked up among the rows of their configuration by their instance-seed pair, which is
+    packed into an integer.
+
+    For every configuration and instance-seed pair, the row of the highest observed budget is tracked. This
+    allows to aggregate the costs of all configurations at once (see ``aggregate``).
+
+    Every added or overwritten trial gets a new version. Consumers (e.g., the runhistory encoders) remember the
+    version they have read so that they only have to process the modified trials (see ``get_modified_rows``).
+
+    Parameters
+    ----------
+    capacity : int, defaults to 1024
+        Initial number of rows which are allocated. The buffers grow geometrically if more rows are needed.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._initial_capacity = max(1, int(capacity))
+        self.clear()
+
+    @property
+    def n_objectives(self) -> int:
+        """Number of objectives of the stored costs. Zero if no trial was added yet."""
+        return self._costs.shape[1]
+
+    @property
+    def version(self) -> int:
+        """Version of the last added or overwritten trial. Zero if no trial was added yet."""
+        return self._version
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        """Removes all trials."""
+        capacity = self._initial_capacity
+
+        self._size = 0
+        self._capacity = capacity
+        self._version = 0
+        self._config_ids = np.zeros(capacity, dtype=np.int64)
+        # Instance-seed pairs packed into an integer, by which the trials of a pair are looked up
+        self._pair_codes = np.zeros(capacity, dtype=np.int64)
+        # Indices of the interned instances, -1 is used if no instance was given
+        self._instances = np.full(capacity, -1, dtype=np.int32)
+        self._seeds = np.zeros(capacity, dtype=np.int64)
+        self._has_seed = np.zeros(capacity, dtype=bool)
+        self._budgets = np.full(capacity, np.nan, dtype=np.float64)
+        self._statuses = np.zeros(capacity, dtype=np.int8)
+        # Whether the cost of the trial was registered, i.e., whether the trial has finished at least once
+        self._has_cost = np.zeros(capacity, dtype=bool)
+        # Version of the last modification of the trial
+        self._versions = np.zeros(capacity, dtype=np.int64)
+        # Whether the row holds the highest observed budget of its config-instance-seed combination
+        self._highest = np.zeros(capacity, dtype=bool)
+        # Row of the first trial of the config-instance-seed combination, which determines the order of the
+        # instance-seed pairs of a configuration
+        self._first_rows = np.zeros(capacity, dtype=np.int64)
+        self._costs = np.zeros((capacity, 0), dtype=np.float64)
+
+        self._instance_ids: dict[Any, int] = {}
+        self._instance_table: list[Any] = []
+
+        # Maps the config id to the (ascending) rows of its trials. The arrays grow geometrically, and only the
+        # first ``_n_config_rows[config_id]`` entries are valid.
+        self._config_rows: dict[int, np.ndarray] = {}
+        self._n_config_rows: dict[int, int] = {}
+
+    @classmethod
+    def from_columns(
+        cls,
+        config_ids: np.ndarray,
+        instance_ids: np.ndarray,
+        instance_table: list[Any],
+        seeds: np.ndarray,
+        has_seed: np.ndarray,
+        budgets: np.ndarray,
+        costs: np.ndarray,
+        statuses: np.ndarray,
+    ) -> ConfigTrialIndex:
+        """Creates an index from the columns of stored trials (e.g., of a ``ColumnarStorage``) at once instead of
+        adding the trials one by one. The costs of running trials are not registered. Since the order in which the
+        trials have finished is not stored, the instance-seed pairs of a configuration are ordered by the row of
+        their first finished trial.
+
+        Parameters
+        ----------
+        config_ids : np.ndarray [n_trials]
+        instance_ids : np.ndarray [n_trials]
+            Indices of the instances in ``instance_table``. -1 is used if no instance was given.
+        instance_table : list[Any]
+        seeds : np.ndarray [n_trials]
+            Seeds of the trials. Only used where ``has_seed`` is true.
+        has_seed : np.ndarray [n_trials]
+        budgets : np.ndarray [n_trials]
+            Budgets of the trials. NaN is used if no budget was given.
+        costs : np.ndarray [n_trials, n_objectives]
+        statuses : np.ndarray [n_trials]
+
+        Returns
+        -------
+        index : ConfigTrialIndex
+        """
+        size = len(config_ids)
+        index = cls(capacity=size)
+        has_cost = statuses != StatusType.RUNNING
+
+        index._size = size
+        index._version = size
+        index._config_ids[:size] = config_ids
+        index._instances[:size] = instance_ids
+        index._has_seed[:size] = has_seed
+        index._seeds[:size] = np.where(has_seed, seeds, 0)
+        index._budgets[:size] = budgets
+        index._pair_codes[:size] = pack_instance_seeds(index._instances[:size], index._seeds[:size], has_seed)
+        index._statuses[:size] = statuses
+        index._has_cost[:size] = has_cost
+        index._versions[:size] = np.arange(1, size + 1)
+        if np.any(has_cost):
+            index._costs = np.zeros((index._capacity, costs.shape[1]), dtype=np.float64)
+            index._costs[:size][has_cost] = costs[has_cost]
+
+        index._instance_table = list(instance_table)
+        index._instance_ids = {instance: instance_id for instance_id, instance in enumerate(instance_table)}
+
+        # The rows of a configuration are ascending
+        order = np.argsort(config_ids, kind="stable")
+        unique_config_ids, starts, counts = np.unique(config_ids[order], return_index=True, return_counts=True)
+        index._config_rows = {
+            config_id: order[start : start + count].copy()
+            for config_id, start, count in zip(unique_config_ids.tolist(), starts.tolist(), counts.tolist())
+        }
+        index._n_config_rows = {config_id: len(rows) for config_id, rows in index._config_rows.items()}
+
+        # The finished rows are grouped by configuration and instance-seed pair (ascending within a group)
+        rows = np.flatnonzero(has_cost)
+        if len(rows) == 0:
+            return index
+
+        groups = np.stack([config_ids, index._instances[:size], has_seed, index._seeds[:size]], axis=1)[rows]
+        order = np.lexsort((rows,) + tuple(groups[:, ::-1].T))
+        rows, groups = rows[order], groups[order]
+        new_group = np.ones(len(rows), dtype=bool)
+        new_group[1:] = np.any(groups[1:] != groups[:-1], axis=1)
+        starts = np.flatnonzero(new_group)
+        counts = np.diff(np.append(starts, len(rows)))
+        index._first_rows[rows] = np.repeat(rows[starts], counts)
+
+        # A budget of None is treated as the highest budget (budgets of an instance-seed pair are either all None
+        # or all floats, and they are distinct otherwise)
+        group_budgets = np.nan_to_num(budgets[rows], nan=np.inf)
+        highest_budgets = np.maximum.reduceat(group_budgets, starts)
+        index._highest[rows[group_budgets == np.repeat(highest_budgets, counts)]] = True
+
+        return index
+
+    def add(
+        self,
+        config_id: int,
+        instance: Any,
+        seed: int | None,
+        budget: float | None,
+        cost: float | list[float],
+        status: StatusType = StatusType.SUCCESS,
+    ) -> None:
+        """Adds a trial or overwrites the status and cost of an existing one. The cost of a running trial is not
+        registered, i.e., a trial is considered by the cost queries once it has finished.
+
+        Parameters
+        ----------
+        config_id : int
+        instance : Any
+        seed : int | None
+        budget : float | None
+        cost : float | list[float]
+            Cost of the trial. Might be a list in case of multi-objective.
+        status : StatusType, defaults to StatusType.SUCCESS
+
+        Raises
+        ------
+        ValueError
+            If the number of objectives changes, or if budgets of None and float budgets are mixed for the same
+            instance-seed pair of a configuration.
+        """
+        finished = status != StatusType.RUNNING
+        if finished:
+            costs = np.atleast_1d(np.asarray(cost, dtype=np.float64))
+            if len(costs) != self._costs.shape[1]:
+                if self._costs.shape[1] > 0:
+                    raise ValueError(
+                        f"Cost is not of the same length ({len(costs)}) as the number of objectives "
+                        f"({self._costs.shape[1]})."
+                    )
+
+                self._costs = np.zeros((self._capacity, len(costs)), dtype=np.float64)
+
+        if instance is None:
+            instance_id = -1
+        else:
+            instance_id = self._instance_ids.get(instance, -1)
+            if instance_id == -1:
+                instance_id = len(self._instance_table)
+                self._instance_ids[instance] = instance_id
+                self._instance_table.append(instance)
+
+        # The trials of the same instance-seed pair in the order they were added
+        pair_code = self._get_pair_code(instance_id, seed)
+        pair_rows = self._get_pair_rows(config_id, pair_code, instance_id, seed)
+
+        budgets = [self._get_budget(pair_row) for pair_row in pair_rows]
+        row = pair_rows[budgets.index(budget)] if budget in budgets else -1
+
+        # Only the finished trials of the pair are considered by the cost queries
+        finished_rows = [pair_row for pair_row in pair_rows if self._has_cost[pair_row] and pair_row != row]
+        if finished and len(finished_rows) > 0:
+            finished_budget = self._get_budget(finished_rows[0])
+            if (finished_budget is None) != (budget is None):
+                raise ValueError(
+                    "Can not mix budgets of different types for the same instance-seed pair. "
+                    f"Wants to add {budget} but found already {finished_budget}."
+                )
+
+        if row == -1:
+            row = self._append(config_id, pair_code, instance_id, seed, budget)
+
+        self._statuses[row] = status
+        self._version += 1
+        self._versions[row] = self._version
+        if not finished:
+            return
+
+        if not self._has_cost[row]:
+            self._has_cost[row] = True
+
+            # A budget of None is treated as the highest budget (budgets of an instance-seed pair are either all
+            # None or all floats)
+            if len(finished_rows) == 0:
+                self._first_rows[row] = row
+                self._highest[row] = True
+            else:
+                self._first_rows[row] = self._first_rows[finished_rows[0]]
+                highest_row = next(pair_row for pair_row in finished_rows if self._highest[pair_row])
+                if budget is not None and budget > self._budgets[highest_row]:
+                    self._highest[highest_row] = False
+                    self._highest[row] = True
+
+        self._costs[row] = costs
+
+    def get_rows(
+        self,
+        config_id: int,
+        instance_seed_budget_keys: list[InstanceSeedBudgetKey] | None = None,
+        highest_observed_budget_only: bool = True,
+    ) -> np.ndarray | None:
+        """Returns the rows of the trials of a configuration.
+
+        Parameters
+        ----------
+        config_id : int
+        instance_seed_budget_keys : list[InstanceSeedBudgetKey] | None, defaults to None
+            The trials to select. If None, all trials of the configuration are selected.
+        highest_observed_budget_only : bool, defaults to True
+            Select only the highest observed budget of each instance-seed pair. Only used if no keys are passed.
+
+        Returns
+        -------
+        rows : np.ndarray | None
+            The rows in the order of the passed keys or None if any of the keys is not indexed (or has not finished
+            yet). Without keys, the rows are ordered by the instance-seed pairs in the order they were added first.
+        """
+        rows = self._get_finished_config_rows(config_id)
+        if instance_seed_budget_keys is None:
+            if highest_observed_budget_only:
+                rows = rows[self._highest[rows]]
+                return rows[np.argsort(self._first_rows[rows], kind="stable")]
+
+            return rows.copy()
+
+        # The rows of the configuration are looked up by their keys (instead of comparing the columns per key)
+        rows_per_key = {
+            (instance_id, seed if seed_given else None, budget if budget == budget else None): row
+            for instance_id, seed, seed_given, budget, row in zip(
+                self._instances[rows].tolist(),
+                self._seeds[rows].tolist(),
+                self._has_seed[rows].tolist(),
+                self._budgets[rows].tolist(),
+                rows.tolist(),
+            )
+        }
+
+        selected = []
+        for key in instance_seed_budget_keys:
+            instance_id = -1 if key.instance is None else self._instance_ids.get(key.instance, -2)
+            row = rows_per_key.get((instance_id, key.seed, key.budget))
+            if row is None:
+                return None
+
+            selected.append(row)
+
+        return np.array(selected, dtype=np.int64)
+
+    def get_instance_seed_budget_keys(
+        self,
+        config_id: int,
+        highest_observed_budget_only: bool = True,
+    ) -> list[InstanceSeedBudgetKey]:
+        """Returns the instance-seed-budget keys of the trials of a configuration. The keys are grouped by their
+        instance-seed pairs in the order the pairs were added first, and the budgets of a pair are in the order they
+        were added.
+
+        Parameters
+        ----------
+        config_id : int
+        highest_observed_budget_only : bool, defaults to True
+            Select only the highest observed budget of each instance-seed pair.
+
+        Returns
+        -------
+        list[InstanceSeedBudgetKey]
+        """
+        if highest_observed_budget_only:
+            rows = self.get_rows(config_id)
+            assert rows is not None
+        else:
+            rows = self._get_finished_config_rows(config_id)
+            rows = rows[np.argsort(self._first_rows[rows], kind="stable")]
+
+        return [
+            InstanceSeedBudgetKey(
+                self._instance_table[instance_id] if instance_id >= 0 else None,
+                seed if seed_given else None,
+                budget if budget == budget else None,
+            )
+            for instance_id, seed, seed_given, budget in zip(
+                self._instances[rows].tolist(),
+                self._seeds[rows].tolist(),
+                self._has_seed[rows].tolist(),
+                self._budgets[rows].tolist(),
+            )
+        ]
+
+    def get_trial_rows(
+        self,
+        budgets: list[float | None] | None = None,
+        statuses: list[StatusType] | None = None,
+    ) -> np.ndarray:
+        """Returns the rows of all trials on the passed budgets with the passed statuses.
+
+        Parameters
+        ----------
+        budgets : list[float | None] | None, defaults to None
+            Budgets to consider. If None, all budgets are considered.
+        statuses : list[StatusType] | None, defaults to None
+            Statuses to consider. If None, all statuses are considered.
+
+        Returns
+        -------
+        rows : np.ndarray
+            The rows grouped by budget (or status if all budgets are considered) in the order the trials were
+            added.
+        """
+        if budgets is None and statuses is None:
+            return np.arange(self._size)
+
+        trial_statuses = self._statuses[: self._size]
+        if budgets is None:
+            assert statuses is not None
+            return np.concatenate(
+                [np.zeros(0, dtype=np.int64)] + [np.flatnonzero(trial_statuses == status) for status in statuses]
+            )
+
+        status_mask = None
+        if statuses is not None:
+            status_mask = np.isin(trial_statuses, [int(status) for status in statuses])
+
+        trial_budgets = self._budgets[: self._size]
+        rows = [np.zeros(0, dtype=np.int64)]
+        for budget in budgets:
+            mask = np.isnan(trial_budgets) if budget is None else trial_budgets == budget
+            if status_mask is not None:
+                mask &= status_mask
+
+            rows.append(np.flatnonzero(mask))
+
+        return np.concatenate(rows)
+
+    def get_modified_rows(self, version: int) -> np.ndarray:
+        """Returns the (ascending) rows of the trials which were added or overwritten after the passed version."""
+        return np.flatnonzero(self._versions[: self._size] > version)
+
+    def get_config_ids(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the config ids of the rows."""
+        return self._config_ids[rows]
+
+    def get_budgets(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the budgets of the rows, where NaN is used if no budget was given."""
+        return self._budgets[rows]
+
+    def get_statuses(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the statuses of the rows."""
+        return self._statuses[rows]
+
+    def get_trial_keys(self, rows: np.ndarray) -> list[TrialKey]:
+        """Returns the keys of the trials of the rows."""
+        return [
+            TrialKey(
+                config_id,
+                self._instance_table[instance_id] if instance_id >= 0 else None,
+                seed if seed_given else None,
+                budget if budget == budget else None,
+            )
+            for config_id, instance_id, seed, seed_given, budget in zip(
+                self._config_ids[rows].tolist(),
+                self._instances[rows].tolist(),
+                self._seeds[rows].tolist(),
+                self._has_seed[rows].tolist(),
+                self._budgets[rows].tolist(),
+            )
+        ]
+
+    def get_costs(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the costs of the rows with shape [len(rows), n_objectives]."""
+        return self._costs[rows]
+
+    def aggregate(
+        self,
+        instances: list[Any] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Aggregates the costs on the highest observed budgets of all configurations at once.
+
+        Parameters
+        ----------
+        instances : list[Any] | None, defaults to None
+            If given, only trials on these instances are considered.
+
+        Returns
+        -------
+        config_ids : np.ndarray [#configs]
+            The (sorted) ids of the configurations which have at least one considered trial.
+        mean_costs : np.ndarray [#configs, n_objectives]
+        min_costs : np.ndarray [#configs, n_objectives]
+        n_trials : np.ndarray [#configs]
+        """
+        mask = self._highest[: self._size].copy()
+        if instances is not None:
+            instance_ids = [self._instance_ids[instance] for instance in instances if instance in self._instance_ids]
+            mask &= np.isin(self._instances[: self._size], instance_ids)
+
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(self._config_ids[rows], kind="stable")]
+        if len(rows) == 0:
+            empty = np.zeros((0, self._costs.shape[1]))
+            return np.zeros(0, dtype=np.int64), empty, empty.copy(), np.zeros(0, dtype=np.int64)
+
+        config_ids, starts, n_trials = np.unique(self._config_ids[rows], return_index=True, return_counts=True)
+        costs = self._costs[rows]
+
+        mean_costs = np.add.reduceat(costs, starts, axis=0) / n_trials[:, np.newaxis]
+        min_costs = np.minimum.reduceat(costs, starts, axis=0)
+
+        return config_ids, mean_costs, min_costs, n_trials
+
+    def _get_config_rows(self, config_id: int) -> np.ndarray:
+        """Returns the rows of the trials of a configuration (a view on the internal buffer)."""
+        rows = self._config_rows.get(config_id)
+        if rows is None:
+            return np.zeros(0, dtype=np.int64)
+
+        return rows[: self._n_config_rows[config_id]]
+
+    def _get_finished_config_rows(self, config_id: int) -> np.ndarray:
+        """Returns the rows of the trials of a configuration whose costs were registered."""
+        rows = self._get_config_rows(config_id)
+        return rows[self._has_cost[rows]]
+
+    def _get_budget(self, row: int) -> float | None:
+        """Returns the budget of the row, which is None if no budget was given."""
+        budget = float(self._budgets[row])
+        return None if np.isnan(budget) else budget
+
+    @staticmethod
+    def _get_pair_code(instance_id: int, seed: int | None) -> int:
+        return pack_instance_seed(instance_id, seed)
+
+    def _get_pair_rows(self, config_id: int, pair_code: int, instance_id: int, seed: int | None) -> list[int]:
+        """Returns the rows of the trials of the configuration on the instance-seed pair in the order they were
+        added.
+        """
+        rows = self._get_config_rows(config_id)
+        rows = rows[self._pair_codes[rows] == pair_code].tolist()
+
+        # Rows of other pairs with the same code are sorted out
+        return [
+            row
+            for row in rows
+            if self._instances[row] == instance_id
+            and self._has_seed[row] == (seed is not None)
+            and (seed is None or self._seeds[row] == seed)
+        ]
+
+    def _append(
+        self,
+        config_id: int,
+        pair_code: int,
+        instance_id: int,
+        seed: int | None,
+        budget: float | None,
+    ) -> int:
+        """Appends a row for a new trial and returns it."""
+        if self._size == self._capacity:
+            self._resize(2 * self._capacity)
+
+        row = self._size
+        self._size += 1
+
+        self._config_ids[row] = config_id
+        self._pair_codes[row] = pair_code
+        self._instances[row] = instance_id
+        self._has_seed[row] = seed is not None
+        self._seeds[row] = seed if seed is not None else 0
+        self._budgets[row] = budget if budget is not None else np.nan
+
+        config_rows = self._config_rows.get(config_id)
+        n = self._n_config_rows.get(config_id, 0)
+        if config_rows is None or n == len(config_rows):
+            new_config_rows = np.zeros(max(8, 2 * n), dtype=np.int64)
+            if config_rows is not None:
+                new_config_rows[:n] = config_rows
+
+            config_rows = new_config_rows
+            self._config_rows[config_id] = config_rows
+
+        config_rows[n] = row
+        self._n_config_rows[config_id] = n + 1
+
+        return row
+
+    def _resize(self, capacity: int) -> None:
+        def grow(column: np.ndarray, fill: Any) -> np.ndarray:
+            new_column = np.full((capacity,) + column.shape[1:], fill, dtype=column.dtype)
+            new_column[: self._size] = column[: self._size]
+            return new_column
+
+        self._config_ids = grow(self._config_ids, 0)
+        self._pair_codes = grow(self._pair_codes, 0)
+        self._instances = grow(self._instances, -1)
+        self._seeds = grow(self._seeds, 0)
+        self._has_seed = grow(self._has_seed, False)
+        self._budgets = grow(self._budgets, np.nan)
+        self._statuses = grow(self._statuses, 0)
+        self._has_cost = grow(self._has_cost, False)
+        self._versions = grow(self._versions, 0)
+        self._highest = grow(self._highest, False)
+        self._first_rows = grow(self._first_rows, 0)
+        self._costs = grow(self._costs, 0.0)
+        self._capacity = capacity
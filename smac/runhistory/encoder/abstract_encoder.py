@@ -6,11 +6,12 @@ from typing import Any, Mapping
 import numpy as np
 
 from smac.multi_objective import AbstractMultiObjectiveAlgorithm
+from smac.runhistory.config_trial_index import ConfigTrialIndex
 from smac.runhistory.runhistory import RunHistory, TrialKey, TrialValue
 from smac.runner.abstract_runner import StatusType
 from smac.scenario import Scenario
-from smac.utils.configspace import convert_configurations_to_array
 from smac.utils.logging import get_logger
+from smac.utils.multi_objective import normalize_costs
 
 __copyright__ = "Copyright 2022, automl.org"
 __license__ = "3-clause BSD"
@@ -86,6 +87,8 @@ class AbstractRunHistoryEncoder:
         self._multi_objective_algorithm: AbstractMultiObjectiveAlgorithm | None = None
         self._runhistory: RunHistory | None = None
 
+        self._reset_cache()
+
     @property
     def meta(self) -> dict[str, Any]:
         """
@@ -114,6 +117,7 @@ class AbstractRunHistoryEncoder:
     def runhistory(self, runhistory: RunHistory) -> None:
         """Sets the multi objective algorithm."""
         self._runhistory = runhistory
+        self._reset_cache()
 
     @property
     def multi_objective_algorithm(self) -> AbstractMultiObjectiveAlgorithm | None:
@@ -147,6 +151,185 @@ class AbstractRunHistoryEncoder:
         """
         raise NotImplementedError()
 
+    def _build_matrix_from_rows(
+        self,
+        rows: np.ndarray,
+        store_statistics: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Builds x and y matrices from rows of the cache (see ``_update_cache``). Encoders should override this
+        method to build the matrices from the cached arrays directly. By default, the trials of the rows are
+        passed to ``_build_matrix``.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Rows of the cache in the order of the runhistory.
+        store_statistics: bool, defaults to false
+            Whether to store statistics about the data (to be used at subsequent calls).
+
+        Returns
+        -------
+        X : np.ndarray
+        Y : np.ndarray
+        """
+        keys = self.runhistory._trial_index.get_trial_keys(rows)
+        trials = {key: self.runhistory[key] for key in keys}
+        return self._build_matrix(trials=trials, store_statistics=store_statistics)
+
+    def _reset_cache(self) -> None:
+        """Drops all cached rows."""
+        n_cols = self._n_params + self._n_features
+        capacity = 1024
+
+        # The trial index of the runhistory and the version which has been read
+        self._cache_index: ConfigTrialIndex | None = None
+        self._cache_version = 0
+
+        # One row per trial, which is the row of the trial in the trial index of the runhistory
+        self._cache_size = 0
+        self._cache_X = np.full((capacity, n_cols), np.nan)
+        self._cache_costs = np.full((capacity, self._n_objectives), np.nan)
+        self._cache_times = np.zeros(capacity)
+        self._cache_statuses = np.zeros(capacity, dtype=np.int8)
+        self._cache_config_ids = np.zeros(capacity, dtype=np.int64)
+        self._cache_budgets = np.full(capacity, np.nan)
+
+    def _update_cache(self) -> None:
+        """Brings the cache up to date with the runhistory. Only the trials which were added or overwritten since
+        the last update are processed: Rows are appended for new trials, and the costs, times and statuses of
+        overwritten trials are updated in place. The configuration vectors and instance features of a trial never
+        change and are computed only once.
+        """
+        runhistory = self.runhistory
+        index = runhistory._trial_index
+        if self._cache_index is not index:
+            # The runhistory was reset (e.g., loaded) or replaced
+            self._reset_cache()
+            self._cache_index = index
+
+        if index.version == self._cache_version:
+            return
+
+        rows = index.get_modified_rows(self._cache_version)
+        keys = index.get_trial_keys(rows)
+        self._cache_version = index.version
+
+        # Trials are appended to the trial index, i.e., the new trials are the last (and contiguous) modified rows
+        new_rows = rows[rows >= self._cache_size]
+        if len(new_rows) > 0:
+            start = self._cache_size
+            end = start + len(new_rows)
+            if end > len(self._cache_times):
+                self._resize_cache(max(end, 2 * len(self._cache_times)))
+
+            self._cache_size = end
+
+            # Scaling is automatically done in configSpace, the vectors are taken from the cache of the runhistory
+            config_ids = index.get_config_ids(new_rows)
+            X = runhistory.get_config_vectors(config_ids)
+            if self._n_features > 0 and self._instance_features is not None:
+                features = []
+                for key in keys[len(keys) - len(new_rows) :]:
+                    assert isinstance(key.instance, str)
+                    features.append(self._instance_features[key.instance])
+
+                X = np.hstack((X, np.array(features, dtype=np.float64)))
+
+            self._cache_X[start:end] = X
+            self._cache_config_ids[start:end] = config_ids
+            self._cache_budgets[start:end] = index.get_budgets(new_rows)
+
+        for row, key in zip(rows.tolist(), keys):
+            value = runhistory[key]
+
+            # Running trials have a scalar cost also in the multi-objective setting
+            self._cache_costs[row] = value.cost
+            self._cache_times[row] = value.time
+            self._cache_statuses[row] = value.status
+
+    def _resize_cache(self, capacity: int) -> None:
+        def grow(column: np.ndarray, fill: Any) -> np.ndarray:
+            new_column = np.full((capacity,) + column.shape[1:], fill, dtype=column.dtype)
+            new_column[: self._cache_size] = column[: self._cache_size]
+            return new_column
+
+        self._cache_X = grow(self._cache_X, np.nan)
+        self._cache_costs = grow(self._cache_costs, np.nan)
+        self._cache_times = grow(self._cache_times, 0.0)
+        self._cache_statuses = grow(self._cache_statuses, 0)
+        self._cache_config_ids = grow(self._cache_config_ids, 0)
+        self._cache_budgets = grow(self._cache_budgets, np.nan)
+
+    def _get_budget_rows(self, budgets: list) -> np.ndarray:
+        """Returns the (sorted) rows of the cache which were evaluated on one of the budgets."""
+        cache_budgets = self._cache_budgets[: self._cache_size]
+        mask = np.zeros(self._cache_size, dtype=bool)
+        for budget in budgets:
+            mask |= np.isnan(cache_budgets) if budget is None else cache_budgets == budget
+
+        return np.flatnonzero(mask)
+
+    def _get_considered_rows(self, budget_subset: list | None = None) -> np.ndarray:
+        """Returns the rows of the cache which are considered for the model (see ``_get_considered_trials``).
+        Only the rows of the relevant budgets are visited. The cache has to be up to date.
+        """
+        if budget_subset is None:
+            rows = np.arange(self._cache_size)
+            return rows[np.isin(self._cache_statuses[rows], [int(status) for status in self._considered_states])]
+
+        if len(budget_subset) != 1:
+            raise ValueError("Can not yet handle getting runs from multiple budgets.")
+
+        budget = budget_subset[0]
+        cache_budgets = self._cache_budgets[: self._cache_size]
+        if budget is None:
+            mask = np.isnan(cache_budgets)
+        elif len(self._lower_budget_states) > 0:
+            mask = cache_budgets <= budget
+        else:
+            mask = cache_budgets == budget
+
+        rows = np.flatnonzero(mask)
+        statuses = self._cache_statuses[rows]
+        mask = np.isin(statuses, [int(status) for status in self._considered_states])
+
+        if budget is not None:
+            # Trials on lower budgets are considered if they have one of the lower budget states
+            lower_budget = self._cache_budgets[rows] < budget
+            lower_budget_mask = np.isin(statuses, [int(status) for status in self._lower_budget_states])
+            mask = np.where(lower_budget, lower_budget_mask, mask)
+
+        return rows[mask]
+
+    def _get_timeout_rows(self, budget_subset: list | None = None) -> np.ndarray:
+        """Returns the rows of the cache which did have a timeout. The cache has to be up to date."""
+        if budget_subset is None:
+            rows = np.arange(self._cache_size)
+        else:
+            rows = self._get_budget_rows(budget_subset)
+
+        # and runhistory.data[run].time >= self._algorithm_walltime_limit  # type: ignore
+        return rows[self._cache_statuses[rows] == StatusType.TIMEOUT]
+
+    def _get_aggregated_costs(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the cached costs of the rows with shape [len(rows), 1]. In the multi-objective setting, the
+        costs are normalized with the current objective bounds of the runhistory and aggregated.
+        """
+        if self._n_objectives > 1:
+            assert self._multi_objective_algorithm is not None
+
+            # Let's normalize y here
+            # We use the objective_bounds calculated by the runhistory
+            bounds = self.runhistory.objective_bounds
+            y = [
+                self._multi_objective_algorithm(normalize_costs(costs, bounds))
+                for costs in self._cache_costs[rows].tolist()
+            ]
+
+            return np.array(y, dtype=np.float64).reshape(-1, 1)
+
+        return self._cache_costs[rows, :1].copy()
+
     def _get_considered_trials(
         self,
         budget_subset: list | None = None,
@@ -159,57 +342,46 @@ class AbstractRunHistoryEncoder:
         ----------
         budget_subset : list[int|float] | None, defaults to None.
         """
-        trials: dict[TrialKey, TrialValue] = {}
+        self._update_cache()
+        keys = self.runhistory._trial_index.get_trial_keys(self._get_considered_rows(budget_subset))
 
-        if budget_subset is not None:
-            if len(budget_subset) != 1:
-                raise ValueError("Can not yet handle getting runs from multiple budgets.")
-
-        for trial_key, trial_value in self.runhistory.items():
-            add = False
-            if budget_subset is not None:
-                if trial_key.budget in budget_subset and trial_value.status in self._considered_states:
-                    add = True
-
-                if (
-                    trial_key.budget is not None
-                    and budget_subset[0] is not None
-                    and trial_key.budget < budget_subset[0]
-                    and trial_value.status in self._lower_budget_states
-                ):
-                    add = True
-            else:
-                # Get only successfully finished runs
-                if trial_value.status in self._considered_states:
-                    add = True
-
-            if add:
-                trials[trial_key] = trial_value
-
-        return trials
+        return {key: self.runhistory[key] for key in keys}
 
     def _get_timeout_trials(
         self,
         budget_subset: list | None = None,
     ) -> dict[TrialKey, TrialValue]:
         """Returns all trials that did have a timeout."""
+        self._update_cache()
+        keys = self.runhistory._trial_index.get_trial_keys(self._get_timeout_rows(budget_subset))
+
+        return {key: self.runhistory[key] for key in keys}
+
+    def get_n_trials(self, budget_subset: list | None = None) -> int:
+        """Returns the number of data points ``transform`` would return for the budget subset. The number is
+        derived from the trial counts of the runhistory, i.e., without visiting any trial.
+
+        Parameters
+        ----------
+        budget_subset : list[int|float] | None, defaults to none
+            List of budgets to consider.
+
+        Returns
+        -------
+        n_trials : int
+        """
+        runhistory = self.runhistory
+        n_considered = runhistory.count_trials(budget_subset, self._considered_states)
+
         if budget_subset is not None:
-            trials = {
-                trial: self.runhistory[trial]
-                for trial in self.runhistory
-                if self.runhistory[trial].status == StatusType.TIMEOUT
-                # and runhistory.data[run].time >= self._algorithm_walltime_limit  # type: ignore
-                and trial.budget in budget_subset
-            }
-        else:
-            trials = {
-                trial: self.runhistory[trial]
-                for trial in self.runhistory
-                if self.runhistory[trial].status == StatusType.TIMEOUT
-                # and runhistory.data[run].time >= self._algorithm_walltime_limit  # type: ignore
-            }
+            if len(budget_subset) != 1:
+                raise ValueError("Can not yet handle getting runs from multiple budgets.")
+
+            if budget_subset[0] is not None and len(self._lower_budget_states) > 0:
+                lower_budgets = [budget for budget in runhistory.get_budgets() if budget < budget_subset[0]]
+                n_considered += runhistory.count_trials(lower_budgets, self._lower_budget_states)
 
-        return trials
+        return n_considered + runhistory.count_trials(budget_subset, [StatusType.TIMEOUT])
 
     def get_configurations(
         self,
@@ -231,13 +403,11 @@ class AbstractRunHistoryEncoder:
         -------
         configs_array : np.ndarray
         """
-        s_trials = self._get_considered_trials(budget_subset)
-        s_config_ids = set(s_trial.config_id for s_trial in s_trials)
-        t_trials = self._get_timeout_trials(budget_subset)
-        t_config_ids = set(t_trial.config_id for t_trial in t_trials)
+        self._update_cache()
+        s_config_ids = set(self._cache_config_ids[self._get_considered_rows(budget_subset)].tolist())
+        t_config_ids = set(self._cache_config_ids[self._get_timeout_rows(budget_subset)].tolist())
         config_ids = s_config_ids | t_config_ids
-        configurations = [self.runhistory._ids_config[config_id] for config_id in config_ids]
-        configs_array = convert_configurations_to_array(configurations)
+        configs_array = self.runhistory.get_config_vectors(list(config_ids))
 
         return configs_array
 
@@ -261,18 +431,21 @@ class AbstractRunHistoryEncoder:
         """
         logger.debug("Transforming RunHistory into X, y format...")
 
-        considered_trials = self._get_considered_trials(budget_subset)
-        X, Y = self._build_matrix(trials=considered_trials, store_statistics=True)
+        # Only the trials which were modified since the last call are encoded
+        self._update_cache()
+
+        considered_rows = self._get_considered_rows(budget_subset)
+        X, Y = self._build_matrix_from_rows(considered_rows, store_statistics=True)
 
         # Get real TIMEOUT runs
-        timeout_trials = self._get_timeout_trials(budget_subset)
+        timeout_rows = self._get_timeout_rows(budget_subset)
 
         # Use penalization (e.g. PAR10) for EPM training
         store_statistics = True if np.any(np.isnan(self._min_y)) else False
-        tX, tY = self._build_matrix(trials=timeout_trials, store_statistics=store_statistics)
+        tX, tY = self._build_matrix_from_rows(timeout_rows, store_statistics=store_statistics)
 
         # If we don't have successful runs, we have to return all timeout runs
-        if not considered_trials:
+        if len(considered_rows) == 0:
             return tX, tY
 
         # If we do not impute, we also return TIMEOUT data
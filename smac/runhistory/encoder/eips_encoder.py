@@ -6,7 +6,6 @@ import numpy as np
 
 from smac.runhistory.encoder import AbstractRunHistoryEncoder
 from smac.runhistory.runhistory import TrialKey, TrialValue
-from smac.utils.configspace import convert_configurations_to_array
 from smac.utils.logging import get_logger
 from smac.utils.multi_objective import normalize_costs
 
@@ -38,8 +37,7 @@ class RunHistoryEIPSEncoder(AbstractRunHistoryEncoder):
         # Then populate matrix
         for row, (key, run) in enumerate(trials.items()):
             # Scaling is automatically done in configSpace
-            conf = self.runhistory.ids_config[key.config_id]
-            conf_vector = convert_configurations_to_array([conf])[0]
+            conf_vector = self.runhistory.get_config_vectors([key.config_id])[0]
             if self._n_features > 0 and self._instance_features is not None:
                 assert isinstance(key.instance, str)
                 feats = self._instance_features[key.instance]
@@ -65,6 +63,18 @@ class RunHistoryEIPSEncoder(AbstractRunHistoryEncoder):
 
         return X, y_transformed
 
+    def _build_matrix_from_rows(
+        self,
+        rows: np.ndarray,
+        store_statistics: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # The configuration vectors and instance features are taken from the cache
+        X = self._cache_X[rows]
+        y = np.hstack((self._get_aggregated_costs(rows), self._cache_times[rows].reshape(-1, 1)))
+        y_transformed = self.transform_response_values(values=y)
+
+        return X, y_transformed
+
     def transform_response_values(self, values: np.ndarray) -> np.ndarray:
         """Transform function response values. Transform the runtimes by a log transformation
         log(1. + runtime).
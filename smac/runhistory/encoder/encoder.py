@@ -6,7 +6,6 @@ import numpy as np
 
 from smac.runhistory.encoder import AbstractRunHistoryEncoder
 from smac.runhistory.runhistory import TrialKey, TrialValue
-from smac.utils.configspace import convert_configurations_to_array
 from smac.utils.logging import get_logger
 from smac.utils.multi_objective import normalize_costs
 
@@ -35,8 +34,7 @@ class RunHistoryEncoder(AbstractRunHistoryEncoder):
         # Then populate matrix
         for row, (key, run) in enumerate(trials.items()):
             # Scaling is automatically done in configSpace
-            conf = self.runhistory._ids_config[key.config_id]
-            conf_vector = convert_configurations_to_array([conf])[0]
+            conf_vector = self.runhistory.get_config_vectors([key.config_id])[0]
 
             if self._n_features > 0 and self._instance_features is not None:
                 assert isinstance(key.instance, str)
@@ -66,6 +64,27 @@ class RunHistoryEncoder(AbstractRunHistoryEncoder):
         y = self.transform_response_values(values=y)
         return X, y
 
+    def _build_matrix_from_rows(
+        self,
+        rows: np.ndarray,
+        store_statistics: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # The configuration vectors and instance features are taken from the cache
+        X = self._cache_X[rows]
+
+        # For now we keep it as 1
+        # TODO: Extend for native multi-objective
+        y = self._get_aggregated_costs(rows)
+
+        if y.size > 0:
+            if store_statistics:
+                self._percentile = np.percentile(y, self._scale_percentage, axis=0)
+                self._min_y = np.min(y, axis=0)
+                self._max_y = np.max(y, axis=0)
+
+        y = self.transform_response_values(values=y)
+        return X, y
+
     def transform_response_values(self, values: np.ndarray) -> np.ndarray:
         """Returns the input values."""
         return values
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, MutableMapping
+
+import numpy as np
+from ConfigSpace import Configuration, ConfigurationSpace
+from ConfigSpace.hyperparameters import (
+    CategoricalHyperparameter,
+    Constant,
+    IntegerHyperparameter,
+    OrdinalHyperparameter,
+)
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def encode_configuration_values(configspace: ConfigurationSpace, configs: list[Configuration]) -> np.ndarray:
+    """Encodes the values of the configurations as a matrix. Numerical hyperparameters hold their values, whereas
+    categorical, ordinal and constant hyperparameters hold the index of their value (as in the vector
+    representation). Inactive hyperparameters are NaN. In contrast to the vector representation, the encoding is
+    lossless, i.e., the decoded configurations are equal to the encoded ones.
+
+    Parameters
+    ----------
+    configspace : ConfigurationSpace
+    configs : list[Configuration]
+
+    Returns
+    -------
+    values : np.ndarray [#configs, #hyperparameters]
+    """
+    hps = configspace.get_hyperparameters()
+    numerical = [
+        j
+        for j, hp in enumerate(hps)
+        if not isinstance(hp, (CategoricalHyperparameter, OrdinalHyperparameter, Constant))
+    ]
+
+    values = np.array([config.get_array() for config in configs], dtype=np.float64).reshape(len(configs), len(hps))
+    for i, config in enumerate(configs):
+        for j in numerical:
+            value = config.get(hps[j].name)
+            if value is not None:
+                values[i, j] = value
+
+    return values
+
+
+def decode_configuration_values(configspace: ConfigurationSpace, values: np.ndarray) -> dict[str, Any]:
+    """Decodes a row of ``encode_configuration_values`` to the values of a configuration."""
+    decoded: dict[str, Any] = {}
+    for hp, value in zip(configspace.get_hyperparameters(), values):
+        if np.isnan(value):
+            continue
+
+        if isinstance(hp, CategoricalHyperparameter):
+            decoded[hp.name] = hp.choices[int(value)]
+        elif isinstance(hp, OrdinalHyperparameter):
+            decoded[hp.name] = hp.sequence[int(value)]
+        elif isinstance(hp, Constant):
+            decoded[hp.name] = hp.value
+        elif isinstance(hp, IntegerHyperparameter):
+            decoded[hp.name] = int(value)
+        else:
+            decoded[hp.name] = float(value)
+
+    return decoded
+
+
+class LazyConfigurations(MutableMapping[int, Configuration]):
+    """Maps config ids to configurations. Configurations which are loaded from a snapshot are only created on
+    first access. Configurations which are added later on are stored as they are.
+
+    Parameters
+    ----------
+    configspace : ConfigurationSpace
+    config_ids : np.ndarray [#configs]
+        The ids of the loaded configurations.
+    values : np.ndarray [#configs, #hyperparameters]
+        The values of the loaded configurations (see ``encode_configuration_values``).
+    vectors : np.ndarray [#configs, #hyperparameters]
+        The vector representation of the loaded configurations.
+    origins : list[str | None]
+        The origins of the loaded configurations.
+    """
+
+    def __init__(
+        self,
+        configspace: ConfigurationSpace,
+        config_ids: np.ndarray,
+        values: np.ndarray,
+        vectors: np.ndarray,
+        origins: list[str | None],
+    ) -> None:
+        self._configspace = configspace
+        self._values = values
+        self._vectors = vectors
+        self._origins = origins
+        self._rows: dict[int, int] = {int(config_id): row for row, config_id in enumerate(config_ids.tolist())}
+
+        # Loaded configurations which have been accessed and configurations which have been added
+        self._configs: dict[int, Configuration] = {}
+
+    @property
+    def n_materialized(self) -> int:
+        """Number of configurations which have been created so far."""
+        return len(self._configs)
+
+    def get_materialized(self, config_id: int) -> Configuration | None:
+        """Returns the configuration if it has been created already and None otherwise."""
+        return self._configs.get(config_id)
+
+    def get_vector(self, config_id: int) -> np.ndarray:
+        """Returns the vector representation of a configuration without creating the configuration."""
+        row = self._rows.get(config_id)
+        if row is not None:
+            return np.asarray(self._vectors[row])
+
+        return self._configs[config_id].get_array()
+
+    def get_values(self, config_id: int) -> np.ndarray:
+        """Returns the encoded values of a configuration without creating the configuration."""
+        row = self._rows.get(config_id)
+        if row is not None:
+            return np.asarray(self._values[row], dtype=np.float64)
+
+        return encode_configuration_values(self._configspace, [self._configs[config_id]])[0]
+
+    def get_origin(self, config_id: int) -> str | None:
+        """Returns the origin of a configuration without creating the configuration."""
+        config = self._configs.get(config_id)
+        if config is not None:
+            return config.origin
+
+        return self._origins[self._rows[config_id]]
+
+    def __getitem__(self, config_id: int) -> Configuration:
+        config = self._configs.get(config_id)
+        if config is None:
+            row = self._rows[config_id]
+            config = Configuration(
+                self._configspace,
+                values=decode_configuration_values(self._configspace, self._values[row]),
+                origin=self._origins[row],
+            )
+            config.config_id = config_id
+            self._configs[config_id] = config
+
+        return config
+
+    def __setitem__(self, config_id: int, config: Configuration) -> None:
+        self._configs[config_id] = config
+
+    def __delitem__(self, config_id: int) -> None:
+        self._rows.pop(config_id, None)
+        self._configs.pop(config_id, None)
+
+    def __contains__(self, config_id: object) -> bool:
+        return config_id in self._rows or config_id in self._configs
+
+    def __iter__(self) -> Iterator[int]:
+        yield from self._rows
+        for config_id in self._configs:
+            if config_id not in self._rows:
+                yield config_id
+
+    def __len__(self) -> int:
+        return len(self._rows) + sum(1 for config_id in self._configs if config_id not in self._rows)
+
+
+class LazyConfigIds(MutableMapping[Configuration, int]):
+    """Maps configurations to config ids without creating the loaded configurations. Configurations are identified
+    by their encoded values (see ``encode_configuration_values``), which is consistent with the equality of
+    configurations.
+
+    Parameters
+    ----------
+    configurations : LazyConfigurations
+        The inverse mapping, which is used to create configurations when iterating.
+    """
+
+    def __init__(self, configurations: LazyConfigurations) -> None:
+        self._configurations = configurations
+        self._ids: dict[bytes, int] = {
+            self._configurations.get_values(config_id).tobytes(): config_id for config_id in configurations
+        }
+
+    def __getitem__(self, config: Configuration) -> int:
+        return self._ids[self._get_key(config)]
+
+    def __setitem__(self, config: Configuration, config_id: int) -> None:
+        self._ids[self._get_key(config)] = config_id
+
+    def __delitem__(self, config: Configuration) -> None:
+        del self._ids[self._get_key(config)]
+
+    def __contains__(self, config: object) -> bool:
+        if not isinstance(config, Configuration):
+            return False
+
+        return self._get_key(config) in self._ids
+
+    def __iter__(self) -> Iterator[Configuration]:
+        for config_id in self._ids.values():
+            yield self._configurations[config_id]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _get_key(self, config: Configuration) -> bytes:
+        return encode_configuration_values(config.configuration_space, [config])[0].tobytes()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Iterator, Mapping, cast
+from typing import Any, Callable, Iterable, Iterator, Mapping, MutableMapping
 
 import json
+import os
 from collections import OrderedDict
 from pathlib import Path
 
@@ -13,17 +14,25 @@ from smac.constants import MAXINT
 from smac.multi_objective.abstract_multi_objective_algorithm import (
     AbstractMultiObjectiveAlgorithm,
 )
+from smac.runhistory.columnar_storage import ColumnarStorage
+from smac.runhistory.config_trial_index import ConfigTrialIndex
 from smac.runhistory.dataclasses import (
     InstanceSeedBudgetKey,
-    InstanceSeedKey,
     TrialInfo,
     TrialKey,
     TrialValue,
 )
 from smac.runhistory.enumerations import StatusType
-from smac.utils.configspace import get_config_hash
+from smac.runhistory.lazy_configurations import (
+    LazyConfigIds,
+    LazyConfigurations,
+    encode_configuration_values,
+)
+from smac.utils.configspace import convert_configurations_to_array, get_config_hash
+from smac.utils.journal import Journal, dump_json, get_journal_filename
 from smac.utils.logging import get_logger
 from smac.utils.multi_objective import normalize_costs
+from smac.utils.npz import load_npz, save_npz
 
 __copyright__ = "Copyright 2022, automl.org"
 __license__ = "3-clause BSD"
@@ -53,15 +62,21 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         The multi-objective algorithm is required to scalarize the costs in case of multi-objective.
     overwrite_existing_trials : bool, defaults to false
         Overwrites a trial (combination of configuration, instance, budget and seed) if it already exists.
+    columnar : bool, defaults to false
+        Stores the trials in NumPy columns (see ``ColumnarStorage``) instead of a dictionary of ``TrialKey`` and
+        ``TrialValue`` objects. The mapping interface stays the same but keys and values are created lazily on
+        access, which reduces the memory footprint considerably for runs with many trials.
     """
 
     def __init__(
         self,
         multi_objective_algorithm: AbstractMultiObjectiveAlgorithm | None = None,
         overwrite_existing_trials: bool = False,
+        columnar: bool = False,
     ) -> None:
         self._multi_objective_algorithm = multi_objective_algorithm
         self._overwrite_existing_trials = overwrite_existing_trials
+        self._columnar = columnar
         self.reset()
 
     @property
@@ -90,12 +105,12 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         self._multi_objective_algorithm = value
 
     @property
-    def ids_config(self) -> dict[int, Configuration]:
+    def ids_config(self) -> MutableMapping[int, Configuration]:
         """Mapping from config id to configuration."""
         return self._ids_config
 
     @property
-    def config_ids(self) -> dict[Configuration, int]:
+    def config_ids(self) -> MutableMapping[Configuration, int]:
         """Mapping from configuration to config id."""
         return self._config_ids
 
@@ -104,26 +119,51 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         """Returns the lower and upper bound of each objective."""
         return self._objective_bounds
 
+    @property
+    def columnar(self) -> bool:
+        """Whether the trials are stored in NumPy columns."""
+        return self._columnar
+
     def reset(self) -> None:
         """Resets this runhistory to its default state."""
         # By having the data in a deterministic order we can do useful tests when we
         # serialize the data and can assume it is still in the same order as it was added.
-        self._data: dict[TrialKey, TrialValue] = OrderedDict()
+        self._data: MutableMapping[TrialKey, TrialValue]
+        if self._columnar:
+            self._data = ColumnarStorage()
+        else:
+            self._data = OrderedDict()
 
         # Keep track of trials
         self._submitted = 0
         self._finished = 0
         self._running = 0
 
-        # For fast access, we have also an unordered data structure to get all instance
-        # seed pairs of a configuration.
-        self._config_id_to_isk_to_budget: dict[int, dict[InstanceSeedKey, list[float | None]]] = {}
-        self._running_trials: list[TrialInfo] = []
+        # Running trials are kept as ordered sets (dictionaries without values) so that membership tests and
+        # removals are O(1). The trials are additionally indexed by config id for the per-config queries.
+        self._running_trials: dict[TrialInfo, None] = {}
+        self._running_trials_per_config: dict[int, dict[TrialInfo, None]] = {}
 
-        self._config_ids: dict[Configuration, int] = {}
-        self._ids_config: dict[int, Configuration] = {}
+        # Keys, statuses and versions of all trials and the costs of the finished trials, which also serves as budget
+        # and status index of the trials. Consumers (e.g., the runhistory encoders) remember the version they have
+        # read so that they only have to process the modified trials.
+        self._trial_index = ConfigTrialIndex()
+
+        # Number of trials (including running ones) per budget and status
+        self._num_trials_per_budget: dict[float | None, dict[StatusType, int]] = {}
+
+        # Both mappings are lazy (see ``LazyConfigurations``) if the runhistory was loaded from a binary snapshot
+        self._config_ids: MutableMapping[Configuration, int] = {}
+        self._ids_config: MutableMapping[int, Configuration] = {}
         self._n_id = 0
 
+        # Append-only matrix of the vector representations of all configurations, which is shared by the consumers
+        # of the runhistory (e.g., the encoders and the acquisition functions) so that configurations do not have to
+        # be vectorized over and over again
+        self._config_vectors = np.zeros((0, 0), dtype=np.float64)
+        self._config_vector_rows: dict[int, int] = {}
+        self._n_config_vectors = 0
+
         # Stores cost for each configuration ID
         self._cost_per_config: dict[int, float | list[float]] = {}
         # Stores min cost across all budgets for each configuration ID
@@ -137,6 +177,9 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         self._n_objectives: int = -1
         self._objective_bounds: list[tuple[float, float]] = []
 
+        # Configurations whose values have been written to the journal (or were loaded)
+        self._journaled_config_ids: set[int] = set()
+
     def __contains__(self, k: object) -> bool:
         """Dictionary semantics for `k in runhistory`."""
         return k in self._data
@@ -218,6 +261,7 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
             self._n_id += 1
             self._config_ids[config] = self._n_id
             self._ids_config[self._n_id] = config
+            self._add_config_vectors([self._n_id], config.get_array()[np.newaxis])
 
             config_id = self._n_id
 
@@ -278,19 +322,7 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         # the same trial_key will be ignored silently if not capped.
         previous_k = self._data.get(k)
         if self._overwrite_existing_trials or force_update or previous_k is None:
-            # Update stati
-            if previous_k is None:
-                if status == StatusType.RUNNING:
-                    self._running += 1
-                else:
-                    self._finished += 1
-
-                self._submitted += 1
-            else:
-                if previous_k.status == StatusType.RUNNING and status != StatusType.RUNNING:
-                    self._running -= 1
-                    self._finished += 1
-
+            self._update_stats(previous_k, status)
             self._add(k, v, status)
         else:
             logger.info("Entry was not added to the runhistory because existing trials will not be overwritten.")
@@ -345,15 +377,13 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         """
         config_id = self._config_ids[config]
 
-        # Removing duplicates while keeping the order
-        inst_seed_budgets = list(
-            dict.fromkeys(self.get_instance_seed_budget_keys(config, highest_observed_budget_only=True))
-        )
-        self._cost_per_config[config_id] = self.average_cost(config, inst_seed_budgets)
-        self._num_trials_per_config[config_id] = len(inst_seed_budgets)
+        costs = self._cost(config)
+        self._cost_per_config[config_id] = self._reduce_costs(np.mean, costs)
+        self._num_trials_per_config[config_id] = len(costs)
 
-        all_isb = list(dict.fromkeys(self.get_instance_seed_budget_keys(config, highest_observed_budget_only=False)))
-        self._min_cost_per_config[config_id] = self.min_cost(config, all_isb)
+        # The minimum is taken across all budgets
+        all_costs = self._cost(config, highest_observed_budget_only=False)
+        self._min_cost_per_config[config_id] = self._reduce_costs(np.min, all_costs)
 
     def incremental_update_cost(self, config: Configuration, cost: float | list[float]) -> None:
         """Incrementally updates the performance of a configuration by using a moving average.
@@ -473,24 +503,9 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         Cost: float | list[float]
             Average cost. In case of multiple objectives, the mean of each objective is returned.
         """
-        costs = self._cost(config, instance_seed_budget_keys)
-        if costs:
-            if self._n_objectives > 1:
-                # Each objective is averaged separately
-                # [[100, 200], [0, 0]] -> [50, 100]
-                averaged_costs = np.mean(costs, axis=0).tolist()
-
-                if normalize:
-                    assert self.multi_objective_algorithm is not None
-                    normalized_costs = normalize_costs(averaged_costs, self._objective_bounds)
-
-                    return self.multi_objective_algorithm(normalized_costs)
-                else:
-                    return averaged_costs
-
-            return float(np.mean(costs))
-
-        return np.nan
+        # Each objective is averaged separately
+        # [[100, 200], [0, 0]] -> [50, 100]
+        return self._reduce_costs(np.mean, self._cost(config, instance_seed_budget_keys), normalize)
 
     def sum_cost(
         self,
@@ -521,21 +536,12 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
             objective individually.
         """
         costs = self._cost(config, instance_seed_budget_keys)
-        if costs:
-            if self._n_objectives > 1:
-                # Each objective is summed separately
-                # [[100, 200], [20, 10]] -> [120, 210]
-                summed_costs = np.sum(costs, axis=0).tolist()
-
-                if normalize:
-                    assert self.multi_objective_algorithm is not None
-                    normalized_costs = normalize_costs(summed_costs, self._objective_bounds)
-
-                    return self.multi_objective_algorithm(normalized_costs)
-                else:
-                    return summed_costs
+        if len(costs) == 0:
+            return 0.0
 
-        return float(np.sum(costs))
+        # Each objective is summed separately
+        # [[100, 200], [20, 10]] -> [120, 210]
+        return self._reduce_costs(np.sum, costs, normalize)
 
     def min_cost(
         self,
@@ -569,24 +575,9 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
             Minimum cost of the config. In case of multi-objective, the minimum cost per objective
             is returned.
         """
-        costs = self._cost(config, instance_seed_budget_keys)
-        if costs:
-            if self._n_objectives > 1:
-                # Each objective is viewed separately
-                # [[100, 200], [20, 500]] -> [20, 200]
-                min_costs = np.min(costs, axis=0).tolist()
-
-                if normalize:
-                    assert self.multi_objective_algorithm is not None
-                    normalized_costs = normalize_costs(min_costs, self._objective_bounds)
-
-                    return self.multi_objective_algorithm(normalized_costs)
-                else:
-                    return min_costs
-
-            return float(np.min(costs))
-
-        return np.nan
+        # Each objective is viewed separately
+        # [[100, 200], [20, 500]] -> [20, 200]
+        return self._reduce_costs(np.min, self._cost(config, instance_seed_budget_keys), normalize)
 
     def get_config(self, config_id: int) -> Configuration:
         """Returns the configuration from the configuration id."""
@@ -596,6 +587,56 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         """Returns the configuration id from a configuration."""
         return self._config_ids[config]
 
+    def get_config_vectors(self, config_ids: list[int] | np.ndarray) -> np.ndarray:
+        """Returns the vector representations of the configurations with the passed ids without vectorizing the
+        configurations again.
+
+        Parameters
+        ----------
+        config_ids : list[int] | np.ndarray
+            Ids of configurations in this runhistory.
+
+        Returns
+        -------
+        vectors : np.ndarray [len(config_ids), #hyperparameters]
+            A copy of the respective rows of the vector cache.
+        """
+        rows = np.fromiter(
+            (self._config_vector_rows[int(config_id)] for config_id in config_ids),
+            dtype=np.int64,
+            count=len(config_ids),
+        )
+
+        return self._config_vectors[rows]
+
+    def get_configs_array(self, configs: list[Configuration]) -> np.ndarray:
+        """Returns the vector representations of the passed configurations (see
+        ``convert_configurations_to_array``). The vectors of configurations which are stored in this runhistory are
+        taken from the vector cache. Only the remaining configurations are vectorized.
+
+        Parameters
+        ----------
+        configs : list[Configuration]
+
+        Returns
+        -------
+        configs_array : np.ndarray [len(configs), #hyperparameters]
+        """
+        rows = np.fromiter(
+            (self._get_config_vector_row(config) for config in configs),
+            dtype=np.int64,
+            count=len(configs),
+        )
+        unknown = np.flatnonzero(rows < 0)
+        if len(unknown) == len(configs):
+            return convert_configurations_to_array(configs)
+
+        X = self._config_vectors[np.maximum(rows, 0)]
+        if len(unknown) > 0:
+            X[unknown] = convert_configurations_to_array([configs[i] for i in unknown])
+
+        return X
+
     def has_config(self, config: Configuration) -> bool:
         """Check if the config is stored in the runhistory"""
         return config in self._config_ids
@@ -658,12 +699,7 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         list[Configuration]
             List of configurations, all of which have at least one running trial.
         """
-        configs = []
-        for trial in self._running_trials:
-            if trial.config not in configs:
-                configs.append(trial.config)
-
-        return configs
+        return [self._ids_config[config_id] for config_id in self._running_trials_per_config]
 
     def get_trials(
         self,
@@ -690,19 +726,11 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
             List of trials for the passed configuration.
         """
         config_id = self._config_ids.get(config)
-        trials = {}
-        if config_id in self._config_id_to_isk_to_budget:
-            trials = self._config_id_to_isk_to_budget[config_id].copy()
-
-        # Select only the max budget run if specified
-        if highest_observed_budget_only:
-            for k, v in trials.items():
-                if None in v:
-                    trials[k] = [None]
-                else:
-                    trials[k] = [max([v_ for v_ in v if v_ is not None])]
+        if config_id is None:
+            return []
 
-        return [TrialInfo(config, k.instance, k.seed, budget) for k, v in trials.items() for budget in v]
+        keys = self._trial_index.get_instance_seed_budget_keys(config_id, highest_observed_budget_only)
+        return [TrialInfo(config, key.instance, key.seed, key.budget) for key in keys]
 
     def get_running_trials(self, config: Configuration | None = None) -> list[TrialInfo]:
         """Returns all running trials for the passed configuration.
@@ -720,9 +748,72 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         """
         # Always work on copies
         if config is None:
-            return [trial for trial in self._running_trials]
-        else:
-            return [trial for trial in self._running_trials if trial.config == config]
+            return list(self._running_trials)
+
+        config_id = self._config_ids.get(config)
+        return list(self._running_trials_per_config.get(config_id, {})) if config_id is not None else []
+
+    def get_budgets(self) -> list[float]:
+        """Returns all budgets (in ascending order) on which trials have been run or are running."""
+        return sorted(budget for budget in self._num_trials_per_budget if budget is not None)
+
+    def get_trial_keys(
+        self,
+        budget_subset: list | None = None,
+        statuses: list[StatusType] | None = None,
+    ) -> list[TrialKey]:
+        """Returns the keys of all trials on the passed budgets with the passed statuses. The trials are selected
+        on the budget and status columns of the trial index, i.e., only the keys of the matching trials are created.
+
+        Parameters
+        ----------
+        budget_subset : list | None, defaults to None
+            Budgets to consider. If None, all budgets are considered.
+        statuses : list[StatusType] | None, defaults to None
+            Statuses to consider. If None, all statuses are considered.
+
+        Returns
+        -------
+        trial_keys : list[TrialKey]
+            The keys of the matching trials, grouped by budget (or status if all budgets are considered) in the
+            order they were added.
+        """
+        if budget_subset is None and statuses is None:
+            return list(self._data.keys())
+
+        rows = self._trial_index.get_trial_rows(budget_subset, statuses)
+        return self._trial_index.get_trial_keys(rows)
+
+    def count_trials(
+        self,
+        budget_subset: list | None = None,
+        statuses: list[StatusType] | None = None,
+    ) -> int:
+        """Returns the number of trials on the passed budgets with the passed statuses in O(#budgets * #statuses).
+
+        Parameters
+        ----------
+        budget_subset : list | None, defaults to None
+            Budgets to consider. If None, all budgets are considered.
+        statuses : list[StatusType] | None, defaults to None
+            Statuses to consider. If None, all statuses are considered.
+
+        Returns
+        -------
+        n_trials : int
+        """
+        if budget_subset is None:
+            budget_subset = list(self._num_trials_per_budget.keys())
+
+        n_trials = 0
+        for budget in budget_subset:
+            num_trials = self._num_trials_per_budget.get(budget, {})
+            if statuses is None:
+                n_trials += sum(num_trials.values())
+            else:
+                n_trials += sum(num_trials.get(status, 0) for status in statuses)
+
+        return n_trials
 
     def get_instance_seed_budget_keys(
         self,
@@ -752,59 +843,59 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         return [InstanceSeedBudgetKey(t.instance, t.seed, t.budget) for t in trials]
 
     def save(self, filename: str | Path = "runhistory.json") -> None:
-        """Saves RunHistory to disk.
+        """Saves RunHistory to disk. If the filename ends with ``.npz``, a binary snapshot is written instead of
+        json. The binary snapshot stores the trials and configurations as uncompressed arrays, which are
+        memory-mapped when loading.
 
         Parameters
         ----------
         filename : str | Path, defaults to "runhistory.json"
         """
-        data = []
-        for k, v in self._data.items():
-            data += [
-                (
-                    int(k.config_id),
-                    str(k.instance) if k.instance is not None else None,
-                    int(k.seed) if k.seed is not None else None,
-                    float(k.budget) if k.budget is not None else None,
-                    v.cost,
-                    v.time,
-                    v.status,
-                    v.starttime,
-                    v.endtime,
-                    v.additional_info,
-                )
-            ]
+        if isinstance(filename, str):
+            filename = Path(filename)
 
-        config_ids_to_serialize = set([entry[0] for entry in data])
+        if filename.suffix == ".npz":
+            self._save_binary(filename)
+            return
+
+        assert str(filename).endswith(".json")
+        dump_json(self._get_snapshot(), filename)
+
+    def append_to_journal(
+        self,
+        trial_keys: list[TrialKey],
+        filename: str | Path = "runhistory.jsonl",
+    ) -> None:
+        """Appends the passed trials as a single compact record to the journal. In contrast to ``save``, the cost of
+        this method does not depend on the size of the runhistory. The journal is replayed by ``load`` if it is
+        found next to the loaded file.
+
+        Parameters
+        ----------
+        trial_keys : list[TrialKey]
+            The trials to append.
+        filename : str | Path, defaults to "runhistory.jsonl"
+        """
+        data = []
         configs = {}
         config_origins = {}
-        for id_, config in self._ids_config.items():
-            if id_ in config_ids_to_serialize:
-                configs[id_] = config.get_dictionary()
-
-            config_origins[id_] = config.origin
+        for k in trial_keys:
+            data += [self._serialize_trial(k, self._data[k])]
 
-        if isinstance(filename, str):
-            filename = Path(filename)
+            if k.config_id not in self._journaled_config_ids:
+                config = self._ids_config[k.config_id]
+                configs[k.config_id] = config.get_dictionary()
+                config_origins[k.config_id] = config.origin
+                self._journaled_config_ids.add(k.config_id)
 
-        assert str(filename).endswith(".json")
-        filename.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(filename, "w") as fp:
-            assert self._running == len(self._running_trials)
-            json.dump(
-                {
-                    "stats": {"submitted": self._submitted, "finished": self._finished, "running": self._running},
-                    "data": data,
-                    "configs": configs,
-                    "config_origins": config_origins,
-                },
-                fp,
-                indent=2,
-            )
+        Journal(filename).append({"data": data, "configs": configs, "config_origins": config_origins})
 
     def load(self, filename: str | Path, configspace: ConfigurationSpace) -> None:
-        """Loads the runhistory from disk.
+        """Loads the runhistory from disk. If a journal (e.g., ``runhistory.jsonl`` for ``runhistory.json``) is
+        found, the trials of the journal are added afterwards.
+
+        Binary snapshots (``.npz``) are memory-mapped: The trials are read on access and configurations are only
+        created when they are requested.
 
         Warning
         -------
@@ -821,62 +912,53 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         # We reset the RunHistory first to avoid any inconsistencies
         self.reset()
 
-        try:
-            with open(filename) as fp:
-                data = json.load(fp)
-        except Exception as e:
-            logger.warning(
-                f"Encountered exception {e} while reading RunHistory from {filename}. Not adding any trials!"
-            )
-            return
+        journal = Journal(get_journal_filename(filename))
 
-        config_origins = data.get("config_origins", {})
+        if filename.suffix == ".npz":
+            try:
+                self._load_binary(filename, configspace)
+            except Exception as e:
+                self.reset()
+                if not journal.exists():
+                    logger.warning(
+                        f"Encountered exception {e} while reading RunHistory from {filename}. Not adding any trials!"
+                    )
+                    return
+        else:
+            try:
+                with open(filename) as fp:
+                    data = json.load(fp)
+            except Exception as e:
+                if not journal.exists():
+                    logger.warning(
+                        f"Encountered exception {e} while reading RunHistory from {filename}. Not adding any trials!"
+                    )
+                    return
 
-        self._ids_config = {}
-        for id_, values in data["configs"].items():
-            self._ids_config[int(id_)] = Configuration(
-                configspace,
-                values=values,
-                origin=config_origins.get(id_, None),
-            )
+                data = {"data": [], "configs": {}, "config_origins": {}, "stats": None}
 
-        self._config_ids = {config: id_ for id_, config in self._ids_config.items()}
-        self._n_id = len(self._config_ids)
+            self._add_configs(data["configs"], data.get("config_origins", {}), configspace)
 
-        # Important to use add method to use all data structure correctly
-        for entry in data["data"]:
-            # Set n_objectives first
-            if self._n_objectives == -1:
-                if isinstance(entry[4], (float, int)):
-                    self._n_objectives = 1
-                else:
-                    self._n_objectives = len(entry[4])
+            # Important to use add method to use all data structure correctly
+            for entry in data["data"]:
+                self._add_serialized_trial(entry)
 
-            cost: list[float] | float
-            if self._n_objectives == 1:
-                cost = float(entry[4])
-            else:
-                cost = [float(x) for x in entry[4]]
-
-            self.add(
-                config=self._ids_config[int(entry[0])],
-                cost=cost,
-                time=float(entry[5]),
-                status=StatusType(entry[6]),
-                instance=entry[1],
-                seed=entry[2],
-                budget=entry[3],
-                starttime=entry[7],
-                endtime=entry[8],
-                additional_info=entry[9],
-            )
+            # Although adding trials should give us the same stats, the trajectory might be different
+            # because of the running status and/or overwriting trials
+            # Therefore, we just overwrite them
+            if data["stats"] is not None:
+                self._submitted = data["stats"]["submitted"]
+                self._finished = data["stats"]["finished"]
+                self._running = data["stats"]["running"]
+
+        # Records of the journal are applied in order and overwrite previous trials (e.g., running trials which
+        # finished later on). Since records are only overwritten, replaying a record twice has no effect.
+        for record in journal.read():
+            self._add_configs(record["configs"], record["config_origins"], configspace)
+            for entry in record["data"]:
+                self._add_serialized_trial(entry, force_update=True)
 
-        # Although adding trials should give us the same stats, the trajectory might be different
-        # because of the running status and/or overwriting trials
-        # Therefore, we just overwrite them
-        self._submitted = data["stats"]["submitted"]
-        self._finished = data["stats"]["finished"]
-        self._running = data["stats"]["running"]
+        self._journaled_config_ids = set(self._ids_config.keys())
 
     def update_from_json(
         self,
@@ -896,30 +978,75 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         self.update(runhistory=new_runhistory)
 
     def update(self, runhistory: RunHistory) -> None:
-        """Updates the current RunHistory by adding new trials from another RunHistory.
+        """Updates the current RunHistory by adding new trials from another RunHistory. Existing trials are only
+        overwritten if ``overwrite_existing_trials`` is set (see ``merge``).
 
         Parameters
         ----------
         runhistory : RunHistory
             RunHistory with additional data to be added to self
         """
-        # Configurations might be already known, but by a different ID. This
-        # does not matter here because the add() method handles this
-        # correctly by assigning an ID to unknown configurations and re-using the ID.
-        for key, value in runhistory.items():
-            config = runhistory._ids_config[key.config_id]
-            self.add(
-                config=config,
-                cost=value.cost,
-                time=value.time,
-                status=value.status,
-                instance=key.instance,
-                starttime=value.starttime,
-                endtime=value.endtime,
-                seed=key.seed,
-                budget=key.budget,
-                additional_info=value.additional_info,
-            )
+        self.merge(runhistory, conflict="overwrite" if self._overwrite_existing_trials else "keep_first")
+
+    def merge(
+        self,
+        runhistories: RunHistory | list[RunHistory],
+        conflict: str = "keep_first",
+    ) -> None:
+        """Merges the trials of other runhistories into this runhistory in bulk. Configurations are mapped to the
+        config ids of this runhistory once per configuration, and the costs of the affected configurations as well
+        as the objective bounds are recomputed once at the end instead of after every trial.
+
+        Parameters
+        ----------
+        runhistories : RunHistory | list[RunHistory]
+            The runhistories to merge, in order.
+        conflict : str, defaults to "keep_first"
+            How trials which exist already (same configuration, instance, seed and budget) are handled:
+
+            * keep_first: The existing trial is kept.
+            * keep_best: The trial with the lower cost is kept. In case of multi-objective, the existing trial is only
+              replaced if it is dominated. Running trials are always replaced by finished trials but never replace
+              finished ones.
+            * overwrite: The existing trial is replaced.
+        """
+        if conflict not in ("keep_first", "keep_best", "overwrite"):
+            raise ValueError(f"Unknown conflict policy {conflict}.")
+
+        if isinstance(runhistories, RunHistory):
+            runhistories = [runhistories]
+
+        modified_config_ids: set[int] = set()
+        for runhistory in runhistories:
+            if runhistory is self:
+                continue
+
+            if runhistory._n_objectives != -1:
+                if self._n_objectives == -1:
+                    self._n_objectives = runhistory._n_objectives
+                elif self._n_objectives != runhistory._n_objectives:
+                    raise ValueError(
+                        f"Can not merge a runhistory with {runhistory._n_objectives} objectives into a runhistory "
+                        f"with {self._n_objectives} objectives."
+                    )
+
+            config_id_map = self._merge_configs(runhistory)
+            for k, v in runhistory.items():
+                k = TrialKey(config_id=config_id_map[k.config_id], instance=k.instance, seed=k.seed, budget=k.budget)
+                previous_v = self._data.get(k)
+                if previous_v is not None and not self._is_replaced(previous_v, v, conflict):
+                    continue
+
+                self._update_stats(previous_v, v.status)
+                self._add(k, v, v.status, update_aggregates=False)
+                modified_config_ids.add(k.config_id)
+
+        # Configurations which only have running trials have no cost
+        for config_id in modified_config_ids:
+            if len(self._trial_index.get_rows(config_id)) > 0:
+                self.update_cost(self._ids_config[config_id])
+
+        self._update_objective_bounds()
 
     def update_costs(self, instances: list[str] | None = None) -> None:
         """Computes the cost of all configurations from scratch and overwrites `self._cost_per_config`
@@ -932,18 +1059,293 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         """
         self._cost_per_config = {}
         self._num_trials_per_config = {}
-        for config, config_id in self._config_ids.items():
-            # Removing duplicates while keeping the order
-            inst_seed_budgets = list(
-                dict.fromkeys(self.get_instance_seed_budget_keys(config, highest_observed_budget_only=True))
-            )
-            if instances is not None:
-                inst_seed_budgets = list(filter(lambda x: x.instance in cast(list, instances), inst_seed_budgets))
 
-            if inst_seed_budgets:  # can be empty if never saw any trials on instances
-                self._cost_per_config[config_id] = self.average_cost(config, inst_seed_budgets)
-                self._min_cost_per_config[config_id] = self.min_cost(config, inst_seed_budgets)
-                self._num_trials_per_config[config_id] = len(inst_seed_budgets)
+        # All configurations are aggregated at once; configurations without any trial on the instances are skipped
+        config_ids, mean_costs, min_costs, n_trials = self._trial_index.aggregate(instances)
+        for config_id, mean_cost, min_cost, n in zip(
+            config_ids.tolist(), mean_costs.tolist(), min_costs.tolist(), n_trials.tolist()
+        ):
+            if self._n_objectives > 1:
+                self._cost_per_config[config_id] = mean_cost
+                self._min_cost_per_config[config_id] = min_cost
+            else:
+                self._cost_per_config[config_id] = mean_cost[0]
+                self._min_cost_per_config[config_id] = min_cost[0]
+
+            self._num_trials_per_config[config_id] = n
+
+    def _get_snapshot(self) -> dict[str, Any]:
+        """Returns the json-serializable representation of the runhistory, which is written by ``save``."""
+        data = [self._serialize_trial(k, v) for k, v in self._data.items()]
+
+        config_ids_to_serialize = set([entry[0] for entry in data])
+        configs = {}
+        config_origins = {}
+        for id_, config in self._ids_config.items():
+            if id_ in config_ids_to_serialize:
+                configs[id_] = config.get_dictionary()
+
+            config_origins[id_] = config.origin
+
+        assert self._running == len(self._running_trials)
+
+        return {
+            "stats": {"submitted": self._submitted, "finished": self._finished, "running": self._running},
+            "data": data,
+            "configs": configs,
+            "config_origins": config_origins,
+        }
+
+    def _serialize_trial(self, k: TrialKey, v: TrialValue) -> tuple:
+        return (
+            int(k.config_id),
+            str(k.instance) if k.instance is not None else None,
+            int(k.seed) if k.seed is not None else None,
+            float(k.budget) if k.budget is not None else None,
+            v.cost,
+            v.time,
+            v.status,
+            v.starttime,
+            v.endtime,
+            v.additional_info,
+        )
+
+    def _add_serialized_trial(self, entry: list, force_update: bool = False) -> None:
+        # Set n_objectives first
+        if self._n_objectives == -1:
+            if isinstance(entry[4], (float, int)):
+                self._n_objectives = 1
+            else:
+                self._n_objectives = len(entry[4])
+
+        cost: list[float] | float
+        if self._n_objectives == 1:
+            cost = float(entry[4])
+        else:
+            cost = [float(x) for x in entry[4]]
+
+        self.add(
+            config=self._ids_config[int(entry[0])],
+            cost=cost,
+            time=float(entry[5]),
+            status=StatusType(entry[6]),
+            instance=entry[1],
+            seed=entry[2],
+            budget=entry[3],
+            starttime=entry[7],
+            endtime=entry[8],
+            additional_info=entry[9],
+            force_update=force_update,
+        )
+
+    def _add_configs(
+        self,
+        configs: dict[str, dict],
+        config_origins: dict[str, str | None],
+        configspace: ConfigurationSpace,
+    ) -> None:
+        """Adds serialized configurations with their ids."""
+        for id_, values in configs.items():
+            if int(id_) in self._ids_config:
+                continue
+
+            config = Configuration(configspace, values=values, origin=config_origins.get(id_, None))
+            self._ids_config[int(id_)] = config
+            self._config_ids[config] = int(id_)
+            self._add_config_vectors([int(id_)], config.get_array()[np.newaxis])
+            self._n_id = max(self._n_id, int(id_))
+
+    def _save_binary(self, filename: Path) -> None:
+        """Writes the runhistory as uncompressed arrays, which can be memory-mapped by ``_load_binary``."""
+        storage: ColumnarStorage
+        if isinstance(self._data, ColumnarStorage):
+            storage = self._data
+        else:
+            storage = ColumnarStorage(capacity=len(self._data))
+            storage.update(self._data)
+
+        config_ids = list(self._ids_config.keys())
+        config_values = np.zeros((len(config_ids), 0))
+        config_vectors = np.zeros((len(config_ids), 0))
+        if len(config_ids) > 0:
+            config_vectors = self.get_config_vectors(config_ids)
+
+        if isinstance(self._ids_config, LazyConfigurations):
+            lazy_configs = self._ids_config
+            if len(config_ids) > 0:
+                config_values = np.array([lazy_configs.get_values(id_) for id_ in config_ids])
+            config_origins = [lazy_configs.get_origin(id_) for id_ in config_ids]
+        else:
+            configs = [self._ids_config[id_] for id_ in config_ids]
+            if len(configs) > 0:
+                config_values = encode_configuration_values(configs[0].configuration_space, configs)
+            config_origins = [config.origin for config in configs]
+
+        assert self._running == len(self._running_trials)
+
+        # Everything which is not an array is stored as json
+        meta = {
+            "stats": {"submitted": self._submitted, "finished": self._finished, "running": self._running},
+            "n_id": self._n_id,
+            "n_objectives": self._n_objectives,
+            "objective_bounds": [[float(min_v), float(max_v)] for min_v, max_v in self._objective_bounds],
+            "instance_table": storage.instance_table,
+            "additional_info": {str(row): info for row, info in storage.additional_info.items()},
+            "config_origins": config_origins,
+        }
+
+        arrays = {f"trial_{name}": column for name, column in storage.to_columns().items()}
+        arrays["config_ids"] = np.array(config_ids, dtype=np.int64)
+        arrays["config_values"] = config_values
+        arrays["config_vectors"] = config_vectors
+
+        # The caches hold floats or lists of floats (multi-objective)
+        meta["scalar_caches"] = {}
+        for name, cache in (
+            ("cost_per_config", self._cost_per_config),
+            ("min_cost_per_config", self._min_cost_per_config),
+            ("num_trials_per_config", self._num_trials_per_config),
+        ):
+            arrays[f"{name}_ids"] = np.array(list(cache.keys()), dtype=np.int64)
+            # The width is passed explicitly since it can not be inferred from an empty cache
+            width = 1 if name == "num_trials_per_config" else max(self._n_objectives, 1)
+            arrays[f"{name}_values"] = np.array(list(cache.values()), dtype=np.float64).reshape(len(cache), width)
+            meta["scalar_caches"][name] = all(not isinstance(value, list) for value in cache.values())
+
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+
+        # Write to a temporary file first so that the snapshot is never left in a partially written state
+        tmp_filename = filename.with_name(filename.name + ".tmp")
+        save_npz(tmp_filename, arrays)
+        os.replace(tmp_filename, filename)
+
+    def _load_binary(self, filename: Path, configspace: ConfigurationSpace) -> None:
+        """Loads a runhistory written by ``_save_binary``. Neither ``TrialKey`` / ``TrialValue`` objects (if the
+        runhistory is columnar) nor configurations are created.
+        """
+        arrays = load_npz(filename)
+        meta = json.loads(arrays["meta"].tobytes().decode("utf-8"))
+
+        lazy_configs = LazyConfigurations(
+            configspace,
+            arrays["config_ids"],
+            arrays["config_values"],
+            arrays["config_vectors"],
+            meta["config_origins"],
+        )
+        self._ids_config = lazy_configs
+        self._config_ids = LazyConfigIds(lazy_configs)
+        self._n_id = meta["n_id"]
+        self._add_config_vectors(arrays["config_ids"].tolist(), arrays["config_vectors"])
+
+        storage = ColumnarStorage.from_columns(
+            {name[len("trial_") :]: column for name, column in arrays.items() if name.startswith("trial_")},
+            meta["instance_table"],
+            {int(row): info for row, info in meta["additional_info"].items()},
+        )
+
+        self._n_objectives = meta["n_objectives"]
+
+        # Rebuild the fast data structures from the columns at once
+        statuses = storage.statuses
+        self._trial_index = ConfigTrialIndex.from_columns(
+            storage.config_ids,
+            storage.instance_ids,
+            storage.instance_table,
+            storage.seeds,
+            storage.has_seed,
+            storage.budgets,
+            storage.costs[:, : max(self._n_objectives, 1)],
+            statuses,
+        )
+
+        # The trials are counted per budget (in the order the budgets were seen first) and status
+        budgets = storage.budgets
+        no_budget = np.isnan(budgets)
+        unique_budgets, first_rows = np.unique(budgets[~no_budget], return_index=True)
+        budget_rows: dict[float | None, int] = dict(
+            zip(unique_budgets.tolist(), np.flatnonzero(~no_budget)[first_rows].tolist())
+        )
+        if np.any(no_budget):
+            budget_rows[None] = int(np.argmax(no_budget))
+
+        for budget in sorted(budget_rows, key=lambda budget: budget_rows[budget]):
+            counts = np.bincount(statuses[no_budget if budget is None else budgets == budget])
+            self._num_trials_per_budget[budget] = {
+                StatusType(status): count for status, count in enumerate(counts.tolist()) if count > 0
+            }
+
+        running_rows = np.flatnonzero(statuses == StatusType.RUNNING)
+        for k in self._trial_index.get_trial_keys(running_rows):
+            trial_info = TrialInfo(lazy_configs[k.config_id], instance=k.instance, seed=k.seed, budget=k.budget)
+            self._running_trials[trial_info] = None
+            self._running_trials_per_config.setdefault(k.config_id, {})[trial_info] = None
+
+        if self._columnar:
+            self._data = storage
+        else:
+            self._data = OrderedDict(storage.items())
+
+        self._objective_bounds = [(min_v, max_v) for min_v, max_v in meta["objective_bounds"]]
+
+        for name in ("cost_per_config", "min_cost_per_config", "num_trials_per_config"):
+            cache: dict[int, Any] = {}
+            for config_id, values in zip(arrays[f"{name}_ids"].tolist(), arrays[f"{name}_values"].tolist()):
+                if name == "num_trials_per_config":
+                    cache[config_id] = int(values[0])
+                elif meta["scalar_caches"][name]:
+                    cache[config_id] = values[0]
+                else:
+                    cache[config_id] = values
+
+            setattr(self, f"_{name}", cache)
+
+        self._submitted = meta["stats"]["submitted"]
+        self._finished = meta["stats"]["finished"]
+        self._running = meta["stats"]["running"]
+
+    def _add_config_vectors(self, config_ids: list[int], vectors: np.ndarray) -> None:
+        """Appends the vector representations of new configurations to the vector cache."""
+        if len(config_ids) == 0:
+            return
+
+        start = self._n_config_vectors
+        end = start + len(config_ids)
+        if start == 0:
+            # The number of hyperparameters is known only once the first configuration is added
+            self._config_vectors = np.zeros((max(end, 64), vectors.shape[1]), dtype=np.float64)
+        elif end > len(self._config_vectors):
+            config_vectors = np.zeros((max(end, 2 * len(self._config_vectors)), vectors.shape[1]), dtype=np.float64)
+            config_vectors[:start] = self._config_vectors[:start]
+            self._config_vectors = config_vectors
+
+        self._config_vectors[start:end] = vectors
+        for row, config_id in enumerate(config_ids, start=start):
+            self._config_vector_rows[config_id] = row
+
+        self._n_config_vectors = end
+
+    def _get_config_vector_row(self, config: Configuration) -> int:
+        """Returns the row of the configuration in the vector cache or -1 if the configuration object is not the
+        one stored in this runhistory (as equality checks of configurations are expensive).
+        """
+        config_id = config.config_id
+        if config_id is None:
+            return -1
+
+        row = self._config_vector_rows.get(config_id)
+        if row is None:
+            return -1
+
+        if isinstance(self._ids_config, LazyConfigurations):
+            stored_config = self._ids_config.get_materialized(config_id)
+        else:
+            stored_config = self._ids_config.get(config_id)
+
+        if stored_config is not config:
+            return -1
+
+        return row
 
     def _check_json_serializable(
         self,
@@ -963,17 +1365,21 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
 
     def _update_objective_bounds(self) -> None:
         """Update the objective bounds based on the data in the RunHistory."""
-        all_costs = []
-        for run_value in self._data.values():
-            costs = run_value.cost
-            if run_value.status == StatusType.SUCCESS:
-                if not isinstance(costs, Iterable):
-                    costs = [costs]
+        if isinstance(self._data, ColumnarStorage):
+            success = self._data.statuses == StatusType.SUCCESS
+            all_costs = self._data.costs[success, : max(self._n_objectives, 0)]
+        else:
+            all_costs = []
+            for run_value in self._data.values():
+                costs = run_value.cost
+                if run_value.status == StatusType.SUCCESS:
+                    if not isinstance(costs, Iterable):
+                        costs = [costs]
 
-                assert len(costs) == self._n_objectives
-                all_costs.append(costs)
+                    assert len(costs) == self._n_objectives
+                    all_costs.append(costs)
 
-        all_costs = np.array(all_costs, dtype=float)  # type: ignore[assignment]
+            all_costs = np.array(all_costs, dtype=float)  # type: ignore[assignment]
 
         if len(all_costs) == 0:
             self._objective_bounds = [(np.inf, -np.inf)] * self._n_objectives
@@ -986,51 +1392,136 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         for min_v, max_v in zip(min_values, max_values):
             self._objective_bounds += [(min_v, max_v)]
 
-    def _add(self, k: TrialKey, v: TrialValue, status: StatusType) -> None:
+    def _update_objective_bounds_incrementally(self, previous: TrialValue | None, value: TrialValue) -> None:
+        """Updates the objective bounds with a single added trial. The bounds are only recomputed from scratch
+        if the overwritten trial held one of the current extremes (or the bounds are not initialized yet).
+
+        Parameters
+        ----------
+        previous : TrialValue | None
+            The value which was overwritten by the added trial.
+        value : TrialValue
+            The value of the added trial.
+        """
+        if self._n_objectives == -1:
+            # Only running trials so far
+            return
+
+        if len(self._objective_bounds) != self._n_objectives:
+            self._update_objective_bounds()
+            return
+
+        if previous is not None and previous.status == StatusType.SUCCESS:
+            previous_costs = np.atleast_1d(np.asarray(previous.cost, dtype=float))
+            for cost, (min_v, max_v) in zip(previous_costs, self._objective_bounds):
+                if cost <= min_v or cost >= max_v:
+                    # The removed cost might have been an extreme
+                    self._update_objective_bounds()
+                    return
+
+        if value.status == StatusType.SUCCESS:
+            costs = np.atleast_1d(np.asarray(value.cost, dtype=float))
+            assert len(costs) == self._n_objectives
+
+            self._objective_bounds = [
+                (min(min_v, cost), max(max_v, cost)) for cost, (min_v, max_v) in zip(costs, self._objective_bounds)
+            ]
+
+    def _count_trial(self, k: TrialKey, previous_status: StatusType | None, status: StatusType) -> None:
+        """Updates the number of trials per budget and status with an added (``previous_status`` is None) or
+        overwritten trial.
+        """
+        if previous_status is not None:
+            self._num_trials_per_budget[k.budget][previous_status] -= 1
+
+        num_trials = self._num_trials_per_budget.setdefault(k.budget, {})
+        num_trials[status] = num_trials.get(status, 0) + 1
+
+    def _merge_configs(self, runhistory: RunHistory) -> dict[int, int]:
+        """Adds the configurations of another runhistory which are unknown so far and returns the mapping from
+        the config ids of the other runhistory to the config ids of this runhistory.
+        """
+        config_id_map: dict[int, int] = {}
+        new_configs: dict[int, Configuration] = {}
+        for config_id, config in runhistory._ids_config.items():
+            own_config_id = self._config_ids.get(config)
+            if own_config_id is None:
+                self._n_id += 1
+                own_config_id = self._n_id
+                new_configs[config_id] = config
+
+            config_id_map[config_id] = own_config_id
+
+        # The vectors are copied from the other runhistory in one go. The configurations are copied as well, since
+        # the config ids of the other runhistory must not be changed.
+        vectors = runhistory.get_config_vectors(list(new_configs))
+        for (config_id, config), vector in zip(new_configs.items(), vectors):
+            own_config_id = config_id_map[config_id]
+            own_config = Configuration(
+                config.configuration_space,
+                vector=vector,
+                origin=config.origin,
+                config_id=own_config_id,
+            )
+            self._config_ids[own_config] = own_config_id
+            self._ids_config[own_config_id] = own_config
+
+        self._add_config_vectors([config_id_map[config_id] for config_id in new_configs], vectors)
+
+        return config_id_map
+
+    def _is_replaced(self, previous: TrialValue, value: TrialValue, conflict: str) -> bool:
+        """Whether an existing trial is replaced by a merged trial with the given conflict policy."""
+        if conflict == "overwrite":
+            return True
+        elif conflict == "keep_first":
+            return False
+
+        if value.status == StatusType.RUNNING:
+            return False
+        elif previous.status == StatusType.RUNNING:
+            return True
+
+        previous_costs = np.atleast_1d(np.asarray(previous.cost, dtype=np.float64))
+        costs = np.atleast_1d(np.asarray(value.cost, dtype=np.float64))
+
+        return bool(np.all(costs <= previous_costs) and np.any(costs < previous_costs))
+
+    def _update_stats(self, previous: TrialValue | None, status: StatusType) -> None:
+        """Updates the number of submitted, finished and running trials with an added or overwritten trial."""
+        if previous is None:
+            if status == StatusType.RUNNING:
+                self._running += 1
+            else:
+                self._finished += 1
+
+            self._submitted += 1
+        elif previous.status == StatusType.RUNNING and status != StatusType.RUNNING:
+            self._running -= 1
+            self._finished += 1
+
+    def _add(self, k: TrialKey, v: TrialValue, status: StatusType, update_aggregates: bool = True) -> None:
         """
         Actual function to add new entry to data structures.
 
         Note
         ----
-        This method always calls `update_cost` in the multi-objective setting.
+        This method always calls `update_cost` in the multi-objective setting. If ``update_aggregates`` is false,
+        neither the costs of the configuration nor the objective bounds are updated, which is up to the caller.
         """
+        previous_v = self._data.get(k)
         self._data[k] = v
+        self._count_trial(k, previous_v.status if previous_v is not None else None, v.status)
 
         # Update objective bounds based on raw data
-        self._update_objective_bounds()
-
-        # Do not register the cost until the run has completed
-        if status != StatusType.RUNNING:
-            # Also add to fast data structure
-            isk = InstanceSeedKey(k.instance, k.seed)
-            self._config_id_to_isk_to_budget[k.config_id] = self._config_id_to_isk_to_budget.get(k.config_id, {})
+        if update_aggregates:
+            self._update_objective_bounds_incrementally(previous_v, v)
 
-            # We sanity-check whether we don't mix none and str in the instances
-            for isk_ in self._config_id_to_isk_to_budget[k.config_id].keys():
-                if isinstance(isk_, str) != isinstance(isk, str):
-                    raise ValueError(
-                        "Can not mix instances of different types. "
-                        f"Wants to add {isk_.instance} but found already {isk.instance}."
-                    )
-
-            if isk not in self._config_id_to_isk_to_budget[k.config_id]:
-                # Add new inst-seed-key with budget to main dict
-                self._config_id_to_isk_to_budget[k.config_id][isk] = [k.budget]
-            # Before it was k.budget not in isk
-            elif k.budget != isk.instance and k.budget != isk.seed:
-                # We have to make sure that we don't mix none and float budgets
-                if isinstance(self._config_id_to_isk_to_budget[k.config_id][isk][0], float) != isinstance(
-                    k.budget, float
-                ):
-                    raise ValueError(
-                        "Can not mix budgets of different types for the same instance-seed pair. "
-                        f"Wants to add {k.budget} but found already "
-                        f"{self._config_id_to_isk_to_budget[k.config_id][isk][0]}."
-                    )
-
-                # Append new budget to existing inst-seed-key dict
-                self._config_id_to_isk_to_budget[k.config_id][isk].append(k.budget)
+        # The trial index does not register the cost until the run has completed. It also makes sure that budgets of
+        # None and float budgets are not mixed for the same instance-seed pair.
+        self._trial_index.add(k.config_id, k.instance, k.seed, k.budget, v.cost, status)
 
+        if update_aggregates and status != StatusType.RUNNING:
             config = self._ids_config[k.config_id]
             config_hash = get_config_hash(config)
 
@@ -1052,19 +1543,50 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         # Fast data structure for pending trials
         if status == StatusType.RUNNING:
             # Add to running cache
-            self._running_trials.append(trial_info)
-        else:
+            self._running_trials[trial_info] = None
+            self._running_trials_per_config.setdefault(k.config_id, {})[trial_info] = None
+        elif trial_info in self._running_trials:
             # Remove from cache
-            if trial_info in self._running_trials:
-                self._running_trials.remove(trial_info)
+            del self._running_trials[trial_info]
+
+            running_trials = self._running_trials_per_config[k.config_id]
+            del running_trials[trial_info]
+            if len(running_trials) == 0:
+                del self._running_trials_per_config[k.config_id]
+
+    def _reduce_costs(
+        self,
+        reduce: Callable[..., Any],
+        costs: np.ndarray,
+        normalize: bool = False,
+    ) -> float | list[float]:
+        """Reduces the costs of ``_cost`` (e.g., with ``np.mean``) for each objective separately. Returns NaN if
+        no costs are given.
+        """
+        if len(costs) == 0:
+            return np.nan
+
+        if self._n_objectives > 1:
+            reduced_costs = reduce(costs, axis=0).tolist()
+
+            if normalize:
+                assert self.multi_objective_algorithm is not None
+                normalized_costs = normalize_costs(reduced_costs, self._objective_bounds)
+
+                return self.multi_objective_algorithm(normalized_costs)
+
+            return reduced_costs
+
+        return float(reduce(costs))
 
     def _cost(
         self,
         config: Configuration,
         instance_seed_budget_keys: list[InstanceSeedBudgetKey] | None = None,
-    ) -> list[float | list[float]]:
-        """Returns a list of all costs for the given config for further calculations.
-        The costs are directly taken from the RunHistory data.
+        highest_observed_budget_only: bool = True,
+    ) -> np.ndarray:
+        """Returns all costs for the given config for further calculations. The costs are taken from the
+        per-config trial index (see ``ConfigTrialIndex``).
 
         Parameters
         ----------
@@ -1073,19 +1595,25 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
         instance_seed_budget_keys : list, defaults to None
             List of tuples of instance-seeds-budget keys. If None, the RunHistory is
             queried for all trials of the given configuration.
+        highest_observed_budget_only : bool, defaults to True
+            Select only the highest observed budget of each instance-seed pair. Only used if no keys are passed.
 
         Returns
         -------
-        costs: list[list[float] | list[list[float]]]
-            List of all found costs. In case of multi-objective, the list contains lists.
+        costs: np.ndarray
+            All found costs with shape [#trials, #objectives].
         """
         try:
             id_ = self._config_ids[config]
         except KeyError:  # Challenger was not running so far
-            return []
+            return np.zeros((0, max(self._n_objectives, 1)))
+
+        rows = self._trial_index.get_rows(id_, instance_seed_budget_keys, highest_observed_budget_only)
+        if rows is not None:
+            return self._trial_index.get_costs(rows)
 
-        if instance_seed_budget_keys is None:
-            instance_seed_budget_keys = self.get_instance_seed_budget_keys(config, highest_observed_budget_only=True)
+        # Some of the keys are not indexed (e.g., running trials), hence we look them up in the data
+        assert instance_seed_budget_keys is not None
 
         costs = []
         for key in instance_seed_budget_keys:
@@ -1098,4 +1626,4 @@ class RunHistory(Mapping[TrialKey, TrialValue]):
 
             costs.append(self._data[k].cost)
 
-        return costs
+        return np.array(costs, dtype=float)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+import glob
+from pathlib import Path
+
+from ConfigSpace import ConfigurationSpace
+
+from smac.multi_objective.abstract_multi_objective_algorithm import (
+    AbstractMultiObjectiveAlgorithm,
+)
+from smac.runhistory.runhistory import RunHistory
+from smac.utils.logging import get_logger
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+logger = get_logger(__name__)
+
+
+class ShardedRunHistory:
+    """Logical runhistory whose trials are spread over several shards, e.g., the runhistories of independent SMAC
+    processes which write to their own files. The shards are merged into a single runhistory (see
+    ``RunHistory.merge``), which is only rebuilt if a shard has changed. Shard files are only reloaded if they
+    have been modified.
+
+    Parameters
+    ----------
+    shards : list[RunHistory | str | Path]
+        The shards in merge order. Runhistories are used as they are (e.g., the runhistory of the current process),
+        whereas strings and paths are glob patterns of runhistory files (e.g.,
+        ``smac3_output/my_run/*/runhistory.json``). The patterns are resolved on every access so that shards of
+        processes which started later on are picked up. Both json and binary (``.npz``) files are supported.
+    configspace : ConfigurationSpace
+        The configuration space of the shard files.
+    conflict : str, defaults to "keep_first"
+        How trials which are contained in multiple shards are merged (see ``RunHistory.merge``).
+    multi_objective_algorithm : AbstractMultiObjectiveAlgorithm | None, defaults to None
+        Passed to the merged runhistory.
+    """
+
+    def __init__(
+        self,
+        shards: list[RunHistory | str | Path],
+        configspace: ConfigurationSpace,
+        conflict: str = "keep_first",
+        multi_objective_algorithm: AbstractMultiObjectiveAlgorithm | None = None,
+    ) -> None:
+        if conflict not in ("keep_first", "keep_best", "overwrite"):
+            raise ValueError(f"Unknown conflict policy {conflict}.")
+
+        self._shards = shards
+        self._configspace = configspace
+        self._conflict = conflict
+        self._multi_objective_algorithm = multi_objective_algorithm
+
+        # Loaded shard files and the modification state they were loaded with
+        self._loaded_shards: dict[Path, tuple[Hashable, RunHistory]] = {}
+
+        self._runhistory: RunHistory | None = None
+        self._state: list[Hashable] = []
+
+    @property
+    def conflict(self) -> str:
+        """The conflict policy which is used to merge the shards."""
+        return self._conflict
+
+    def get_shards(self) -> list[RunHistory]:
+        """Returns the runhistories of all shards in merge order. Shard files are (re-)loaded if they are new or
+        have been modified since they were loaded.
+        """
+        return [runhistory for _, runhistory in self._get_shards()]
+
+    def get_runhistory(self) -> RunHistory:
+        """Returns the merged runhistory of all shards. The merged runhistory is rebuilt if a shard has been
+        modified since the last call; otherwise, the same object is returned. It should be treated as read-only.
+        """
+        shards = self._get_shards()
+        state = [shard_state for shard_state, _ in shards]
+        if self._runhistory is None or state != self._state:
+            runhistory = RunHistory(multi_objective_algorithm=self._multi_objective_algorithm)
+            runhistory.merge([shard for _, shard in shards], conflict=self._conflict)
+
+            self._runhistory = runhistory
+            self._state = state
+
+        return self._runhistory
+
+    def _get_shards(self) -> list[tuple[Hashable, RunHistory]]:
+        """Returns the shards together with their modification state."""
+        shards: list[tuple[Hashable, RunHistory]] = []
+        for shard in self._shards:
+            if isinstance(shard, RunHistory):
+                # Every modification of a runhistory increases the version of its trial index
+                shards.append(((id(shard), shard._trial_index.version), shard))
+                continue
+
+            for filename in sorted(glob.glob(str(shard))):
+                path = Path(filename)
+                loaded = self._load_shard(path)
+                if loaded is not None:
+                    shards.append(loaded)
+
+        return shards
+
+    def _load_shard(self, filename: Path) -> tuple[Hashable, RunHistory] | None:
+        """Loads a shard file if it is new or has been modified since it was loaded."""
+        try:
+            stat = filename.stat()
+        except OSError:
+            # The file might have been replaced in the meantime
+            return None
+
+        state = (str(filename), stat.st_mtime_ns, stat.st_size)
+        loaded = self._loaded_shards.get(filename)
+        if loaded is None or loaded[0] != state:
+            logger.debug(f"Loading runhistory shard {filename}.")
+            runhistory = RunHistory(multi_objective_algorithm=self._multi_objective_algorithm)
+            runhistory.load(filename, self._configspace)
+            loaded = (state, runhistory)
+            self._loaded_shards[filename] = loaded
+
+        return loaded
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from typing import Iterator
+
 import hashlib
 import logging
 from functools import partial
 
 import numpy as np
 from ConfigSpace import Configuration, ConfigurationSpace
+from ConfigSpace.c_util import change_hp_value, check_configuration
+from ConfigSpace.exceptions import ForbiddenValueError
 from ConfigSpace.hyperparameters import (
     BetaFloatHyperparameter,
     BetaIntegerHyperparameter,
@@ -13,6 +17,7 @@ from ConfigSpace.hyperparameters import (
     Constant,
     NormalFloatHyperparameter,
     NormalIntegerHyperparameter,
+    NumericalHyperparameter,
     OrdinalHyperparameter,
     UniformFloatHyperparameter,
     UniformIntegerHyperparameter,
@@ -155,6 +160,129 @@ def get_conditional_hyperparameters(X: np.ndarray, Y: np.ndarray | None = None)
     return active
 
 
+def get_one_exchange_neighbourhood_vectors(
+    configspace: ConfigurationSpace,
+    vector: np.ndarray,
+    seed: int,
+    num_neighbors: int = 8,
+    stdev: float = 0.05,
+    random_state: np.random.RandomState | None = None,
+) -> Iterator[np.ndarray]:
+    """Returns the one-exchange neighbourhood of a configuration in its vector representation.
+
+    The neighbours (and the order in which they are returned) are the same as the ones of
+    ``get_one_exchange_neighbourhood`` for the same seed but no ``Configuration`` objects are created: Conditions
+    are resolved and forbidden clauses are checked on the vectors directly.
+
+    Parameters
+    ----------
+    configspace : ConfigurationSpace
+        The configuration space of the vector.
+    vector : np.ndarray
+        The vector representation of the configuration whose neighbours are returned.
+    seed : int
+        Seed of the neighbour sampling.
+    num_neighbors : int, defaults to 8
+        Number of neighbours which are sampled per numerical hyperparameter.
+    stdev : float, defaults to 0.05
+        Standard deviation of the neighbours of uniform float and integer hyperparameters.
+    random_state : np.random.RandomState | None, defaults to None
+        Random state which is seeded with `seed` and used for the sampling. Seeding an existing random state is much
+        faster than creating a new one, which matters if many neighbourhoods are generated. The random state must not
+        be used elsewhere while the neighbourhood is iterated.
+
+    Returns
+    -------
+    Iterator[np.ndarray]
+        The vectors of the neighbours.
+    """
+    if random_state is None:
+        rng = np.random.RandomState(seed)
+    else:
+        rng = random_state
+        rng.seed(seed)
+
+    hyperparameters = configspace.get_hyperparameters()
+    n_hyperparameters = len(hyperparameters)
+    values = [None if not np.isfinite(v) else hp._transform(v) for hp, v in zip(hyperparameters, vector)]
+
+    # The number of neighbours which are left per hyperparameter and the hyperparameters without neighbours. Note
+    # that hyperparameters without valid neighbours are added twice (as in ConfigSpace).
+    n_neighbors_per_hp = []
+    used = []
+    for index, (hp, value) in enumerate(zip(hyperparameters, values)):
+        n = hp.get_num_neighbors(value)
+        if isinstance(hp, NumericalHyperparameter) and n > num_neighbors:
+            n = num_neighbors
+
+        n_neighbors_per_hp.append(n)
+        if n == 0 and value is not None:
+            used.append(index)
+
+    n_usable = int(np.sum(np.isfinite(vector)))
+    finite_neighbors_stack: dict[int, list[float]] = {}
+
+    while len(used) < n_usable:
+        index = int(rng.randint(n_hyperparameters))
+        value = vector[index]
+
+        # Inactive hyperparameters have no neighbours
+        if n_neighbors_per_hp[index] == 0 or value != value:
+            continue
+
+        hp = hyperparameters[index]
+        infinite = np.isinf(hp.get_num_neighbors(values[index]))
+        neighbourhood = []
+        iteration = 0
+        while iteration <= 100:
+            if infinite:
+                if len(neighbourhood) > 0:
+                    break
+
+                if isinstance(hp, UniformFloatHyperparameter):
+                    neighbor = hp.get_neighbors(value, rng, number=1, std=stdev)[0]
+                else:
+                    neighbor = hp.get_neighbors(value, rng, number=1)[0]
+            else:
+                if iteration > 0:
+                    break
+
+                if index not in finite_neighbors_stack:
+                    if isinstance(hp, UniformIntegerHyperparameter):
+                        neighbors = hp.get_neighbors(value, rng, number=n_neighbors_per_hp[index], std=stdev)
+                    else:
+                        neighbors = hp.get_neighbors(value, rng)
+
+                    rng.shuffle(neighbors)
+                    finite_neighbors_stack[index] = neighbors
+
+                neighbor = finite_neighbors_stack[index].pop()
+
+            new_vector = change_hp_value(configspace, vector.copy(), hp.name, neighbor, index)
+            try:
+                # Like ConfigSpace, only every twentieth neighbour is checked rigorously
+                if rng.random() > 0.95:
+                    check_configuration(configspace, new_vector, False)
+                else:
+                    configspace._check_forbidden(new_vector)
+
+                neighbourhood.append(new_vector)
+            except ForbiddenValueError:
+                pass
+
+            iteration += 1
+
+        if len(neighbourhood) == 0:
+            n_neighbors_per_hp[index] = 0
+            used.extend([index, index])
+        elif index not in used:
+            n_neighbors_per_hp[index] -= 1
+            if n_neighbors_per_hp[index] == 0:
+                used.append(index)
+
+            yield neighbourhood.pop()
+
+
 def get_config_hash(config: Configuration, chars: int = 6) -> str:
     """Returns a hash of the configuration."""
     return hashlib.sha1(str(config).encode("utf-8")).hexdigest()[:chars]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import json
+import os
+from pathlib import Path
+
+from smac.utils.logging import get_logger
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+logger = get_logger(__name__)
+
+
+def get_journal_filename(filename: str | Path) -> Path:
+    """Returns the filename of the journal belonging to a snapshot, e.g., ``runhistory.jsonl`` for
+    ``runhistory.json``.
+    """
+    return Path(filename).with_suffix(".jsonl")
+
+
+def dump_json(data: Any, filename: str | Path) -> None:
+    """Writes data to a json file. The data is written to a temporary file first, which then replaces the
+    original file. Hence, the file is never left in a partially written state.
+    """
+    filename = Path(filename)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_filename = filename.with_name(filename.name + ".tmp")
+    with open(tmp_filename, "w") as fp:
+        json.dump(data, fp, indent=2)
+
+    os.replace(tmp_filename, filename)
+
+
+class Journal:
+    """Append-only log of json records (JSON Lines). Each record is written as a single compact line.
+
+    A journal is compacted by rotating it: The current file is moved aside (``<filename>.old``) and new records are
+    appended to a fresh file. Once the snapshot covering the rotated records is written, the rotated file is removed.
+    Reading a journal yields the rotated records first. Therefore, records must be applied idempotently because
+    they might be contained in the snapshot already (if the process stopped after writing the snapshot but before
+    the rotated file was removed).
+
+    Parameters
+    ----------
+    filename : str | Path
+        Where the journal is stored.
+    """
+
+    def __init__(self, filename: str | Path) -> None:
+        self._filename = Path(filename)
+
+    @property
+    def filename(self) -> Path:
+        """Filename of the journal."""
+        return self._filename
+
+    @property
+    def rotated_filename(self) -> Path:
+        """Filename of the rotated journal."""
+        return self._filename.with_name(self._filename.name + ".old")
+
+    def exists(self) -> bool:
+        """Whether any records have been written to the journal."""
+        return self._filename.exists() or self.rotated_filename.exists()
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Appends a record to the journal."""
+        self._filename.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._filename, "a") as fp:
+            fp.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def read(self) -> Iterator[dict[str, Any]]:
+        """Yields all records of the journal. Incomplete records (e.g., if the process was killed while writing)
+        are skipped.
+        """
+        for filename in (self.rotated_filename, self._filename):
+            if not filename.exists():
+                continue
+
+            with open(filename) as fp:
+                for line in fp:
+                    if not line.strip():
+                        continue
+
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping incomplete record in journal {filename}.")
+
+    def rotate(self) -> None:
+        """Moves the current records aside so that new records are written to a fresh file. If the journal was
+        rotated before, the records are merged with the previously rotated ones.
+        """
+        if not self._filename.exists():
+            return
+
+        if self.rotated_filename.exists():
+            with open(self.rotated_filename, "a") as fp_old, open(self._filename) as fp:
+                fp_old.write(fp.read())
+
+            self._filename.unlink()
+        else:
+            os.replace(self._filename, self.rotated_filename)
+
+    def remove_rotated(self) -> None:
+        """Removes the rotated records. Should be called once a snapshot covering them was written."""
+        if self.rotated_filename.exists():
+            self.rotated_filename.unlink()
+
+    def clear(self) -> None:
+        """Removes all records."""
+        self.remove_rotated()
+        if self._filename.exists():
+            self._filename.unlink()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def save_npz(filename: str | Path, arrays: dict[str, np.ndarray]) -> None:
+    """Saves the arrays uncompressed so that they can be memory-mapped by ``load_npz``."""
+    filename = Path(filename)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    # ``np.savez`` would append the suffix if it is missing
+    with open(filename, "wb") as fp:
+        np.savez(fp, **arrays)
+
+
+def load_npz(filename: str | Path, mmap: bool = True) -> dict[str, np.ndarray]:
+    """Loads all arrays of a npz file. Arrays which are stored uncompressed are memory-mapped in copy-on-write mode,
+    i.e., the data is only read from disk on access and modifications are not written back to the file.
+
+    Parameters
+    ----------
+    filename : str | Path
+        The npz file.
+    mmap : bool, defaults to True
+        Whether to memory-map the arrays. If false, all arrays are read into memory.
+
+    Returns
+    -------
+    arrays : dict[str, np.ndarray]
+    """
+    arrays: dict[str, np.ndarray] = {}
+
+    if not mmap:
+        with np.load(filename, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    with zipfile.ZipFile(filename) as zf, open(filename, "rb") as fp:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            # The data of a member starts after its local file header (30 bytes + file name + extra field)
+            fp.seek(info.header_offset)
+            header = fp.read(30)
+            if header[:4] != b"PK\x03\x04":
+                raise ValueError(f"Invalid local file header for {info.filename} in {filename}.")
+
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            fp.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(fp)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+
+            if dtype.hasobject:
+                raise ValueError(f"Can not memory-map {info.filename} because it contains objects.")
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    filename,
+                    dtype=dtype,
+                    mode="c",
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                    offset=fp.tell(),
+                )
+
+    return arrays
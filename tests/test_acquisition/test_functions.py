@@ -2,6 +2,7 @@ from typing import Any
 
 import numpy as np
 import pytest
+from ConfigSpace import Configuration, ConfigurationSpace, Float
 
 from smac.acquisition.function import (
     EI,
@@ -9,9 +10,15 @@ from smac.acquisition.function import (
     LCB,
     PI,
     TS,
+    BatchTS,
+    ConstantLiar,
     IntegratedAcquisitionFunction,
+    KrigingBeliever,
+    LocalPenalization,
     PriorAcquisitionFunction,
 )
+from smac import BlackBoxFacade, Scenario
+from smac.model.random_forest import RandomForest
 
 __copyright__ = "Copyright 2022, automl.org"
 __license__ = "3-clause BSD"
@@ -175,6 +182,82 @@ def test_update_without_required(acquisition_function):
         acquisition_function.update(other=None)
 
 
+def test_cache():
+    class CountingModel(MockModel):
+        n_points = 0
+
+        def predict_marginalized(self, X):
+            self.n_points += len(X)
+            return super().predict_marginalized(X)
+
+    model = CountingModel()
+    ei = EI()
+    ei.update(model=model, eta=1.0)
+    X = np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]])
+
+    expected = ei(X)
+    assert model.n_points == 3
+
+    # Only the new point is computed
+    acq = ei(np.vstack([X[[2, 0]], [[0.7, 0.8]]]))
+    assert model.n_points == 4
+    np.testing.assert_array_equal(acq[:2], expected[[2, 0]])
+    assert ei.cache.hits == 2 and ei.cache.misses == 4
+    assert ei.cache.hit_rate == 1 / 3
+
+    # Returned values are not shared with the cache
+    acq[:] = 0
+    np.testing.assert_array_equal(ei(X), expected)
+    assert model.n_points == 4
+
+    # Updating invalidates the cache
+    ei.update(model=model, eta=2.0)
+    assert len(ei.cache) == 0
+    assert not np.array_equal(ei(X), expected)
+    assert model.n_points == 7
+
+    # The least recently used points are evicted
+    ei.cache.max_size = 2
+    assert len(ei.cache) == 2
+    ei(X[2:])
+    assert model.n_points == 7
+    ei(X[:1])
+    assert model.n_points == 8
+
+    ei.cache.max_size = 0
+    ei(X)
+    assert model.n_points == 11
+    assert len(ei.cache) == 0
+
+    # Samples of Thompson sampling are not cached
+    assert TS().cache.max_size == 0
+
+
+def test_cache_wrapped_ts(prior_model, hp_dict3, beta):
+    X = np.array([[0.1, 0.2, 0.3]])
+
+    # Wrappers of Thompson sampling must draw new samples on every call, too
+    prior_model.update_prior(hp_dict3)
+    paf = PriorAcquisitionFunction(acquisition_function=TS(), decay_beta=beta)
+    paf.update(model=prior_model, eta=1)
+    assert not paf.cacheable
+    values = np.array([paf(X) for _ in range(3)])
+    assert len(np.unique(values)) == 3
+    assert paf.cache.hits == 0
+
+    model = MockModelRNG()
+    model.models = [MockModelRNG(seed=seed) for seed in range(3)]
+    iaf = IntegratedAcquisitionFunction(acquisition_function=TS())
+    iaf.update(model=model)
+    assert not iaf.cacheable
+    values = np.array([iaf(X) for _ in range(3)])
+    assert len(np.unique(values)) == 3
+    assert iaf.cache.hits == 0
+
+    # Other acquisition functions are still cached
+    assert PriorAcquisitionFunction(acquisition_function=EI(), decay_beta=beta).cacheable
+
+
 # --------------------------------------------------------------
 # Test IntegratedAcquisitionFunction
 # --------------------------------------------------------------
@@ -758,3 +841,136 @@ def test_ts_sampler():
     model = MockModelSampler()
     ts = TS()
     ts.model = model
+
+
+# --------------------------------------------------------------
+# Test batch acquisition functions
+# --------------------------------------------------------------
+
+
+@pytest.fixture
+def rf_data():
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters([Float("x0", (0, 1)), Float("x1", (0, 1))])
+
+    rng = np.random.RandomState(0)
+    X = rng.rand(30, 2)
+    Y = np.sum((X - 0.3) ** 2, axis=1, keepdims=True)
+    model = RandomForest(cs, seed=0)
+    model.train(X, Y)
+
+    return cs, model, X, Y
+
+
+def test_kriging_believer(rf_data):
+    cs, model, X, Y = rf_data
+    kb = KrigingBeliever(EI())
+    kb.update(model=model, eta=Y.min(), X=X, X_train=X, Y_train=Y)
+
+    x = np.array([[0.3, 0.3], [0.8, 0.8]])
+    expected = EI()
+    expected.update(model=model, eta=Y.min())
+    values = kb(x)
+    np.testing.assert_array_equal(values, expected(x))
+
+    # The pending point is fantasized with the predicted mean
+    kb.add_pending(Configuration(cs, vector=x[0]))
+    fantasy_model = kb._fantasy_model
+    assert fantasy_model is not None and fantasy_model is not model
+    assert kb._X_fantasy.shape == (31, 2)
+    assert kb._Y_fantasy[-1] == pytest.approx(model.predict(x[:1])[0][0])
+    assert kb(x)[0] < values[0]
+
+    # The fantasized target is believed, i.e., it improves on the incumbent
+    assert kb._acquisition_function._eta == min(Y.min(), kb._Y_fantasy[-1, 0])
+
+    # Further pending points extend the fantasies of the same model
+    kb.add_pending(Configuration(cs, vector=x[1]))
+    assert kb._fantasy_model is fantasy_model
+    assert kb._X_fantasy.shape == (32, 2)
+    assert len(kb.pending) == 2
+
+    # Updating the acquisition function drops the pending points
+    kb.update(model=model, eta=Y.min(), X=X, X_train=X, Y_train=Y)
+    assert len(kb.pending) == 0
+    np.testing.assert_array_equal(kb(x), values)
+
+    # The training data are required to fantasize
+    kb.update(model=model, eta=Y.min())
+    with pytest.raises(ValueError):
+        kb.add_pending(Configuration(cs, vector=x[0]))
+
+
+@pytest.mark.parametrize("acquisition_function", [KrigingBeliever, ConstantLiar])
+def test_fantasize_gp(rf_data, acquisition_function):
+    cs, _, X, Y = rf_data
+    model = BlackBoxFacade.get_model(Scenario(cs))
+    model.train(X, Y)
+    hypers = model._hypers.copy()
+
+    fantasy = acquisition_function(EI())
+    fantasy.update(model=model, eta=Y.min(), X=X, Y_train=Y)
+
+    # The posterior of the Gaussian process is conditioned on the pending point without training the model again
+    x = np.array([[0.2, 0.3], [0.8, 0.8]])
+    values = fantasy(x)
+    assert values[0] > 0
+    fantasy.add_pending(Configuration(cs, vector=x[0]))
+    assert fantasy._X_fantasy is None
+    np.testing.assert_array_equal(fantasy._fantasy_model._hypers, hypers)
+    assert fantasy._fantasy_model.predict(x[:1])[1][0, 0] < 0.1 * model.predict(x[:1])[1][0, 0]
+    assert fantasy(x)[0] < 0.1 * values[0]
+
+
+def test_constant_liar(rf_data):
+    cs, model, X, Y = rf_data
+    for lie in ["min", "mean", "max"]:
+        cl = ConstantLiar(EI(), lie=lie)
+        cl.update(model=model, eta=Y.min(), X=X, X_train=X, Y_train=Y)
+        cl.set_pending([Configuration(cs, vector=[0.3, 0.3]), Configuration(cs, vector=[0.8, 0.8])])
+        np.testing.assert_array_equal(cl._Y_fantasy[-2:], getattr(np, lie)(Y) * np.ones((2, 1)))
+
+    with pytest.raises(ValueError):
+        ConstantLiar(EI(), lie="median")
+
+
+def test_local_penalization(rf_data):
+    cs, model, X, Y = rf_data
+    lp = LocalPenalization(EI())
+    lp.update(model=model, eta=Y.min(), X=X)
+    assert lp._lipschitz_constant > 0
+
+    x = np.array([[0.3, 0.3], [0.31, 0.3], [0.9, 0.9]])
+    values = lp(x)
+
+    # The acquisition values are penalized around the pending point, at least by half at the pending point itself
+    lp.set_pending([Configuration(cs, vector=x[0])])
+    penalized = lp(x)
+    assert np.all(penalized <= values)
+    assert penalized[0] <= 0.5 * values[0]
+    assert penalized[2] == pytest.approx(values[2])
+
+    lp.set_pending([])
+    np.testing.assert_array_equal(lp(x), values)
+
+
+def test_local_penalization_ts():
+    lp = LocalPenalization(TS())
+    lp.update(model=MockModelRNG(), eta=1.0)
+    x = np.array([[0.1, 0.2, 0.3]])
+
+    # Each call draws new samples, which must not be frozen by the cache
+    assert not lp.cacheable
+    assert lp(x) != lp(x)
+    assert len(lp.cache) == 0
+
+
+def test_batch_ts():
+    bts = BatchTS()
+    bts.update(model=MockModelRNG(), eta=0.0)
+    x = np.array([[0.1, 0.2, 0.3]])
+
+    # Each call draws new samples
+    assert not bts.cacheable
+    assert bts(x) != bts(x)
+    assert len(bts.cache) == 0
@@ -35,6 +35,7 @@ from smac.acquisition.maximizer import (
     LocalSearch,
     RandomSearch,
 )
+from smac.acquisition.maximizer.helpers import ChallengerList
 from smac.model.random_forest.random_forest import RandomForest
 from smac.runhistory.runhistory import RunHistory
 from smac.runner.abstract_runner import StatusType
@@ -158,6 +159,24 @@ def test_ei_maximization_challenger_list_callback():
         next(rval)
 
 
+def test_challenger_list_lazily():
+    generated = []
+
+    def challengers():
+        for i in range(5):
+            generated.append(i)
+            yield i
+
+    challenger_list = ChallengerList(MockConfigurationSpace(), challengers, random_design=None)
+    assert [next(challenger_list) for _ in range(2)] == [0, 1]
+    assert generated == [0, 1]
+
+    # The remaining challengers are generated to get their number
+    assert len(challenger_list) == 3
+    assert generated == [0, 1, 2, 3, 4]
+    assert list(challenger_list) == [2, 3, 4]
+
+
 def test_ei_maximization_get_next_by_random_search():
     cs = MockConfigurationSpace()
     ei = EI(None)
@@ -257,6 +276,46 @@ def test_local_search_2(configspace, acquisition_function):
     assert values[0][0] >= values[1][0]
 
 
+def test_local_search_vectors(configspace, acquisition_function):
+    # Acquisition functions which are not derived from `AbstractAcquisitionFunction` are called with configurations
+    def configuration_acquisition_function(configurations):
+        assert all(isinstance(config, Configuration) for config in configurations)
+        return acquisition_function(configurations)
+
+    start_points = configspace.sample_configuration(10)
+    expected = LocalSearch(configspace, configuration_acquisition_function, seed=1)._search(start_points)
+    actual = LocalSearch(configspace, acquisition_function, seed=1)._search(start_points)
+
+    assert [config for _, config in actual] == [config for _, config in expected]
+    np.testing.assert_array_equal([value for value, _ in actual], [value for value, _ in expected])
+    for _, config in actual:
+        assert isinstance(config, Configuration)
+        config.is_valid_configuration()
+
+
+def test_local_search_parallel(configspace, acquisition_function):
+    start_points = configspace.sample_configuration(10)
+    actual = LocalSearch(configspace, acquisition_function, n_jobs=2, seed=1)._search_in_parallel(start_points)
+
+    # Each partition is searched with its own seed
+    ls = LocalSearch(configspace, acquisition_function, seed=1)
+    seeds = ls._rng.randint(0, 2**31 - 1, size=2)
+    expected = []
+    for partition, seed in zip(np.array_split(np.arange(10), 2), seeds):
+        ls._rng = np.random.RandomState(seed)
+        expected += ls._search([start_points[i] for i in partition])
+
+    assert [config for _, config in actual] == [config for _, config in expected]
+    np.testing.assert_array_equal([value for value, _ in actual], [value for value, _ in expected])
+    for _, config in actual:
+        assert config.configuration_space is configspace
+
+    # The results are reproducible
+    values = LocalSearch(configspace, acquisition_function, n_jobs=2, seed=1)._maximize(start_points, 10, None)
+    assert values == LocalSearch(configspace, acquisition_function, n_jobs=2, seed=1)._maximize(start_points, 10, None)
+    assert values[0][0] >= values[-1][0]
+
+
 def test_get_initial_points_moo(configspace):
     class Model:
         def predict_marginalized(self, X):
@@ -346,6 +405,30 @@ def test_local_and_random_search(configspace, acquisition_function):
     assert "Acquisition Function Maximizer: Local Search" in config_origins
 
 
+def test_local_and_random_search_lazily(configspace, acquisition_function):
+    previous_configs = configspace.sample_configuration(20)
+    rs = LocalAndSortedRandomSearch(configspace, acquisition_function, local_search_iterations=10)
+    rs._local_search._search_in_parallel = MethodCallLogger(rs._local_search._search_in_parallel)
+
+    # Only the local searches of the first round are run to get the first challengers
+    challengers = rs.maximize(previous_configs, n_points=2)
+    assert rs._local_search._search_in_parallel.call_count == 0
+    first = [next(challengers) for _ in range(2)]
+    assert rs._local_search._search_in_parallel.call_count == 1
+
+    # The remaining challengers are generated if they are requested
+    configs = first + list(challengers)
+    assert rs._local_search._search_in_parallel.call_count > 1
+    assert len(configs) == len(set(configs))
+    assert {config.origin for config in configs} == {
+        "Acquisition Function Maximizer: Random Search (sorted)",
+        "Acquisition Function Maximizer: Local Search",
+    }
+
+    values = acquisition_function(first)
+    assert values[0] >= values[1]
+
+
 # --------------------------------------------------------------
 # TestLocalAndSortedPriorRandomSearch
 # --------------------------------------------------------------
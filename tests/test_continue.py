@@ -15,6 +15,8 @@ from smac import RandomFacade as RFacade
 from smac import Scenario
 from smac.callback.callback import Callback
 from smac.runhistory.dataclasses import TrialInfo, TrialValue
+from smac.runhistory.enumerations import StatusType
+from smac.utils.journal import Journal
 
 FACADES = [BBFacade, HPOFacade, MFFacade, RFacade, HBFacade, ACFacade]
 
@@ -135,3 +137,75 @@ def test_continue_when_walltime_stopped(rosenbrock, facade):
     smac2.optimize()
     assert smac2.runhistory.finished > smac.runhistory.finished
     assert smac2._optimizer.used_walltime > FINAL_LIMIT
+
+
+@pytest.mark.parametrize("facade", [HPOFacade, MFFacade, ACFacade])
+@pytest.mark.parametrize("compact_after", [5, 100])
+def test_continue_from_journal(rosenbrock, facade, compact_after):
+    """
+    Expects
+    -------
+    * In journal mode, a run which was interrupted without saving is restored from the snapshots and journals.
+    """
+    scenario = Scenario(rosenbrock.configspace, n_trials=50, min_budget=1, max_budget=10)
+    smac = facade(scenario, rosenbrock.train, overwrite=True, journal=True)
+    smac.optimizer._compact_after = compact_after
+
+    for _ in range(17):
+        info = smac.ask()
+        cost = rosenbrock.train(info.config, seed=info.seed)
+        smac.tell(info, TrialValue(cost=cost, time=0.5))
+
+    # Wait for a background compaction but do not save (as if the process was killed)
+    if smac.optimizer._compaction_thread is not None:
+        smac.optimizer._compaction_thread.join()
+
+    assert (scenario.output_directory / "runhistory.jsonl").exists()
+
+    # The records of the intensifier only contain the changes, e.g., not all rejected configs
+    for record in Journal(scenario.output_directory / "intensifier.jsonl").read():
+        assert "rejected_config_ids" not in record
+
+    scenario = Scenario(rosenbrock.configspace, n_trials=50, min_budget=1, max_budget=10)
+    smac2 = facade(scenario, rosenbrock.train, journal=True)
+
+    finished = [(k, v) for k, v in smac.runhistory.items() if v.status != StatusType.RUNNING]
+    assert [(k, v) for k, v in smac2.runhistory.items() if v.status != StatusType.RUNNING] == finished
+    assert smac2.runhistory.finished == smac.runhistory.finished == 17
+    assert smac2.intensifier.get_incumbents() == smac.intensifier.get_incumbents()
+    assert smac2.intensifier.trajectory == smac.intensifier.trajectory
+
+    # The journals are compacted when the run is continued
+    assert not (scenario.output_directory / "runhistory.jsonl").exists()
+
+
+@pytest.mark.parametrize("facade", [HPOFacade, MFFacade, ACFacade])
+def test_continue_from_journal_with_running_trials(rosenbrock, facade):
+    """
+    Expects
+    -------
+    * In journal mode, a run which was interrupted while trials were still running is restored, including the
+      running trials which the state of the intensifier refers to.
+    """
+    scenario = Scenario(rosenbrock.configspace, n_trials=50, min_budget=1, max_budget=10)
+    smac = facade(scenario, rosenbrock.train, overwrite=True, journal=True)
+
+    infos = [smac.ask() for _ in range(4)]
+    for info in infos[:2]:
+        cost = rosenbrock.train(info.config, seed=info.seed)
+        smac.tell(info, TrialValue(cost=cost, time=0.5))
+
+    scenario = Scenario(rosenbrock.configspace, n_trials=50, min_budget=1, max_budget=10)
+    smac2 = facade(scenario, rosenbrock.train, journal=True)
+
+    assert smac2.runhistory.finished == 2
+    assert smac2.runhistory.get_running_trials() == smac.runhistory.get_running_trials()
+    assert smac2.intensifier.get_state() == smac.intensifier.get_state()
+
+    # The restored run continues
+    for _ in range(3):
+        info = smac2.ask()
+        cost = rosenbrock.train(info.config, seed=info.seed)
+        smac2.tell(info, TrialValue(cost=cost, time=0.5))
+
+    assert smac2.runhistory.finished == 5
@@ -1,6 +1,14 @@
 import pytest
 
 from smac import HyperparameterOptimizationFacade, MultiFidelityFacade, Scenario
+from smac.acquisition.function import (
+    EI,
+    BatchTS,
+    ConstantLiar,
+    KrigingBeliever,
+    LocalPenalization,
+)
+from smac.runhistory import TrialValue
 
 
 def test_termination_cost_threshold(rosenbrock):
@@ -55,3 +63,30 @@ def test_termination_cost_threshold_with_fidelities(rosenbrock):
     assert config == i
     assert counter == 1
     assert smac.validate(i) < termination_cost_threshold
+
+
+@pytest.mark.parametrize(
+    "acquisition_function",
+    [KrigingBeliever(EI()), ConstantLiar(EI()), LocalPenalization(EI()), BatchTS()],
+)
+def test_batch_acquisition_function(rosenbrock, acquisition_function):
+    scenario = Scenario(rosenbrock.configspace, deterministic=True, n_trials=100)
+    smac = HyperparameterOptimizationFacade(
+        scenario,
+        rosenbrock.train,
+        acquisition_function=acquisition_function,
+        intensifier=HyperparameterOptimizationFacade.get_intensifier(scenario, max_config_calls=1),
+        overwrite=True,
+    )
+
+    for _ in range(20):
+        info = smac.ask()
+        smac.tell(info, TrialValue(cost=rosenbrock.train(info.config)))
+
+    # The configurations of the running trials and the selected ones are pending
+    infos = [smac.ask() for _ in range(4)]
+    configs = [info.config for info in infos]
+    assert len(set(configs)) == 4
+    assert len(acquisition_function.pending) >= 3
+    pending = {tuple(vector) for vector in acquisition_function.pending}
+    assert {tuple(config.get_array()) for config in configs[:-1]} <= pending
@@ -88,3 +88,36 @@ def test_pca(configspace_small, make_scenario):
     X_test, _ = get_X_y(configspace_small, n_samples, 10)
     with pytest.raises(ValueError, match="Feature mismatch.*"):
         model.predict_marginalized(X_test)
+
+
+def test_feature_projection(configspace_small):
+    rs = np.random.RandomState(1)
+    instance_features = {str(i): list(rs.rand(10)) for i in range(20)}
+    features = np.array(list(instance_features.values()))
+
+    model = AbstractModel(configspace_small, instance_features, pca_components=3)
+    model._train = _train
+    model._predict = lambda X, covariance_type: (X[:, -3:], X[:, -3:])
+
+    X, y = get_X_y(configspace_small, 50, None)
+    X = np.hstack((X, features[rs.randint(0, 20, 50)]))
+    model.train(X, y)
+    assert model._apply_pca
+
+    # The scaler and the PCA are fitted on the features of all instances
+    np.testing.assert_allclose(model._scaler.data_min_, features.min(axis=0))
+    expected = model._pca.transform(model._scaler.transform(X[:, -10:]))
+    mean, _ = model.predict(X)
+    np.testing.assert_allclose(mean, expected)
+
+    # They are not fitted again if the instance features did not change
+    projection = model._projection
+    model.train(X[:40], y[:40])
+    assert model._projection is projection
+
+    # But if they changed
+    instance_features["0"] = list(rs.rand(10))
+    model.train(X, y)
+    assert model._projection is not projection
+    mean, _ = model.predict(X)
+    np.testing.assert_allclose(mean, model._pca.transform(model._scaler.transform(X[:, -10:])))
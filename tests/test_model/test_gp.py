@@ -20,7 +20,7 @@ __copyright__ = "Copyright 2021, AutoML.org Freiburg-Hannover"
 __license__ = "3-clause BSD"
 
 
-def get_gp(n_dimensions, seed, noise=1e-3, normalize_y=True) -> GaussianProcess:
+def get_gp(n_dimensions, seed, noise=1e-3, normalize_y=True, reoptimize_after=1) -> GaussianProcess:
     from smac.model.gaussian_process.kernels import (
         ConstantKernel,
         MaternKernel,
@@ -58,6 +58,7 @@ def get_gp(n_dimensions, seed, noise=1e-3, normalize_y=True) -> GaussianProcess:
         kernel=kernel,
         n_restarts=2,
         normalize_y=normalize_y,
+        reoptimize_after=reoptimize_after,
         seed=rs.randint(low=1, high=10000),
     )
     return model
@@ -201,6 +202,96 @@ def test_train_do_optimize():
     np.testing.assert_array_almost_equal(theta, theta_)
 
 
+def test_incremental_update():
+    seed = 1
+    rs = np.random.RandomState(seed)
+    X = rs.rand(40, 3)
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+
+    model = get_gp(3, seed, reoptimize_after=10)
+    model.train(X[:20], Y[:20])
+    hypers = model._hypers.copy()
+    n_ll_evals = model._n_ll_evals
+
+    # New data points are added with the current hyperparameters
+    model.train(X[:25], Y[:25])
+    assert model._n_ll_evals == n_ll_evals
+    np.testing.assert_array_equal(model._hypers, hypers)
+
+    # The updated Gaussian process equals a Gaussian process which is fitted from scratch
+    expected = get_gp(3, seed)
+    expected._kernel.theta = hypers
+    expected._train(X[:25], Y[:25], optimize_hyperparameters=False)
+    for actual, desired in zip(model.predict(X[25:]), expected.predict(X[25:])):
+        np.testing.assert_allclose(actual, desired, rtol=1e-6)
+
+    assert model._gp.log_marginal_likelihood_value_ == pytest.approx(
+        expected._gp.log_marginal_likelihood_value_, rel=1e-6
+    )
+
+    # The hyperparameters are optimized after ten new data points or if previous data points change
+    model.train(X[:30], Y[:30])
+    assert model._n_ll_evals > n_ll_evals
+
+    n_ll_evals = model._n_ll_evals
+    model.train(X[1:31], Y[1:31])
+    assert model._n_ll_evals > n_ll_evals
+
+
+@pytest.mark.parametrize("normalize_y", [False, True])
+def test_fantasize(normalize_y):
+    seed = 1
+    rs = np.random.RandomState(seed)
+    X = rs.rand(30, 3)
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+
+    model = get_gp(3, seed, normalize_y=normalize_y)
+    model.train(X[:20], Y[:20])
+    hypers = model._hypers.copy()
+    mean, var = model.predict(X[20:25])
+
+    # The posterior is conditioned on the fantasies with the current hyperparameters and normalization
+    model.fantasize(X[20:25], mean)
+    np.testing.assert_array_equal(model._hypers, hypers)
+    fantasized_mean, fantasized_var = model.predict(X[20:25])
+    np.testing.assert_allclose(fantasized_mean, mean, atol=1e-3)
+    assert np.all(fantasized_var < 0.1 * var)
+
+    if not normalize_y:
+        # The conditioned Gaussian process equals a Gaussian process which is fitted on all data points
+        expected = get_gp(3, seed, normalize_y=False)
+        expected._kernel.theta = hypers
+        expected._train(np.vstack([X[:20], X[20:25]]), np.vstack([Y[:20], mean]), optimize_hyperparameters=False)
+        for actual, desired in zip(model.predict(X[25:]), expected.predict(X[25:])):
+            np.testing.assert_allclose(actual, desired, rtol=1e-6)
+
+
+def test_parallel_optimization():
+    seed = 1
+    rs = np.random.RandomState(seed)
+    X = rs.rand(30, 3)
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+
+    hypers = []
+    for n_jobs in [1, 2]:
+        model = get_gp(3, seed)
+        model._n_jobs = n_jobs
+        model.train(X, Y)
+        hypers.append(model._hypers)
+
+        # One restart from the previous hyperparameters and two restarts from the prior
+        assert len(model.meta["restart_times"]) == 3
+
+    np.testing.assert_array_equal(hypers[0], hypers[1])
+
+    # The optimization stops once two restarts converged to the same optimum
+    model = get_gp(3, seed)
+    model._n_restarts = 20
+    model._n_converged_restarts = 2
+    model.train(X, Y)
+    assert len(model.meta["restart_times"]) < 21
+
+
 def test_train_continue_on_linalg_error():
     """Checks that training does not stop on a linalg error, but that uncertainty is increased!"""
 
@@ -442,3 +533,67 @@ def test_impute_inactive_hyperparameters():
         elif line[0] == 1:
             assert line[2] == -1
 """
+
+
+def test_difference_cache():
+    from smac.model.gaussian_process.kernels import (
+        DifferenceCache,
+        HammingKernel,
+        MaternKernel,
+        RBFKernel,
+    )
+    from smac.utils.configspace import get_conditional_hyperparameters
+
+    rs = np.random.RandomState(1)
+    X = np.hstack([rs.rand(20, 3), rs.randint(0, 3, (20, 2))])
+    X[:5, 1] = -1
+    X[7] = X[8]
+
+    kernels = [
+        MaternKernel(np.array([0.7, 1.0, 2.0]), nu=nu, operate_on=np.arange(3), has_conditions=True)
+        for nu in [0.5, 1.5, 2.5]
+    ]
+    kernels.append(RBFKernel(np.array([0.5, 1.0, 2.0]), operate_on=np.arange(3), has_conditions=True))
+    kernels.append(HammingKernel(np.array([0.5, 2.0]), operate_on=np.array([3, 4])))
+
+    for kernel in kernels:
+        X_ = X[:, kernel.operate_on]
+        active = get_conditional_hyperparameters(X_) if kernel.has_conditions else None
+        for _ in range(2):
+            K, K_gradient = kernel(X, eval_gradient=True)
+            expected_K, expected_K_gradient = kernel._call(X_, None, True, active)
+            np.testing.assert_allclose(K, expected_K, atol=1e-12)
+            np.testing.assert_allclose(K_gradient, expected_K_gradient, atol=1e-12)
+
+            # Only the length scales change
+            kernel.theta = kernel.theta + 0.5
+
+    cache = DifferenceCache(max_size=2 * 20 * 20 * 3 * 8)
+    X1, X2, X3 = rs.rand(20, 3), rs.rand(20, 3), rs.rand(20, 3)
+    differences = cache.get(X1, None, "squared")
+    np.testing.assert_allclose(differences, (X1[:, np.newaxis] - X1[np.newaxis]) ** 2)
+    assert cache.get(X1, None, "squared") is differences
+    assert cache.get(X1.copy(), None, "squared") is not differences
+    assert cache.get(X1, np.array([0, 1]), "squared").shape == (20, 20, 2)
+
+    # The least recently used entries are evicted
+    cache.clear()
+    cache.get(X1, None, "squared")
+    cache.get(X2, None, "squared")
+    cache.get(X1, None, "squared")
+    cache.get(X3, None, "squared")
+    assert cache.size == 2 * 20 * 20 * 3 * 8
+    assert len(cache._entries) == 2
+    assert {key[0] for key in cache._entries} == {id(X1), id(X3)}
+
+    # Entries are dropped with their data points and too large entries are not cached
+    del X1
+    assert len(cache._entries) == 1
+    cache.get(rs.rand(40, 3), None, "squared")
+    assert len(cache._entries) == 1
+
+    cache.max_size = 0
+    assert cache.size == 0
+
+    with pytest.raises(ValueError):
+        cache.get(X2, None, "distance")
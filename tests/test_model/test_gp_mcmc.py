@@ -240,3 +240,92 @@ def test_normalization():
     mu_hat_prime, var_hat_prime = gp_norm.predict(X_test)
     np.testing.assert_array_almost_equal(mu_hat, mu_hat_prime, decimal=4)
     np.testing.assert_array_almost_equal(var_hat, var_hat_prime, decimal=4)
+
+
+def test_batched_kernel():
+    from smac.model.gaussian_process.kernels import (
+        BatchedKernel,
+        ConstantKernel,
+        HammingKernel,
+        MaternKernel,
+        RBFKernel,
+        WhiteKernel,
+    )
+
+    rs = np.random.RandomState(1)
+    X = np.hstack([rs.rand(20, 3), rs.randint(0, 3, (20, 2))])
+    X[:5, 1] = -1
+    Y = np.hstack([rs.rand(7, 3), rs.randint(0, 3, (7, 2))])
+
+    kernels = [
+        ConstantKernel(2.0)
+        * MaternKernel(np.ones(3), nu=nu, operate_on=np.arange(3), has_conditions=True)
+        * HammingKernel(np.ones(2), operate_on=np.array([3, 4]))
+        + WhiteKernel(1e-3)
+        for nu in [0.5, 1.5, 2.5]
+    ]
+    kernels.append(ConstantKernel(2.0) * RBFKernel(1.5, operate_on=np.arange(3)) + WhiteKernel(1e-3))
+
+    for kernel in kernels:
+        batched_kernel = BatchedKernel(kernel)
+        thetas = rs.randn(4, len(kernel.theta))
+        K = batched_kernel(thetas, batched_kernel.precompute(X))
+        K_cross = batched_kernel(thetas, batched_kernel.precompute(X, Y))
+        assert K.shape == (4, 20, 20)
+        assert K_cross.shape == (4, 20, 7)
+
+        for i, theta in enumerate(thetas):
+            kernel.theta = theta
+            np.testing.assert_allclose(K[i], kernel(X))
+            np.testing.assert_allclose(K_cross[i], kernel(X, Y))
+
+    assert not BatchedKernel.is_supported(MaternKernel(1.0, nu=3.5))
+    with pytest.raises(ValueError):
+        BatchedKernel(MaternKernel(1.0, nu=3.5))
+
+
+def test_batched_likelihood():
+    seed = 1
+    rs = np.random.RandomState(seed)
+    X = rs.rand(30, 3)
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+
+    model = get_gp(3, seed)
+    model.train(X, Y)
+    assert model._batched_kernel is not None
+    assert model._cache is None
+
+    expected = get_gp(3, seed)
+    expected._batched_kernel = None
+    expected.train(X, Y)
+    np.testing.assert_allclose(model._samples, expected._samples)
+    assert len(model.models) == len(expected.models)
+
+    X_test = rs.rand(20, 3)
+    for actual, desired in zip(model.predict(X_test), expected.predict(X_test)):
+        np.testing.assert_allclose(actual, desired, rtol=1e-6, atol=1e-10)
+
+    # The likelihood of all walkers equals the one of each walker
+    model._cache = model._batched_kernel.precompute(model._impute_inactive(X))
+    model._y_train = model._normalize(Y).flatten()
+    model._gp.fit(model._impute_inactive(X), model._normalize(Y))
+    thetas = rs.uniform(-3, 1, size=(10, len(model._kernel.theta)))
+    thetas[0, -1] = -100
+    np.testing.assert_allclose(model._ll_batch(thetas), [model._ll(theta.copy()) for theta in thetas])
+
+
+def test_fantasize():
+    rs = np.random.RandomState(1)
+    X = rs.rand(25, 3)
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+
+    model = get_gp(3, 1, n_iter=20)
+    model.train(X[:20], Y[:20])
+    mean, var = model.predict(X[20:])
+
+    # The posteriors of all models are conditioned on the fantasies, i.e., they keep sharing their data points
+    model.fantasize(X[20:], mean)
+    assert all(len(gp._gp.X_train_) == 25 for gp in model.models)
+    fantasized_mean, fantasized_var = model.predict(X[20:])
+    np.testing.assert_allclose(fantasized_mean, mean, atol=1e-2)
+    assert np.all(fantasized_var < var)
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from ConfigSpace import ConfigurationSpace, UniformFloatHyperparameter
+
+from smac import BlackBoxFacade, Scenario
+from smac.model.gaussian_process import GaussianProcess, SparseGaussianProcess
+from smac.model.gaussian_process.priors import HorseshoePrior, LogNormalPrior
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def get_kernel(n_dimensions, seed):
+    from smac.model.gaussian_process.kernels import (
+        ConstantKernel,
+        MaternKernel,
+        WhiteKernel,
+    )
+
+    cov_amp = ConstantKernel(
+        2.0,
+        constant_value_bounds=(1e-10, 2),
+        prior=LogNormalPrior(mean=0.0, sigma=1.0, seed=seed),
+    )
+
+    exp_kernel = MaternKernel(
+        np.ones([n_dimensions]),
+        [(np.exp(-10), np.exp(2)) for _ in range(n_dimensions)],
+        nu=2.5,
+    )
+
+    noise_kernel = WhiteKernel(
+        noise_level=1e-3,
+        noise_level_bounds=(1e-10, 2),
+        prior=HorseshoePrior(scale=0.1, seed=seed),
+    )
+
+    return cov_amp * exp_kernel + noise_kernel
+
+
+def get_cs(n_dimensions):
+    configspace = ConfigurationSpace()
+    for i in range(n_dimensions):
+        configspace.add_hyperparameter(UniformFloatHyperparameter("x%d" % i, 0, 1))
+
+    return configspace
+
+
+def test_equals_exact_gp():
+    """
+    Expects
+    -------
+    * With at least as many inducing points as data points, the sparse GP equals the exact GP.
+    """
+    rs = np.random.RandomState(1)
+    X = rs.rand(40, 3)
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+    X_test = rs.rand(10, 3)
+
+    exact = GaussianProcess(get_cs(3), get_kernel(3, 1), n_restarts=2, seed=1)
+    exact.train(X, Y)
+
+    kernel = get_kernel(3, 1)
+    kernel.theta = exact._hypers
+    model = SparseGaussianProcess(get_cs(3), kernel, n_inducing_points=50, n_restarts=2, seed=1)
+    model._train(X, Y, optimize_hyperparameters=False)
+    assert len(model._X_inducing) == 40
+
+    for covariance_type in ["diagonal", "full"]:
+        for actual, expected in zip(
+            model.predict(X_test, covariance_type=covariance_type),
+            exact.predict(X_test, covariance_type=covariance_type),
+        ):
+            np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-6)
+
+
+@pytest.mark.parametrize("inducing_point_selection", ["greedy_variance", "kmeans++"])
+def test_inducing_points(inducing_point_selection):
+    """
+    Expects
+    -------
+    * The sparse GP selects the given number of distinct inducing points and approximates the function well.
+    * Duplicated data points are not selected twice.
+    """
+    rs = np.random.RandomState(1)
+    X = rs.rand(1000, 2)
+    X = np.vstack([X, X[:100]])
+    Y = np.sin(X * 3).sum(axis=1, keepdims=True)
+
+    model = SparseGaussianProcess(
+        get_cs(2),
+        get_kernel(2, 1),
+        n_inducing_points=30,
+        inducing_point_selection=inducing_point_selection,
+        n_restarts=2,
+        seed=1,
+    )
+    model.train(X, Y)
+    assert len(np.unique(model._X_inducing, axis=0)) == 30
+
+    X_test = rs.rand(200, 2)
+    mean, var = model.predict(X_test)
+    assert mean.shape == (200, 1)
+    assert np.all(var > 0)
+    assert np.sqrt(np.mean((mean.ravel() - np.sin(X_test * 3).sum(axis=1)) ** 2)) < 0.05
+
+    assert model.sample_functions(X_test[:5], n_funcs=3).shape == (5, 3)
+
+    # Only duplicated points are left
+    model = SparseGaussianProcess(get_cs(2), get_kernel(2, 1), n_inducing_points=30, n_restarts=0, seed=1)
+    model.train(np.repeat(X[:10], 5, axis=0), np.repeat(Y[:10], 5, axis=0))
+    assert len(model._X_inducing) == 10
+
+
+def test_blackbox_facade():
+    """
+    Expects
+    -------
+    * The black-box facade returns a sparse GP for the model type `sparse`.
+    """
+    scenario = Scenario(get_cs(2))
+    model = BlackBoxFacade.get_model(scenario, model_type="sparse", n_inducing_points=20)
+    assert isinstance(model, SparseGaussianProcess)
+    assert model.meta["n_inducing_points"] == 20
+
+    with pytest.raises(ValueError):
+        SparseGaussianProcess(get_cs(2), get_kernel(2, 1), inducing_point_selection="random")
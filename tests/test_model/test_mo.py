@@ -37,3 +37,65 @@ def test_train_and_predict_with_rf():
     m, v = model.predict_marginalized(X[10:])
     assert m.shape == (10, 2)
     assert v.shape == (10, 2)
+
+
+def test_train_and_predict_in_parallel():
+    """
+    Expects
+    -------
+    * The models are trained and predict the same in parallel.
+    * A single model is copied for each objective.
+    """
+    rs = np.random.RandomState(1)
+    X = rs.rand(30, 3)
+    Y = np.hstack([np.sin(X * 3).sum(axis=1, keepdims=True), np.cos(X * 3).sum(axis=1, keepdims=True)])
+
+    results = []
+    for n_jobs in [1, 2]:
+        model = MultiObjectiveModel(models=RandomForest(_get_cs(3), seed=1), objectives=["a", "b"], n_jobs=n_jobs)
+        assert model.models[0] is not model.models[1]
+
+        model.train(X[:20], Y[:20])
+        results.append(model.predict(X[20:]) + model.predict_marginalized(X[20:]))
+
+    for expected, actual in zip(*results):
+        np.testing.assert_array_almost_equal(expected, actual)
+
+    # Each objective is predicted by its own model
+    assert not np.allclose(results[0][0][:, 0], results[0][0][:, 1])
+
+
+def test_shared_preprocessing():
+    """
+    Expects
+    -------
+    * The instance features are reduced once and the models are trained on the reduced features directly.
+    * The models predict the same as if they were trained on their own.
+    """
+    rs = np.random.RandomState(1)
+    instance_features = {str(i): list(rs.rand(10)) for i in range(5)}
+    features = np.array(list(instance_features.values()))
+    X = np.hstack([rs.rand(40, 3), features[rs.randint(0, 5, 40)]])
+    Y = rs.rand(40, 2)
+
+    models = [RandomForest(_get_cs(3), instance_features=instance_features, pca_components=2) for _ in range(2)]
+    model = MultiObjectiveModel(models=models, objectives=["a", "b"])
+    with mock.patch.object(RandomForest, "train") as train:
+        model.train(X, Y)
+        train.assert_not_called()
+
+    assert all(m._apply_pca for m in models)
+    assert all(len(m._types) == 3 + 2 for m in models)
+
+    expected = [RandomForest(_get_cs(3), instance_features=instance_features, pca_components=2) for _ in range(2)]
+    for i, m in enumerate(expected):
+        m.train(X, Y[:, i])
+
+    mean, var = model.predict(X[:5])
+    for i, m in enumerate(expected):
+        expected_mean, expected_var = m.predict(X[:5])
+        np.testing.assert_array_almost_equal(mean[:, i], expected_mean.flatten())
+        np.testing.assert_array_almost_equal(var[:, i], expected_var.flatten())
+
+    mean, var = model.predict_marginalized(X[:5, :3])
+    assert mean.shape == (5, 2)
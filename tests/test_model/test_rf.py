@@ -1,3 +1,5 @@
+import pickle
+
 import numpy as np
 import pytest
 from ConfigSpace import (
@@ -8,7 +10,9 @@ from ConfigSpace import (
     UniformFloatHyperparameter,
     UniformIntegerHyperparameter,
 )
+from pyrfr import regression
 
+from smac.constants import VERY_SMALL_NUMBER
 from smac.model.random_forest.random_forest import RandomForest
 from smac.utils.configspace import convert_configurations_to_array
 
@@ -215,6 +219,137 @@ def test_with_ordinal():
         assert pytest.approx(y[idx], 0.05) == m
 
 
+@pytest.mark.parametrize("log_y", [False, True])
+@pytest.mark.parametrize("n_trees", [1, 10])
+def test_batched_predict(log_y, n_trees):
+    cs = ConfigurationSpace(seed=0)
+    a = cs.add_hyperparameter(CategoricalHyperparameter("a", ["x", "y", "z", "w"]))
+    b = cs.add_hyperparameter(UniformFloatHyperparameter("b", 0, 1))
+    c = cs.add_hyperparameter(UniformIntegerHyperparameter("c", 1, 10))
+    cs.add_condition(EqualsCondition(b, a, "x"))
+
+    X_train = convert_configurations_to_array(cs.sample_configuration(200))
+    y_train = np.nan_to_num(X_train).sum(axis=1) + np.random.RandomState(0).rand(200)
+    model = RandomForest(configspace=cs, n_trees=n_trees, log_y=log_y)
+    model.train(X_train, y_train.reshape((-1, 1)))
+
+    X = convert_configurations_to_array(cs.sample_configuration(500))
+    means, vars_ = model.predict(X)
+    assert means.shape == (500, 1)
+
+    # The batched prediction equals the prediction of pyrfr per row
+    X = model._impute_inactive(X)
+    for row_X, mean, var in zip(X, means, vars_):
+        if log_y:
+            preds = [
+                np.log(np.mean(np.exp(values)) + VERY_SMALL_NUMBER)
+                for forest in model._rf
+                for values in forest.all_leaf_values(row_X)
+            ]
+            expected_mean, expected_var = np.mean(preds), np.var(preds)
+        else:
+            # The variance of the tree means is unbiased (as the one of pyrfr forests with multiple trees)
+            preds = [forest.predict_mean_var(row_X)[0] for forest in model._rf]
+            expected_mean, expected_var = np.mean(preds), np.var(preds, ddof=1) if n_trees > 1 else 0.0
+
+        assert mean[0] == pytest.approx(expected_mean)
+        assert var[0] == pytest.approx(expected_var, abs=1e-10)
+
+
+@pytest.mark.parametrize("log_y", [False, True])
+def test_online_update(log_y):
+    rs = np.random.RandomState(1)
+    X = rs.rand(60, 5)
+    y = X.sum(axis=1, keepdims=True)
+
+    model = RandomForest(configspace=_get_cs(5), log_y=log_y, rebuild_after=3)
+    model.train(X[:40], y[:40])
+    forest = model._rf
+    model.predict(X)
+
+    # New data points are added to the leaves of the existing forest
+    model.train(X[:50], y[:50])
+    assert model._rf is forest
+
+    # The updated predictor equals a predictor which is exported from the updated forest
+    means, vars_ = model.predict(X)
+    model._predictor = None
+    expected_means, expected_vars = model.predict(X)
+    np.testing.assert_allclose(means, expected_means)
+    np.testing.assert_allclose(vars_, expected_vars, atol=1e-12)
+
+    # The forest is rebuilt after three trainings or if previous targets change
+    model.train(X[:55], y[:55])
+    assert model._rf is forest
+    model.train(X, y)
+    assert model._rf is not forest
+
+    forest = model._rf
+    model.train(X, y + 1)
+    assert model._rf is not forest
+
+
+def test_n_jobs():
+    rs = np.random.RandomState(1)
+    X = rs.rand(100, 5)
+    y = X.sum(axis=1, keepdims=True)
+    X_test = rs.rand(2500, 5)
+
+    F = {f"instance-{i}": list(rs.rand(2)) for i in range(3)}
+    X_instances = np.hstack([X, rs.rand(100, 2)])
+
+    predictions = []
+    for n_jobs in [1, 2, 4]:
+        model = RandomForest(configspace=_get_cs(5), n_trees=7, n_jobs=n_jobs, seed=5)
+        model.train(X, y)
+        model.train(X, y + 1)
+        assert len(model._rf) == 7
+        assert model.meta["n_jobs"] == n_jobs
+
+        model_instances = RandomForest(configspace=_get_cs(5), instance_features=F, n_jobs=n_jobs, seed=5)
+        model_instances.train(X_instances, y)
+        predictions.append((*model.predict(X_test), *model_instances.predict_marginalized(X_test[:10])))
+
+    # Each tree is fitted with its own seed, which is drawn from the random state of the model
+    model = RandomForest(configspace=_get_cs(5), n_trees=7, seed=5)
+    model.train(X, y)
+    model.train(X, y + 1)
+
+    rng = np.random.RandomState(5)
+    rng.randint(0, 2**31 - 1, size=7)
+    for forest, seed in zip(model._rf, rng.randint(0, 2**31 - 1, size=7)):
+        expected_forest = regression.binary_rss_forest()
+        expected_forest.options = forest.options
+        expected_forest.fit(
+            model._init_data_container(X, (y + 1).flatten()), rng=regression.default_random_engine(int(seed))
+        )
+        assert forest.ascii_string_representation() == expected_forest.ascii_string_representation()
+
+    # The forest is the same for any number of jobs
+    for prediction in predictions[1:]:
+        for expected, actual in zip(predictions[0], prediction):
+            np.testing.assert_array_equal(expected, actual)
+
+
+def test_pickle():
+    rs = np.random.RandomState(1)
+    X = rs.rand(60, 5)
+    y = X.sum(axis=1, keepdims=True)
+
+    model = RandomForest(configspace=_get_cs(5), rebuild_after=3)
+    model.train(X[:40], y[:40])
+    copy = pickle.loads(pickle.dumps(model))
+
+    for expected, actual in zip(model.predict(X), copy.predict(X)):
+        np.testing.assert_array_equal(expected, actual)
+
+    # The restored forest can be updated with new data points
+    model.train(X[:50], y[:50])
+    copy.train(X[:50], y[:50])
+    for expected, actual in zip(model.predict(X), copy.predict(X)):
+        np.testing.assert_allclose(expected, actual)
+
+
 # def test_rf_on_sklearn_data():
 #     import sklearn.datasets
 
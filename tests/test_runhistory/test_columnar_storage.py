@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from smac.multi_objective.aggregation_strategy import MeanAggregationStrategy
+from smac.runhistory.columnar_storage import ColumnarStorage
+from smac.runhistory.dataclasses import TrialKey, TrialValue
+from smac.runhistory.enumerations import StatusType
+from smac.runhistory.runhistory import RunHistory
+from smac.scenario import Scenario
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def test_mapping_semantics():
+    """
+    Expects
+    -------
+    * The storage behaves like an ordered dictionary, also when trials are overwritten or removed.
+    * Values are reconstructed with the same types as they were stored.
+    """
+    storage = ColumnarStorage(capacity=2)
+    reference: OrderedDict[TrialKey, TrialValue] = OrderedDict()
+
+    items = [
+        (TrialKey(1), TrialValue(cost=1.0, time=2.0, starttime=3.0, endtime=5.0)),
+        (TrialKey(2, "i1", 5, 1.0), TrialValue(cost=[1.0, 2.0], additional_info={"a": 1})),
+        (TrialKey(2, "i2", None, None), TrialValue(cost=3.0, status=StatusType.CRASHED, additional_info=None)),
+        (TrialKey(3, "i1", 0), TrialValue(cost=float(2**31 - 1), status=StatusType.RUNNING)),
+        (TrialKey(1), TrialValue(cost=0.5, status=StatusType.TIMEOUT)),
+    ]
+
+    for k, v in items:
+        storage[k] = v
+        reference[k] = v
+
+    assert len(storage) == len(reference) == 4
+    assert list(storage.keys()) == list(reference.keys())
+    assert list(storage.values()) == list(reference.values())
+    assert storage[TrialKey(2, "i1", 5, 1.0)].cost == [1.0, 2.0]
+    assert storage[TrialKey(1)].status == StatusType.TIMEOUT
+    assert storage.instance_table == ["i1", "i2"]
+    assert storage.instance_ids.tolist() == [-1, 0, 1, 0]
+
+    del storage[TrialKey(2, "i1", 5, 1.0)]
+    del reference[TrialKey(2, "i1", 5, 1.0)]
+    storage[TrialKey(2, "i1", 5, 1.0)] = TrialValue(cost=[4.0, 5.0])
+    reference[TrialKey(2, "i1", 5, 1.0)] = TrialValue(cost=[4.0, 5.0])
+
+    assert list(storage.items()) == list(reference.items())
+    assert storage.config_ids.tolist() == [1, 2, 3, 2]
+    assert storage.costs.shape == (4, 2)
+    assert storage == reference
+    assert TrialKey(4) not in storage
+
+
+@pytest.mark.parametrize("collide", [False, True])
+def test_lookup(collide, monkeypatch):
+    """
+    Expects
+    -------
+    * Trials are looked up by config id, instance, seed and budget, where None differs from zero.
+    * Trials whose instance and seed are packed into the same code are kept apart.
+    """
+    if collide:
+        monkeypatch.setattr(ColumnarStorage, "_get_key_code", staticmethod(lambda *args: 0))
+        monkeypatch.setattr(
+            ColumnarStorage, "_get_key_codes", staticmethod(lambda instance_ids, *args: np.zeros(len(instance_ids)))
+        )
+
+    storage = ColumnarStorage()
+    keys = [
+        TrialKey(1),
+        TrialKey(1, None, 0),
+        TrialKey(1, None, None, 0.0),
+        TrialKey(1, "i1", 0, 0.0),
+        TrialKey(1, "i1", 0, 1.0),
+        TrialKey(1, "i2", 0, 1.0),
+        TrialKey(2, "i1", 0, 1.0),
+    ]
+    for cost, k in enumerate(keys):
+        storage[k] = TrialValue(cost=float(cost))
+
+    assert len(storage) == len(keys)
+    assert [storage[k].cost for k in keys] == list(range(len(keys)))
+    assert [storage.get_row(k) for k in keys] == list(range(len(keys)))
+    assert TrialKey(1, "i3", 0, 1.0) not in storage
+    assert TrialKey(3) not in storage
+    assert storage.get(TrialKey(1, "i1", 1, 1.0)) is None
+
+    # Removing a trial keeps the lookup of the subsequent trials intact
+    del storage[keys[1]]
+    assert [storage[k].cost for k in keys[2:]] == list(range(2, len(keys)))
+
+    with pytest.raises(KeyError):
+        storage.get_row(keys[1])
+
+
+def test_runhistory_equivalence(configspace_small, tmp_path):
+    """
+    Expects
+    -------
+    * A runhistory with columnar storage yields the same trials, costs and bounds as the default one.
+    * The columnar runhistory survives pickling and saving/loading.
+    """
+    scenario = Scenario(configspace_small, objectives=["a", "b"])
+    configs = configspace_small.sample_configuration(5)
+
+    runhistories = [
+        RunHistory(multi_objective_algorithm=MeanAggregationStrategy(scenario)),
+        RunHistory(multi_objective_algorithm=MeanAggregationStrategy(scenario), columnar=True),
+    ]
+
+    rng = np.random.RandomState(0)
+    trials = []
+    for i in range(50):
+        config = configs[rng.randint(len(configs))]
+        cost = rng.rand(2).tolist()
+        status = StatusType.SUCCESS if rng.rand() > 0.2 else StatusType.CRASHED
+        trials.append((config, cost, status, f"i{i % 3}", i % 4, float(1 + i % 2)))
+
+    for runhistory in runhistories:
+        for config, cost, status, instance, seed, budget in trials:
+            runhistory.add(config, cost, status=status, instance=instance, seed=seed, budget=budget)
+
+    default, columnar = runhistories
+    assert isinstance(columnar._data, ColumnarStorage)
+    assert list(default.items()) == list(columnar.items())
+    assert default.objective_bounds == columnar.objective_bounds
+    for config in configs:
+        assert default.get_cost(config) == columnar.get_cost(config)
+        assert default.average_cost(config) == columnar.average_cost(config)
+
+    unpickled = pickle.loads(pickle.dumps(columnar))
+    assert unpickled == default
+
+    path = tmp_path / "runhistory.json"
+    columnar.save(path)
+    loaded = RunHistory(columnar=True)
+    loaded.load(path, configspace_small)
+    assert loaded == default
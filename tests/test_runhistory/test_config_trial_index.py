@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from smac.runhistory.config_trial_index import ConfigTrialIndex
+from smac.runhistory.dataclasses import InstanceSeedBudgetKey, TrialKey
+from smac.runhistory.enumerations import StatusType
+from smac.runhistory.runhistory import RunHistory
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def test_highest_budget_rows():
+    """
+    Expects
+    -------
+    * Only the highest observed budget of each instance-seed pair is selected by default.
+    * Overwriting a trial keeps its row.
+    * Selecting keys which are not indexed yields None.
+    """
+    index = ConfigTrialIndex(capacity=1)
+    index.add(1, "a", 0, 1.0, 5.0)
+    index.add(1, "b", 0, 1.0, 3.0)
+    index.add(1, "a", 0, 3.0, 4.0)
+    index.add(1, "a", 0, 2.0, 1.0)
+    index.add(2, "a", 0, 1.0, 2.0)
+    index.add(1, "b", 0, 1.0, 6.0)
+
+    assert len(index) == 5
+    assert index.n_objectives == 1
+    assert index.get_rows(1).tolist() == [2, 1]
+    assert index.get_rows(1, highest_observed_budget_only=False).tolist() == [0, 1, 2, 3]
+    assert index.get_costs(index.get_rows(1)).ravel().tolist() == [4.0, 6.0]
+    assert index.get_rows(3).tolist() == []
+
+    keys = [InstanceSeedBudgetKey("a", 0, 2.0), InstanceSeedBudgetKey("b", 0, 1.0)]
+    assert index.get_rows(1, keys).tolist() == [3, 1]
+    assert index.get_rows(1, [InstanceSeedBudgetKey("c", 0, 1.0)]) is None
+
+    with pytest.raises(ValueError):
+        index.add(3, "a", 0, 1.0, [1.0, 2.0])
+
+
+def test_instance_seed_budget_keys():
+    """
+    Expects
+    -------
+    * The keys are grouped by instance-seed pairs in the order the pairs were added first.
+    * Trials without instance or seed are kept apart from trials with instance or seed.
+    * Budgets of None and float budgets can not be mixed for an instance-seed pair.
+    """
+    index = ConfigTrialIndex()
+    index.add(1, "a", 0, 1.0, 5.0)
+    index.add(1, None, None, None, 3.0)
+    index.add(1, "a", 0, 3.0, 4.0)
+    index.add(1, "a", None, 2.0, 1.0)
+    index.add(1, None, 0, None, 2.0)
+
+    assert index.get_instance_seed_budget_keys(1, highest_observed_budget_only=False) == [
+        InstanceSeedBudgetKey("a", 0, 1.0),
+        InstanceSeedBudgetKey("a", 0, 3.0),
+        InstanceSeedBudgetKey(None, None, None),
+        InstanceSeedBudgetKey("a", None, 2.0),
+        InstanceSeedBudgetKey(None, 0, None),
+    ]
+    assert index.get_instance_seed_budget_keys(1) == [
+        InstanceSeedBudgetKey("a", 0, 3.0),
+        InstanceSeedBudgetKey(None, None, None),
+        InstanceSeedBudgetKey("a", None, 2.0),
+        InstanceSeedBudgetKey(None, 0, None),
+    ]
+    keys = [InstanceSeedBudgetKey(None, 0, None), InstanceSeedBudgetKey("a", 0, 3)]
+    assert index.get_rows(1, keys).tolist() == [4, 2]
+    assert index.get_instance_seed_budget_keys(2) == []
+
+    with pytest.raises(ValueError):
+        index.add(1, "a", 0, None, 1.0)
+
+    with pytest.raises(ValueError):
+        index.add(1, None, None, 1.0, 1.0)
+
+
+def test_running_trials():
+    """
+    Expects
+    -------
+    * Running trials are indexed but their costs are not considered until they have finished.
+    * The trials are selected by budget and status in the order they were added.
+    """
+    index = ConfigTrialIndex()
+    index.add(1, "a", 0, 1.0, 0.0, StatusType.RUNNING)
+    index.add(1, "b", 0, 1.0, 3.0)
+    index.add(2, "a", 0, None, 0.0, StatusType.RUNNING)
+    index.add(1, "a", 0, 2.0, 2.0, StatusType.TIMEOUT)
+
+    assert len(index) == 4
+    assert index.get_rows(1).tolist() == [1, 3]
+    assert index.get_rows(2).tolist() == []
+    assert index.get_rows(1, [InstanceSeedBudgetKey("a", 0, 1.0)]) is None
+    assert index.get_trial_rows([1.0, None]).tolist() == [0, 1, 2]
+    assert index.get_trial_rows(statuses=[StatusType.TIMEOUT, StatusType.RUNNING]).tolist() == [3, 0, 2]
+    assert index.get_trial_rows([1.0, 2.0], [StatusType.RUNNING, StatusType.TIMEOUT]).tolist() == [0, 3]
+    assert index.get_trial_keys(index.get_trial_rows(statuses=[StatusType.RUNNING])) == [
+        TrialKey(1, "a", 0, 1.0),
+        TrialKey(2, "a", 0, None),
+    ]
+
+    # Finishing the running trial registers its cost
+    index.add(1, "a", 0, 1.0, 1.0)
+    index.add(2, "a", 0, None, 4.0)
+
+    assert index.get_rows(1, highest_observed_budget_only=False).tolist() == [0, 1, 3]
+    assert index.get_costs(index.get_rows(1)).ravel().tolist() == [3.0, 2.0]
+    assert index.get_trial_rows(statuses=[StatusType.RUNNING]).tolist() == []
+    assert index.get_trial_rows(statuses=[StatusType.SUCCESS]).tolist() == [0, 1, 2]
+
+
+def test_modified_rows():
+    """
+    Expects
+    -------
+    * Every added or overwritten trial gets a new version.
+    * Only the rows which were modified after a version are returned.
+    """
+    index = ConfigTrialIndex()
+    assert index.version == 0
+    assert index.get_modified_rows(0).tolist() == []
+
+    index.add(1, "a", 0, 1.0, 0.0, StatusType.RUNNING)
+    index.add(1, "b", 0, 1.0, 3.0)
+    assert index.version == 2
+    assert index.get_modified_rows(0).tolist() == [0, 1]
+
+    index.add(2, "a", 0, 1.0, 2.0)
+    index.add(1, "a", 0, 1.0, 1.0)
+    assert index.version == 4
+    assert index.get_modified_rows(2).tolist() == [0, 2]
+    assert index.get_modified_rows(4).tolist() == []
+
+    # Trials which are rejected do not change the version
+    with pytest.raises(ValueError):
+        index.add(1, "a", 0, None, 1.0)
+
+    assert index.version == 4
+
+
+def test_from_columns():
+    """
+    Expects
+    -------
+    * An index created from columns equals the index to which the same trials were added one by one (if the
+      trials have finished in the order of their rows), including the highest budgets and the running trials.
+    * Trials can be added to an index which was created from columns.
+    """
+    trials = [
+        (1, "a", 0, 1.0, 5.0, StatusType.SUCCESS),
+        (1, None, None, None, 3.0, StatusType.CRASHED),
+        (2, "a", 0, 1.0, 0.0, StatusType.RUNNING),
+        (1, "a", 0, 3.0, 4.0, StatusType.SUCCESS),
+        (1, "a", -1, 2.0, 1.0, StatusType.SUCCESS),
+        (1, "a", 0, 2.0, 2.0, StatusType.SUCCESS),
+        (2, "b", 2**40, None, 6.0, StatusType.SUCCESS),
+    ]
+    expected = ConfigTrialIndex()
+    for trial in trials:
+        expected.add(*trial)
+
+    instance_table = ["a", "b"]
+    config_ids, instances, seeds, budgets, costs, statuses = zip(*trials)
+    index = ConfigTrialIndex.from_columns(
+        np.array(config_ids),
+        np.array([-1 if instance is None else instance_table.index(instance) for instance in instances]),
+        instance_table,
+        np.array([0 if seed is None else seed for seed in seeds]),
+        np.array([seed is not None for seed in seeds]),
+        np.array([np.nan if budget is None else budget for budget in budgets]),
+        np.array(costs)[:, np.newaxis],
+        np.array(statuses),
+    )
+
+    assert len(index) == len(expected)
+    assert index.version == expected.version
+    assert index.get_modified_rows(0).tolist() == expected.get_modified_rows(0).tolist()
+    for config_id in (1, 2):
+        for highest_observed_budget_only in (True, False):
+            assert index.get_rows(config_id, highest_observed_budget_only=highest_observed_budget_only).tolist() == (
+                expected.get_rows(config_id, highest_observed_budget_only=highest_observed_budget_only).tolist()
+            )
+            assert index.get_instance_seed_budget_keys(config_id, highest_observed_budget_only) == (
+                expected.get_instance_seed_budget_keys(config_id, highest_observed_budget_only)
+            )
+
+    for result, expected_result in zip(index.aggregate(), expected.aggregate()):
+        assert result.tolist() == expected_result.tolist()
+
+    running_rows = index.get_trial_rows(statuses=[StatusType.RUNNING])
+    assert index.get_trial_keys(running_rows) == [TrialKey(2, "a", 0, 1.0)]
+
+    for trial in [(2, "a", 0, 1.0, 1.0, StatusType.SUCCESS), (1, "a", 0, 4.0, 0.5, StatusType.SUCCESS)]:
+        index.add(*trial)
+        expected.add(*trial)
+
+    assert index.get_rows(1).tolist() == expected.get_rows(1).tolist()
+    assert index.get_rows(2).tolist() == expected.get_rows(2).tolist()
+    assert index.get_costs(index.get_rows(1)).tolist() == [[0.5], [3.0], [1.0]]
+
+
+@pytest.mark.parametrize("instances", [None, ["i1"], ["i0", "i2"], ["unknown"]])
+def test_aggregate(instances):
+    """
+    Expects
+    -------
+    * The bulk aggregation equals the aggregation per configuration.
+    """
+    index = ConfigTrialIndex()
+    rng = np.random.RandomState(0)
+    trials = {}
+    for _ in range(200):
+        key = (rng.randint(10), f"i{rng.randint(3)}", rng.randint(3), float(rng.randint(1, 4)))
+        trials[key] = rng.rand(2)
+        index.add(*key, trials[key].tolist())
+
+    config_ids, mean_costs, min_costs, n_trials = index.aggregate(instances)
+
+    expected_ids = []
+    for config_id in range(10):
+        # The costs of the highest budget of each instance-seed pair
+        highest = {}
+        for (trial_config_id, instance, seed, budget), cost in trials.items():
+            if trial_config_id == config_id and (instances is None or instance in instances):
+                if (instance, seed) not in highest or budget > highest[(instance, seed)][0]:
+                    highest[(instance, seed)] = (budget, cost)
+
+        if len(highest) == 0:
+            continue
+
+        i = len(expected_ids)
+        expected_ids += [config_id]
+        costs = np.array([cost for _, cost in highest.values()])
+        np.testing.assert_allclose(mean_costs[i], costs.mean(axis=0))
+        np.testing.assert_array_equal(min_costs[i], costs.min(axis=0))
+        assert n_trials[i] == len(highest)
+
+    assert config_ids.tolist() == expected_ids
+
+
+def test_runhistory_update_costs(configspace_small):
+    """
+    Expects
+    -------
+    * The cached costs after ``update_costs`` equal the costs of the trials on the passed instances.
+    """
+    runhistory = RunHistory()
+    configs = configspace_small.sample_configuration(5)
+
+    rng = np.random.RandomState(0)
+    for _ in range(50):
+        runhistory.add(
+            configs[rng.randint(5)],
+            float(rng.rand()),
+            instance=f"i{rng.randint(3)}",
+            seed=int(rng.randint(3)),
+            budget=float(rng.randint(1, 3)),
+        )
+
+    runhistory.update_costs(instances=["i0", "i1"])
+    for config in configs:
+        isb_keys = [
+            key
+            for key in runhistory.get_instance_seed_budget_keys(config, highest_observed_budget_only=True)
+            if key.instance in ["i0", "i1"]
+        ]
+
+        assert runhistory.get_cost(config) == pytest.approx(runhistory.average_cost(config, isb_keys))
+        assert runhistory.get_min_cost(config) == runhistory.min_cost(config, isb_keys)
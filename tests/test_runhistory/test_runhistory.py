@@ -4,8 +4,11 @@ import os
 import pickle
 import tempfile
 
+import numpy as np
 import pytest
+from ConfigSpace import Configuration
 
+from smac.runhistory.dataclasses import TrialInfo
 from smac.runhistory.runhistory import RunHistory, TrialKey
 from smac.runner.abstract_runner import StatusType
 
@@ -102,7 +105,7 @@ def test_add_multiple_times(runhistory, config1):
 
     assert len(runhistory._data) == 1
     assert len(runhistory.get_trials(config1, highest_observed_budget_only=True)) == 1
-    assert len(runhistory._config_id_to_isk_to_budget[1]) == 1
+    assert len(runhistory.get_trials(config1, highest_observed_budget_only=False)) == 1
     assert list(runhistory._data.values())[0].cost == 1
 
 
@@ -381,6 +384,87 @@ def test_get_configs_per_budget(runhistory, config1, config2, config3):
     assert runhistory.get_configs_per_budget([1]) == [config1, config2]
 
 
+def test_running_trials(runhistory, config1, config2):
+    """
+    Expects
+    -------
+    * Running trials are returned per configuration and removed once they finished.
+    * Configurations are only returned as running as long as they have running trials.
+    """
+    trials = [
+        TrialInfo(config1, instance="a", seed=0),
+        TrialInfo(config2, instance="a", seed=0),
+        TrialInfo(config1, instance="b", seed=0),
+    ]
+    for trial in trials:
+        runhistory.add_running_trial(trial)
+
+    assert runhistory.running == 3
+    assert runhistory.get_running_trials() == trials
+    assert runhistory.get_running_trials(config1) == [trials[0], trials[2]]
+    assert runhistory.get_running_configs() == [config1, config2]
+
+    runhistory.add(config1, cost=1.0, instance="a", seed=0, force_update=True)
+    runhistory.add(config2, cost=1.0, instance="a", seed=0, force_update=True)
+
+    assert runhistory.running == 1
+    assert runhistory.get_running_trials() == [trials[2]]
+    assert runhistory.get_running_trials(config2) == []
+    assert runhistory.get_running_configs() == [config1]
+
+    runhistory.add(config1, cost=1.0, instance="b", seed=0, force_update=True)
+    assert runhistory.get_running_trials() == []
+    assert runhistory.get_running_configs() == []
+
+
+def test_budget_and_status_indices(runhistory, config1, config2):
+    """
+    Expects
+    -------
+    * Trials are counted and returned per budget and status, also if the status of a trial changes.
+    """
+    runhistory.add_running_trial(TrialInfo(config1, instance="a", seed=0, budget=1.0))
+    runhistory.add(config1, cost=1.0, instance="b", seed=0, budget=1.0)
+    runhistory.add(config2, cost=1.0, instance="a", seed=0, budget=3.0, status=StatusType.TIMEOUT)
+
+    assert runhistory.get_budgets() == [1.0, 3.0]
+    assert runhistory.count_trials() == 3
+    assert runhistory.count_trials([1.0]) == 2
+    assert runhistory.count_trials([1.0], [StatusType.RUNNING]) == 1
+    assert runhistory.count_trials(statuses=[StatusType.SUCCESS, StatusType.TIMEOUT]) == 2
+
+    runhistory.add(config1, cost=2.0, instance="a", seed=0, budget=1.0, force_update=True)
+
+    assert runhistory.count_trials([1.0], [StatusType.RUNNING]) == 0
+    assert runhistory.count_trials([1], [StatusType.SUCCESS]) == 2
+    assert runhistory.get_trial_keys([1.0], [StatusType.SUCCESS]) == [
+        TrialKey(config_id=1, instance="a", seed=0, budget=1.0),
+        TrialKey(config_id=1, instance="b", seed=0, budget=1.0),
+    ]
+    assert runhistory.get_trial_keys(statuses=[StatusType.TIMEOUT]) == [
+        TrialKey(config_id=2, instance="a", seed=0, budget=3.0)
+    ]
+    assert runhistory.get_trial_keys([2.0]) == []
+
+
+def test_config_vectors(runhistory, config1, config2, config3):
+    """
+    Expects
+    -------
+    * The cached vectors equal the vectors of the configurations.
+    * Vectors of configurations which are not the objects stored in the runhistory are computed.
+    """
+    runhistory.add(config1, cost=1.0, instance="a", seed=0)
+    runhistory.add(config2, cost=1.0, instance="a", seed=0)
+    runhistory.add(config1, cost=1.0, instance="b", seed=0)
+
+    np.testing.assert_array_equal(runhistory.get_config_vectors([2, 1]), [config2.get_array(), config1.get_array()])
+
+    copy = Configuration(config1.configuration_space, values=config1.get_dictionary())
+    X = runhistory.get_configs_array([config3, config2, copy])
+    np.testing.assert_array_equal(X, [config3.get_array(), config2.get_array(), config1.get_array()])
+
+
 def test_json_origin(configspace_small, config1):
 
     for i, origin in enumerate(["test_origin", None]):
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from ConfigSpace import Categorical, ConfigurationSpace, Float, Integer
+
+from smac.multi_objective.aggregation_strategy import MeanAggregationStrategy
+from smac.runhistory.dataclasses import TrialInfo
+from smac.runhistory.enumerations import StatusType
+from smac.runhistory.lazy_configurations import (
+    LazyConfigurations,
+    decode_configuration_values,
+    encode_configuration_values,
+)
+from smac.runhistory.runhistory import RunHistory
+from smac.scenario import Scenario
+from smac.utils.npz import load_npz, save_npz
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+@pytest.fixture
+def configspace() -> ConfigurationSpace:
+    cs = ConfigurationSpace(seed=0)
+    cs.add_hyperparameters(
+        [
+            Float("x", (0, 1)),
+            Float("y", (1e-5, 1), log=True),
+            Integer("i", (1, 100), log=True),
+            Categorical("c", ["a", "b", "c"]),
+        ]
+    )
+
+    return cs
+
+
+def make_runhistory(configspace, multi_objective: bool, columnar: bool) -> RunHistory:
+    scenario = Scenario(configspace, objectives=["a", "b"] if multi_objective else "cost")
+    mo = MeanAggregationStrategy(scenario) if multi_objective else None
+    runhistory = RunHistory(multi_objective_algorithm=mo, columnar=columnar)
+    configs = configspace.sample_configuration(10)
+
+    rng = np.random.RandomState(0)
+    for i in range(100):
+        cost = rng.rand(2).tolist() if multi_objective else float(rng.rand())
+        runhistory.add(
+            configs[rng.randint(len(configs))],
+            cost,
+            status=StatusType.SUCCESS if i % 5 else StatusType.CRASHED,
+            instance=f"i{i % 3}",
+            seed=i % 4,
+            budget=float(1 + i % 2),
+            additional_info={"i": i} if i % 7 == 0 else {},
+        )
+
+    runhistory.add_running_trial(TrialInfo(configs[0], instance="i0", seed=100, budget=1.0))
+
+    return runhistory
+
+
+def test_encode_configuration_values(configspace):
+    """
+    Expects
+    -------
+    * Decoding the encoded values yields exactly the values of the configurations.
+    """
+    configs = configspace.sample_configuration(50)
+    values = encode_configuration_values(configspace, configs)
+
+    assert values.shape == (50, 4)
+    for config, row in zip(configs, values):
+        assert decode_configuration_values(configspace, row) == config.get_dictionary()
+
+
+@pytest.mark.parametrize("multi_objective", [False, True])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_save_load_binary(configspace, tmp_path, multi_objective, columnar):
+    """
+    Expects
+    -------
+    * A runhistory loaded from a binary snapshot equals the saved one, including costs, bounds and running trials.
+    * Configurations are only created on access, e.g., for running trials.
+    * Trials can be added to the loaded runhistory and it can be saved again.
+    """
+    runhistory = make_runhistory(configspace, multi_objective, columnar)
+    path = tmp_path / "runhistory.npz"
+    runhistory.save(path)
+
+    loaded = RunHistory(multi_objective_algorithm=runhistory.multi_objective_algorithm, columnar=columnar)
+    loaded.load(path, configspace)
+
+    assert isinstance(loaded.ids_config, LazyConfigurations)
+    assert loaded.ids_config.n_materialized == 1
+    assert list(loaded.items()) == list(runhistory.items())
+    assert loaded.objective_bounds == runhistory.objective_bounds
+    assert loaded.get_running_trials() == runhistory.get_running_trials()
+    assert (loaded.submitted, loaded.finished, loaded.running) == (
+        runhistory.submitted,
+        runhistory.finished,
+        runhistory.running,
+    )
+
+    for config in runhistory.get_configs():
+        assert loaded.has_config(config)
+        assert loaded.get_config_id(config) == runhistory.get_config_id(config)
+        assert loaded.get_config(runhistory.get_config_id(config)) == config
+        assert loaded.get_cost(config) == runhistory.get_cost(config)
+        assert loaded.get_min_cost(config) == runhistory.get_min_cost(config)
+        assert loaded.get_instance_seed_budget_keys(config) == runhistory.get_instance_seed_budget_keys(config)
+        assert loaded.get_instance_seed_budget_keys(
+            config, highest_observed_budget_only=False
+        ) == runhistory.get_instance_seed_budget_keys(config, highest_observed_budget_only=False)
+
+    # The trial index and the counters are rebuilt from the columns
+    assert loaded.get_budgets() == runhistory.get_budgets()
+    for budget in runhistory.get_budgets():
+        for status in (StatusType.SUCCESS, StatusType.CRASHED, StatusType.RUNNING):
+            assert loaded.get_trial_keys([budget], [status]) == runhistory.get_trial_keys([budget], [status])
+
+    config = runhistory.get_configs()[0]
+    for rh in (runhistory, loaded):
+        rh.add(config, [0.5, 0.5] if multi_objective else 0.5, instance="i3", seed=0, budget=2.0)
+
+    assert loaded.get_cost(config) == runhistory.get_cost(config)
+
+    loaded.save(path)
+    reloaded = RunHistory(columnar=columnar)
+    reloaded.load(path, configspace)
+    assert list(reloaded.items()) == list(runhistory.items())
+
+
+@pytest.mark.parametrize("trials", ["none", "running", "incremental"])
+def test_save_load_binary_with_empty_caches(configspace, tmp_path, trials):
+    """
+    Expects
+    -------
+    * Snapshots can be written and loaded if (some of) the caches are empty, i.e., for an empty runhistory, if
+      all trials are running, or if only the mean costs are updated (incrementally).
+    """
+    runhistory = RunHistory()
+    config = configspace.sample_configuration()
+    if trials == "running":
+        runhistory.add_running_trial(TrialInfo(config, instance="i0", seed=0))
+    elif trials == "incremental":
+        runhistory.add(config, 0.5, instance="i0", seed=0, budget=0)
+
+    path = tmp_path / "runhistory.npz"
+    runhistory.save(path)
+
+    loaded = RunHistory()
+    loaded.load(path, configspace)
+    assert list(loaded.items()) == list(runhistory.items())
+    assert loaded.get_running_trials() == runhistory.get_running_trials()
+    for config in runhistory.get_configs():
+        np.testing.assert_equal(loaded.get_cost(config), runhistory.get_cost(config))
+        assert np.isnan(loaded.get_min_cost(config))
+
+    loaded.add(config, 0.1, instance="i1", seed=0, budget=0)
+    assert loaded.get_cost(config) == (0.1 if trials != "incremental" else 0.3)
+
+
+def test_load_binary_with_journal(configspace, tmp_path):
+    """
+    Expects
+    -------
+    * The journal next to a binary snapshot is replayed.
+    """
+    runhistory = make_runhistory(configspace, False, True)
+    runhistory.save(tmp_path / "runhistory.npz")
+
+    config = configspace.sample_configuration()
+    runhistory.add(config, 0.1, instance="i0", seed=0, budget=1.0)
+    runhistory.append_to_journal([list(runhistory.keys())[-1]], tmp_path / "runhistory.jsonl")
+
+    loaded = RunHistory(columnar=True)
+    loaded.load(tmp_path / "runhistory.npz", configspace)
+    assert list(loaded.items()) == list(runhistory.items())
+    assert loaded.get_cost(config) == 0.1
+
+
+def test_load_npz(tmp_path):
+    """
+    Expects
+    -------
+    * Arrays are memory-mapped and modifications are not written back to the file.
+    """
+    arrays = {"a": np.arange(10, dtype=np.int64), "b": np.random.rand(3, 4), "empty": np.zeros((0, 2))}
+    save_npz(tmp_path / "arrays.npz", arrays)
+
+    loaded = load_npz(tmp_path / "arrays.npz")
+    assert isinstance(loaded["a"], np.memmap)
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(loaded[name], array)
+
+    loaded["a"][0] = 100
+    np.testing.assert_array_equal(load_npz(tmp_path / "arrays.npz", mmap=False)["a"], arrays["a"])
@@ -3,6 +3,7 @@ import pytest
 
 from smac.multi_objective.aggregation_strategy import MeanAggregationStrategy
 from smac.runhistory.encoder import (
+    AbstractRunHistoryEncoder,
     RunHistoryEIPSEncoder,
     RunHistoryInverseScaledEncoder,
     RunHistoryLogEncoder,
@@ -288,3 +289,72 @@ def test_lower_budget_states(runhistory, make_scenario, configspace_small, confi
     # receive the cost of 3
     X, Y = encoder.transform(budget_subset=[500])
     assert Y.tolist() == [[3.0]]
+
+
+@pytest.mark.parametrize("encoder_type", [RunHistoryEncoder, RunHistoryLogScaledEncoder, RunHistoryEIPSEncoder])
+@pytest.mark.parametrize("use_multi_objective", [False, True])
+def test_incremental_cache(runhistory, make_scenario, configspace_small, encoder_type, use_multi_objective):
+    """
+    Expects
+    -------
+    * Transforming a growing runhistory with the cache yields the same matrices as building them from scratch,
+      also if trials are overwritten.
+    """
+
+    class UncachedEncoder(encoder_type):  # type: ignore
+        _build_matrix_from_rows = AbstractRunHistoryEncoder._build_matrix_from_rows
+
+    configs = configspace_small.sample_configuration(20)
+    scenario = make_scenario(configspace_small, use_multi_objective=use_multi_objective)
+
+    encoder = encoder_type(scenario=scenario, considered_states=[StatusType.SUCCESS])
+    encoder.runhistory = runhistory
+    if use_multi_objective:
+        encoder.multi_objective_algorithm = MeanAggregationStrategy(scenario)
+
+    rng = np.random.RandomState(0)
+    for i in range(60):
+        config = configs[rng.randint(len(configs))]
+        cost = rng.rand(2).tolist() if use_multi_objective else float(rng.rand())
+        status = [StatusType.SUCCESS, StatusType.TIMEOUT, StatusType.CRASHED][rng.randint(3)]
+        runhistory.add(config, cost, time=float(i), status=status, budget=float(rng.randint(1, 3)), force_update=True)
+
+        if i % 10 == 9:
+            uncached = UncachedEncoder(scenario=scenario, considered_states=[StatusType.SUCCESS])
+            uncached.runhistory = runhistory
+            uncached.multi_objective_algorithm = encoder.multi_objective_algorithm
+
+            for budget_subset in (None, [1.0], [2.0]):
+                X, Y = encoder.transform(budget_subset=budget_subset)
+                X_expected, Y_expected = uncached.transform(budget_subset=budget_subset)
+
+                np.testing.assert_array_equal(X, X_expected)
+                np.testing.assert_array_equal(Y, Y_expected)
+
+            np.testing.assert_array_equal(encoder.get_configurations(), uncached.get_configurations())
+
+
+@pytest.mark.parametrize("lower_budget_states", [[], [StatusType.TIMEOUT, StatusType.CRASHED]])
+def test_get_n_trials(runhistory, make_scenario, configspace_small, lower_budget_states):
+    """
+    Expects
+    -------
+    * The number of data points is derived from the runhistory without transforming it.
+    """
+    configs = configspace_small.sample_configuration(20)
+    scenario = make_scenario(configspace_small)
+    encoder = RunHistoryEncoder(
+        scenario=scenario,
+        considered_states=[StatusType.SUCCESS],
+        lower_budget_states=lower_budget_states,
+    )
+    encoder.runhistory = runhistory
+
+    rng = np.random.RandomState(0)
+    for config in configs:
+        status = [StatusType.SUCCESS, StatusType.TIMEOUT, StatusType.CRASHED][rng.randint(3)]
+        runhistory.add(config, float(rng.rand()), status=status, budget=float(rng.randint(1, 4)))
+
+    for budget_subset in (None, [1.0], [2.0], [3.0], [4.0]):
+        X, _ = encoder.transform(budget_subset=budget_subset)
+        assert encoder.get_n_trials(budget_subset) == X.shape[0]
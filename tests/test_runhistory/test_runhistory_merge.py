@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from smac.runhistory import ShardedRunHistory
+from smac.runhistory.dataclasses import TrialInfo, TrialKey
+from smac.runhistory.runhistory import RunHistory
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def make_runhistory(configs, seed: int, n_trials: int = 50) -> RunHistory:
+    runhistory = RunHistory()
+    rng = np.random.RandomState(seed)
+    for _ in range(n_trials):
+        runhistory.add(
+            configs[rng.randint(len(configs))],
+            float(rng.rand()),
+            instance=f"i{rng.randint(3)}",
+            seed=int(rng.randint(2)),
+            budget=float(rng.randint(1, 3)),
+        )
+
+    return runhistory
+
+
+@pytest.mark.parametrize("conflict", ["keep_first", "keep_best", "overwrite"])
+def test_merge(configspace_small, conflict):
+    """
+    Expects
+    -------
+    * Merging in bulk yields the same trials, costs, bounds and stats as adding the trials one by one.
+    * Config ids are remapped to the ids of the merged runhistory.
+    """
+    configs = configspace_small.sample_configuration(10)
+    runhistories = [make_runhistory(configs[i : i + 6], seed=i) for i in range(3)]
+
+    merged = RunHistory()
+    merged.merge(runhistories, conflict=conflict)
+
+    expected = RunHistory()
+    for runhistory in runhistories:
+        for k, v in runhistory.items():
+            config = runhistory.get_config(k.config_id)
+            config_id = expected.get_config_id(config) if expected.has_config(config) else None
+            previous = expected.get(TrialKey(config_id, k.instance, k.seed, k.budget)) if config_id else None
+            if previous is not None:
+                if conflict == "keep_first" or (conflict == "keep_best" and v.cost >= previous.cost):
+                    continue
+
+            expected.add(config, v.cost, instance=k.instance, seed=k.seed, budget=k.budget, force_update=True)
+
+    assert len(merged) == len(expected)
+    for config in expected.get_configs():
+        assert merged.get_config_id(config) == expected.get_config_id(config)
+        assert merged.get_cost(config) == pytest.approx(expected.get_cost(config))
+        assert merged.get_min_cost(config) == expected.get_min_cost(config)
+        assert merged.get_instance_seed_budget_keys(config) == expected.get_instance_seed_budget_keys(config)
+
+    for k, v in expected.items():
+        assert merged[k].cost == v.cost
+
+    assert merged.objective_bounds == expected.objective_bounds
+    assert (merged.submitted, merged.finished, merged.running) == (
+        expected.submitted,
+        expected.finished,
+        expected.running,
+    )
+
+    configs = merged.get_configs()
+    config_ids = [merged.get_config_id(config) for config in configs]
+    np.testing.assert_array_equal(merged.get_config_vectors(config_ids), [config.get_array() for config in configs])
+
+
+def test_merge_keeps_configs(configspace_small):
+    """
+    Expects
+    -------
+    * Merging does not change the config ids of the configurations of the merged runhistories, which keep using
+      their vector cache.
+    """
+    configs = configspace_small.sample_configuration(4)
+    runhistory1 = make_runhistory(configs[:2], seed=0, n_trials=10)
+    runhistory2 = make_runhistory(configs[2:], seed=1, n_trials=10)
+
+    merged = RunHistory()
+    merged.merge([runhistory1, runhistory2])
+    assert sorted(merged.get_config_id(config) for config in configs) == [1, 2, 3, 4]
+
+    for runhistory in (runhistory1, runhistory2):
+        for config_id, config in runhistory.ids_config.items():
+            assert config.config_id == config_id
+            assert runhistory.get_config_id(config) == config_id
+            assert runhistory._get_config_vector_row(config) >= 0
+
+    for config_id, config in merged.ids_config.items():
+        assert config.config_id == config_id
+        assert merged._get_config_vector_row(config) >= 0
+
+
+def test_merge_running_trials(configspace_small):
+    """
+    Expects
+    -------
+    * With keep_best, running trials are replaced by finished trials but never replace finished trials.
+    * Merging runhistories with a different number of objectives fails.
+    """
+    config1, config2 = configspace_small.sample_configuration(2)
+
+    runhistory1 = RunHistory()
+    runhistory1.add_running_trial(TrialInfo(config1, instance="a", seed=0))
+    runhistory1.add(config2, 1.0, instance="a", seed=0)
+
+    runhistory2 = RunHistory()
+    runhistory2.add(config1, 2.0, instance="a", seed=0)
+    runhistory2.add_running_trial(TrialInfo(config2, instance="a", seed=0))
+
+    runhistory1.merge(runhistory2, conflict="keep_best")
+    assert runhistory1.get_running_trials() == []
+    assert runhistory1.get_cost(config1) == 2.0
+    assert runhistory1.get_cost(config2) == 1.0
+    assert (runhistory1.submitted, runhistory1.finished, runhistory1.running) == (2, 2, 0)
+
+    runhistory3 = RunHistory()
+    runhistory3.add(config1, [1.0, 2.0], instance="a", seed=0)
+    with pytest.raises(ValueError):
+        runhistory1.merge(runhistory3)
+
+    with pytest.raises(ValueError):
+        runhistory1.merge(runhistory2, conflict="unknown")
+
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_sharded_runhistory(configspace_small, tmp_path, suffix):
+    """
+    Expects
+    -------
+    * The shards of several processes are queried as one runhistory.
+    * The merged runhistory is only rebuilt if a shard changed, and new shard files are picked up.
+    """
+    configs = configspace_small.sample_configuration(10)
+    local = make_runhistory(configs, seed=0)
+    make_runhistory(configs, seed=1).save(tmp_path / "1" / f"runhistory{suffix}")
+
+    sharded = ShardedRunHistory([local, tmp_path / "*" / f"runhistory{suffix}"], configspace_small, "keep_best")
+    assert len(sharded.get_shards()) == 2
+
+    merged = sharded.get_runhistory()
+    assert sharded.get_runhistory() is merged
+
+    expected = RunHistory()
+    expected.merge(sharded.get_shards(), conflict="keep_best")
+    assert list(merged.items()) == list(expected.items())
+
+    # A new shard and a new trial in the local shard
+    make_runhistory(configs, seed=2).save(tmp_path / "2" / f"runhistory{suffix}")
+    local.add(configs[0], 0.0, instance="new", seed=0, budget=1.0)
+
+    merged = sharded.get_runhistory()
+    assert len(sharded.get_shards()) == 3
+    assert merged is not expected
+    assert len(merged) > len(expected)
+    assert TrialKey(merged.get_config_id(configs[0]), "new", 0, 1.0) in merged
@@ -136,7 +136,7 @@ def test_add_multiple_times(scenario, runhistory, config1):
 
     assert len(runhistory._data) == 1
     assert len(runhistory.get_trials(config1, highest_observed_budget_only=True)) == 1
-    assert len(runhistory._config_id_to_isk_to_budget[1]) == 1
+    assert len(runhistory.get_trials(config1, highest_observed_budget_only=False)) == 1
 
     # We expect to get 1.0 and 2.0 because runhistory does not overwrite by default
     assert list(runhistory._data.values())[0].cost == [1.0, 2.0]
@@ -593,3 +593,27 @@ def test_objective_weights(scenario, runhistory, config1, config2):
     # If we change the weights/mo algorithm now, we expect a higher value in the second cost
     runhistory.multi_objective_algorithm = MeanAggregationStrategy(scenario, objective_weights=[1, 2])
     assert round(runhistory.get_cost(config1), 2) == 0.67
+
+
+def test_objective_bounds_overwrite_extreme(scenario, runhistory, config1, config2, config3):
+    """
+    Expects
+    -------
+    * Overwriting the trial holding an extreme recomputes the bounds from the remaining trials.
+    * Overwriting a successful trial with a crashed one removes its cost from the bounds.
+    """
+    runhistory.multi_objective_algorithm = MeanAggregationStrategy(scenario)
+
+    runhistory.add(config=config1, cost=[10, 50], status=StatusType.SUCCESS)
+    runhistory.add(config=config2, cost=[5, 100], status=StatusType.SUCCESS)
+    runhistory.add(config=config3, cost=[7.5, 150], status=StatusType.SUCCESS)
+    assert runhistory.objective_bounds == [(5, 10), (50, 150)]
+
+    runhistory.add(config=config2, cost=[8, 80], status=StatusType.SUCCESS, force_update=True)
+    assert runhistory.objective_bounds == [(7.5, 10), (50, 150)]
+
+    runhistory.add(config=config3, cost=[1, 1], status=StatusType.CRASHED, force_update=True)
+    assert runhistory.objective_bounds == [(8, 10), (50, 80)]
+
+    runhistory.add(config=config1, cost=[1, 1000], status=StatusType.SUCCESS, force_update=True)
+    assert runhistory.objective_bounds == [(1, 8), (80, 1000)]
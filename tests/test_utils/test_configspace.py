@@ -0,0 +1,54 @@
+import numpy as np
+from ConfigSpace import (
+    Categorical,
+    ConfigurationSpace,
+    EqualsCondition,
+    Float,
+    ForbiddenAndConjunction,
+    ForbiddenEqualsClause,
+    InCondition,
+    Integer,
+    OrConjunction,
+)
+from ConfigSpace.hyperparameters import OrdinalHyperparameter
+
+from smac.utils.configspace import (
+    get_one_exchange_neighbourhood,
+    get_one_exchange_neighbourhood_vectors,
+)
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def test_one_exchange_neighbourhood_vectors():
+    """
+    Expects
+    -------
+    * The neighbours equal the ones of ConfigSpace for the same seed, also with conditions and forbidden clauses.
+    * Reusing a random state does not change the neighbours.
+    """
+    cs = ConfigurationSpace(seed=0)
+    p = Categorical("p", ["a", "b", "c"])
+    q = Float("q", (1, 100), log=True)
+    r = Integer("r", (0, 3))
+    s = Categorical("s", [True, False])
+    t = OrdinalHyperparameter("t", ["low", "medium", "high"])
+    u = Integer("u", (1, 1000))
+    cs.add_hyperparameters([p, q, r, s, t, u])
+    cs.add_condition(InCondition(q, p, ["a", "b"]))
+    cs.add_condition(EqualsCondition(r, p, "c"))
+    cs.add_condition(OrConjunction(EqualsCondition(t, p, "a"), EqualsCondition(t, s, False)))
+    cs.add_forbidden_clause(ForbiddenAndConjunction(ForbiddenEqualsClause(p, "b"), ForbiddenEqualsClause(s, False)))
+    cs.add_forbidden_clause(ForbiddenEqualsClause(r, 2))
+
+    random_state = np.random.RandomState()
+    for i, config in enumerate(cs.sample_configuration(20)):
+        expected = [neighbor.get_array() for neighbor in get_one_exchange_neighbourhood(config, seed=i)]
+        assert len(expected) > 0
+
+        for kwargs in [{}, {"random_state": random_state}]:
+            actual = list(get_one_exchange_neighbourhood_vectors(cs, config.get_array(), seed=i, **kwargs))
+            assert len(actual) == len(expected)
+            for a, e in zip(actual, expected):
+                np.testing.assert_array_equal(a, e)
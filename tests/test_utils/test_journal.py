@@ -0,0 +1,39 @@
+from smac.utils.journal import Journal, dump_json, get_journal_filename
+
+__copyright__ = "Copyright 2022, automl.org"
+__license__ = "3-clause BSD"
+
+
+def test_journal(tmp_path):
+    """
+    Expects
+    -------
+    * Rotated records are read before the current ones.
+    * Incomplete records are skipped.
+    """
+    journal = Journal(get_journal_filename(tmp_path / "runhistory.json"))
+    assert journal.filename == tmp_path / "runhistory.jsonl"
+    assert not journal.exists()
+
+    journal.append({"a": 1})
+    journal.append({"a": 2})
+    journal.rotate()
+    journal.append({"a": 3})
+
+    with open(journal.filename, "a") as fp:
+        fp.write('{"a": 4')
+
+    assert [record["a"] for record in journal.read()] == [1, 2, 3]
+
+    journal.remove_rotated()
+    assert journal.exists()
+
+    journal.clear()
+    assert not journal.exists()
+    assert list(journal.read()) == []
+
+
+def test_dump_json(tmp_path):
+    dump_json({"a": [1, 2]}, tmp_path / "sub" / "data.json")
+    assert (tmp_path / "sub" / "data.json").exists()
+    assert not (tmp_path / "sub" / "data.json.tmp").exists()